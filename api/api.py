@@ -36,6 +36,7 @@ import jwt
 from attributes import Email
 from attributes import Origin
 from attributes import Path
+from codec import codec
 from controllers import Controller
 from controllers import PrivateControllerMixin
 from data import Secret
@@ -116,7 +117,7 @@ class ApiRequest(Serializable[dict[str, Any]]):
         if not self._body:
             return {}
         try:
-            return json.loads(self._body)
+            return codec.decode(self._body)
         except json.JSONDecodeError:
             return {}
 
@@ -161,7 +162,7 @@ class ApiResponse(Serializable[dict[str, Any]]):
             status_code = code if isinstance(code, http.HTTPStatus) else http.HTTPStatus(int(code))
             error_type = data.__class__.__name__
             error_message = str(data) if str(data) else "An error occurred"
-            body = json.dumps({"error": {"code": status_code.value, "type": error_type, "message": error_message}})
+            body = codec.encode({"error": {"code": status_code.value, "type": error_type, "message": error_message}}).decode("utf-8")
             return cls(status_code=status_code, body=body)
         raise NotImplementedError
 
@@ -288,7 +289,7 @@ def interceptor(
                 extra={**extra, "elapsed_ms": elapsed_ms, "status": 200},
             )
 
-            return ApiResponse(http.HTTPStatus.OK, json.dumps(result, default=str), origin).serialize()
+            return ApiResponse(http.HTTPStatus.OK, codec.encode(result).decode("utf-8"), origin).serialize()
 
         except GeometryException as e:
             elapsed_ms: float = (time.perf_counter() - start) * 1000
@@ -323,7 +324,7 @@ def interceptor(
             logger.error("Interceptor.wrapper() | traceback:\n%s", tb_str, extra=extra)
             # Do not leak internal details (S3, SQS, stack traces) unless EXPOSE_TRACEBACK is set.
             if EXPOSE_TRACEBACK:
-                body = json.dumps(
+                body = codec.encode(
                     {
                         "error": {
                             "code": 500,
@@ -332,7 +333,7 @@ def interceptor(
                             "traceback": tb_str.strip().split("\n"),
                         },
                     }
-                )
+                ).decode("utf-8")
                 response = ApiResponse(http.HTTPStatus.INTERNAL_SERVER_ERROR, body)
             else:
                 response = ApiResponse.unserialize(InternalServerError("An error occurred"))
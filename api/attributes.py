@@ -8,7 +8,7 @@ Attributes Module (Value Types)
 Context
 -------
 This module defines validated value types used across the API: Timestamp,
-Countdown, Identifier, Email, Url, Title, Path, Origin, Limit, Offset,
+Countdown, Deadline, Identifier, Email, Url, Title, Path, Origin, Limit, Offset,
 Slug, Signature, ReceiptHandle. Each enforces format and raises
 ValidationError (or a specific exception) on invalid input. Geometry types
 (Point, Polygon, Segment, etc.) live in the geometry package. Data
@@ -26,6 +26,7 @@ from __future__ import annotations
 
 import hashlib
 import re
+import time
 from datetime import date
 from datetime import datetime
 from datetime import timedelta
@@ -278,6 +279,48 @@ class Work(int):
         return Work(super().__rsub__(other))
 
 
+class Deadline(float):
+    """
+    Monotonic clock time (time.monotonic(), in seconds) at which the current invocation is cut off.
+
+    Constructor accepts a number >= 0 (or Deadline). Use from_millis or from_context to build it
+    from the time left; remaining() returns the milliseconds left as a Duration (0 once passed).
+
+    For example, to read the Lambda deadline in a worker:
+    >>> deadline = Deadline.from_context(context)
+    >>> deadline.remaining() > 0
+    True
+    """
+
+    def __new__(cls, value: Any) -> Deadline:
+        if isinstance(value, Deadline):
+            return super().__new__(cls, float(value))
+        try:
+            raw: float = float(value)
+        except (TypeError, ValueError):
+            raise ValidationError("Deadline must be a number")
+        if raw < 0:
+            raise ValidationError("Deadline must be >= 0")
+        return super().__new__(cls, raw)
+
+    @classmethod
+    def from_millis(cls, millis: int) -> Deadline:
+        """Build Deadline millis milliseconds from now."""
+        return cls(time.monotonic() + int(millis) / 1000)
+
+    @classmethod
+    def from_context(cls, context: Any) -> Deadline | None:
+        """Build Deadline from a Lambda context (get_remaining_time_in_millis); None when there is no such context."""
+        remaining = getattr(context, "get_remaining_time_in_millis", None)
+        if not callable(remaining):
+            return None
+        return cls.from_millis(remaining())
+
+    def remaining(self) -> Duration:
+        """Milliseconds left until the deadline (0 once passed)."""
+        return Duration(max(0, int((self - time.monotonic()) * 1000)))
+
+
 class Countdown(int):
     """
     Integer sort key for "newest first": (FAR_FUTURE - value) in total_seconds, multiplied by 10**PRECISION.
@@ -0,0 +1,284 @@
+"""
+Shared-memory geometry buffers for multiprocess workers.
+
+Title
+-----
+Buffers Module
+
+Context
+-------
+Pickling an ArtGallery into every worker process copies thousands of
+list-subclass Points and Decimals per worker. GeometryBuffer flattens the
+read-only geometry of a gallery (boundary, stitched, obstacles, ears,
+convex components and adjacency) into a single multiprocessing.shared_memory
+block: a vertex table, polygon offset/index arrays and a CSR adjacency array,
+all uint32, followed by the coordinate text. Coordinates are stored as their
+Decimal strings so attaching is exact. Workers attach by name without copying
+the arrays and rebuild lightweight polygon views that share one Point per
+distinct vertex; polygons are neither re-validated nor re-hashed (hashes
+are stored on export).
+
+Layout (native byte order, read back with memoryview.cast("I")):
+    header             HEADER_FORMAT (version and counts)
+    vertex_offsets     uint32[vertices + 1]         byte offsets into text ("x,y" per vertex)
+    polygon_offsets    uint32[polygons + 1]         offsets into polygon_vertices
+    polygon_vertices   uint32[polygon_vertices]     vertex indices
+    adjacency_offsets  uint32[components + 1]       offsets into adjacency_indices
+    adjacency_indices  uint32[adjacency]            component indices
+    polygon_hashes     bytes[32 * polygons]         hash(polygon), big-endian (Table keys)
+    text               bytes[text]                  ASCII coordinates
+
+Polygons are ordered boundary, stitched, obstacles, ears, convex components.
+
+Examples:
+>>> buffer = GeometryBuffer.export(gallery)
+>>> view = GeometryBuffer.attach(buffer.name)  # in a worker process
+>>> view.boundary, view.convex_components
+>>> view.close(); buffer.close(); buffer.unlink()
+"""
+
+from __future__ import annotations
+
+import struct
+from decimal import Decimal
+from functools import cached_property
+from multiprocessing import shared_memory
+from typing import Any
+from typing import Iterable
+from typing import Type
+
+from attributes import Identifier
+from exceptions import ValidationError
+from geometry import ConvexComponent
+from geometry import Ear
+from geometry import Point
+from geometry import Polygon
+from structs import Collection
+from structs import Table
+
+HEADER_FORMAT: str = "=9I"
+HEADER_SIZE: int = struct.calcsize(HEADER_FORMAT)
+HASH_SIZE: int = 32
+BUFFER_VERSION: int = 1
+
+
+class GeometryBuffer:
+    """
+    Flat, shared-memory copy of an ArtGallery's geometry.
+
+    export() (owner) creates the block; attach() maps an existing block by name.
+    Array properties are memoryviews over the block (no copies); geometry
+    properties build Points and polygon views on first access and cache them.
+    The owner must close() and unlink() when done; attached views only close().
+
+    For example:
+    >>> buffer = GeometryBuffer.export(gallery)
+    >>> GeometryBuffer.attach(buffer.name).obstacles
+    Table(...)
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory) -> None:
+        self.memory: shared_memory.SharedMemory = memory
+        header: tuple[int, ...] = struct.unpack_from(HEADER_FORMAT, memory.buf, 0)
+        (
+            version,
+            self.vertices_count,
+            self.polygons_count,
+            self.obstacles_count,
+            self.ears_count,
+            self.components_count,
+            self.polygon_vertices_count,
+            self.adjacency_count,
+            self.text_size,
+        ) = header
+        if version != BUFFER_VERSION:
+            raise ValidationError(f"Unsupported geometry buffer version: {version}")
+        self._arrays: list[memoryview] = []
+
+        # Start of each section: the five uint32 arrays, the polygon hashes and the text.
+        self.offsets: list[int] = [HEADER_SIZE]
+        for count in (
+            self.vertices_count + 1,
+            self.polygons_count + 1,
+            self.polygon_vertices_count,
+            self.components_count + 1,
+            self.adjacency_count,
+        ):
+            self.offsets.append(self.offsets[-1] + 4 * count)
+        self.offsets.append(self.offsets[-1] + HASH_SIZE * self.polygons_count)
+
+    @property
+    def name(self) -> str:
+        """Shared memory block name; pass it to attach() in the worker."""
+        return self.memory.name
+
+    @classmethod
+    def export(cls, gallery: Any) -> GeometryBuffer:
+        """
+        Flatten the geometry of gallery (an ArtGallery) into a new shared memory block.
+
+        For example:
+        >>> buffer = GeometryBuffer.export(gallery)
+        >>> buffer.vertices_count
+        42
+        """
+        # Table keys already are hash(item); only boundary and stitched need hashing.
+        tables: list[Table[Polygon]] = [gallery.obstacles, gallery.ears, gallery.convex_components]
+        keys: list[int] = [hash(gallery.boundary), hash(gallery.stitched), *(key for table in tables for key in table.keys())]
+        polygons: list[Iterable[Point]] = [gallery.boundary, gallery.stitched, *(polygon for table in tables for polygon in table.values())]
+
+        # Vertex table: one entry per distinct point, shared by every polygon that uses it.
+        index_by_point: dict[Point, int] = {}
+        text: bytearray = bytearray()
+        vertex_offsets: list[int] = [0]
+        polygon_offsets: list[int] = [0]
+        polygon_vertices: list[int] = []
+        for polygon in polygons:
+            for point in polygon:
+                index: int | None = index_by_point.get(point)
+                if index is None:
+                    index = index_by_point[point] = len(index_by_point)
+                    text += f"{point.x},{point.y}".encode("ascii")
+                    vertex_offsets.append(len(text))
+                polygon_vertices.append(index)
+            polygon_offsets.append(len(polygon_vertices))
+
+        # Adjacency in CSR form over component indices.
+        index_by_component: dict[int, int] = {key: i for i, key in enumerate(gallery.convex_components.keys())}
+        adjacency_offsets: list[int] = [0]
+        adjacency_indices: list[int] = []
+        for key in gallery.convex_components.keys():
+            if key in gallery.adjacency:
+                neighbours = sorted(index_by_component[hash(i)] for i in gallery.adjacency[key].items if hash(i) in index_by_component)
+                adjacency_indices.extend(neighbours)
+            adjacency_offsets.append(len(adjacency_indices))
+
+        header: bytes = struct.pack(
+            HEADER_FORMAT,
+            BUFFER_VERSION,
+            len(index_by_point),
+            len(polygons),
+            len(gallery.obstacles),
+            len(gallery.ears),
+            len(gallery.convex_components),
+            len(polygon_vertices),
+            len(adjacency_indices),
+            len(text),
+        )
+        arrays: bytes = b"".join(
+            struct.pack(f"={len(values)}I", *values)
+            for values in (vertex_offsets, polygon_offsets, polygon_vertices, adjacency_offsets, adjacency_indices)
+        )
+        hashes: bytes = b"".join(key.to_bytes(HASH_SIZE, "big") for key in keys)
+        data: bytes = header + arrays + hashes + bytes(text)
+        memory = shared_memory.SharedMemory(create=True, size=len(data))
+        memory.buf[: len(data)] = data
+        return cls(memory)
+
+    @classmethod
+    def attach(cls, name: str) -> GeometryBuffer:
+        """
+        Map an existing block by name (no copy).
+
+        For example:
+        >>> view = GeometryBuffer.attach(name)
+        """
+        return cls(shared_memory.SharedMemory(name=name))
+
+    def _array(self, offset: int, count: int) -> memoryview:
+        array: memoryview = self.memory.buf[offset : offset + 4 * count].cast("I")
+        self._arrays.append(array)
+        return array
+
+    @cached_property
+    def vertex_offsets(self) -> memoryview:
+        return self._array(self.offsets[0], self.vertices_count + 1)
+
+    @cached_property
+    def polygon_offsets(self) -> memoryview:
+        return self._array(self.offsets[1], self.polygons_count + 1)
+
+    @cached_property
+    def polygon_vertices(self) -> memoryview:
+        return self._array(self.offsets[2], self.polygon_vertices_count)
+
+    @cached_property
+    def adjacency_offsets(self) -> memoryview:
+        return self._array(self.offsets[3], self.components_count + 1)
+
+    @cached_property
+    def adjacency_indices(self) -> memoryview:
+        return self._array(self.offsets[4], self.adjacency_count)
+
+    @cached_property
+    def polygon_hashes(self) -> list[int]:
+        """hash() of every polygon, stored on export so attach() does not rehash (Table keys, ids)."""
+        data: bytes = bytes(self.memory.buf[self.offsets[5] : self.offsets[6]])
+        return [int.from_bytes(data[i : i + HASH_SIZE], "big") for i in range(0, len(data), HASH_SIZE)]
+
+    @cached_property
+    def points(self) -> list[Point]:
+        """Vertex table as Points (one object per distinct vertex)."""
+        text: str = bytes(self.memory.buf[self.offsets[6] : self.offsets[6] + self.text_size]).decode("ascii")
+        offsets: memoryview = self.vertex_offsets
+        points: list[Point] = []
+        for i in range(self.vertices_count):
+            x, y = text[offsets[i] : offsets[i + 1]].split(",")
+            points.append(Point([Decimal(x), Decimal(y)]))
+        return points
+
+    def polygon(self, index: int, cls: Type[Polygon] = Polygon) -> Polygon:
+        """Polygon view number index (see module layout for the order)."""
+        points: list[Point] = self.points
+        vertices: memoryview = self.polygon_vertices
+        return cls.trusted([points[vertices[i]] for i in range(self.polygon_offsets[index], self.polygon_offsets[index + 1])])
+
+    def table(self, first: int, count: int, cls: Type[Polygon]) -> Table[Polygon]:
+        """Table of polygons first..first+count keyed by their stored hashes."""
+        table: Table[Polygon] = Table()
+        for index in range(first, first + count):
+            dict.__setitem__(table, self.polygon_hashes[index], self.polygon(index, cls))
+        return table
+
+    @cached_property
+    def boundary(self) -> Polygon:
+        return self.polygon(0)
+
+    @cached_property
+    def stitched(self) -> Polygon:
+        return self.polygon(1)
+
+    @cached_property
+    def obstacles(self) -> Table[Polygon]:
+        return self.table(2, self.obstacles_count, Polygon)
+
+    @cached_property
+    def ears(self) -> Table[Ear]:
+        return self.table(2 + self.obstacles_count, self.ears_count, Ear)
+
+    @cached_property
+    def convex_components(self) -> Table[ConvexComponent]:
+        return self.table(2 + self.obstacles_count + self.ears_count, self.components_count, ConvexComponent)
+
+    @cached_property
+    def adjacency(self) -> Table[Collection[ConvexComponent, Identifier]]:
+        first: int = 2 + self.obstacles_count + self.ears_count
+        keys: list[int] = self.polygon_hashes[first : first + self.components_count]
+        offsets: memoryview = self.adjacency_offsets
+        indices: memoryview = self.adjacency_indices
+        table: Table[Collection[ConvexComponent, Identifier]] = Table()
+        for i, key in enumerate(keys):
+            neighbours: set[Identifier] = {Identifier(keys[indices[j]]) for j in range(offsets[i], offsets[i + 1])}
+            dict.__setitem__(table, key, Collection(self.convex_components[key], neighbours))
+        return table
+
+    def close(self) -> None:
+        """Release the array views and detach from the block (the block survives until unlink())."""
+        for array in self._arrays:
+            array.release()
+        self._arrays = []
+        self.memory.close()
+
+    def unlink(self) -> None:
+        """Destroy the block. Owner only, after every process has closed it."""
+        self.memory.unlink()
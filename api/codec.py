@@ -0,0 +1,144 @@
+"""
+JSON codec shared by the bucket, the worker and the API.
+
+Title
+-----
+Codec Module
+
+Context
+-------
+Every stored JSON object (Bucket.load/save), queue message (Queue) and API
+request or response body (api.py) goes through the module-level codec, picked
+by JSON_CODEC: "orjson" (fast, native code), "json" (standard library) or
+"auto" (orjson when it is installed, else json). Both write compact UTF-8 and
+read what the other wrote, so switching codecs never breaks stored objects.
+
+native() is the one fallback of both encoders for values JSON does not know:
+models, geometry and structs (Serializable) encode as their serialize(),
+Decimal as its exact string, Enum as its value and sets and tuples as lists.
+Attribute types (Identifier, Timestamp, Duration, ...) subclass str, int or
+float and encode natively. Anything else raises TypeError instead of being
+written as its str().
+
+Examples:
+>>> from codec import codec
+>>> codec.encode({"id": Identifier("g1"), "x": Decimal("1.5")})
+b'{"id":"g1","x":"1.5"}'
+>>> codec.decode(b'{"id":"g1"}')
+{'id': 'g1'}
+"""
+
+from __future__ import annotations
+
+import json
+from abc import ABC
+from abc import abstractmethod
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from typing import ClassVar
+
+from exceptions import ConfigurationError
+from interfaces import Serializable
+from settings import JSON_CODEC
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+OPTIONS: int = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+
+
+def native(value: Any) -> Any:
+    """
+    JSON-native form of a value the encoders do not handle themselves; raises TypeError for unknown types.
+
+    For example:
+    >>> native(Decimal("0.1")), native(Status.SUCCESS), native(Point(["1", "2"]))
+    ('0.1', 'success', ['1', '2'])
+    """
+    if isinstance(value, Serializable):
+        return value.serialize()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Codec(ABC):
+    """
+    Encodes values to compact UTF-8 JSON bytes and decodes JSON bytes or str. Invalid JSON raises
+    json.JSONDecodeError (a ValueError); values that cannot be encoded raise TypeError.
+
+    For example, to pick a codec by name:
+    >>> Codec.of("json").encode([1, "a"])
+    b'[1,"a"]'
+    """
+
+    NAME: ClassVar[str]
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, content: bytes | str) -> Any:
+        pass
+
+    @classmethod
+    def of(cls, name: str) -> Codec:
+        """
+        Codec for a JSON_CODEC name: "json", "orjson" or "auto" (orjson if installed). Raises ConfigurationError for
+        an unknown name or "orjson" when it is not installed.
+        """
+        if name == "auto":
+            return OrjsonCodec() if orjson is not None else StandardCodec()
+        for codec_class in (StandardCodec, OrjsonCodec):
+            if codec_class.NAME == name:
+                return codec_class()
+        raise ConfigurationError(f"JSON_CODEC must be one of ['auto', 'json', 'orjson'], got {name!r}")
+
+
+class StandardCodec(Codec):
+    """Standard library json, compact and without ASCII escaping."""
+
+    NAME: ClassVar[str] = "json"
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=native).encode("utf-8")
+
+    def decode(self, content: bytes | str) -> Any:
+        return json.loads(content)
+
+
+class OrjsonCodec(Codec):
+    """
+    orjson, with non-str dict keys (e.g. Table's int keys) written as strings. Dataclasses (models) and datetimes go
+    through native() like in StandardCodec, not orjson's own field-by-field encoding. Integers beyond 64 bits, which
+    orjson refuses, are encoded by StandardCodec instead.
+    """
+
+    NAME: ClassVar[str] = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ConfigurationError("JSON_CODEC=orjson requires the orjson package")
+        self.fallback: StandardCodec = StandardCodec()
+
+    def encode(self, value: Any) -> bytes:
+        try:
+            return orjson.dumps(value, default=native, option=OPTIONS)
+        except orjson.JSONEncodeError as e:
+            if "64-bit" not in str(e):
+                raise
+            return self.fallback.encode(value)
+
+    def decode(self, content: bytes | str) -> Any:
+        return orjson.loads(content)
+
+
+codec: Codec = Codec.of(JSON_CODEC)
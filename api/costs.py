@@ -0,0 +1,249 @@
+"""
+Per-step cost model: predicted runtime and work of a step from gallery size.
+
+Title
+-----
+Costs Module
+
+Context
+-------
+StartTask records, for every invocation of a step, the units of work done and
+the wall time spent into job.meta (step:{slug}:work, step:{slug}:wall_time,
+step:{slug}:invocations), next to the gallery size (step:{slug}:vertices,
+step:{slug}:obstacles). ReportTask merges child meta into the parent, so a
+finished root job holds one Sample per step.
+
+CostModel fits, per step, a power law in the gallery's vertex count v and
+obstacle count o by least squares on logarithms:
+
+    seconds = exp(a + b * ln(1 + v) + c * ln(1 + o))     (same form for work)
+
+and uses it to:
+
+1. budget(): work units expected to fit in a time window (replaces the fixed
+   *_MAX_WORK counts when no deadline is known).
+2. invocations(): continuations a gallery is expected to need, so galleries
+   expected to exceed MAX_TASK_CONTINUATION_STEPS are refused up front.
+3. fits(): whether a step is expected to finish within the time left, so the
+   next job runs inline instead of being queued.
+
+All three only act within the sizes the model was fitted on (covers()):
+budget() and fits() answer None and False beyond them, and admission skips
+the check, so an extrapolation never overrides *_MAX_WORK or refuses a job.
+
+Coefficients live in COST_MODEL_PATH (api/costs.json by default), read once
+per process by CostModel.current(), and are refreshed from recorded history
+with CostModel.fit(samples).save(path).
+
+Examples:
+>>> model = CostModel.current()
+>>> model.predict(StepName.GUARD_PLACEMENT, Size(vertices=120, obstacles=4))
+Estimate(seconds=..., work=...)
+>>> CostModel.fit(CostModel.samples(jobs)).save("api/costs.json")
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import ClassVar
+from typing import Iterable
+from typing import TypedDict
+
+from enums import StepName
+from interfaces import Serializable
+from settings import COST_MODEL_PATH
+
+# Ridge term keeping the normal equations solvable when all samples share a size.
+RIDGE: float = 1e-6
+
+# Wall times are recorded in milliseconds; shorter runs are floored so near-zero samples do not dominate the log fit.
+MIN_SECONDS: float = 1e-3
+
+
+class Sample(TypedDict):
+    """One recorded step run: gallery size, total work and total wall time (seconds) across invocations."""
+
+    step_name: str
+    vertices: int
+    obstacles: int
+    work: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class Size:
+    """Gallery size used as model input: boundary plus obstacle vertices, and number of obstacles."""
+
+    vertices: int
+    obstacles: int
+
+    @classmethod
+    def of(cls, data: dict[str, Any]) -> Size:
+        """Size of a job stdin/stdout dict with "boundary" and "obstacles" lists."""
+        obstacles: list[Any] = list(data.get("obstacles") or [])
+        return cls(vertices=len(data.get("boundary") or []) + sum(len(obstacle) for obstacle in obstacles), obstacles=len(obstacles))
+
+    @property
+    def features(self) -> list[float]:
+        return [1.0, math.log1p(self.vertices), math.log1p(self.obstacles)]
+
+
+@dataclass(frozen=True)
+class Estimate:
+    """Predicted total wall time (seconds) and units of work of one step."""
+
+    seconds: float
+    work: float
+
+
+def _solve(samples: list[tuple[list[float], float]]) -> list[float]:
+    """Least squares coefficients for y ~ x (ridge-regularized normal equations, Gaussian elimination)."""
+    n: int = len(samples[0][0])
+    a: list[list[float]] = [[RIDGE if i == j else 0.0 for j in range(n)] + [0.0] for i in range(n)]
+    for x, y in samples:
+        for i in range(n):
+            for j in range(n):
+                a[i][j] += x[i] * x[j]
+            a[i][n] += x[i] * y
+    for k in range(n):
+        pivot: int = max(range(k, n), key=lambda r: abs(a[r][k]))
+        a[k], a[pivot] = a[pivot], a[k]
+        for r in range(n):
+            if r != k and a[k][k]:
+                factor: float = a[r][k] / a[k][k]
+                a[r] = [value - factor * pivot_value for value, pivot_value in zip(a[r], a[k])]
+    return [a[i][n] / a[i][i] if a[i][i] else 0.0 for i in range(n)]
+
+
+@dataclass
+class CostModel(Serializable[dict[str, Any]]):
+    """
+    Fitted coefficients per step slug: {"seconds": [a, b, c], "work": [a, b, c], "samples": n,
+    "vertices": max, "obstacles": max}. Steps without coefficients have no prediction (predict() returns None).
+
+    For example:
+    >>> model = CostModel.fit(samples)
+    >>> model.budget(StepName.STITCHING, size, seconds=60)
+    420
+    """
+
+    coefficients: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    # Model of COST_MODEL_PATH, loaded on the first current() call.
+    _current: ClassVar[CostModel | None] = None
+
+    def predict(self, step_name: StepName, size: Size) -> Estimate | None:
+        """Predicted seconds and work of step_name for a gallery of this size, or None if the step was never fitted."""
+        coefficients: dict[str, Any] | None = self.coefficients.get(str(step_name.slug))
+        if not coefficients:
+            return None
+        features: list[float] = size.features
+        seconds: float = math.exp(sum(w * x for w, x in zip(coefficients["seconds"], features)))
+        work: float = math.exp(sum(w * x for w, x in zip(coefficients["work"], features))) - 1
+        return Estimate(seconds=seconds, work=max(work, 0.0))
+
+    def budget(self, step_name: StepName, size: Size, seconds: float) -> int | None:
+        """
+        Units of work of step_name expected to fit in seconds, or None without a prediction, for steps that count no work,
+        or for sizes beyond the fitted ones (see covers()).
+        """
+        if not self.covers(step_name, size):
+            return None
+        estimate: Estimate | None = self.predict(step_name, size)
+        if estimate is None or estimate.seconds <= 0 or estimate.work < 1:
+            return None
+        return max(1, math.floor(estimate.work * seconds / estimate.seconds))
+
+    def invocations(self, step_name: StepName, size: Size, seconds: float) -> int:
+        """Invocations of seconds each that step_name is expected to need (1 without a prediction)."""
+        estimate: Estimate | None = self.predict(step_name, size)
+        if estimate is None:
+            return 1
+        return max(1, math.ceil(estimate.seconds / seconds))
+
+    def covers(self, step_name: StepName, size: Size) -> bool:
+        """True if size lies within the largest gallery step_name was fitted on (the prediction is not an extrapolation)."""
+        coefficients: dict[str, Any] | None = self.coefficients.get(str(step_name.slug))
+        if not coefficients:
+            return False
+        return size.vertices <= coefficients.get("vertices", 0) and size.obstacles <= coefficients.get("obstacles", 0)
+
+    def fits(self, step_name: StepName, size: Size, seconds: float) -> bool:
+        """True if step_name is predicted to finish within seconds (False without a prediction or beyond the fitted sizes)."""
+        if not self.covers(step_name, size):
+            return False
+        estimate: Estimate | None = self.predict(step_name, size)
+        return estimate is not None and estimate.seconds <= seconds
+
+    @staticmethod
+    def samples(jobs: Iterable[Any]) -> list[Sample]:
+        """Samples recorded in the meta of finished jobs (see module docstring for the keys)."""
+        samples: list[Sample] = []
+        for job in jobs:
+            if not job.is_finished():
+                continue
+            for step_name in StepName:
+                prefix: str = f"step:{step_name.slug}:"
+                if f"{prefix}work" not in job.meta or f"{prefix}wall_time" not in job.meta:
+                    continue
+                samples.append(
+                    {
+                        "step_name": str(step_name.slug),
+                        "vertices": int(job.meta.get(f"{prefix}vertices", 0)),
+                        "obstacles": int(job.meta.get(f"{prefix}obstacles", 0)),
+                        "work": int(job.meta[f"{prefix}work"]),
+                        "seconds": float(job.meta[f"{prefix}wall_time"]),
+                    }
+                )
+        return samples
+
+    @classmethod
+    def fit(cls, samples: Iterable[Sample]) -> CostModel:
+        """Fit one power law per step (seconds and work) from samples."""
+        by_step: dict[str, list[Sample]] = {}
+        for sample in samples:
+            by_step.setdefault(sample["step_name"], []).append(sample)
+        coefficients: dict[str, dict[str, Any]] = {}
+        for slug, rows in by_step.items():
+            features: list[list[float]] = [Size(vertices=row["vertices"], obstacles=row["obstacles"]).features for row in rows]
+            coefficients[slug] = {
+                "seconds": _solve([(x, math.log(max(row["seconds"], MIN_SECONDS))) for x, row in zip(features, rows)]),
+                "work": _solve([(x, math.log1p(row["work"])) for x, row in zip(features, rows)]),
+                "samples": len(rows),
+                "vertices": max(row["vertices"] for row in rows),
+                "obstacles": max(row["obstacles"] for row in rows),
+            }
+        return cls(coefficients=coefficients)
+
+    @classmethod
+    def load(cls, path: str = COST_MODEL_PATH) -> CostModel:
+        """Read coefficients from path; an empty model if the file does not exist."""
+        try:
+            with open(path) as f:
+                return cls.unserialize(json.load(f))
+        except FileNotFoundError:
+            return cls()
+
+    @classmethod
+    def current(cls) -> CostModel:
+        """The model of COST_MODEL_PATH, read on first use and shared by StartTask and JobMutation."""
+        if cls._current is None:
+            cls._current = cls.load()
+        return cls._current
+
+    def save(self, path: str = COST_MODEL_PATH) -> None:
+        """Write coefficients to path."""
+        with open(path, "w") as f:
+            json.dump(self.serialize(), f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    def serialize(self) -> dict[str, Any]:
+        return {"coefficients": self.coefficients}
+
+    @classmethod
+    def unserialize(cls, data: dict[str, Any]) -> CostModel:
+        return cls(coefficients=dict(data.get("coefficients") or {}))
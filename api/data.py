@@ -9,46 +9,132 @@ Context
 -------
 This module provides storage and configuration access for the geometry API.
 Bucket wraps S3 for the data bucket (DATA_BUCKET_NAME): load/save/delete
-JSON objects by key, and search with prefix and pagination (Page). Page
-holds keys and next_token from list_objects_v2. Secret reads secret values
-from S3 (SECRETS_BUCKET_NAME). All raise appropriate exceptions on missing env,
+JSON (or packed binary, see packing.py) objects by key, and search with prefix and pagination (Page). load_many() loads
+several keys at once with a bounded thread pool over the shared client. save()
+writes compact JSON (codec.py) and gzip-compresses bodies of BUCKET_COMPRESSION_THRESHOLD
+bytes or more (tagged ContentEncoding "gzip"); load() detects compressed,
+packed and JSON objects from their first bytes, so objects written before
+compression (pretty-printed JSON) still load. Page
+holds keys, next_token, and object sizes and modification times from
+list_objects_v2. Secret reads secret values
+from S3 (SECRETS_BUCKET_NAME). Both reach their store through connect(): the
+boto3 S3 client, or LocalStorage (storage.py) under BUCKET_ROOT when
+BUCKET_BACKEND is "local". All raise appropriate exceptions on missing env,
 S3 errors, or invalid input.
 """
 
 from __future__ import annotations
 
+import gzip
 import json
+import mmap
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
+from typing import Callable
 from typing import Iterator
 from typing import NotRequired
 from typing import TypedDict
+from typing import TypeVar
 
 import boto3
 from attributes import Limit
 from attributes import Offset
+from attributes import Timestamp
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from codec import codec
+from enums import Encoding
 from exceptions import ConfigurationError
 from exceptions import NotFoundError
 from exceptions import ServiceUnavailableError
 from exceptions import StorageError
 from exceptions import ValidationError
 from logger import get_logger
+from packing import is_packed
+from packing import pack
+from packing import unpack
+from settings import BUCKET_BACKEND
+from settings import BUCKET_COMPRESSION_LEVEL
+from settings import BUCKET_COMPRESSION_THRESHOLD
+from settings import BUCKET_MAX_WORKERS
+from settings import BUCKET_ROOT
 from settings import DATA_BUCKET_NAME
 from settings import DEFAULT_LIMIT
 from settings import JWT_SECRET_NAME
 from settings import JWT_TEST_NAME
 from settings import SECRETS_BUCKET_NAME
+from storage import LocalStorage
 
 logger = get_logger(__name__)
+T = TypeVar("T")
+R = TypeVar("R")
+
+# First bytes of a gzip stream; JSON starts with printable text and packed objects with a NUL byte.
+GZIP_MAGIC: bytes = b"\x1f\x8b"
+
+
+def compress(body: bytes) -> bytes | None:
+    """
+    body gzip-compressed at BUCKET_COMPRESSION_LEVEL (mtime 0, so equal bodies compress to equal bytes),
+    or None if body is shorter than BUCKET_COMPRESSION_THRESHOLD.
+
+    For example:
+    >>> compress(b"{}") is None
+    True
+    >>> gzip.decompress(compress(body)) == body
+    True
+    """
+    if len(body) < BUCKET_COMPRESSION_THRESHOLD:
+        return None
+    return gzip.compress(body, compresslevel=BUCKET_COMPRESSION_LEVEL, mtime=0)
+
+
+def decompress(raw: bytes | mmap.mmap) -> bytes | mmap.mmap:
+    """raw decompressed if it is a gzip stream (see compress()), else raw unchanged (e.g. a LocalStorage mmap)."""
+    if raw[:2] != GZIP_MAGIC:
+        return raw
+    return zlib.decompress(raw, wbits=16 + zlib.MAX_WBITS)
+
+
+def connect(config: Config | None = None) -> Any:
+    """
+    Client of the BUCKET_BACKEND store: the boto3 S3 client (with config), or LocalStorage under BUCKET_ROOT.
+    Raises ConfigurationError for other backends.
+
+    For example, with BUCKET_BACKEND=local:
+    >>> connect()
+    <storage.LocalStorage object at ...>
+    """
+    if BUCKET_BACKEND == "s3":
+        return boto3.client("s3", config=config) if config is not None else boto3.client("s3")
+    if BUCKET_BACKEND == "local":
+        return LocalStorage(BUCKET_ROOT)
+    raise ConfigurationError(f"BUCKET_BACKEND must be one of ['s3', 'local'], got {BUCKET_BACKEND!r}")
+
+
+def many(f: Callable[[T], R], items: list[T]) -> list[R]:
+    """
+    [f(item) for item in items], run on up to BUCKET_MAX_WORKERS threads when there are several items (f does
+    I/O, e.g. S3 requests over one shared client). Keeps the order of items and raises the first error.
+
+    For example, to load records by id:
+    >>> many(repository.get, [Identifier("g1"), Identifier("g2")])
+    [ArtGallery(...), ArtGallery(...)]
+    """
+    if len(items) <= 1 or BUCKET_MAX_WORKERS <= 1:
+        return [f(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(BUCKET_MAX_WORKERS, len(items))) as executor:
+        return list(executor.map(f, items))
 
 
 class ListObjectsV2Entry(TypedDict):
     """Single entry in ListObjectsV2Response Contents."""
 
     Key: str
-    LastModified: NotRequired[str]
+    LastModified: NotRequired[Any]
     ETag: NotRequired[str]
     Size: NotRequired[int]
     StorageClass: NotRequired[str]
@@ -81,6 +167,9 @@ class Page:
 
     keys: list[str] = field(default_factory=list)
     next_token: Offset | None = None
+    # Object size in bytes and last modification time by key, when list_objects_v2 reports them.
+    sizes: dict[str, int] = field(default_factory=dict)
+    modified: dict[str, Timestamp] = field(default_factory=dict)
 
     @property
     def continues(self) -> bool:
@@ -97,7 +186,7 @@ class Page:
 @dataclass
 class Bucket:
     """
-    S3 bucket operations. Bucket name from DATA_BUCKET_NAME env.
+    Bucket operations on the BUCKET_BACKEND store (S3 or LocalStorage). Bucket name from DATA_BUCKET_NAME env.
 
     For example, to load and save JSON by key:
     >>> bucket = Bucket()
@@ -116,7 +205,7 @@ class Bucket:
     @property
     def client(self) -> Any:
         if self._client is None:
-            self._client = boto3.client("s3")
+            self._client = connect(Config(max_pool_connections=max(BUCKET_MAX_WORKERS, 10)))
         return self._client
 
     def exists(self, key: str) -> bool:
@@ -141,6 +230,7 @@ class Bucket:
     def load(self, key: str, default: Any = None) -> Any:
         """
         Load JSON from key. Returns default if key not found (and default is not None).
+        Compressed and packed objects are detected from their content and decoded transparently.
 
         For example, to load a record or get None:
         >>> data = bucket.load("data/galleries/g1.json")
@@ -152,10 +242,13 @@ class Bucket:
             response: Any = self.client.get_object(Bucket=self.name, Key=key)
             if "Body" not in response:
                 raise ValidationError(f"Invalid S3 response: missing Body for key {key}")
-            content: str = response["Body"].read().decode("utf-8")
+            raw: bytes | mmap.mmap = decompress(response["Body"].read())
+            if is_packed(raw):
+                return unpack(raw)
+            content: str = str(raw, "utf-8")
             if not content.strip():
                 raise ValidationError(f"Empty content in S3 object {key}")
-            return json.loads(content)
+            return codec.decode(content)
         except ClientError as e:
             if e.response["Error"]["Code"] == "NoSuchKey":
                 return default
@@ -165,10 +258,28 @@ class Bucket:
             raise ValidationError(f"Invalid JSON content in object {key}: {str(e)}") from e
         except UnicodeDecodeError as e:
             raise ValidationError(f"Invalid UTF-8 content in object {key}: {str(e)}") from e
+        except zlib.error as e:
+            raise ValidationError(f"Invalid compressed content in object {key}: {str(e)}") from e
+
+    def load_many(self, keys: list[str], default: Any = None) -> list[Any]:
+        """
+        load() every key, in order, up to BUCKET_MAX_WORKERS at a time (boto3 clients are thread-safe).
+        Raises the first error, like loading them one by one.
+
+        For example, to load a listing page:
+        >>> page = bucket.search(prefix="data/galleries/", limit=20)
+        >>> records = bucket.load_many(page.keys)
+        """
+        # The threads share one client: create it before they start.
+        if self._client is None:
+            self._client = self.client
+        return many(lambda key: self.load(key, default), keys)
 
-    def save(self, key: str, data: Any) -> None:
+    def save(self, key: str, data: Any, encoding: Encoding = Encoding.JSON) -> None:
         """
-        Save data as JSON at key. Raises on serialization or S3 errors.
+        Save data at key as compact JSON, or packed (packing.py) with Encoding.BINARY. Bodies of at least
+        BUCKET_COMPRESSION_THRESHOLD bytes are gzip-compressed and stored with ContentEncoding "gzip".
+        Raises on serialization or S3 errors. load() reads every format.
 
         For example, to persist a gallery:
         >>> bucket.save("data/galleries/g1.json", gallery.serialize())
@@ -176,13 +287,17 @@ class Bucket:
         if not key or not isinstance(key, str):
             raise ValidationError("Key must be a non-empty string")
         try:
-            json_data: str = json.dumps(data, indent=2)
-            self.client.put_object(
-                Bucket=self.name,
-                Key=key,
-                Body=json_data.encode("utf-8"),
-                ContentType="application/json",
-            )
+            body: bytes = pack(data) if encoding == Encoding.BINARY else codec.encode(data)
+            compressed: bytes | None = compress(body)
+            params: dict[str, Any] = {
+                "Bucket": self.name,
+                "Key": key,
+                "Body": body if compressed is None else compressed,
+                "ContentType": encoding.content_type,
+            }
+            if compressed is not None:
+                params["ContentEncoding"] = "gzip"
+            self.client.put_object(**params)
         except (TypeError, ValueError) as e:
             raise ValidationError(f"Data is not JSON serializable: {str(e)}") from e
         except ClientError as e:
@@ -242,15 +357,23 @@ class Bucket:
         if not isinstance(response, dict):
             raise StorageError("Invalid S3 response: expected dictionary")
         keys: list[str] = []
+        sizes: dict[str, int] = {}
+        modified: dict[str, Timestamp] = {}
         if "Contents" in response:
             for obj in response["Contents"]:
                 keys.append(obj["Key"])
+                if "Size" in obj:
+                    sizes[obj["Key"]] = int(obj["Size"])
+                if "LastModified" in obj:
+                    modified[obj["Key"]] = Timestamp(obj["LastModified"])
         new_next = ""
         if response.get("IsTruncated", False):
             new_next = response.get("NextContinuationToken") or ""
         return Page(
             keys=keys,
             next_token=Offset(new_next) if new_next else None,
+            sizes=sizes,
+            modified=modified,
         )
 
 
@@ -273,7 +396,7 @@ class Secret:
     @classmethod
     def _get_client(cls) -> Any:
         if cls._client is None:
-            cls._client = boto3.client("s3")
+            cls._client = connect()
         return cls._client
 
     @classmethod
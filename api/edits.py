@@ -0,0 +1,242 @@
+"""
+Differences between an edited art gallery and the job it was edited from (incremental recomputation).
+
+Title
+-----
+Edits Module
+
+Context
+-------
+Editing a gallery in the editor usually moves, adds or removes one obstacle
+and keeps the boundary. A job created with a source_id (the job it was edited
+from) reuses that job's outputs: Edit.of() compares the obstacles of both
+galleries by hash (rotation- and orientation-free, like Table keys) into
+removed and added ones, or returns None when the boundary changed and the
+pipeline runs in full.
+
+- StitchingStep: every obstacle sits in the stitched polygon between the two
+  copies of its bridge (v, a) as the interval [v, a, ..., a, v], and obstacles
+  bridged later to one of its vertices sit inside that interval. unbridge()
+  cuts out the intervals of removed obstacles and of obstacles whose bridge
+  now touches an added one; the obstacles nested in them are released and,
+  with the added ones, are the only ones bridged again.
+- EarClippingStep: source ears that keep their vertices and are not entered
+  by an added obstacle or a new bridge survive (Edit.survives()). residue()
+  cuts the new stitched polygon along their edges; the pieces left over are
+  the only regions clipped again.
+- ConvexComponentOptimizationStep: source components whose ears all survived
+  are kept as they are, and only merges with a new component are tried (two
+  kept components could not be merged in the source either).
+- GuardPlacementStep: source guards still on the stitched polygon are
+  stationed first, their visibility explored in the edited gallery, and the
+  greedy loop only covers what they leave.
+
+Outputs are valid for the edited gallery but differ from a full run (bridges,
+ears, merges and guards depend on the order they are found in). A step that
+cannot reuse the source (a missing interval, an ear that does not fit the new
+polygon, a bridge that cannot be placed) falls back to a full run.
+
+Examples:
+>>> edit = Edit.of(source, gallery)
+>>> [len(obstacle) for obstacle in edit.removed], [len(obstacle) for obstacle in edit.added]
+([4], [4])
+>>> points, stitches, pending = edit.unbridge(source.stitched, source.stitches)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from decimal import Decimal
+
+from geometry import Ear
+from geometry import Point
+from geometry import Polygon
+from geometry import Segment
+from geometry.walk import Walk
+from models import ArtGallery
+
+
+def turn(a: Point, b: Point, c: Point) -> Decimal:
+    """Twice the signed area of a, b, c: positive if c lies left of a -> b."""
+    return Walk(start=a, center=b, end=c).signed_area
+
+
+def interval(ring: list[Point], stitch: Segment) -> tuple[int, int] | None:
+    """
+    Positions (start, end) of the interval [v, a, ..., a, v] that the bridge stitch (v, a) encloses in ring
+    (ring[start] == v, ring[start + 1] == a, ring[end - 1] == a, ring[end] == v, cyclic), or None if ring does
+    not have exactly one such interval.
+
+    For example:
+    >>> interval([v, a, b, c, a, v, w], v.to(a))
+    (0, 5)
+    """
+    n: int = len(ring)
+    v: Point = stitch[0]
+    a: Point = stitch[1]
+    opens: list[int] = [i for i in range(n) if ring[i] == v and ring[(i + 1) % n] == a]
+    closes: list[int] = [i for i in range(n) if ring[i] == a and ring[(i + 1) % n] == v]
+    if len(opens) != 1 or len(closes) != 1:
+        return None
+    return opens[0], (closes[0] + 1) % n
+
+
+def inside(ring: list[Point], k: int, point: Point) -> bool:
+    """
+    True if point lies strictly inside the interior angle of the counter-clockwise ring at position k. Tells the
+    copies of a bridge endpoint apart: each one owns the ears on its side of the bridge.
+    """
+    before: Point = ring[k - 1]
+    vertex: Point = ring[k]
+    after: Point = ring[(k + 1) % len(ring)]
+    bend: Decimal = turn(before, vertex, after)
+    if bend > 0:
+        return turn(vertex, after, point) > 0 and turn(vertex, point, before) > 0
+    if bend < 0:
+        return not (turn(vertex, before, point) >= 0 and turn(vertex, point, after) >= 0)
+    return turn(vertex, after, point) > 0
+
+
+def locate(ring: list[Point], positions: dict[Point, list[int]], ear: Ear) -> tuple[int, int, int] | None:
+    """
+    Positions of the vertices of the counter-clockwise ear in ring, in ring order, or None if a vertex is missing
+    or the ear does not fit the interior angles of ring.
+    """
+    located: list[int] = []
+    for i in range(3):
+        candidates: list[int] = positions.get(ear[i], [])
+        if len(candidates) > 1:
+            towards: Point = ear[i + 1].to(ear[i + 2]).midpoint
+            candidates = [k for k in candidates if inside(ring, k, towards)]
+        if len(candidates) != 1:
+            return None
+        located.append(candidates[0])
+    n: int = len(ring)
+    if (located[1] - located[0]) % n >= (located[2] - located[0]) % n:
+        return None
+    return located[0], located[1], located[2]
+
+
+def residue(ring: Polygon, ears: list[Ear]) -> list[Polygon] | None:
+    """
+    Pieces of the counter-clockwise ring left over when the (non-overlapping) ears are cut out of it along their
+    edges, or None if an ear does not fit ring. Works on ring positions, so the two copies of a bridge endpoint
+    stay apart; a piece with m positions clips into m - 2 ears, and the pieces with the kept ears clip the ring.
+
+    For example, one ear cut off a square leaves the other half:
+    >>> residue(Polygon([a, b, c, d]), [Ear([a, b, c])])
+    [Polygon([c, d, a])]
+    """
+    n: int = len(ring)
+    positions: dict[Point, list[int]] = {}
+    for k, point in enumerate(ring):
+        positions.setdefault(point, []).append(k)
+    triangles: list[tuple[int, int, int]] = []
+    for ear in ears:
+        located: tuple[int, int, int] | None = locate(ring, positions, ear)
+        if located is None:
+            return None
+        triangles.append(located)
+
+    pieces: list[list[int] | None] = [list(range(n))]
+    pieces_by_position: dict[int, set[int]] = {k: {0} for k in range(n)}
+    for triangle in triangles:
+        for i, j in ((triangle[0], triangle[1]), (triangle[1], triangle[2]), (triangle[2], triangle[0])):
+            if (j - i) % n == 1:
+                continue
+            for index in pieces_by_position[i] & pieces_by_position[j]:
+                piece: list[int] = pieces[index]
+                start: int = piece.index(i)
+                end: int = piece.index(j)
+                if (end - start) % len(piece) in (1, len(piece) - 1):
+                    continue
+                rotated: list[int] = piece[start:] + piece[:start]
+                cut: int = (end - start) % len(piece)
+                pieces[index] = None
+                for part in (rotated[: cut + 1], rotated[cut:] + rotated[:1]):
+                    pieces.append(part)
+                    for k in part:
+                        pieces_by_position[k].discard(index)
+                        pieces_by_position[k].add(len(pieces) - 1)
+                break
+
+    cut_out: set[tuple[int, ...]] = {tuple(sorted(triangle)) for triangle in triangles}
+    left: list[Polygon] = []
+    for piece in pieces:
+        if piece is None:
+            continue
+        if len(piece) == 3 and tuple(sorted(piece)) in cut_out:
+            cut_out.discard(tuple(sorted(piece)))
+            continue
+        left.append(Polygon([ring[k] for k in piece]))
+    if cut_out:
+        return None
+    return left
+
+
+@dataclass
+class Edit:
+    """
+    Obstacles removed from and added to the source gallery, by hash. kept are the obstacles of the edited gallery
+    that the source has too.
+
+    For example, moving one obstacle:
+    >>> edit = Edit.of(source, gallery)
+    >>> len(edit.removed), len(edit.added), len(edit.kept)
+    (1, 1, 2)
+    """
+
+    removed: list[Polygon] = field(default_factory=list)
+    added: list[Polygon] = field(default_factory=list)
+    kept: list[Polygon] = field(default_factory=list)
+
+    @classmethod
+    def of(cls, source: ArtGallery, gallery: ArtGallery) -> Edit | None:
+        """Edit turning source into gallery, with gallery's obstacle objects; None if the boundaries differ."""
+        if hash(source.boundary) != hash(gallery.boundary):
+            return None
+        before: set[int] = {hash(obstacle) for obstacle in source.obstacles}
+        after: set[int] = {hash(obstacle) for obstacle in gallery.obstacles}
+        return cls(
+            removed=[obstacle for obstacle in source.obstacles if hash(obstacle) not in after],
+            added=[obstacle for obstacle in gallery.obstacles if hash(obstacle) not in before],
+            kept=[obstacle for obstacle in gallery.obstacles if hash(obstacle) in before],
+        )
+
+    def unbridge(self, stitched: Polygon, stitches: list[Segment]) -> tuple[Polygon, list[Segment], list[Polygon]] | None:
+        """
+        The source's stitched polygon and stitches without the intervals of removed obstacles and of obstacles whose
+        bridge touches an added one, and the obstacles left to bridge (released and added ones), or None if an
+        interval is not where its bridge says.
+        """
+        ring: list[Point] = list(stitched)
+        stitches = list(stitches)
+        owner: dict[Point, int] = {point: hash(obstacle) for obstacle in self.removed + self.kept for point in obstacle}
+        removed: set[int] = {hash(obstacle) for obstacle in self.removed}
+        released: set[int] = set()
+        detached: list[Segment] = [stitch for stitch in stitches if owner.get(stitch[1]) in removed]
+        detached += [stitch for stitch in stitches if any(obstacle.intersects(stitch, inclusive=True) for obstacle in self.added)]
+        for stitch in detached:
+            if stitch not in stitches:
+                continue
+            span: tuple[int, int] | None = interval(ring, stitch)
+            if span is None:
+                return None
+            start, end = span
+            gone: set[int] = {(start + 1 + t) % len(ring) for t in range((end - start) % len(ring))}
+            enclosed: set[Point] = {ring[k] for k in gone if k != end}
+            for other in [other for other in stitches if other[1] in enclosed]:
+                stitches.remove(other)
+                released.add(owner[other[1]])
+            ring = [point for k, point in enumerate(ring) if k not in gone]
+        pending: list[Polygon] = [obstacle for obstacle in self.kept if hash(obstacle) in released] + list(self.added)
+        return Polygon(ring), stitches, pending
+
+    def survives(self, ear: Ear, points: set[Point], stitches: list[Segment]) -> bool:
+        """True if the source ear is still an ear: its vertices are in points and no added obstacle or new bridge (stitches) enters it."""
+        if any(point not in points for point in ear):
+            return False
+        if any(ear.intersects(obstacle, inclusive=True) for obstacle in self.added):
+            return False
+        return not any(ear.intersects(stitch, inclusive=False) for stitch in stitches)
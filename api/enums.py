@@ -1,5 +1,5 @@
 """
-API enums: Action, LogLevel, Method, Orientation, StepName, Status.
+API enums: Action, Encoding, LogLevel, Method, Orientation, StepName, Status.
 
 Title
 -----
@@ -14,6 +14,7 @@ defaulting to START. Status is task status (PENDING, SUCCESS, FAILED).
 StepName is job pipeline step name (ART_GALLERY, STITCHING, EAR_CLIPPING, etc.).
 Orientation is geometric turn direction (COLLINEAR, CLOCKWISE, COUNTER_CLOCKWISE).
 LogLevel is logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL) for LOG_LEVEL env.
+Encoding is the storage format of a bucket object (JSON, BINARY; see packing.py).
 All have parse() or value coercion where used in request/response.
 """
 
@@ -64,6 +65,22 @@ class Action(str, Enum):
             raise InvalidActionError(f"action must be one of [{cls.START.value!r}, {cls.REPORT.value!r}], got {raw!r}")
 
 
+class Encoding(str, Enum):
+    """
+    Storage format of objects written by Bucket.save(). Bucket.load() detects it from the content.
+
+    For example, to store job state packed:
+    >>> bucket.save(key, state.serialize(), encoding=Encoding.BINARY)
+    """
+
+    JSON = "json"
+    BINARY = "binary"
+
+    @property
+    def content_type(self) -> str:
+        return "application/json" if self == Encoding.JSON else "application/octet-stream"
+
+
 class LogLevel(str, Enum):
     """
     Logging level for LOG_LEVEL env. Matches standard library names (DEBUG, INFO, etc.).
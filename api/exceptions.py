@@ -377,6 +377,20 @@ class MetaValuesMustBeStringsError(ValidationError):
         super().__init__(message)
 
 
+class SourceIdMustBeStringError(ValidationError):
+    """source_id (the job a gallery was edited from) must be a string."""
+
+    def __init__(self, message: str = "source_id must be a string"):
+        super().__init__(message)
+
+
+class JobSourceNotFinishedError(ValidationError):
+    """The job a gallery was edited from must be successfully finished to reuse its results."""
+
+    def __init__(self, message: str = "Source job must be successfully finished to edit from it"):
+        super().__init__(message)
+
+
 class JobNotFinishedToPublishError(ValidationError):
     """Job must be successfully finished to publish."""
 
@@ -412,6 +426,20 @@ class JobNotReprocessableError(ValidationError):
         super().__init__(message)
 
 
+class JobStepNotReprocessableError(ValidationError):
+    """Job cannot be reprocessed from the requested step (not one of its children, or an upstream child did not succeed)."""
+
+    def __init__(self, message: str = "Job cannot be reprocessed from this step"):
+        super().__init__(message)
+
+
+class GalleryTooExpensiveError(ValidationError):
+    """The cost model predicts the gallery needs more than MAX_TASK_CONTINUATION_STEPS invocations of a step."""
+
+    def __init__(self, message: str = "Gallery is expected to exceed the maximum number of task continuations"):
+        super().__init__(message)
+
+
 class JobChildrenError(GeometryException):
     """One or more child jobs failed."""
 
@@ -0,0 +1,272 @@
+"""
+Geometry-normalized fingerprints of step inputs (keys of the step result cache).
+
+Title
+-----
+Fingerprints Module
+
+Context
+-------
+The step result cache (StepResultRepository) is keyed by a Signature of the
+step's input fields. Hashing the raw JSON misses whenever the same gallery is
+drawn shifted on the canvas, starts its rings at another vertex, or lists its
+obstacles in another order. fingerprint() hashes a normalized copy instead:
+
+1. Frame.of() picks the integer translation that moves the bottom-left corner
+   of the inputs' bounding box (floored) to the origin, and normalize() moves
+   every point by it.
+2. Rings (RINGS, and each ring of RING_LISTS) start at their minimum vertex,
+   like Sequence.__hash__, keeping their orientation.
+3. Ring lists (obstacles) are sorted.
+4. Polygons in tables (ears, convex components) are written in one form per
+   cycle, whatever their start and orientation, as their keys already are.
+
+The cache stores outputs in the normalized frame (Frame.normalize) and a hit
+is mapped back with the job's own frame (Frame.restore). Moving a value tree
+also re-keys the tables in it: keys that are hash() of their value (points,
+polygons) are recomputed from the moved value, and every other reference to
+them (tables keyed by guard, adjacency ids) follows. Collections serialized
+as lists keep their order, which only matters as a set.
+
+Translations are by whole units so that coordinate strings keep their digits
+("1.5" - 1 + 1 == "1.5"); Frame.of() returns None when a coordinate would not
+round-trip exactly (e.g. exponent notation), and the step is not cached.
+Offsets are translation-exact for everything steps derive with +, -, * and /2
+(vertices, bridges, ears, components, midpoints); points rounded to the
+decimal context (segment intersections) may differ in the last digits from a
+direct run on the shifted gallery, and are equally valid.
+
+Examples:
+>>> frame = Frame.of({"boundary": [["10", "20.5"], ["14", "20.5"], ["14", "24"]]})
+>>> frame
+Frame(x=10, y=20)
+>>> frame.normalize([["10", "20.5"]])
+[['0', '0.5']]
+>>> frame.restore([['0', '0.5']])
+[['10', '20.5']]
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from decimal import InvalidOperation
+from decimal import localcontext
+from typing import Any
+
+from attributes import Signature
+from exceptions import ValidationError
+from geometry import Point
+from structs import Sequence
+
+# Input fields holding one ring, and lists of rings, whose starting vertex (and list order) carries no meaning.
+RINGS: tuple[str, ...] = ("boundary", "stitched")
+RING_LISTS: tuple[str, ...] = ("obstacles",)
+
+# Digits of the decimal context used to move coordinates, so translations never round.
+PRECISION: int = 100
+
+DIGITS: re.Pattern[str] = re.compile(r"-?\d+\Z")
+
+
+def coordinates(value: Any) -> tuple[Decimal, Decimal] | None:
+    """(x, y) of a serialized point (two numeric strings), or None if value is not one (e.g. a pair of integer ids)."""
+    if not isinstance(value, (list, tuple)) or len(value) != 2 or not isinstance(value[0], str) or not isinstance(value[1], str):
+        return None
+    try:
+        x: Decimal = Decimal(str(value[0]))
+        y: Decimal = Decimal(str(value[1]))
+    except InvalidOperation:
+        return None
+    return (x, y) if x.is_finite() and y.is_finite() else None
+
+
+def stringified(ring: Any) -> Any:
+    """ring with numeric coordinates written as Point.serialize() writes them (stdin may hold numbers)."""
+    if not isinstance(ring, list):
+        return ring
+    result: list[Any] = []
+    for point in ring:
+        if isinstance(point, list):
+            point = [str(Decimal(str(c))) if isinstance(c, (int, float)) and not isinstance(c, bool) else c for c in point]
+        result.append(point)
+    return result
+
+
+def rotated(ring: list[Any]) -> list[Any]:
+    """ring starting at its minimum vertex (x, then y), same orientation."""
+    if not ring:
+        return ring
+    start: int = min(range(len(ring)), key=lambda i: coordinates(ring[i]) or (Decimal(0), Decimal(0)))
+    return ring[start:] + ring[:start]
+
+
+def cycle(ring: list[Any]) -> list[Any]:
+    """ring rotated to its minimum vertex in whichever orientation comes first: one form per cycle, like Sequence.__hash__."""
+    forward: list[Any] = rotated(ring)
+    backward: list[Any] = rotated(ring[::-1])
+    return min(forward, backward, key=lambda points: [coordinates(point) for point in points])
+
+
+def canonical(inputs: dict[str, Any]) -> dict[str, Any]:
+    """
+    Inputs with RINGS rotated to their canonical start, RING_LISTS rotated and sorted, and the polygons of tables
+    (ears, convex components, keyed by their rotation- and orientation-free hash) written in one form (cycle()).
+    """
+    result: dict[str, Any] = dict(inputs)
+    for name, value in result.items():
+        if isinstance(value, dict):
+            result[name] = {
+                key: cycle(item) if DIGITS.match(key) and isinstance(item, list) and item and all(coordinates(point) for point in item) else item
+                for key, item in value.items()
+            }
+    for name in RINGS:
+        if isinstance(result.get(name), list):
+            result[name] = rotated(result[name])
+    for name in RING_LISTS:
+        if isinstance(result.get(name), list):
+            rings: list[Any] = [rotated(ring) if isinstance(ring, list) else ring for ring in result[name]]
+            result[name] = sorted(rings, key=lambda ring: json.dumps(ring, default=str))
+    return result
+
+
+@dataclass(frozen=True)
+class Frame:
+    """
+    Integer translation between a gallery and its normalized copy: normalize() subtracts (x, y), restore() adds it.
+
+    For example, to cache a step output independently of where the gallery sits:
+    >>> frame = Frame.of(inputs)
+    >>> stored = frame.normalize(stdout)
+    >>> frame.restore(stored) == stdout
+    True
+    """
+
+    x: int
+    y: int
+
+    @classmethod
+    def of(cls, value: Any) -> Frame | None:
+        """Frame moving the floored bottom-left corner of all points in value to the origin; None if a coordinate would not round-trip."""
+        points: list[tuple[Decimal, Decimal]] = list(cls.points(value))
+        if not points:
+            return cls(x=0, y=0)
+        frame: Frame = cls(x=math.floor(min(x for x, _ in points)), y=math.floor(min(y for _, y in points)))
+        with localcontext() as context:
+            context.prec = PRECISION
+            if any(str(x - frame.x + frame.x) != str(x) or str(y - frame.y + frame.y) != str(y) for x, y in points):
+                return None
+        return frame
+
+    @classmethod
+    def points(cls, value: Any):
+        """Coordinates of every serialized point in a value tree."""
+        point: tuple[Decimal, Decimal] | None = coordinates(value)
+        if point is not None:
+            yield point
+        elif isinstance(value, list):
+            for item in value:
+                yield from cls.points(item)
+        elif isinstance(value, dict):
+            for item in value.values():
+                yield from cls.points(item)
+
+    def normalize(self, value: Any) -> Any:
+        """value moved into the normalized frame (points minus (x, y), tables re-keyed)."""
+        return self.move(value, -1)
+
+    def restore(self, value: Any) -> Any:
+        """value moved back out of the normalized frame (points plus (x, y), tables re-keyed)."""
+        return self.move(value, 1)
+
+    def move(self, value: Any, sign: int) -> Any:
+        if not self.x and not self.y:
+            return value
+        keys: dict[str, str] = {}
+        with localcontext() as context:
+            context.prec = PRECISION
+            moved: Any = self.translate(value, sign * self.x, sign * self.y, keys)
+        return self.rekey(moved, keys)
+
+    def translate(self, value: Any, dx: int, dy: int, keys: dict[str, str]) -> Any:
+        """Copy of value with every point moved by (dx, dy); keys collects old -> new hash keys of self-keyed table entries."""
+        point: tuple[Decimal, Decimal] | None = coordinates(value)
+        if point is not None:
+            return [str(point[0] + dx), str(point[1] + dy)]
+        if isinstance(value, list):
+            return [self.translate(item, dx, dy, keys) for item in value]
+        if isinstance(value, dict):
+            result: dict[str, Any] = {}
+            for key, item in value.items():
+                result[key] = self.translate(item, dx, dy, keys)
+                if DIGITS.match(key):
+                    relocated: str | None = self.relocate(key, item, result[key])
+                    if relocated is not None:
+                        keys[key] = relocated
+            return result
+        return value
+
+    @staticmethod
+    def relocate(key: str, before: Any, after: Any) -> str | None:
+        """New key of a table entry whose key is hash() of its value (a point or a ring of points), else None."""
+        if coordinates(before) is not None:
+            return str(hash(Point(after))) if str(hash(Point(before))) == key else None
+        if isinstance(before, list) and before and all(coordinates(item) is not None for item in before):
+            if str(hash(Sequence([Point(item) for item in before]))) == key:
+                return str(hash(Sequence([Point(item) for item in after])))
+        return None
+
+    @classmethod
+    def rekey(cls, value: Any, keys: dict[str, str]) -> Any:
+        """
+        Replace old hash keys by new ones everywhere: dict keys, and lists of integer ids (adjacency), which are
+        re-sorted as Collection.serialize() sorts them. Raises ValidationError for a hash key nothing relocated.
+        """
+        if isinstance(value, dict):
+            result: dict[str, Any] = {}
+            for key, item in value.items():
+                if DIGITS.match(key) and key not in keys:
+                    raise ValidationError(f"Cannot move table key {key}: it is not the hash of a moved value")
+                result[keys.get(key, key)] = cls.rekey(item, keys)
+            return result
+        if isinstance(value, list):
+            if value and all(isinstance(item, int) and not isinstance(item, bool) and str(item) in keys for item in value):
+                return sorted(int(keys[str(item)]) for item in value)
+            return [cls.rekey(item, keys) for item in value]
+        return value
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """
+    Cache key of a step run (key) and the frame its output is stored in (frame).
+
+    For example, from StartTask:
+    >>> fingerprint = Fingerprint.of("stitching", "1", {}, {"boundary": boundary, "obstacles": obstacles})
+    >>> StepResult(id=Identifier(fingerprint.key), step_name=step_name, stdout=fingerprint.frame.normalize(stdout))
+    """
+
+    key: Signature
+    frame: Frame
+
+    @classmethod
+    def of(cls, step: str, version: str, kwargs: dict[str, Any], inputs: dict[str, Any]) -> Fingerprint | None:
+        """Fingerprint of step (slug) at version with run() kwargs and input fields; None if inputs cannot be normalized."""
+        inputs = dict(inputs)
+        for name in RINGS:
+            inputs[name] = stringified(inputs.get(name))
+        for name in RING_LISTS:
+            if isinstance(inputs.get(name), list):
+                inputs[name] = [stringified(ring) for ring in inputs[name]]
+        frame: Frame | None = Frame.of(inputs)
+        if frame is None:
+            return None
+        try:
+            normalized: dict[str, Any] = frame.normalize(inputs)
+        except ValidationError:
+            return None
+        payload: dict[str, Any] = {"step": step, "version": version, "kwargs": kwargs, "inputs": canonical(normalized)}
+        return cls(key=Signature(json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)), frame=frame)
@@ -13,7 +13,9 @@ Segment is two Points; Polygon is a closed sequence of Points; Box is
 axis-aligned; Interval is [start, end]; Walk is three Points for turn
 orientation. ConvexComponent and Ear are specialized polygons. Types
 implement Spatial (contains, intersects), Bounded (box), Measurable (size),
-Volume (signed_area), and Serializable for JSON/S3. Orientation is the
+Volume (signed_area), and Serializable for JSON/S3. Sight batches
+obstacle-edge crossing tests from one guard to many targets;
+VisibilityGraph holds vertex-to-vertex visibility for the whole gallery. Orientation is the
 enum for collinear/clockwise/counter-clockwise. Used by models.ArtGallery
 and by the pipeline (ear clipping, visibility, guard placement).
 
@@ -36,6 +38,9 @@ from geometry.polygon import Polygon
 from geometry.polygon import SerializedPolygon
 from geometry.segment import Segment
 from geometry.segment import SerializedSegment
+from geometry.sight import Sight
+from geometry.visibility import SerializedVisibilityGraph
+from geometry.visibility import VisibilityGraph
 from geometry.walk import Walk
 
 __all__ = [
@@ -52,5 +57,8 @@ __all__ = [
     "SerializedPoint",
     "SerializedPolygon",
     "SerializedSegment",
+    "SerializedVisibilityGraph",
+    "Sight",
+    "VisibilityGraph",
     "Walk",
 ]
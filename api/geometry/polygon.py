@@ -29,6 +29,7 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import Any
 from typing import TypeAlias
+from typing import TypeVar
 from typing import Union
 
 from attributes import Identifier
@@ -52,6 +53,7 @@ from structs import Sequence
 SerializedPolygon: TypeAlias = list[SerializedPoint]
 
 PolygonLike: TypeAlias = Union["Polygon", SerializedPolygon, dict[str, Any]]
+P = TypeVar("P", bound="Polygon")
 
 
 class Polygon(Sequence[Point], Volume, Spatial, Bounded, Serializable[SerializedPolygon]):
@@ -84,6 +86,21 @@ class Polygon(Sequence[Point], Volume, Spatial, Bounded, Serializable[Serialized
                 raise PolygonItemMustBePointError(f"Polygon item at index {i} must be a Point, got {type(item).__name__}")
         super().__init__(value)
 
+    @classmethod
+    def trusted(cls: type[P], points: list[Point]) -> P:
+        """
+        Build a cls around points without item checks, deduplication, or the convexity/simplicity checks of
+        subclasses (Ear, ConvexComponent). Only for geometry this pipeline already produced and validated.
+
+        Example
+        -------
+        >>> ConvexComponent.trusted([a, b, c])
+        ConvexComponent([a, b, c])
+        """
+        polygon: P = cls.__new__(cls)
+        list.__init__(polygon, points)
+        return polygon
+
     @property
     def id(self) -> Identifier:
         """Identifier that matches this polygon's hash (for table keys and adjacency)."""
@@ -0,0 +1,107 @@
+"""
+Sight type: batched line-of-sight test of one guard against many targets.
+
+Title
+-----
+Sight (Batch Crossing Kernel)
+
+Context
+-------
+Guard placement asks whether the segment from a guard to each of many targets
+is cut by an obstacle edge, one Segment.crosses call (four Walks of Decimals)
+per edge and target. Sight keeps the obstacle edges as float coordinates and
+evaluates the four orientation tests of every (target, edge) pair in plain
+float arithmetic, after a bounding-box rejection. Decimal -> float conversion
+is monotonic, so a strict float box rejection is exact; any orientation whose
+magnitude is within TOLERANCE of its error scale (near-collinear, touching or
+endpoint cases) is re-checked with the exact Segment.crosses, so the result
+always equals Segment.crosses. The error scale covers the products of the
+float differences and the rounding of the coordinates themselves, which grows
+with their magnitude: each difference may be off by up to TOLERANCE times the
+largest absolute coordinate, times the other factor of its product.
+
+Examples:
+>>> sight = Sight([edge for obstacle in obstacles for edge in obstacle.edges])
+>>> sight.crosses(guard, [p1, p2, p3])
+[False, True, False]
+"""
+
+from __future__ import annotations
+
+from geometry.point import Point
+from geometry.segment import Segment
+
+
+class Sight:
+    """
+    Obstacle edges prepared for batched crossing tests from one guard.
+
+    For example:
+    >>> sight = Sight(square.edges)
+    >>> sight.crosses(Point([0, 1]), [Point([4, 1]), Point([0, 5])])
+    [True, False]
+    """
+
+    TOLERANCE: float = 1e-9
+
+    def __init__(self, edges: list[Segment]) -> None:
+        self.edges: list[Segment] = list(edges)
+        self.coordinates: list[tuple[float, float, float, float]] = [
+            (float(edge[0].x), float(edge[0].y), float(edge[1].x), float(edge[1].y)) for edge in self.edges
+        ]
+        # Largest absolute edge coordinate: bounds the rounding of every converted edge coordinate.
+        self.magnitude: float = max((max(abs(ax), abs(ay), abs(bx), abs(by)) for ax, ay, bx, by in self.coordinates), default=0.0)
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    def crosses(self, guard: Point, targets: list[Point]) -> list[bool]:
+        """
+        For each target, True iff some edge crosses guard.to(target) (same semantics as Segment.crosses).
+
+        For example:
+        >>> sight.crosses(guard, targets)
+        [False, True]
+        """
+        tolerance: float = self.TOLERANCE
+        gx: float = float(guard.x)
+        gy: float = float(guard.y)
+        result: list[bool] = []
+        for target in targets:
+            tx: float = float(target.x)
+            ty: float = float(target.y)
+            min_x, max_x = (gx, tx) if gx <= tx else (tx, gx)
+            min_y, max_y = (gy, ty) if gy <= ty else (ty, gy)
+            dx: float = tx - gx
+            dy: float = ty - gy
+            # Rounding bound of any difference of converted coordinates in this row, scaled by TOLERANCE.
+            rounding: float = tolerance * max(self.magnitude, abs(gx), abs(gy), abs(tx), abs(ty))
+            crossed: bool = False
+            for index, (ax, ay, bx, by) in enumerate(self.coordinates):
+                if (ax if ax >= bx else bx) < min_x or (ax if ax <= bx else bx) > max_x:
+                    continue
+                if (ay if ay >= by else by) < min_y or (ay if ay <= by else by) > max_y:
+                    continue
+                ex: float = bx - ax
+                ey: float = by - ay
+
+                # Orientation of guard and target against the edge, and of the edge ends against guard->target.
+                o1: float = ex * (gy - ay) - ey * (gx - ax)
+                o2: float = ex * (ty - ay) - ey * (tx - ax)
+                o3: float = dx * (ay - gy) - dy * (ax - gx)
+                o4: float = dx * (by - gy) - dy * (bx - gx)
+                # Product rounding, plus each factor's coordinate rounding times the other factor.
+                s1: float = tolerance * (abs(ex * (gy - ay)) + abs(ey * (gx - ax))) + rounding * (abs(ex) + abs(ey) + abs(gy - ay) + abs(gx - ax))
+                s2: float = tolerance * (abs(ex * (ty - ay)) + abs(ey * (tx - ax))) + rounding * (abs(ex) + abs(ey) + abs(ty - ay) + abs(tx - ax))
+                s3: float = tolerance * (abs(dx * (ay - gy)) + abs(dy * (ax - gx))) + rounding * (abs(dx) + abs(dy) + abs(ay - gy) + abs(ax - gx))
+                s4: float = tolerance * (abs(dx * (by - gy)) + abs(dy * (bx - gx))) + rounding * (abs(dx) + abs(dy) + abs(by - gy) + abs(bx - gx))
+                if abs(o1) <= s1 or abs(o2) <= s2 or abs(o3) <= s3 or abs(o4) <= s4:
+                    if guard.to(target).crosses(self.edges[index]):
+                        crossed = True
+                        break
+                    continue
+                if (o1 > 0) != (o2 > 0) and (o3 > 0) != (o4 > 0):
+                    crossed = True
+                    break
+            result.append(crossed)
+        return result
@@ -0,0 +1,339 @@
+"""
+VisibilityGraph: vertex-to-vertex visibility of a gallery (boundary with obstacles).
+
+Title
+-----
+Visibility Graph
+
+Context
+-------
+Stitching (bridge candidates) and guard placement (guard to vertex) both ask
+whether the segment between two gallery vertices is unobstructed: inside or on
+the boundary, not through an obstacle interior and not properly crossing an
+obstacle edge. VisibilityGraph answers that for every pair of boundary and
+obstacle vertices, built once per gallery with a rotational sweep around each
+vertex (Lee's algorithm):
+
+1. Sort the other vertices by exact angle around p, then by distance.
+2. Sweep the ray: an edge enters the active set at its first endpoint and
+   leaves at its second, so the active set holds the edges the ray passes
+   through. Edges do not cross, so their order along the ray never changes
+   while they are active: the active set is a list kept sorted nearest
+   first by binary search (_closer() compares two edges without a ray). Vertex q
+   is blocked iff the nearest active edge separates p from q.
+3. Otherwise pq is visible iff it leaves p into free space (interior cone at p).
+
+Degenerate pairs (a vertex on the open segment, q on an edge, pq along an edge
+at p) fall back to the exact predicate, so the graph always agrees with clear().
+Each sweep sorts O(n) events, makes O(log n) edge comparisons per insertion
+and O(1) work per query: O(n^2 log n) comparisons overall. Insertions and
+removals (list.remove, by index identity) also scan or shift the list, O(k)
+in C for k active edges, so O(n^2 k) memory moves overall; k stays small on
+the fixture galleries.
+
+Stored compactly as the sorted vertex list and one bitset row per vertex
+(hex strings), so it can ride along in job stdout.
+
+Examples:
+>>> graph = VisibilityGraph.build(boundary, obstacles)
+>>> graph.sees(p, q)   # True/False, or None when p or q is not a vertex
+True
+>>> VisibilityGraph.unserialize(graph.serialize()).sees(p, q)
+True
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from functools import cmp_to_key
+from typing import Iterator
+from typing import TypedDict
+
+from geometry.point import Point
+from geometry.point import SerializedPoint
+from geometry.polygon import Polygon
+from geometry.segment import Segment
+from interfaces import Serializable
+
+Vector = tuple[Decimal, Decimal]
+
+# Sweep event priorities at equal angle: edges ending there leave before the query, edges starting there join after.
+REMOVE: int = 0
+QUERY: int = 1
+ADD: int = 2
+
+
+class SerializedVisibilityGraph(TypedDict):
+    """Wire format: sorted vertices and one hex bitset row per vertex (bit j set = sees vertex j)."""
+
+    vertices: list[SerializedPoint]
+    rows: list[str]
+
+
+def _half(d: Vector) -> int:
+    """0 for directions in [0, pi), 1 for [pi, 2*pi)."""
+    return 0 if d[1] > 0 or (d[1] == 0 and d[0] > 0) else 1
+
+
+def _compare(a: Vector, b: Vector) -> int:
+    """Exact angular order of two directions starting at angle 0 (positive x axis)."""
+    ha: int = _half(a)
+    hb: int = _half(b)
+    if ha != hb:
+        return ha - hb
+    cross: Decimal = a[0] * b[1] - a[1] * b[0]
+    return -1 if cross > 0 else (1 if cross < 0 else 0)
+
+
+def _cross(o: Vector, a: Vector, b: Vector) -> Decimal:
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _closer(e: tuple[Vector, Vector], e_side: int, f: tuple[Vector, Vector], f_side: int) -> int:
+    """
+    -1 if edge e is nearer to p than edge f along every ray from p through both, 1 if farther, 0 if undecided.
+    e_side and f_side are the signs of p against each edge's line (nonzero: p is on neither line), and the edges
+    must not cross. Then one of them has both ends on a single side of the other's line, and that side (p's or the
+    far one) tells which is nearer.
+    """
+    (ax, ay), (bx, by) = e
+    (cx, cy), (dx, dy) = f
+    # Sides of f's ends against e's line and of e's ends against f's line, as seen from p (+1 = p's side).
+    ux: Decimal = bx - ax
+    uy: Decimal = by - ay
+    side_c: Decimal = ux * (cy - ay) - uy * (cx - ax)
+    side_d: Decimal = ux * (dy - ay) - uy * (dx - ax)
+    f0: int = ((side_c > 0) - (side_c < 0)) * e_side
+    f1: int = ((side_d > 0) - (side_d < 0)) * e_side
+    if f0 or f1:
+        if f0 >= 0 and f1 >= 0:
+            return 1
+        if f0 <= 0 and f1 <= 0:
+            return -1
+    vx: Decimal = dx - cx
+    vy: Decimal = dy - cy
+    side_a: Decimal = vx * (ay - cy) - vy * (ax - cx)
+    side_b: Decimal = vx * (by - cy) - vy * (bx - cx)
+    e0: int = ((side_a > 0) - (side_a < 0)) * f_side
+    e1: int = ((side_b > 0) - (side_b < 0)) * f_side
+    if e0 >= 0 and e1 >= 0 and (e0 or e1):
+        return -1
+    if e0 <= 0 and e1 <= 0 and (e0 or e1):
+        return 1
+    return 0
+
+
+class VisibilityGraph(Serializable[SerializedVisibilityGraph]):
+    """
+    Vertex-to-vertex visibility of a gallery, as bitset rows over sorted vertices.
+
+    For example:
+    >>> graph = VisibilityGraph.build(boundary, [obstacle])
+    >>> graph.sees(boundary[0], obstacle[0])
+    False
+    """
+
+    def __init__(self, vertices: list[Point], rows: list[int]) -> None:
+        self.vertices: list[Point] = vertices
+        self.rows: list[int] = rows
+        self.index_by_point: dict[Point, int] = {point: index for index, point in enumerate(vertices)}
+
+    def __len__(self) -> int:
+        return len(self.vertices)
+
+    def __contains__(self, point: object) -> bool:
+        return point in self.index_by_point
+
+    def sees(self, a: Point, b: Point) -> bool | None:
+        """True if segment ab is unobstructed; None when a or b is not a vertex of the graph."""
+        i: int | None = self.index_by_point.get(a)
+        j: int | None = self.index_by_point.get(b)
+        if i is None or j is None:
+            return None
+        return bool((self.rows[i] >> j) & 1)
+
+    def row(self, point: Point) -> int | None:
+        """Bitset of the vertices point sees (bit j = self.vertices[j]); None when point is not a vertex."""
+        i: int | None = self.index_by_point.get(point)
+        return None if i is None else self.rows[i]
+
+    @staticmethod
+    def clear(boundary: Polygon, obstacles: list[Polygon], segment: Segment) -> bool:
+        """
+        Exact predicate: segment inside or on the boundary, no obstacle strictly containing its midpoint,
+        and no obstacle edge properly crossing it. Same test as GuardPlacementStep.sees().
+        """
+        if not boundary.contains(segment, inclusive=True):
+            return False
+        midpoint: Point = segment.midpoint
+        if any(obstacle.intersects(midpoint, inclusive=False) for obstacle in obstacles):
+            return False
+        return not any(segment.crosses(edge) for obstacle in obstacles for edge in obstacle.edges)
+
+    @classmethod
+    def build(cls, boundary: Polygon, obstacles: list[Polygon]) -> VisibilityGraph:
+        """
+        Build the graph over all boundary and obstacle vertices with one rotational sweep per vertex.
+
+        For example:
+        >>> graph = VisibilityGraph.build(gallery.boundary, list(gallery.obstacles))
+        >>> len(graph)
+        16
+        """
+        obstacles = list(obstacles)
+        vertices: list[Point] = sorted({point for polygon in [boundary, *obstacles] for point in polygon})
+        index_by_point: dict[Point, int] = {point: index for index, point in enumerate(vertices)}
+        coordinates: list[Vector] = [(point.x, point.y) for point in vertices]
+
+        # Rings in CCW order. Free space is left of boundary edges and right of obstacle edges, so the
+        # free cone at a vertex runs CCW from next to prev on the boundary and from prev to next on obstacles.
+        edges: list[tuple[int, int]] = []
+        cones: dict[int, tuple[Vector, Vector] | None] = {}
+        for polygon, is_boundary in [(boundary, True), *((obstacle, False) for obstacle in obstacles)]:
+            ring: Polygon = Polygon(list(polygon))
+            ring.sort("ccw")
+            indices: list[int] = [index_by_point[point] for point in ring]
+            for k, index in enumerate(indices):
+                previous: int = indices[k - 1]
+                following: int = indices[(k + 1) % len(indices)]
+                edges.append((index, following))
+                u: Vector = (coordinates[following][0] - coordinates[index][0], coordinates[following][1] - coordinates[index][1])
+                v: Vector = (coordinates[previous][0] - coordinates[index][0], coordinates[previous][1] - coordinates[index][1])
+                # A vertex shared by two rings has no single cone; its pairs use the exact predicate.
+                cones[index] = None if index in cones else ((u, v) if is_boundary else (v, u))
+
+        graph: VisibilityGraph = cls(vertices, [0] * len(vertices))
+        for p in range(len(vertices)):
+            for q, visible in graph.sweep(p, coordinates, edges, cones.get(p)):
+                if visible is None:
+                    visible = cls.clear(boundary, obstacles, vertices[p].to(vertices[q]))
+                if visible:
+                    graph.rows[p] |= 1 << q
+                    graph.rows[q] |= 1 << p
+        return graph
+
+    @staticmethod
+    def sweep(
+        p: int,
+        coordinates: list[Vector],
+        edges: list[tuple[int, int]],
+        cone: tuple[Vector, Vector] | None,
+    ) -> Iterator[tuple[int, bool | None]]:
+        """
+        Rotational sweep around vertex p. Yields (q, visible) for every q > p, where visible is None
+        for degenerate pairs that need the exact predicate.
+        """
+        px, py = coordinates[p]
+        directions: list[Vector] = [(x - px, y - py) for x, y in coordinates]
+
+        events: list[tuple[Vector, int, Decimal, int]] = []
+        # Active edges, nearest to p first (ties, which non-crossing edges only have at a shared endpoint, by index).
+        # sides[e]: sign of p against edge e's line, which is the sign of the edge's turn around p.
+        sides: dict[int, int] = {}
+        segments: dict[int, tuple[Vector, Vector]] = {}
+
+        def insert(e: int) -> None:
+            """Binary-search e's place in active (bisect.insort with the edge order, without key objects)."""
+            low: int = 0
+            high: int = len(active)
+            while low < high:
+                middle: int = (low + high) // 2
+                f: int = active[middle]
+                if (_closer(segments[f], sides[f], segments[e], sides[e]) or (f > e) - (f < e)) < 0:
+                    low = middle + 1
+                else:
+                    high = middle
+            active.insert(low, e)
+
+        # A plain list: insert() and list.remove() shift or scan it, O(k) for k active edges, but as a memmove or
+        # an int scan in C, which beats a balanced tree in Python for the handful of edges a ray crosses here.
+        active: list[int] = []
+        spanning: list[int] = []
+        for e, (a, b) in enumerate(edges):
+            if a == p or b == p:
+                continue
+            da: Vector = directions[a]
+            db: Vector = directions[b]
+            turn: Decimal = da[0] * db[1] - da[1] * db[0]
+            # p on the edge's line: no ray from p passes through the edge's interior.
+            if turn == 0:
+                continue
+            sides[e] = 1 if turn > 0 else -1
+            segments[e] = (coordinates[a], coordinates[b])
+            start, end = (da, db) if turn > 0 else (db, da)
+            events.append((start, ADD, Decimal(0), e))
+            events.append((end, REMOVE, Decimal(0), e))
+            # The edge spans angle 0, so the ray starts inside it.
+            if _compare(start, end) > 0:
+                spanning.append(e)
+        for e in spanning:
+            insert(e)
+        for q, d in enumerate(directions):
+            if q != p:
+                events.append((d, QUERY, d[0] * d[0] + d[1] * d[1], q))
+
+        def order(x: tuple[Vector, int, Decimal, int], y: tuple[Vector, int, Decimal, int]) -> int:
+            return _compare(x[0], y[0]) or (x[1] - y[1]) or (-1 if x[2] < y[2] else (1 if x[2] > y[2] else 0))
+
+        previous: Vector | None = None
+        for d, kind, _, payload in sorted(events, key=cmp_to_key(order)):
+            if kind == REMOVE:
+                # Removing keeps the order; list.remove finds the edge by identity without comparing geometry.
+                active.remove(payload)
+                continue
+            if kind == ADD:
+                insert(payload)
+                continue
+            q: int = payload
+            # Another vertex lies on the open segment pq (same ray, closer).
+            collinear: bool = previous is not None and _compare(previous, d) == 0
+            previous = d
+            if q < p:
+                continue
+            if collinear or cone is None:
+                yield q, None
+                continue
+            yield q, VisibilityGraph.decide(p, q, coordinates, edges, active, cone, d)
+
+    @staticmethod
+    def decide(
+        p: int,
+        q: int,
+        coordinates: list[Vector],
+        edges: list[tuple[int, int]],
+        active: list[int],
+        cone: tuple[Vector, Vector],
+        d: Vector,
+    ) -> bool | None:
+        """
+        Visibility of q from p given the edges the ray p->q passes through, nearest first; None when degenerate.
+        Only the nearest edge matters: if q is before it, q is before every other one.
+        """
+        if active:
+            a, b = edges[active[0]]
+            side_p: Decimal = _cross(coordinates[a], coordinates[b], coordinates[p])
+            side_q: Decimal = _cross(coordinates[a], coordinates[b], coordinates[q])
+            if side_q == 0:
+                return None
+            if (side_p > 0) != (side_q > 0):
+                return False
+
+        # Nothing blocks pq, so it lies entirely in free space or entirely outside: the cone at p decides.
+        u, v = cone
+        cu: Decimal = u[0] * d[1] - u[1] * d[0]
+        cv: Decimal = d[0] * v[1] - d[1] * v[0]
+        if cu == 0 or cv == 0:
+            return None
+        turn: Decimal = u[0] * v[1] - u[1] * v[0]
+        if turn > 0:
+            return cu > 0 and cv > 0
+        if turn < 0:
+            return cu > 0 or cv > 0
+        return None
+
+    def serialize(self) -> SerializedVisibilityGraph:
+        return {"vertices": [point.serialize() for point in self.vertices], "rows": [format(row, "x") for row in self.rows]}
+
+    @classmethod
+    def unserialize(cls, data: SerializedVisibilityGraph) -> VisibilityGraph:
+        return cls([Point.unserialize(point) for point in data["vertices"]], [int(row, 16) for row in data["rows"]])
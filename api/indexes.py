@@ -11,9 +11,30 @@ Indexes provide secondary listing by sort key (e.g. newest-first via
 Countdown). Index and PrivateIndex define get, save, delete, exists,
 search, and all; path is index/{NAME}/ or index/{NAME}/{email.slug}/.
 ArtGalleryPublicIndex lists galleries by reversed created_at. JobsPrivateIndex
-lists jobs per user. Indexed holds index_id (sort key) and real_id (record id).
-
-**Read-repair:** search() and all() load full records via repository.get().
+lists jobs per user. Indexed holds index_id (sort key), real_id (record id)
+and summary, a small versioned projection of the record (the model's
+summarize(): title, timestamps, status, counts, bounding box and a thumbnail,
+the geometry a list cell draws simplified to a bounded size) written at
+publish or spawn time.
+
+**Summaries:** summaries() answers the list queries from the index entries
+alone. Entries without a summary, or with an older SUMMARY_VERSION, are
+backfilled from their records (loaded concurrently) and rewritten, so an index
+written before summaries existed converges on the first listings.
+JobsPrivateIndex.refresh() rewrites a job's entry whenever its status or title
+changes.
+
+**Status:** JobsStatusIndex files the same entries per user and per status
+under index/jobs-status/{email.slug}/{status}/, so the jobs of one status are
+listed from one prefix. refresh() writes the entry under the job's status and,
+when start(), finish() or fail() moved it (Job.filed_status), deletes the one
+under the status it had. Inside a unit of work these writes are deferred to
+its flush, after the job record they follow, and filed_status is persisted
+with the record, so a flush that fails between the two is repaired by the
+job's next refresh().
+
+**Read-repair:** search() and all() load full records via repository.get_many(),
+fetching the entries of a page and then their records concurrently.
 If a record is missing (RecordNotFoundError), the entry is skipped and the
 stale index key is deleted, so list responses never surface 404 for a single
 missing item.
@@ -30,12 +51,15 @@ from typing import Iterator
 from typing import TypedDict
 from typing import TypeVar
 
+from attributes import Countdown
 from attributes import Email
 from attributes import Identifier
 from attributes import Limit
 from attributes import Offset
+from attributes import Timestamp
 from data import Bucket
 from data import Page
+from enums import Status
 from exceptions import RecordNotFoundError
 from exceptions import ValidationError
 from interfaces import Serializable
@@ -44,6 +68,7 @@ from models import Job
 from repositories import ArtGalleryRepository
 from repositories import JobsRepository
 from repositories import Repository
+from repositories import unit
 from serializers import Serialized
 from settings import DEFAULT_LIMIT
 
@@ -56,24 +81,27 @@ class IndexedDict(TypedDict):
 
     index_id: str
     real_id: str
+    summary: dict[str, Any] | None
 
 
 @dataclass
 class Indexed(Serializable[dict[str, Any]]):
     """
-    Stored index entry: index_id (sort key) and real_id (actual record id).
+    Stored index entry: index_id (sort key), real_id (actual record id) and summary (the record's summarize(),
+    None for entries written before summaries existed).
 
     For example, to create an index entry for a gallery:
-    >>> entry = Indexed(index_id=Identifier("20240101"), real_id=Identifier("g1"))
+    >>> entry = Indexed(index_id=Identifier("20240101"), real_id=Identifier("g1"), summary=gallery.summarize())
     >>> entry.serialize()
-    {'index_id': '20240101', 'real_id': 'g1'}
+    {'index_id': '20240101', 'real_id': 'g1', 'summary': {'version': 1, ...}}
     """
 
     index_id: Identifier
     real_id: Identifier
+    summary: dict[str, Any] | None = None
 
     def serialize(self) -> IndexedDict:
-        return {"index_id": str(self.index_id), "real_id": str(self.real_id)}
+        return {"index_id": str(self.index_id), "real_id": str(self.real_id), "summary": self.summary}
 
     @classmethod
     def unserialize(cls, data: Any) -> Indexed:
@@ -82,6 +110,7 @@ class Indexed(Serializable[dict[str, Any]]):
         return cls(
             index_id=Identifier(data.get("index_id")),
             real_id=Identifier(data.get("real_id")),
+            summary=data.get("summary"),
         )
 
 
@@ -89,7 +118,8 @@ class Indexed(Serializable[dict[str, Any]]):
 class Index(Generic[T]):
     """
     Generic index: stores Indexed entries under index/{NAME}/{index_id}.
-    REPOSITORY is used to load the full record by real_id. Set REPOSITORY in subclass.
+    REPOSITORY is used to load the full record by real_id. Set REPOSITORY and SUMMARY_VERSION (the version of
+    the record's summarize()) in subclass.
 
     For example, to list and get a gallery by index id:
     >>> index = ArtGalleryPublicIndex()
@@ -99,6 +129,7 @@ class Index(Generic[T]):
 
     REPOSITORY: ClassVar[type[Repository[T]]]
     NAME: ClassVar[str]
+    SUMMARY_VERSION: ClassVar[int]
 
     @property
     def path(self) -> str:
@@ -136,14 +167,15 @@ class Index(Generic[T]):
         """
         return self.get(identifier).serialize()
 
-    def index(self, index_id: Identifier, real_id: Identifier) -> None:
+    def index(self, index_id: Identifier, real_id: Identifier, summary: dict[str, Any] | None = None) -> None:
         """
-        Build an Indexed entry from index_id and real_id and persist it under this index.
+        Build an Indexed entry from index_id, real_id and the record's summary and persist it under this index.
+        Without a summary, the first summaries() listing the entry backfills it from the record.
 
         For example, to add a gallery to the public index:
-        >>> ArtGalleryPublicIndex().index(index_id=Identifier(countdown), real_id=gallery.id)
+        >>> ArtGalleryPublicIndex().index(index_id=Identifier(countdown), real_id=gallery.id, summary=gallery.summarize())
         """
-        self.save(Indexed(index_id=index_id, real_id=real_id))
+        self.save(Indexed(index_id=index_id, real_id=real_id, summary=summary))
 
     def save(self, record: Indexed) -> None:
         """
@@ -197,20 +229,71 @@ class Index(Generic[T]):
             limit=limit,
             next_token=next_token,
         )
-        records: list[T] = []
-        for key in page:
-            data: Any = bucket.load(key)
+        return (self.load(page), page.next_token)
+
+    def summaries(
+        self,
+        next_token: Offset | None = None,
+        limit: Limit = Limit(DEFAULT_LIMIT),
+    ) -> tuple[list[dict[str, Any]], Offset | None]:
+        """
+        List the summaries held by the index entries with pagination, without loading the records. Returns
+        (summaries, next_token). Entries without a summary or with an older SUMMARY_VERSION are backfilled: their
+        records are loaded concurrently (Repository.get_many()), summarized, and the entries rewritten.
+        Read-repair as in search().
+
+        For example, to list the newest galleries for the home page:
+        >>> summaries, next_token = index.summaries(limit=Limit(20))
+        >>> summaries[0]["guard_count"]
+        3
+        """
+        page: Page = bucket.search(
+            prefix=self.path,
+            limit=limit,
+            next_token=next_token,
+        )
+        keys, entries = self.entries(page)
+        outdated: list[int] = [i for i, entry in enumerate(entries) if (entry.summary or {}).get("version") != self.SUMMARY_VERSION]
+        missing: set[int] = set()
+        if outdated:
+            for i, record in zip(outdated, self.repository.get_many([entries[i].real_id for i in outdated])):
+                if record is None:
+                    bucket.delete(keys[i])
+                    missing.add(i)
+                    continue
+                entries[i].summary = dict(record.summarize())
+                self.save(entries[i])
+        return ([entry.summary for i, entry in enumerate(entries) if i not in missing], page.next_token)
+
+    def entries(self, page: Page) -> tuple[list[str], list[Indexed]]:
+        """
+        Keys and index entries listed in page, in order, loaded concurrently (Bucket.load_many()).
+        Read-repair: keys that are gone are deleted and skipped.
+        """
+        keys: list[str] = []
+        entries: list[Indexed] = []
+        for key, data in zip(page.keys, bucket.load_many(page.keys)):
             if data is None:
                 bucket.delete(key)
                 continue
-            indexed: Indexed = Indexed.unserialize(data)
-            try:
-                record: T = self.repository.get(indexed.real_id)
-            except RecordNotFoundError:
+            keys.append(key)
+            entries.append(Indexed.unserialize(data))
+        return keys, entries
+
+    def load(self, page: Page) -> list[T]:
+        """
+        Records of the index entries listed in page, in order: the entries are loaded concurrently, then their
+        records (Bucket.load_many(), Repository.get_many()). Read-repair: entries that are gone or whose record is
+        missing are deleted and skipped.
+        """
+        keys, entries = self.entries(page)
+        records: list[T] = []
+        for key, record in zip(keys, self.repository.get_many([entry.real_id for entry in entries])):
+            if record is None:
                 bucket.delete(key)
                 continue
             records.append(record)
-        return (records, page.next_token)
+        return records
 
     def all(self) -> Iterator[T]:
         """
@@ -229,18 +312,7 @@ class Index(Generic[T]):
                 limit=Limit(100),
                 next_token=next_token,
             )
-            for key in page:
-                data: Any = bucket.load(key)
-                if data is None:
-                    bucket.delete(key)
-                    continue
-                indexed: Indexed = Indexed.unserialize(data)
-                try:
-                    record: T = self.repository.get(indexed.real_id)
-                except RecordNotFoundError:
-                    bucket.delete(key)
-                    continue
-                yield record
+            yield from self.load(page)
             if not page.continues:
                 break
             next_token = page.next_token
@@ -284,6 +356,7 @@ class ArtGalleryPublicIndex(Index[ArtGallery]):
 
     REPOSITORY: ClassVar[type[Repository[ArtGallery]]] = ArtGalleryRepository
     NAME: ClassVar[str] = "galleries"
+    SUMMARY_VERSION: ClassVar[int] = ArtGallery.SUMMARY_VERSION
 
 
 @dataclass
@@ -298,3 +371,83 @@ class JobsPrivateIndex(PrivateIndex[Job]):
 
     REPOSITORY: ClassVar[type[Repository[Job]]] = JobsRepository
     NAME: ClassVar[str] = "jobs"
+    SUMMARY_VERSION: ClassVar[int] = Job.SUMMARY_VERSION
+
+    def refresh(self, job: Job) -> None:
+        """
+        Write the entry of job (keyed by the Countdown of its created_at) with a fresh summary, here and in the
+        JobsStatusIndex of its status. If a transition moved the job from another status (job.filed_status), its
+        entry there is deleted and filed_status cleared. Called when the job is created and whenever its status or
+        title changes, so the job lists never show a stale status.
+
+        Inside a unit of work (a worker message) the writes are deferred to its flush, like the job save they
+        follow, and a later refresh() of the job in the same message replaces them; the summary is taken then.
+
+        For example, after a root job finished:
+        >>> JobsPrivateIndex(user_email=user.email).refresh(job)
+        """
+        index_id: Identifier = Identifier(Countdown.from_timestamp(job.created_at))
+
+        def write() -> None:
+            entry: Indexed = Indexed(index_id=index_id, real_id=job.id, summary=dict(job.summarize()))
+            self.save(entry)
+            JobsStatusIndex(user_email=self.user_email, status=job.status).save(entry)
+            if job.filed_status is not None and job.filed_status != job.status:
+                JobsStatusIndex(user_email=self.user_email, status=job.filed_status).delete(index_id)
+            job.filed_status = None
+
+        if unit.active:
+            unit.defer(f"{self.path}{index_id}.json", write)
+            return
+        write()
+
+    def forget(self, job: Job) -> None:
+        """
+        Delete the entries of job here and in the JobsStatusIndex of its status (and of job.filed_status, if a
+        transition has not been refreshed yet).
+
+        For example, when the job is deleted:
+        >>> JobsPrivateIndex(user_email=user.email).forget(job)
+        """
+        index_id: Identifier = Identifier(Countdown.from_timestamp(job.created_at))
+        self.delete(index_id)
+        for status in {job.status, job.filed_status or job.status}:
+            JobsStatusIndex(user_email=self.user_email, status=status).delete(index_id)
+
+
+@dataclass
+class JobsStatusIndex(PrivateIndex[Job]):
+    """
+    Per-user index for the jobs of one status, kept by JobsPrivateIndex.refresh(). path =
+    index/{NAME}/{email.slug}/{status}/; entries and their summaries are those of JobsPrivateIndex.
+
+    For example, to list the current user's failed jobs:
+    >>> index = JobsStatusIndex(user_email=user.email, status=Status.FAILED)
+    >>> summaries, token = index.summaries(limit=Limit(20))
+    """
+
+    REPOSITORY: ClassVar[type[Repository[Job]]] = JobsRepository
+    NAME: ClassVar[str] = "jobs-status"
+    SUMMARY_VERSION: ClassVar[int] = Job.SUMMARY_VERSION
+
+    status: Status
+
+    @property
+    def path(self) -> str:
+        """S3 prefix for this status index: index/{NAME}/{email.slug}/{status}/."""
+        return f"index/{self.NAME}/{self.user_email.slug}/{self.status.value}/"
+
+    def summaries(
+        self,
+        next_token: Offset | None = None,
+        limit: Limit = Limit(DEFAULT_LIMIT),
+    ) -> tuple[list[dict[str, Any]], Offset | None]:
+        """
+        Index.summaries() without the entries whose summary has another status (left behind when a transition was
+        saved but not refreshed, and found when the summary is backfilled); those entries are deleted.
+        """
+        summaries, next_token = super().summaries(next_token=next_token, limit=limit)
+        for summary in summaries:
+            if summary.get("status") != self.status.value:
+                self.delete(Identifier(Countdown.from_timestamp(Timestamp(summary.get("created_at")))))
+        return ([summary for summary in summaries if summary.get("status") == self.status.value], next_token)
@@ -16,7 +16,6 @@ parse with Message.unserialize, run the task, and commit to remove from queue.
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
@@ -26,6 +25,7 @@ from attributes import Email
 from attributes import Identifier
 from attributes import ReceiptHandle
 from botocore.exceptions import ClientError
+from codec import codec
 from enums import Action
 from exceptions import ConfigurationError
 from exceptions import InternalServerError
@@ -150,7 +150,7 @@ class Queue:
         if delay_seconds < 0 or delay_seconds > 900:
             raise ValidationError("Delay seconds must be between 0 and 900")
         try:
-            json_message = json.dumps(message.serialize())
+            json_message = codec.encode(message.serialize()).decode("utf-8")
             params: dict[str, Any] = {"QueueUrl": self.url, "MessageBody": json_message}
             if delay_seconds > 0:
                 params["DelaySeconds"] = delay_seconds
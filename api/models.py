@@ -11,8 +11,10 @@ This module defines the domain models: Model (base), ArtGallery, Job, User.
 All implement Serializable[dict] for S3 persistence and JSON API transport.
 Model has id, created_at, updated_at; subclasses add fields and implement
 serialize/unserialize. ArtGallery holds boundary, obstacles, ears, convex
-components, guards, visibility, stitched, owner_job_id. Job holds
-status, step_name, stdin, stdout, meta, stderr, parent/children. User holds
+components, guards, visibility, stitched, owner_job_id; ArtGalleryDecoder
+decodes those fields lazily for unserialize(lazy=True). Job holds
+status, step_name, stdin, stdout, meta, stderr, parent/children. JobState
+holds step checkpoints; StepResult holds cached step outputs. User holds
 email, name, avatar_url and is used for auth and private repos. Used by
 repositories, indexes, mutations, and queries.
 
@@ -25,10 +27,15 @@ Examples:
 
 from __future__ import annotations
 
+import json
 from abc import abstractmethod
 from dataclasses import dataclass
 from dataclasses import field
+from functools import cached_property
+from itertools import islice
 from typing import Any
+from typing import ClassVar
+from typing import TypeVar
 
 from attributes import Attempt
 from attributes import Duration
@@ -38,6 +45,7 @@ from attributes import Signature
 from attributes import Timestamp
 from attributes import Title
 from attributes import Url
+from buffers import GeometryBuffer
 from enums import Status
 from enums import StepName
 from exceptions import ValidationError
@@ -48,14 +56,19 @@ from geometry import Polygon
 from geometry import Segment
 from interfaces import Serializable
 from serializers import ArtGalleryDict
+from serializers import ArtGallerySummaryDict
+from serializers import IndexedArtGalleryDict
 from serializers import JobDict
 from serializers import JobStateDict
+from serializers import JobSummaryDict
 from serializers import Serialized
+from serializers import StepResultDict
 from serializers import UserDict
 from settings import ANONYMOUS_AVATAR_URL
 from settings import ANONYMOUS_EMAIL as SETTINGS_ANONYMOUS_EMAIL
 from settings import ANONYMOUS_NAME
 from settings import DEFAULT_TITLE_MAX_LENGTH
+from settings import SUMMARY_THUMBNAIL_POINTS
 from settings import TEST_AVATAR_URL
 from settings import TEST_EMAIL
 from settings import TEST_NAME
@@ -63,6 +76,49 @@ from settings import UNTITLED_ART_GALLERY_NAME
 from structs import Collection
 from structs import Table
 
+P = TypeVar("P", bound=Polygon)
+
+
+def extent(boundary: Polygon, obstacles: list[Any], guards: Any, stitched: Any) -> dict[str, Any]:
+    """
+    Counts and bounding box of a gallery for its index summary (SummaryDict): vertices of the boundary and the
+    obstacles, obstacles, guards, vertices of the stitched polygon, and the serialized box of the boundary (None
+    without a boundary).
+
+    For example:
+    >>> extent(gallery.boundary, list(gallery.obstacles.values()), gallery.guards, gallery.stitched)
+    {'vertex_count': 12, 'obstacle_count': 2, 'guard_count': 3, 'stitched_count': 16, 'box': {...}}
+    """
+    return {
+        "vertex_count": len(boundary) + sum(len(obstacle) for obstacle in obstacles),
+        "obstacle_count": len(obstacles),
+        "guard_count": len(guards),
+        "stitched_count": len(stitched),
+        "box": boundary.box.serialize() if boundary else None,
+    }
+
+
+def thumbnail(boundary: list[Any], obstacles: Any, guards: Any) -> dict[str, Any]:
+    """
+    Simplified geometry of a gallery for a list cell, from its serialized boundary, obstacles and guards: every
+    stride-th vertex of the boundary and of each obstacle, the stride chosen so that about SUMMARY_THUMBNAIL_POINTS
+    vertices are kept, and the first SUMMARY_THUMBNAIL_POINTS guards. The boundary keeps at least 3 vertices;
+    obstacles left with fewer are dropped. Obstacles and guards keep their shape (dict by id, or list).
+
+    For example:
+    >>> thumbnail(gallery.boundary.serialize(), gallery.obstacles.serialize(), gallery.guards.serialize())
+    {'boundary': [...], 'obstacles': {...}, 'guards': {...}}
+    """
+    items: list[tuple[Any, list[Any]]] = list(obstacles.items()) if isinstance(obstacles, dict) else list(enumerate(obstacles))
+    total: int = len(boundary) + sum(len(obstacle) for _, obstacle in items)
+    stride: int = max(1, -(-total // SUMMARY_THUMBNAIL_POINTS))
+    kept: list[tuple[Any, list[Any]]] = [(key, obstacle[::stride]) for key, obstacle in items if len(obstacle[::stride]) >= 3]
+    return {
+        "boundary": boundary[:: max(1, min(stride, len(boundary) // 3))],
+        "obstacles": dict(kept) if isinstance(obstacles, dict) else [obstacle for _, obstacle in kept],
+        "guards": dict(islice(guards.items(), SUMMARY_THUMBNAIL_POINTS)) if isinstance(guards, dict) else list(guards)[:SUMMARY_THUMBNAIL_POINTS],
+    }
+
 
 class Model(Serializable[Serialized]):
     """
@@ -224,6 +280,11 @@ class User(Model):
 class Job(Model):
     """
     Job for async processing. parent_id, children_ids, status, step_name, stdin, stdout, meta, stderr.
+    context is the pipeline context of a child job: for every field produced so far (its own stdout and the
+    earlier steps'), the id of the job whose stdout or stdin holds it (see StartTask.inherit()).
+    filed_status is the status the job had before start(), finish() or fail() last changed it, until
+    JobsPrivateIndex.refresh() moves its status index entry (None when there is nothing to move). It is persisted,
+    so a job saved while the move did not happen (a failed flush) still moves its entry on the next refresh().
 
     For example, to check job status:
     >>> job = Job.unserialize(data)
@@ -242,9 +303,16 @@ class Job(Model):
     stdout: dict[str, Any] = field(default_factory=dict)
     meta: dict[str, Any] = field(default_factory=dict)
     stderr: dict[str, Any] = field(default_factory=dict)
+    context: dict[str, Identifier] = field(default_factory=dict)
     duration: Duration = field(default_factory=lambda: Duration(0))
     created_at: Timestamp = field(default_factory=Timestamp.now)
     updated_at: Timestamp = field(default_factory=Timestamp.now)
+    filed_status: Status | None = field(default=None, compare=False, repr=False)
+
+    # Version of summarize(); index entries holding an older one are rewritten from the record when listed.
+    SUMMARY_VERSION: ClassVar[int] = 2
+    # stdin/stdout fields summarize() counts and draws the thumbnail from.
+    SUMMARY_FIELDS: ClassVar[tuple[str, ...]] = ("boundary", "obstacles", "stitched", "guards")
 
     def __str__(self) -> str:
         return f"Job(id={self.id}, status={self.status}, step_name={self.step_name})"
@@ -284,12 +352,13 @@ class Job(Model):
 
     def start(self) -> None:
         """
-        Set status to PENDING, clear children_ids/stdout/stderr, and set started_at in meta for self.step_name. Does not save.
+        Set status to PENDING, clear children_ids/stdout/stderr/context, and set started_at in meta for self.step_name. Does not save.
         """
-        self.status = Status.PENDING
+        self.transition(Status.PENDING)
         self.children_ids = []
         self.stdout.clear()
         self.stderr.clear()
+        self.context.clear()
         slug: str = self.step_name.slug
         self.meta[f"step:{slug}:started_at"] = Timestamp.now().to_iso()
 
@@ -298,7 +367,7 @@ class Job(Model):
         Set finished_at for self.step_name in meta; if started_at exists, set elapsed and self.duration.
         Set status to SUCCESS. Does not save.
         """
-        self.status = Status.SUCCESS
+        self.transition(Status.SUCCESS)
         slug: str = self.step_name.slug
         self.meta[f"step:{slug}:finished_at"] = Timestamp.now().to_iso()
         started_at_key: str = f"step:{slug}:started_at"
@@ -314,11 +383,25 @@ class Job(Model):
         Call finish() to set duration and meta, then override status to FAILED and set stderr. Does not save.
         """
         self.finish()
-        self.status = Status.FAILED
+        self.transition(Status.FAILED)
         slug: str = self.step_name.slug
         self.stderr[f"error:{slug}:message"] = str(error)
         self.stderr[f"error:{slug}:type"] = error.__class__.__name__
 
+    def transition(self, status: Status) -> None:
+        """
+        Set status, keeping in filed_status the one the job's status index entry is filed under (the status before
+        the first transition since the last JobsPrivateIndex.refresh()). Does not save.
+
+        For example, fail() passes through SUCCESS but the entry moves from PENDING:
+        >>> job.fail(error)
+        >>> job.filed_status, job.status
+        (<Status.PENDING: 'pending'>, <Status.FAILED: 'failed'>)
+        """
+        if self.filed_status is None and status != self.status:
+            self.filed_status = self.status
+        self.status = status
+
     @classmethod
     def unserialize(cls, data: Any) -> Job:
         """
@@ -349,9 +432,11 @@ class Job(Model):
             stdout=dict(data.get("stdout") or {}),
             meta=dict(data.get("meta") or {}),
             stderr=dict(data.get("stderr") or {}),
+            context={key: Identifier(value) for key, value in (data.get("context") or {}).items()},
             duration=duration,
             created_at=Timestamp(data.get("created_at")),
             updated_at=Timestamp(data.get("updated_at")),
+            filed_status=Status.parse(data["filed_status"]) if data.get("filed_status") else None,
         )
 
     def serialize(self) -> JobDict:
@@ -365,9 +450,49 @@ class Job(Model):
             "stdout": dict(self.stdout),
             "meta": dict(self.meta),
             "stderr": dict(self.stderr),
+            "context": {key: str(value) for key, value in self.context.items()},
             "duration": int(self.duration),
             "created_at": str(self.created_at),
             "updated_at": str(self.updated_at),
+            "filed_status": self.filed_status.value if self.filed_status is not None else None,
+        }
+
+    def summarize(self) -> JobSummaryDict:
+        """
+        Small projection of the job stored in its JobsPrivateIndex entry, so the job list is answered without
+        loading the record: the scalars of serialize() (no stdin, stdout, meta, children, stderr or context) with
+        the title from meta, plus the counts, bounding box and thumbnail() of the gallery (SUMMARY_FIELDS of stdout
+        once a step produced them, else of stdin).
+
+        For example:
+        >>> job.summarize()["vertex_count"], job.summarize()["thumbnail"].keys()
+        (12, dict_keys(['boundary', 'obstacles', 'guards']))
+        """
+        gallery: dict[str, Any] = {
+            **{key: self.stdin[key] for key in self.SUMMARY_FIELDS if key in self.stdin},
+            **{key: self.stdout[key] for key in self.SUMMARY_FIELDS if key in self.stdout},
+        }
+        boundary: list[Any] = gallery.get("boundary") or []
+        obstacles: Any = gallery.get("obstacles") or []
+        guards: Any = gallery.get("guards") or []
+        title: Any = self.meta.get("title")
+        return {
+            "version": self.SUMMARY_VERSION,
+            "id": str(self.id),
+            "parent_id": str(self.parent_id) if self.parent_id is not None else None,
+            "status": self.status.value,
+            "step_name": str(self.step_name.slug),
+            "title": str(title) if title is not None else None,
+            "duration": int(self.duration),
+            "created_at": str(self.created_at),
+            "updated_at": str(self.updated_at),
+            **extent(
+                Polygon.unserialize(boundary),
+                list(obstacles.values()) if isinstance(obstacles, dict) else list(obstacles),
+                guards,
+                gallery.get("stitched") or [],
+            ),
+            "thumbnail": thumbnail(boundary, obstacles, guards),
         }
 
 
@@ -377,6 +502,10 @@ class JobState(Model):
     Persistent state for a job. The id equals the job id (1:1 relationship).
     Used to persist intermediate step state across retries or restarts.
 
+    Stored as a snapshot (this record) plus append-only delta records, each holding the
+    edit operations from the previous checkpoint (see JobStateRepository.checkpoint()).
+    generation names the snapshot its deltas belong to; deltas is the number replayed on load.
+
     For example, to create and persist job state:
     >>> state = JobState(id=job.id, data={"remaining_points": [...]})
     >>> state.serialize()
@@ -386,6 +515,8 @@ class JobState(Model):
     id: Identifier
     data: dict[str, Any] = field(default_factory=dict)
     attempt: Attempt = field(default_factory=lambda: Attempt(0))
+    generation: str = ""
+    deltas: int = 0
     created_at: Timestamp = field(default_factory=Timestamp.now)
     updated_at: Timestamp = field(default_factory=Timestamp.now)
 
@@ -395,10 +526,90 @@ class JobState(Model):
     def __repr__(self) -> str:
         return f"JobState(id={self.id!r})"
 
+    def delta(self, previous: dict[str, Any]) -> list[Any]:
+        """
+        Edit operations that turn previous into self.data; empty when nothing changed.
+        Each operation is [kind, path, value?] with path the list of dict keys from data:
+        "set" (replace), "del" (remove key), "ext" (append items), "rem" (remove items from a list).
+
+        For example, after a guard is added:
+        >>> JobState(id=job_id, data={"guards": [a, b]}).delta({"guards": [a]})
+        [['ext', ['guards'], [b]]]
+        """
+        operations: list[Any] = []
+        self.diff(previous, self.data, [], operations)
+        return operations
+
+    @classmethod
+    def diff(cls, old: Any, new: Any, path: list[str], operations: list[Any]) -> None:
+        """Append to operations the edits from old to new at path (dicts per key, lists by append or removal)."""
+        if old == new:
+            return
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key, value in new.items():
+                if key not in old:
+                    operations.append(["set", [*path, key], value])
+                else:
+                    cls.diff(old[key], value, [*path, key], operations)
+            for key in old:
+                if key not in new:
+                    operations.append(["del", [*path, key]])
+            return
+        if isinstance(old, list) and isinstance(new, list) and path:
+            if len(new) >= len(old) and new[: len(old)] == old:
+                operations.append(["ext", path, new[len(old) :]])
+                return
+            # Set-like lists (remaining points, ids): drop the removed items, append the new ones, if that rebuilds new exactly.
+            new_keys: set[Any] = {cls.key(item) for item in new}
+            old_keys: set[Any] = {cls.key(item) for item in old}
+            removed: list[Any] = [item for item in old if cls.key(item) not in new_keys]
+            added: list[Any] = [item for item in new if cls.key(item) not in old_keys]
+            kept: list[Any] = [item for item in old if cls.key(item) in new_keys]
+            if kept + added == new and len(removed) + len(added) < len(new):
+                if removed:
+                    operations.append(["rem", path, removed])
+                if added:
+                    operations.append(["ext", path, added])
+                return
+        operations.append(["set", path, new])
+
+    @classmethod
+    def key(cls, item: Any) -> Any:
+        """Hashable identity of a JSON value: tuples for lists (points), canonical JSON for dicts."""
+        if isinstance(item, list):
+            return tuple(cls.key(value) for value in item)
+        return json.dumps(item, sort_keys=True) if isinstance(item, dict) else item
+
+    def replay(self, operations: list[Any]) -> None:
+        """
+        Apply edit operations produced by delta() to self.data, in order.
+
+        For example, to rebuild a checkpoint:
+        >>> state.replay([["ext", ["guards"], [b]]])
+        """
+        for operation in operations:
+            kind: str = operation[0]
+            path: list[str] = operation[1]
+            parent: dict[str, Any] = self.data
+            for key in path[:-1]:
+                parent = parent[key]
+            last: str = path[-1]
+            if kind == "set":
+                parent[last] = operation[2]
+            elif kind == "del":
+                parent.pop(last, None)
+            elif kind == "ext":
+                parent[last] = [*parent[last], *operation[2]]
+            elif kind == "rem":
+                removed: set[Any] = {self.key(item) for item in operation[2]}
+                parent[last] = [item for item in parent[last] if self.key(item) not in removed]
+            else:
+                raise ValidationError(f"Unknown job state operation: {kind}")
+
     @classmethod
     def unserialize(cls, data: Any) -> JobState:
         """
-        Build JobState from dict. Parses id, data, attempt, created_at, updated_at.
+        Build JobState from dict. Parses id, data, attempt, generation, created_at, updated_at.
 
         For example, to load state from S3:
         >>> state = JobState.unserialize({"id": "abc", "data": {"key": "value"}})
@@ -411,6 +622,7 @@ class JobState(Model):
             id=Identifier(data.get("id", "")),
             data=dict(data.get("data") or {}),
             attempt=attempt_val,
+            generation=str(data.get("generation") or ""),
             created_at=Timestamp(data.get("created_at")),
             updated_at=Timestamp(data.get("updated_at")),
         )
@@ -420,11 +632,194 @@ class JobState(Model):
             "id": str(self.id),
             "data": dict(self.data),
             "attempt": int(self.attempt),
+            "generation": self.generation,
             "created_at": str(self.created_at),
             "updated_at": str(self.updated_at),
         }
 
 
+@dataclass
+class StepResult(Model):
+    """
+    Cached output of a completed step. The id is the step's fingerprint (Step.fingerprint()): a Signature of
+    the step, STEP_CACHE_VERSION and the input fields the step reads, so equal inputs share one record.
+    stdout is what run() returned; StartTask merges it into job.stdout instead of running the step again.
+
+    For example, to cache a stitching result:
+    >>> result = StepResult(id=Identifier(key), step_name=StepName.STITCHING, stdout={"stitched": [...], "stitches": [...]})
+    >>> StepResult.unserialize(result.serialize()).stdout == result.stdout
+    True
+    """
+
+    id: Identifier
+    step_name: StepName = StepName.ART_GALLERY
+    stdout: dict[str, Any] = field(default_factory=dict)
+    created_at: Timestamp = field(default_factory=Timestamp.now)
+    updated_at: Timestamp = field(default_factory=Timestamp.now)
+
+    def __str__(self) -> str:
+        return f"StepResult(id={self.id}, step_name={self.step_name})"
+
+    def __repr__(self) -> str:
+        return f"StepResult(id={self.id!r}, step_name={self.step_name!r})"
+
+    @classmethod
+    def unserialize(cls, data: Any) -> StepResult:
+        return cls(
+            id=Identifier(data.get("id", "")),
+            step_name=StepName.parse(data.get("step_name")),
+            stdout=dict(data.get("stdout") or {}),
+            created_at=Timestamp(data.get("created_at")),
+            updated_at=Timestamp(data.get("updated_at")),
+        )
+
+    def serialize(self) -> StepResultDict:
+        return {
+            "id": str(self.id),
+            "step_name": str(self.step_name.slug),
+            "stdout": dict(self.stdout),
+            "created_at": str(self.created_at),
+            "updated_at": str(self.updated_at),
+        }
+
+
+class ArtGalleryDecoder:
+    """
+    Decodes the geometry fields of a serialized ArtGallery (legacy dict or indexed format), each on first access
+    and at most once (fields that depend on others, e.g. adjacency on convex components, reuse them).
+    trusted builds polygons, ears and convex components with Polygon.trusted(), skipping their validation.
+
+    For example:
+    >>> decoder = ArtGalleryDecoder(job.stdout, trusted=True)
+    >>> decoder.boundary
+    Polygon(...)
+    """
+
+    def __init__(self, data: dict[str, Any], trusted: bool = False) -> None:
+        # Shallow copy: the caller may update the dict (e.g. job.stdout) before every field is decoded.
+        self.data: dict[str, Any] = dict(data)
+        self.trusted: bool = trusted
+        self.indexed: bool = data.get("version") == ArtGallery.INDEXED_VERSION
+
+    @cached_property
+    def vertices(self) -> list[Point]:
+        """Shared vertex table of the indexed format."""
+        return [Point.unserialize(v) for v in self.data.get("vertices") or []]
+
+    def points(self, positions: Any) -> list[Point]:
+        """Vertices at positions (indexed format). Raises ValidationError on a position outside the vertex table."""
+        vertices: list[Point] = self.vertices
+        try:
+            return [vertices[position] for position in positions]
+        except (IndexError, TypeError) as e:
+            raise ValidationError(f"Invalid vertex position: {str(e)}") from e
+
+    def polygon(self, raw: Any, cls: type[P]) -> P:
+        """Build a cls (Polygon, Ear, ConvexComponent) from vertex positions or serialized points."""
+        if self.indexed:
+            points: list[Point] = self.points(raw)
+        elif self.trusted and isinstance(raw, list):
+            points = [Point.unserialize(p) for p in raw]
+        else:
+            return cls.unserialize(raw)
+        return cls.trusted(points) if self.trusted else cls(points)
+
+    def polygons(self, raw: Any, cls: type[P]) -> Table[P]:
+        sequence: Any = raw.values() if isinstance(raw, dict) else raw or []
+        return Table.unserialize([self.polygon(item, cls) for item in sequence])
+
+    def bags(self, raw: Any) -> Table[Collection[Point, Point]]:
+        """Visibility or exclusivity: one Collection of points per guard."""
+        bags: list[Collection[Point, Point]] = []
+        if self.indexed:
+            pairs: list[tuple[Point, Any]] = list(zip(self.guards.values(), raw or []))
+        elif isinstance(self.data.get("guards"), dict):
+            pairs = [(Point.unserialize(guard), (raw.get(k) or []) if isinstance(raw, dict) else []) for k, guard in self.data["guards"].items()]
+        else:
+            pairs = list(zip(self.guards.values(), raw)) if isinstance(raw, list) else []
+        for guard, items in pairs:
+            if not isinstance(items, (list, tuple)):
+                continue
+            bag: Collection[Point, Point] = Collection(guard)
+            for point in self.points(items) if self.indexed else items:
+                bag += Point.unserialize(point)
+            bags.append(bag)
+        return Table.unserialize(bags)
+
+    @cached_property
+    def boundary(self) -> Polygon:
+        return self.polygon(self.data.get("boundary") or self.data.get("boundaries") or [], Polygon)
+
+    @cached_property
+    def obstacles(self) -> Table[Polygon]:
+        return self.polygons(self.data.get("obstacles") or self.data.get("holes") or [], Polygon)
+
+    @cached_property
+    def ears(self) -> Table[Ear]:
+        return self.polygons(self.data.get("ears") or [], Ear)
+
+    @cached_property
+    def convex_components(self) -> Table[ConvexComponent]:
+        return self.polygons(self.data.get("convex_components") or [], ConvexComponent)
+
+    @cached_property
+    def adjacency(self) -> Table[Collection[ConvexComponent, Identifier]]:
+        raw: Any = self.data.get("adjacency") or ([] if self.indexed else {})
+        components: list[ConvexComponent] = list(self.convex_components.values())
+        collections: list[Collection[ConvexComponent, Identifier]] = []
+        if self.indexed:
+            ids: list[Identifier] = [component.id for component in components]
+            for component, neighbours in zip(components, raw):
+                collection: Collection[ConvexComponent, Identifier] = Collection(component)
+                for position in neighbours:
+                    collection += ids[position]
+                collections.append(collection)
+        elif isinstance(raw, dict):
+            for component in components:
+                hashes: Any = raw.get(str(component.id), [])
+                if not isinstance(hashes, (list, tuple)):
+                    continue
+                collection = Collection(component)
+                for h in hashes:
+                    collection += Identifier(int(h))
+                collections.append(collection)
+        return Table.unserialize(collections)
+
+    @cached_property
+    def guards(self) -> Table[Point]:
+        raw: Any = self.data.get("guards") or []
+        if self.indexed:
+            return Table.unserialize(self.points(raw))
+        return Table.unserialize([Point.unserialize(guard) for guard in (raw.values() if isinstance(raw, dict) else raw)])
+
+    @cached_property
+    def visibility(self) -> Table[Collection[Point, Point]]:
+        return self.bags(self.data.get("visibility") or [])
+
+    @cached_property
+    def exclusivity(self) -> Table[Collection[Point, Point]]:
+        return self.bags(self.data.get("exclusivity") or [])
+
+    @cached_property
+    def stitched(self) -> Polygon:
+        raw: Any = self.data.get("stitched") or self.data.get("stiteched") or []
+        return self.polygon(raw, Polygon) if raw else Polygon([])
+
+    @cached_property
+    def stitches(self) -> list[Segment]:
+        raw: Any = self.data.get("stitches") or []
+        if self.indexed:
+            return [Segment(self.points(pair)) for pair in raw]
+        return [Segment.unserialize(stitch) for stitch in raw]
+
+    @cached_property
+    def coverage(self) -> set[Point]:
+        raw: Any = self.data.get("coverage") or []
+        if self.indexed:
+            return set(self.points(raw))
+        return {Point.unserialize(p) for p in raw} if isinstance(raw, list) else set()
+
+
 @dataclass
 class ArtGallery(Model):
     """
@@ -457,19 +852,51 @@ class ArtGallery(Model):
     stitches: list[Segment] = field(default_factory=list)
     coverage: set[Point] = field(default_factory=set)
 
+    # Wire format version of serialize_indexed(); unserialize() treats dicts without "version" as the legacy format.
+    INDEXED_VERSION: ClassVar[int] = 2
+    # Version of summarize(); index entries holding an older one are rewritten from the record when listed.
+    SUMMARY_VERSION: ClassVar[int] = 2
+    # Geometry fields decoded on first access by unserialize(lazy=True).
+    LAZY_FIELDS: ClassVar[tuple[str, ...]] = (
+        "boundary",
+        "obstacles",
+        "ears",
+        "convex_components",
+        "adjacency",
+        "guards",
+        "visibility",
+        "exclusivity",
+        "stitched",
+        "stitches",
+        "coverage",
+    )
+
     def __str__(self) -> str:
         return f"ArtGallery(id={self.id})"
 
     def __repr__(self) -> str:
         return f"ArtGallery(id={self.id!r}, owner_job_id={self.owner_job_id!r})"
 
+    def __getattr__(self, name: str) -> Any:
+        """Decode a geometry field of a lazy gallery on first access (only called when the attribute is not set yet)."""
+        decoder: ArtGalleryDecoder | None = self.__dict__.get("_decoder")
+        if decoder is None or name not in self.LAZY_FIELDS:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        value: Any = getattr(decoder, name)
+        self.__dict__[name] = value
+        return value
+
     @classmethod
-    def unserialize(cls, data: Any) -> ArtGallery:
+    def unserialize(cls, data: Any, trusted: bool = False, lazy: bool = False) -> ArtGallery:
         """
-        Build ArtGallery from dict. Unserializes boundary, obstacles, ears, guards, visibility, stitched, stitches.
+        Build ArtGallery from dict (legacy or serialize_indexed() format, told apart by "version").
         stitched is optional; accepts key "stitched" or "stiteched"; defaults to empty polygon. stitches is optional list
         of segments (bridge edges from stitching step).
 
+        lazy leaves the geometry fields (LAZY_FIELDS) undecoded until first access, so a step that only reads boundary
+        and obstacles never builds ears, convex components or visibility. trusted skips re-validating polygons, ears and
+        convex components; only pass it for geometry this pipeline produced (job stdout, stored galleries).
+
         For example, to build a gallery from publish response:
         >>> gallery = ArtGallery.unserialize({"id": "g1", "boundary": [...], "owner_job_id": "j1", ...})
         >>> gallery.boundary
@@ -477,121 +904,66 @@ class ArtGallery(Model):
         >>> gallery = ArtGallery.unserialize({"id": "g1", "boundary": [...], "stitched": [[0,0],[1,0],[1,1]]})
         >>> len(gallery.stitched)
         3
+        >>> gallery = ArtGallery.unserialize(job.stdout, trusted=True, lazy=True)
+        >>> "ears" in vars(gallery)
+        False
         """
-        boundary = data.get("boundary") or data.get("boundaries") or []
-        obstacles_raw = data.get("obstacles") or data.get("holes") or []
-        obstacles_list: list[Any] = list(obstacles_raw.values()) if isinstance(obstacles_raw, dict) else (obstacles_raw or [])
-        ears_raw = data.get("ears") or []
-        convex_components_raw = data.get("convex_components") or []
-        guards_raw = data.get("guards") or []
-        visibility_raw = data.get("visibility") or []
-        exclusivity_raw = data.get("exclusivity") or []
-        stitched_raw = data.get("stitched") or data.get("stiteched") or []
-        stitched = Polygon.unserialize(stitched_raw) if stitched_raw else Polygon([])
-        stitches_raw = data.get("stitches") or []
-        stitches = [Segment.unserialize(stitch) for stitch in stitches_raw] if stitches_raw else []
-        coverage_raw = data.get("coverage") or []
-        coverage: set[Point] = set()
-        if isinstance(coverage_raw, list):
-            for p in coverage_raw:
-                coverage.add(Point.unserialize(p))
-
-        ears_sequence = ears_raw.values() if isinstance(ears_raw, dict) else ears_raw
-        ears = Table.unserialize([Ear.unserialize(ser) for ser in ears_sequence])
-
-        cc_sequence = convex_components_raw.values() if isinstance(convex_components_raw, dict) else convex_components_raw
-        convex_components = Table.unserialize([ConvexComponent.unserialize(cc) for cc in cc_sequence])
-
-        def _adjacency_collection(component: ConvexComponent, hashes_list: Any) -> Collection[ConvexComponent, Identifier] | None:
-            if not isinstance(hashes_list, (list, tuple)):
-                return None
-            collection: Collection[ConvexComponent, Identifier] = Collection(component)
-            for h in hashes_list:
-                collection += Identifier(int(h))
-            return collection
-
-        adjacency_raw = data.get("adjacency") or {}
-        adjacency_collections = (
-            [b for cc in convex_components for b in [_adjacency_collection(cc, adjacency_raw.get(str(cc.id), []))] if b is not None]
-            if isinstance(adjacency_raw, dict)
-            else []
-        )
-        adjacency_table: Table[Collection[ConvexComponent, Identifier]] = Table.unserialize(adjacency_collections)
-
-        def _visibility_collection(guard: Point, pts_raw: Any) -> Collection[Point, Point] | None:
-            if not isinstance(pts_raw, (list, tuple)):
-                return None
-            vis_collection: Collection[Point, Point] = Collection(guard)
-            for p in pts_raw:
-                vis_collection += Point.unserialize(p)
-            return vis_collection
-
-        def _exclusivity_collection(guard: Point, pts_raw: Any) -> Collection[Point, Point] | None:
-            if not isinstance(pts_raw, (list, tuple)):
-                return None
-            exc_collection: Collection[Point, Point] = Collection(guard)
-            for p in pts_raw:
-                exc_collection += Point.unserialize(p)
-            return exc_collection
-
-        if isinstance(guards_raw, dict):
-            guards = Table.unserialize([Point.unserialize(serialized) for serialized in guards_raw.values()])
-            visibility_collections = [
-                b
-                for k, guard_ser in guards_raw.items()
-                for guard in [Point.unserialize(guard_ser)]
-                for pts_raw in [(visibility_raw.get(k) or []) if isinstance(visibility_raw, dict) else []]
-                for b in [_visibility_collection(guard, pts_raw)]
-                if b is not None
-            ]
-            visibility_table: Table[Collection[Point, Point]] = Table.unserialize(visibility_collections)
-            exclusivity_collections = [
-                b
-                for k, guard_ser in guards_raw.items()
-                for guard in [Point.unserialize(guard_ser)]
-                for pts_raw in [(exclusivity_raw.get(k) or []) if isinstance(exclusivity_raw, dict) else []]
-                for b in [_exclusivity_collection(guard, pts_raw)]
-                if b is not None
-            ]
-            exclusivity_table: Table[Collection[Point, Point]] = Table.unserialize(exclusivity_collections)
-        else:
-            guards = Table.unserialize([Point.unserialize(guard) for guard in guards_raw])
-            visibility_collections = (
-                [b for guard, path in zip(list(guards.values()), visibility_raw) for b in [_visibility_collection(guard, path)] if b is not None]
-                if isinstance(visibility_raw, list)
-                else []
-            )
-            visibility_table = Table.unserialize(visibility_collections)
-            exclusivity_collections = (
-                [b for guard, path in zip(list(guards.values()), exclusivity_raw) for b in [_exclusivity_collection(guard, path)] if b is not None]
-                if isinstance(exclusivity_raw, list)
-                else []
-            )
-            exclusivity_table = Table.unserialize(exclusivity_collections)
-
-        id_raw = (data.get("id") or "").strip()
-        owner_raw = (data.get("owner_job_id") or "").strip()
+        decoder: ArtGalleryDecoder = ArtGalleryDecoder(data, trusted=trusted)
         duration_raw = data.get("duration")
-        duration: Duration = Duration(int(duration_raw)) if duration_raw is not None else Duration(0)
-        return cls(
-            id=Identifier(id_raw or "art-gallery"),
-            boundary=Polygon.unserialize(boundary),
-            obstacles=Table.unserialize([Polygon.unserialize(obstacle) for obstacle in obstacles_list]),
-            owner_job_id=Identifier(owner_raw or "art-gallery"),
-            title=Title(data.get("title", UNTITLED_ART_GALLERY_NAME)),
-            duration=duration,
-            created_at=Timestamp(data.get("created_at")),
-            updated_at=Timestamp(data.get("updated_at")),
-            ears=ears,
-            convex_components=convex_components,
-            adjacency=adjacency_table,
-            guards=guards,
-            visibility=visibility_table,
-            exclusivity=exclusivity_table,
-            stitched=stitched,
-            stitches=stitches,
-            coverage=coverage,
-        )
+        scalars: dict[str, Any] = {
+            "id": Identifier((data.get("id") or "").strip() or "art-gallery"),
+            "owner_job_id": Identifier((data.get("owner_job_id") or "").strip() or "art-gallery"),
+            "title": Title(data.get("title", UNTITLED_ART_GALLERY_NAME)),
+            "duration": Duration(int(duration_raw)) if duration_raw is not None else Duration(0),
+            "created_at": Timestamp(data.get("created_at")),
+            "updated_at": Timestamp(data.get("updated_at")),
+        }
+        if not lazy:
+            return cls(**scalars, **{name: getattr(decoder, name) for name in cls.LAZY_FIELDS})
+        gallery: ArtGallery = cls.__new__(cls)
+        gallery.__dict__.update(scalars)
+        gallery.__dict__["_decoder"] = decoder
+        return gallery
+
+    def export(self) -> GeometryBuffer:
+        """
+        Copy the geometry (boundary, stitched, obstacles, ears, convex components, adjacency) into a
+        shared memory block that worker processes can attach() to instead of unpickling the gallery.
+        The caller owns the block and must close() and unlink() it once the workers are done.
+
+        For example:
+        >>> buffer = gallery.export()
+        >>> ArtGallery.attach(buffer.name).boundary == gallery.boundary
+        True
+        """
+        return GeometryBuffer.export(self)
+
+    @classmethod
+    def attach(cls, name: str) -> ArtGallery:
+        """
+        Build a read-only gallery from a block created by export(). Polygons share one Point per
+        vertex and are not re-validated; guards, visibility and coverage are not part of the block.
+
+        For example, in a worker process:
+        >>> gallery = ArtGallery.attach(name)
+        >>> len(gallery.convex_components)
+        12
+        """
+        buffer: GeometryBuffer = GeometryBuffer.attach(name)
+        try:
+            return cls(
+                id=Identifier("art-gallery"),
+                boundary=buffer.boundary,
+                owner_job_id=Identifier("art-gallery"),
+                title=Title(UNTITLED_ART_GALLERY_NAME),
+                obstacles=buffer.obstacles,
+                ears=buffer.ears,
+                convex_components=buffer.convex_components,
+                adjacency=buffer.adjacency,
+                stitched=buffer.stitched,
+            )
+        finally:
+            buffer.close()
 
     def serialize(self) -> ArtGalleryDict:
         return {
@@ -613,3 +985,95 @@ class ArtGallery(Model):
             "stitches": [s.serialize() for s in self.stitches],
             "coverage": [p.serialize() for p in self.coverage],
         }
+
+    def summarize(self) -> ArtGallerySummaryDict:
+        """
+        Small projection of the gallery stored in its ArtGalleryPublicIndex entry, so the gallery list is answered
+        without loading the record: the scalars of serialize(), counts, box and a thumbnail() of the boundary,
+        obstacles and guards (what a list cell draws). On a lazy gallery only boundary, obstacles, guards and
+        stitched (counted) are decoded.
+
+        For example:
+        >>> summary = gallery.summarize()
+        >>> summary["guard_count"], "stitched" in summary
+        (3, False)
+        """
+        return {
+            "version": self.SUMMARY_VERSION,
+            "id": str(self.id),
+            "owner_job_id": str(self.owner_job_id),
+            "title": str(self.title),
+            "duration": int(self.duration),
+            "created_at": str(self.created_at),
+            "updated_at": str(self.updated_at),
+            **extent(self.boundary, list(self.obstacles.values()), self.guards, self.stitched),
+            "thumbnail": thumbnail(self.boundary.serialize(), self.obstacles.serialize(), self.guards.serialize()),
+        }
+
+    def serialize_indexed(self) -> IndexedArtGalleryDict:
+        """
+        Serialize with every distinct point listed once in "vertices" and referenced by position everywhere else.
+        Polygons are lists of vertex positions, stitches are [start, end] pairs, visibility and exclusivity are
+        lists of vertex positions aligned with "guards", and adjacency lists, per convex component, the positions
+        of its neighbours in "convex_components" (neighbour ids that are not components of this gallery are
+        dropped). unserialize() detects the format from "version".
+
+        For example:
+        >>> data = gallery.serialize_indexed()
+        >>> data["version"], data["vertices"][data["boundary"][0]]
+        (2, ['0', '0'])
+        >>> ArtGallery.unserialize(data) == gallery
+        True
+        """
+        positions: dict[Point, int] = {}
+
+        def index(point: Point) -> int:
+            position: int | None = positions.get(point)
+            if position is None:
+                position = positions[point] = len(positions)
+            return position
+
+        guards: list[Point] = list(self.guards.values())
+        components: list[ConvexComponent] = list(self.convex_components.values())
+        component_positions: dict[int, int] = {hash(component): position for position, component in enumerate(components)}
+        neighbours: dict[int, list[int]] = {
+            hash(bag.key): sorted(component_positions[int(h)] for h in bag.items if int(h) in component_positions) for bag in self.adjacency
+        }
+        visibility: dict[int, list[Point]] = {hash(bag.key): list(bag.items) for bag in self.visibility}
+        exclusivity: dict[int, list[Point]] = {hash(bag.key): list(bag.items) for bag in self.exclusivity}
+        return {
+            "version": self.INDEXED_VERSION,
+            "id": str(self.id),
+            "owner_job_id": str(self.owner_job_id),
+            "title": str(self.title),
+            "duration": int(self.duration),
+            "created_at": str(self.created_at),
+            "updated_at": str(self.updated_at),
+            "boundary": [index(p) for p in self.boundary],
+            "obstacles": [[index(p) for p in obstacle] for obstacle in self.obstacles.values()],
+            "ears": [[index(p) for p in ear] for ear in self.ears.values()],
+            "convex_components": [[index(p) for p in component] for component in components],
+            "adjacency": [neighbours.get(hash(component), []) for component in components],
+            "guards": [index(guard) for guard in guards],
+            "visibility": [[index(p) for p in visibility.get(hash(guard), [])] for guard in guards],
+            "exclusivity": [[index(p) for p in exclusivity.get(hash(guard), [])] for guard in guards],
+            "stitched": [index(p) for p in self.stitched],
+            "stitches": [[index(s.start), index(s.end)] for s in self.stitches],
+            "coverage": [index(p) for p in self.coverage],
+            "vertices": [p.serialize() for p in positions],
+        }
+
+    @classmethod
+    def unserialize_indexed(cls, data: dict[str, Any], trusted: bool = False, lazy: bool = False) -> ArtGallery:
+        """
+        Build ArtGallery from serialize_indexed() output. Each vertex is parsed once and the same Point is shared
+        by every polygon, guard and bag that refers to it. Raises ValidationError on an unknown version or a
+        position outside "vertices".
+
+        For example:
+        >>> ArtGallery.unserialize_indexed(gallery.serialize_indexed()).boundary == gallery.boundary
+        True
+        """
+        if data.get("version") != cls.INDEXED_VERSION:
+            raise ValidationError(f"Unsupported art gallery version {data.get('version')!r}")
+        return cls.unserialize(data, trusted=trusted, lazy=lazy)
@@ -33,7 +33,10 @@ from controllers import Controller
 from controllers import ControllerRequest
 from controllers import ControllerResponse
 from controllers import PrivateControllerMixin
+from costs import CostModel
+from costs import Size
 from enums import Action
+from enums import StepName
 from exceptions import BoundaryRequiredError
 from exceptions import GalleryHasNoBoundaryError
 from exceptions import GalleryHasNoConvexComponentsError
@@ -43,10 +46,13 @@ from exceptions import GalleryHasNoStitchedError
 from exceptions import GalleryHasNoStitchesError
 from exceptions import GalleryHasNoVisibilityError
 from exceptions import GalleryHasStitchesWithoutObstaclesError
+from exceptions import GalleryTooExpensiveError
 from exceptions import JobAlreadyExistsError
 from exceptions import JobNotFinishedToPublishError
 from exceptions import JobNotFoundError
 from exceptions import JobNotSuccessToUpdateError
+from exceptions import JobSourceNotFinishedError
+from exceptions import JobStepNotReprocessableError
 from exceptions import MetaKeysMustBeStringsError
 from exceptions import MetaMustBeDictError
 from exceptions import MetaRequiredError
@@ -54,6 +60,7 @@ from exceptions import MetaValuesMustBeStringsError
 from exceptions import ObstaclesMustBeListError
 from exceptions import PolygonValidationError
 from exceptions import RecordNotFoundError
+from exceptions import SourceIdMustBeStringError
 from exceptions import TitleMustBeStringError
 from geometry import Polygon
 from indexes import ArtGalleryPublicIndex
@@ -67,7 +74,10 @@ from models import User
 from repositories import ArtGalleryRepository
 from repositories import JobsRepository
 from repositories import JobStateRepository
+from settings import MAX_TASK_CONTINUATION_STEPS
+from settings import SUSPEND_SAFETY_MARGIN_MS
 from settings import UNTITLED_ART_GALLERY_NAME
+from settings import WORKER_TIMEOUT_MS
 from structs import Table
 from validators import PolygonValidator
 
@@ -88,11 +98,15 @@ class ArtGalleryPublishMutationRequest(MutationRequest):
 
 
 class JobMutationRequest(MutationRequest):
-    """Create job: boundary and obstacles; id is hash (idempotent). Optional title (default: Untitled Gallery)."""
+    """
+    Create job: boundary and obstacles; id is hash (idempotent). Optional title (default: Untitled Gallery) and
+    source_id, the job the gallery was edited from, whose results the steps reuse (see edits.py).
+    """
 
     boundary: Polygon
     obstacles: Table[Polygon]
     title: str
+    source_id: Identifier | None
 
 
 class JobUpdateMutationRequest(MutationRequest):
@@ -109,9 +123,10 @@ class JobDeleteMutationRequest(MutationRequest):
 
 
 class ReprocessingJobMutationRequest(MutationRequest):
-    """Reprocess job: job_id from path; job must exist and be success or failed."""
+    """Reprocess job: job_id from path; optional step_name (a child step) to reprocess from, keeping the children before it."""
 
     job_id: Identifier
+    step_name: StepName | None
 
 
 class MutationResponse(ControllerResponse):
@@ -152,6 +167,7 @@ class JobMutationResponse(MutationResponse):
     stdout: dict[str, Any]
     meta: dict[str, Any]
     stderr: dict[str, Any]
+    context: dict[str, str]
 
 
 def gallery_id_from_job_and_user(job_id: Identifier, user_email: Email) -> Identifier:
@@ -194,6 +210,9 @@ class JobMutation(PrivateControllerMixin, Mutation):
     >>> result = handler.handler({"boundary": [[0,0],[10,0],[10,10],[0,10]], "obstacles": []})
     >>> "id" in result
     True
+
+    For example, to create a job from an edit of a finished job, reusing its results where the edit allows:
+    >>> result = handler.handler({"boundary": [...], "obstacles": [...], "source_id": "j1"})
     """
 
     def validate(self, body: dict[str, Any]) -> JobMutationRequest:
@@ -207,10 +226,14 @@ class JobMutation(PrivateControllerMixin, Mutation):
         title = body.get("title") or UNTITLED_ART_GALLERY_NAME
         if body.get("title") is not None and not isinstance(body.get("title"), str):
             raise TitleMustBeStringError("title must be a string")
+        source_id = body.get("source_id")
+        if source_id is not None and not isinstance(source_id, str):
+            raise SourceIdMustBeStringError("source_id must be a string")
         return JobMutationRequest(
             boundary=Polygon.unserialize(boundary),
             obstacles=Table.unserialize([Polygon.unserialize(obstacle) for obstacle in obstacles]),
             title=title.strip(),
+            source_id=Identifier(source_id) if source_id else None,
         )
 
     def execute(self, validated_input: JobMutationRequest) -> JobMutationResponse:
@@ -227,20 +250,37 @@ class JobMutation(PrivateControllerMixin, Mutation):
         if repo.exists(job_id):
             raise JobAlreadyExistsError("Job already exists for this boundary and obstacles")
         title = validated_input.get("title") or UNTITLED_ART_GALLERY_NAME
+        stdin: dict[str, Any] = {
+            "boundary": boundary.serialize(),
+            "obstacles": [poly.serialize() for poly in obstacles],
+        }
+        source_id: Identifier | None = validated_input.get("source_id")
+        if source_id is not None:
+            try:
+                source: Job = repo.get(source_id)
+            except RecordNotFoundError:
+                raise JobNotFoundError("Source job not found")
+            if not source.is_finished():
+                raise JobSourceNotFinishedError("Source job must be successfully finished to edit from it")
+            stdin["source_id"] = str(source_id)
+        # Refuse galleries the cost model expects to need more continuations than a job may take.
+        # Sizes beyond the fitted history are not refused on an extrapolation.
+        size: Size = Size.of(stdin)
+        model: CostModel = CostModel.current()
+        for step_name in StepName:
+            if not model.covers(step_name, size):
+                continue
+            invocations: int = model.invocations(step_name, size, (WORKER_TIMEOUT_MS - SUSPEND_SAFETY_MARGIN_MS) / 1000)
+            if invocations > MAX_TASK_CONTINUATION_STEPS:
+                raise GalleryTooExpensiveError(f"{step_name.value} is expected to need {invocations} invocations (max {MAX_TASK_CONTINUATION_STEPS})")
         job = Job(
             id=job_id,
-            stdin={
-                "boundary": boundary.serialize(),
-                "obstacles": [poly.serialize() for poly in obstacles],
-            },
+            stdin=stdin,
             meta={"title": title},
         )
         repo.save(job)
         queue.put(Message(action=Action.START, job_id=job.id, user_email=self.user.email))
-        JobsPrivateIndex(user_email=self.user.email).index(
-            index_id=Identifier(Countdown.from_timestamp(job.created_at)),
-            real_id=job.id,
-        )
+        JobsPrivateIndex(user_email=self.user.email).refresh(job)
         logger.info("JobMutation.mutate() | created job_id=%s user=%s", job.id, self.user.email)
         return job.serialize()
 
@@ -250,6 +290,10 @@ class ReprocessingJobMutation(PrivateControllerMixin, Mutation):
     Reprocess an existing job: load by id (any status allowed), delete associated gallery (if any),
     delete all children via JobDeleteMutation, then job.start() (clears children/stdout/stderr,
     sets pending), save and enqueue START.
+    With step_name (e.g. "guard_placement"), only the children from that step onward are deleted; the
+    children before it must have succeeded and are kept as they are. ArtGalleryStep.spawn() reuses them
+    (same deterministic ids) and StartTask.broadcast() starts the first child that has not succeeded,
+    so the pipeline resumes at step_name with the upstream stdout read from the kept children.
     Idempotent: yes (re-reprocess overwrites; same job runs again).
 
     For example, to reprocess a job:
@@ -263,11 +307,15 @@ class ReprocessingJobMutation(PrivateControllerMixin, Mutation):
     True
     >>> result["children_ids"] == []
     True
+
+    For example, to re-run only guard placement:
+    >>> result = handler.handler({"id": "j1", "step_name": "guard_placement"})
     """
 
     def validate(self, body: dict[str, Any]) -> ReprocessingJobMutationRequest:
         super().validate(body)
-        return ReprocessingJobMutationRequest(job_id=Identifier(body.get("id")))
+        step_name: StepName | None = StepName.parse(body.get("step_name")) if body.get("step_name") is not None else None
+        return ReprocessingJobMutationRequest(job_id=Identifier(body.get("id")), step_name=step_name)
 
     def execute(self, validated_input: ReprocessingJobMutationRequest) -> JobMutationResponse:
         job_id = validated_input["job_id"]
@@ -276,6 +324,7 @@ class ReprocessingJobMutation(PrivateControllerMixin, Mutation):
             job = repo.get(job_id)
         except RecordNotFoundError:
             raise JobNotFoundError("Job not found")
+        obsolete_ids: list[Identifier] = self.obsolete(job, validated_input.get("step_name"))
 
         # Delete associated art gallery (if any) so reprocess produces a fresh pipeline; re-publish if needed after completion.
         gallery_id = gallery_id_from_job_and_user(job_id, self.user.email)
@@ -287,17 +336,36 @@ class ReprocessingJobMutation(PrivateControllerMixin, Mutation):
             gallery_repo.delete(gallery_id)
             logger.info("ReprocessingJobMutation.execute() | deleted gallery_id=%s for job_id=%s", gallery_id, job_id)
 
-        # Delete all children (and their subtrees) before resetting the job.
+        # Delete all children (and their subtrees) before resetting the job; with step_name, only those from step_name onward.
         delete_mutation = JobDeleteMutation(user=self.user)
-        for child_id in job.children_ids:
+        for child_id in obsolete_ids:
             delete_mutation.kill(child_id, self.user.email)
 
         job.start()
         repo.save(job)
+        JobsPrivateIndex(user_email=self.user.email).refresh(job)
         queue.put(Message(action=Action.START, job_id=job.id, user_email=self.user.email))
         logger.info("ReprocessingJobMutation.execute() | reprocess job_id=%s user=%s", job.id, self.user.email)
         return job.serialize()
 
+    def obsolete(self, job: Job, step_name: StepName | None) -> list[Identifier]:
+        """
+        Children to delete before reprocessing job: all of them, or with step_name the child running step_name and
+        the ones after it. Raises JobStepNotReprocessableError if no child runs step_name or one before it did not succeed.
+        """
+        if step_name is None:
+            return list(job.children_ids)
+        repo = JobsRepository(user=self.user)
+        children: list[Job] = [repo.get(child_id) for child_id in job.children_ids]
+        names: list[StepName] = [child.step_name for child in children]
+        if step_name not in names:
+            raise JobStepNotReprocessableError(f"Cannot reprocess from {step_name.value}: job has no {step_name.value} step")
+        index: int = names.index(step_name)
+        for child in children[:index]:
+            if not child.is_finished():
+                raise JobStepNotReprocessableError(f"Cannot reprocess from {step_name.value}: {child.step_name.value} did not succeed")
+        return list(job.children_ids[index:])
+
 
 class JobUpdateMutation(PrivateControllerMixin, Mutation):
     """
@@ -337,6 +405,7 @@ class JobUpdateMutation(PrivateControllerMixin, Mutation):
             raise JobNotSuccessToUpdateError("Only success jobs can be updated")
         job.meta = {**job.meta, **meta}
         repo_job.save(job)
+        JobsPrivateIndex(user_email=self.user.email).refresh(job)
         if "title" in meta:
             gallery_repo = ArtGalleryRepository()
             gallery_id = gallery_id_from_job_and_user(job_id, self.user.email)
@@ -403,13 +472,14 @@ class ArtGalleryPublishMutation(PrivateControllerMixin, Mutation):
         if not gallery.visibility or len(gallery.visibility) == 0:
             raise GalleryHasNoVisibilityError("Gallery has no visibility; cannot publish")
 
-        # Save the gallery.
-        ArtGalleryRepository().save(gallery)
+        # Save the gallery, reading it back so the index never points at a copy that cannot be loaded.
+        ArtGalleryRepository().save(gallery, verify=True)
 
         # Index the gallery, so that it is listed in the home page.
         ArtGalleryPublicIndex().index(
             index_id=Identifier(Countdown.from_timestamp(gallery.created_at)),
             real_id=gallery.id,
+            summary=dict(gallery.summarize()),
         )
 
         return gallery.serialize()
@@ -452,9 +522,8 @@ class JobDeleteMutation(PrivateControllerMixin, Mutation):
             gallery_repo.delete(gallery_id)
             logger.info("JobDeleteMutation.kill() | deleted gallery_id=%s for job_id=%s", gallery_id, job_id)
 
-        # Remove the job index entry, so that it is not listed in the job list.
-        index = JobsPrivateIndex(user_email=user_email)
-        index.delete(Identifier(Countdown.from_timestamp(job.created_at)))
+        # Remove the job index entries (all jobs and its status), so that it is not listed in the job lists.
+        JobsPrivateIndex(user_email=user_email).forget(job)
 
         # Delete step state for this job if it exists (e.g. from a continuation). If none was persisted, ignore.
         state_repo = JobStateRepository(user=User(email=user_email))
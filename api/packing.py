@@ -0,0 +1,353 @@
+"""
+Compact binary encoding of JSON-like values (step state, job stdout).
+
+Title
+-----
+Packing Module
+
+Context
+-------
+Job state and stdout are JSON documents where every coordinate is a decimal
+string, the same points appear in many lists, and tables are keyed by
+77-digit str(hash(...)) strings. pack() encodes the same value tree as:
+
+    MAGIC (4 bytes: "\\x00GB" + version)
+    string table      varint count, then varint length + UTF-8 bytes each
+    vertex table      varint count, then two coordinates each (packed, or literal UTF-8)
+    root value        one tag byte per value (see the TAG_* constants)
+
+- Points (lists of two decimal strings) are stored once in the vertex table
+  and referenced by index; coordinates are packed as zigzag varint mantissa
+  and scale when that round-trips to the exact same string. Lists made only
+  of points (polygons, visibility bags) are one tag plus fixed-width indices.
+- Other strings are stored once in the string table; canonical integer
+  strings (hash keys, numeric ids) are stored as zigzag varints instead.
+- Integers are zigzag varints, floats are 8-byte IEEE doubles.
+
+unpack() returns the exact value tree pack() was given (lists stay lists,
+strings stay strings), so callers do not know which encoding was used.
+Bucket.load() detects the format from MAGIC; JSON never starts with a NUL byte.
+
+Examples:
+>>> content = pack({"guards": [["1.5", "2"]], "pruned": [3]})
+>>> is_packed(content)
+True
+>>> unpack(content)
+{'guards': [['1.5', '2']], 'pruned': [3]}
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+import struct
+from typing import Any
+
+from exceptions import ValidationError
+
+VERSION: int = 1
+MAGIC: bytes = b"\x00GB" + bytes([VERSION])
+
+TAG_NONE: int = 0
+TAG_FALSE: int = 1
+TAG_TRUE: int = 2
+TAG_INT: int = 3
+TAG_FLOAT: int = 4
+TAG_STRING: int = 5
+TAG_LIST: int = 6
+TAG_DICT: int = 7
+TAG_POINT: int = 8
+TAG_DIGITS: int = 9
+TAG_POINTS: int = 10
+
+# Coordinate kinds in the vertex table.
+PACKED: int = 0
+LITERAL: int = 1
+
+# Longest digit run packed as an integer; longer ones stay strings (int() refuses over 4300 digits by default).
+MAX_DIGITS: int = 1000
+# ASCII digits only: int() also reads other Unicode digits, which would not decode back to the same string.
+NUMBER: re.Pattern[str] = re.compile(rf"-?[0-9]{{1,{MAX_DIGITS}}}(?:\.[0-9]{{1,{MAX_DIGITS}}})?\Z")
+DIGITS: re.Pattern[str] = re.compile(rf"(?:0|-?[1-9][0-9]{{0,{MAX_DIGITS - 1}}})\Z")
+
+FLOAT: struct.Struct = struct.Struct("<d")
+
+# Fixed-width little-endian vertex indices of TAG_POINTS lists (struct codes, narrowest that fits the vertex table so far).
+INDEX_CODES: tuple[str, str, str] = ("B", "H", "I")
+
+
+def is_packed(content: bytes | mmap.mmap) -> bool:
+    """True if content starts with the packing magic (any version)."""
+    return content[:3] == MAGIC[:3]
+
+
+def pack(data: Any) -> bytes:
+    """Encode a JSON-like value (dict, list, str, int, float, bool, None)."""
+    return Packer().pack(data)
+
+
+def unpack(content: bytes | mmap.mmap) -> Any:
+    """
+    Decode content produced by pack(), read in place (a LocalStorage mmap is not copied into bytes first).
+    Raises ValidationError on unknown versions or corrupt content.
+    """
+    return Unpacker(content).unpack()
+
+
+def zigzag(value: int) -> int:
+    """Map signed to unsigned integers so small magnitudes stay small varints."""
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def scaled(text: str) -> tuple[int, int] | None:
+    """(mantissa, scale) with text == the decimal mantissa / 10**scale written back, or None if it would not round-trip."""
+    integer, _, fraction = text.partition(".")
+    mantissa: int = int(integer + fraction)
+    scale: int = len(fraction)
+    return (mantissa, scale) if unscaled(mantissa, scale) == text else None
+
+
+def unscaled(mantissa: int, scale: int) -> str:
+    """Decimal string of mantissa / 10**scale with exactly scale fraction digits."""
+    digits: str = str(abs(mantissa))
+    if scale:
+        digits = digits.rjust(scale + 1, "0")
+        digits = f"{digits[:-scale]}.{digits[-scale:]}"
+    return f"-{digits}" if mantissa < 0 else digits
+
+
+class Packer:
+    """
+    Single-use encoder: the value tree is written to body while the string and vertex tables fill up,
+    then the tables are written in front of it.
+
+    For example:
+    >>> Packer().pack([["0", "0"], ["0", "0"]])
+    b'\\x00GB\\x01...'
+    """
+
+    def __init__(self) -> None:
+        self.body: bytearray = bytearray()
+        self.strings: dict[str, int] = {}
+        self.vertices: dict[tuple[str, str], int] = {}
+
+    def pack(self, data: Any) -> bytes:
+        self.value(data)
+        head: bytearray = bytearray(MAGIC)
+        self.varint(len(self.strings), head)
+        for text in self.strings:
+            self.literal(text, head)
+        self.varint(len(self.vertices), head)
+        for vertex in self.vertices:
+            for coordinate in vertex:
+                packed: tuple[int, int] | None = scaled(coordinate)
+                if packed is None:
+                    head.append(LITERAL)
+                    self.literal(coordinate, head)
+                else:
+                    head.append(PACKED)
+                    self.varint(zigzag(packed[0]), head)
+                    self.varint(packed[1], head)
+        return bytes(head + self.body)
+
+    def value(self, data: Any) -> None:
+        body: bytearray = self.body
+        if data is None:
+            body.append(TAG_NONE)
+        elif data is True:
+            body.append(TAG_TRUE)
+        elif data is False:
+            body.append(TAG_FALSE)
+        elif isinstance(data, int):
+            body.append(TAG_INT)
+            self.varint(zigzag(data), body)
+        elif isinstance(data, float):
+            body.append(TAG_FLOAT)
+            body += FLOAT.pack(data)
+        elif isinstance(data, str):
+            self.text(data)
+        elif isinstance(data, (list, tuple)):
+            index: int | None = self.vertex(data)
+            if index is not None:
+                body.append(TAG_POINT)
+                self.varint(index, body)
+                return
+            indices: list[int] = []
+            for item in data:
+                index = self.vertex(item) if isinstance(item, (list, tuple)) else None
+                if index is None:
+                    break
+                indices.append(index)
+            if data and len(indices) == len(data):
+                code: str = INDEX_CODES[0] if len(self.vertices) <= 0x100 else INDEX_CODES[1] if len(self.vertices) <= 0x10000 else INDEX_CODES[2]
+                body.append(TAG_POINTS)
+                self.varint(len(indices), body)
+                body += code.encode("ascii")
+                body += struct.pack(f"<{len(indices)}{code}", *indices)
+                return
+            body.append(TAG_LIST)
+            self.varint(len(data), body)
+            for item in data:
+                self.value(item)
+        elif isinstance(data, dict):
+            body.append(TAG_DICT)
+            self.varint(len(data), body)
+            for key, item in data.items():
+                if not isinstance(key, str):
+                    raise ValidationError(f"Keys must be strings, got {type(key).__name__}")
+                self.text(key)
+                self.value(item)
+        else:
+            raise ValidationError(f"Cannot pack {type(data).__name__}")
+
+    def vertex(self, data: list[Any] | tuple[Any, ...]) -> int | None:
+        """Index of data in the vertex table (added on first sight), or None if data is not a point."""
+        if len(data) != 2:
+            return None
+        x: Any = data[0]
+        y: Any = data[1]
+        if not isinstance(x, str) or not isinstance(y, str):
+            return None
+        vertex: tuple[str, str] = (x, y)
+        index: int | None = self.vertices.get(vertex)
+        if index is None:
+            if not (NUMBER.match(x) and NUMBER.match(y)):
+                return None
+            index = self.vertices[vertex] = len(self.vertices)
+        return index
+
+    def text(self, data: str) -> None:
+        body: bytearray = self.body
+        if DIGITS.match(data):
+            body.append(TAG_DIGITS)
+            self.varint(zigzag(int(data)), body)
+            return
+        body.append(TAG_STRING)
+        self.varint(self.string(data), body)
+
+    def string(self, data: str) -> int:
+        index: int | None = self.strings.get(data)
+        if index is None:
+            index = self.strings[data] = len(self.strings)
+        return index
+
+    @classmethod
+    def literal(cls, text: str, out: bytearray) -> None:
+        raw: bytes = text.encode("utf-8")
+        cls.varint(len(raw), out)
+        out += raw
+
+    @staticmethod
+    def varint(value: int, out: bytearray) -> None:
+        while value > 0x7F:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+
+class Unpacker:
+    """
+    Single-use decoder of one packed object.
+
+    For example:
+    >>> Unpacker(content).unpack()
+    {...}
+    """
+
+    def __init__(self, content: bytes | mmap.mmap) -> None:
+        self.content: bytes | mmap.mmap = content
+        self.position: int = 0
+        self.strings: list[str] = []
+        self.vertices: list[tuple[str, str]] = []
+
+    def unpack(self) -> Any:
+        if not is_packed(self.content):
+            raise ValidationError("Content is not packed")
+        if self.content[3] != VERSION:
+            raise ValidationError(f"Unsupported packing version {self.content[3]}")
+        self.position = len(MAGIC)
+        try:
+            for _ in range(self.varint()):
+                self.strings.append(self.literal())
+            for _ in range(self.varint()):
+                self.vertices.append((self.coordinate(), self.coordinate()))
+            return self.value()
+        except (IndexError, UnicodeDecodeError, struct.error) as e:
+            raise ValidationError(f"Corrupt packed content: {str(e)}") from e
+
+    def coordinate(self) -> str:
+        kind: int = self.content[self.position]
+        self.position += 1
+        if kind == LITERAL:
+            return self.literal()
+        mantissa: int = unzigzag(self.varint())
+        return unscaled(mantissa, self.varint())
+
+    def literal(self) -> str:
+        length: int = self.varint()
+        text: str = self.content[self.position : self.position + length].decode("utf-8")
+        self.position += length
+        return text
+
+    def value(self) -> Any:
+        content: bytes | mmap.mmap = self.content
+        tag: int = content[self.position]
+        self.position += 1
+        if tag == TAG_POINT:
+            return list(self.vertices[self.varint()])
+        if tag == TAG_POINTS:
+            count: int = self.varint()
+            code: str = chr(content[self.position])
+            if code not in INDEX_CODES:
+                raise ValidationError(f"Corrupt packed content: unknown index width {code!r}")
+            indices: tuple[int, ...] = struct.unpack_from(f"<{count}{code}", content, self.position + 1)
+            self.position += 1 + count * struct.calcsize(code)
+            vertices: list[tuple[str, str]] = self.vertices
+            return [list(vertices[index]) for index in indices]
+        if tag == TAG_STRING:
+            return self.strings[self.varint()]
+        if tag == TAG_DIGITS:
+            return str(unzigzag(self.varint()))
+        if tag == TAG_LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == TAG_DICT:
+            result: dict[str, Any] = {}
+            for _ in range(self.varint()):
+                key: Any = self.value()
+                result[key] = self.value()
+            return result
+        if tag == TAG_INT:
+            return unzigzag(self.varint())
+        if tag == TAG_FLOAT:
+            (number,) = FLOAT.unpack_from(content, self.position)
+            self.position += FLOAT.size
+            return number
+        if tag == TAG_NONE:
+            return None
+        if tag == TAG_TRUE:
+            return True
+        if tag == TAG_FALSE:
+            return False
+        raise ValidationError(f"Corrupt packed content: unknown tag {tag}")
+
+    def varint(self) -> int:
+        content: bytes | mmap.mmap = self.content
+        position: int = self.position
+        byte: int = content[position]
+        if byte < 0x80:
+            self.position = position + 1
+            return byte
+        value: int = 0
+        shift: int = 0
+        while True:
+            byte: int = content[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.position = position
+                return value
+            shift += 7
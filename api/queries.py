@@ -9,7 +9,8 @@ Context
 -------
 This module exports read-side handlers: ArtGalleryListQuery, ArtGalleryDetailsQuery,
 JobListQuery, JobDetailsQuery. List queries use indexes (ArtGalleryPublicIndex,
-JobsPrivateIndex) and return data + next_token. Details queries use
+JobsPrivateIndex) and return data + next_token, where data are the summaries
+held by the index entries (Index.summaries()), not the full records. Details queries use
 repositories and require id (from path). Job queries use PrivateControllerMixin
 with ListQuery/DetailsQuery (user must be authenticated); gallery list/details
 are public. Registered in api.api (ROUTES). All return dicts that the interceptor
@@ -25,6 +26,7 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from typing import Any
+from typing import NotRequired
 
 from attributes import Identifier
 from attributes import Limit
@@ -33,8 +35,12 @@ from controllers import Controller
 from controllers import ControllerRequest
 from controllers import ControllerResponse
 from controllers import PrivateControllerMixin
+from enums import Status
 from indexes import ArtGalleryPublicIndex
+from indexes import Index
 from indexes import JobsPrivateIndex
+from indexes import JobsStatusIndex
+from models import Job
 from repositories import ArtGalleryRepository
 from repositories import JobsRepository
 from serializers import Serialized
@@ -54,6 +60,12 @@ class ListQueryRequest(QueryRequest):
     limit: Limit
 
 
+class JobListQueryRequest(ListQueryRequest):
+    """Request for JobListQuery: next_token, limit and an optional status filter."""
+
+    status: NotRequired[Status]
+
+
 class DetailsQueryRequest(QueryRequest):
     """Request for details-by-id queries."""
 
@@ -136,7 +148,8 @@ class DetailsQuery(Query):
 
 class ArtGalleryListQuery(ListQuery):
     """
-    List galleries using the public index. Public query; no user check.
+    List galleries using the public index. Public query; no user check. Each item is the gallery's index summary
+    (ArtGallery.summarize()): scalars, counts, box and a thumbnail of the geometry.
 
     For example, to list galleries with pagination:
     >>> query = ArtGalleryListQuery()
@@ -147,12 +160,12 @@ class ArtGalleryListQuery(ListQuery):
 
     def query(self, validated_input: ListQueryRequest) -> ListQueryResponse:
         index = ArtGalleryPublicIndex()
-        records, next_token = index.search(
+        summaries, next_token = index.summaries(
             next_token=validated_input.get("next_token"),
             limit=validated_input["limit"],
         )
         return {
-            "data": [record.serialize() for record in records],
+            "data": summaries,
             "next_token": str(next_token) if next_token else "",
         }
 
@@ -176,21 +189,36 @@ class ArtGalleryDetailsQuery(DetailsQuery):
 
 class JobListQuery(PrivateControllerMixin, ListQuery):
     """
-    List jobs for the current user using the private index.
+    List jobs for the current user using the private index. Each item is the job's index summary (Job.summarize()).
+    With status, only the jobs of that status are listed, from their JobsStatusIndex.
 
     For example, to list the authenticated user's jobs:
     >>> query = JobListQuery(user=request.user)
     >>> result = query.handler({"limit": 20})
+
+    For example, to list the failed ones:
+    >>> result = query.handler({"limit": 20, "status": "failed"})
+    >>> {job["status"] for job in result["data"]}
+    {'failed'}
     """
 
-    def query(self, validated_input: ListQueryRequest) -> ListQueryResponse:
-        index = JobsPrivateIndex(user_email=self.user.email)
-        records, next_token = index.search(
+    def validate(self, body: dict[str, Any]) -> JobListQueryRequest:
+        request: JobListQueryRequest = {**super().validate(body)}
+        if body.get("status") is not None:
+            request["status"] = Status.parse(body.get("status"))
+        return request
+
+    def query(self, validated_input: JobListQueryRequest) -> ListQueryResponse:
+        status: Status | None = validated_input.get("status")
+        index: Index[Job] = (
+            JobsPrivateIndex(user_email=self.user.email) if status is None else JobsStatusIndex(user_email=self.user.email, status=status)
+        )
+        summaries, next_token = index.summaries(
             next_token=validated_input.get("next_token"),
             limit=validated_input["limit"],
         )
         return {
-            "data": [record.serialize() for record in records],
+            "data": summaries,
             "next_token": str(next_token) if next_token else "",
         }
 
@@ -10,7 +10,9 @@ Context
 This module provides S3-backed persistence for ArtGallery and Job.
 Repository is the base; PrivateRepository scopes path by user (data/{email.slug}/{NAME}).
 ArtGalleryRepository is public (data/galleries). JobsRepository is
-PrivateRepository (data/{email.slug}/jobs). Results holds paginated
+PrivateRepository (data/{email.slug}/jobs). JobStateRepository keeps step
+checkpoints as a snapshot plus append-only deltas. StepResultRepository is
+the shared step result cache (data/cache/steps). Results holds paginated
 search results (records, next_token). Used by mutations, queries,
 indexes (to load full record by real_id), and worker tasks.
 
@@ -27,23 +29,31 @@ Examples:
 
 from __future__ import annotations
 
+import uuid
 from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
 from dataclasses import field
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
 from typing import Any
+from typing import Callable
 from typing import ClassVar
 from typing import Generic
 from typing import Iterator
 from typing import TypeVar
 from typing import cast
 
+from attributes import Attempt
 from attributes import Identifier
 from attributes import Limit
 from attributes import Offset
 from attributes import Timestamp
 from data import Bucket
 from data import Page
+from data import many
+from enums import Encoding
 from exceptions import ConfigurationError
 from exceptions import CorruptionError
 from exceptions import RecordNotFoundError
@@ -54,8 +64,14 @@ from models import ArtGallery
 from models import Job
 from models import JobState
 from models import Model
+from models import StepResult
 from models import User
+from serializers import JobStateDeltaDict
 from settings import DEFAULT_LIMIT
+from settings import JOB_STATE_MAX_DELTAS
+from settings import MAX_LIMIT
+from settings import STEP_CACHE_MAX_AGE_SECONDS
+from settings import STEP_CACHE_MAX_BYTES
 
 bucket: Bucket = Bucket()
 logger = get_logger(__name__)
@@ -90,6 +106,61 @@ class Results(Generic[T]):
         }
 
 
+@dataclass
+class UnitOfWork:
+    """
+    Identity map and write buffer of the repositories with SHARED set (jobs and job states) while active, for
+    one worker message (workers.handler enters it with "with unit:"; nested blocks join the outer one). get() of
+    a record already read or saved returns the same instance without reading the bucket. Writes are kept in
+    pending, in order, a later write of a key replacing the earlier one, and run by flush() when the outermost
+    block exits; records are serialized when flushed. Tasks flush before queueing a message (Task.enqueue()),
+    so the task it starts reads what was saved.
+
+    For example, to load the same job twice with one read:
+    >>> with unit:
+    ...     job = JobsRepository(user=user).get(job_id)
+    ...     JobsRepository(user=user).get(job_id) is job
+    True
+    """
+
+    records: dict[str, Model] = field(default_factory=dict)
+    pending: dict[str, Callable[[], None]] = field(default_factory=dict)
+    depth: int = 0
+
+    def __enter__(self) -> UnitOfWork:
+        self.depth += 1
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.depth -= 1
+        if self.depth > 0:
+            return
+        try:
+            self.flush()
+        finally:
+            self.records.clear()
+            self.pending.clear()
+
+    @property
+    def active(self) -> bool:
+        """True inside a with block."""
+        return self.depth > 0
+
+    def defer(self, key: str, write: Callable[[], None]) -> None:
+        """Run write at the next flush(), after the writes deferred before it, in place of a pending write of key."""
+        self.pending.pop(key, None)
+        self.pending[key] = write
+
+    def flush(self) -> None:
+        """Run the pending writes in order."""
+        while self.pending:
+            key: str = next(iter(self.pending))
+            self.pending.pop(key)()
+
+
+unit: UnitOfWork = UnitOfWork()
+
+
 @dataclass
 class Repository(Generic[T], ABC):
     """
@@ -102,6 +173,12 @@ class Repository(Generic[T], ABC):
     """
 
     MODEL: ClassVar[type[Model]]
+    # Storage format of saved records; loads detect the format, so it can change without migrating.
+    ENCODING: ClassVar[Encoding] = Encoding.JSON
+    # Whether save() reads the record back by default; callers that need the stored copy pass verify=True.
+    VERIFY: ClassVar[bool] = False
+    # Whether get() and save() go through the unit of work (unit) while it is active.
+    SHARED: ClassVar[bool] = False
 
     @property
     @abstractmethod
@@ -120,6 +197,32 @@ class Repository(Generic[T], ABC):
         if not self.MODEL:
             raise ConfigurationError("MODEL is not set")
         key: str = f"{self.path}/{identifier}.json"
+        if self.shared and key in unit.records:
+            return cast(T, unit.records[key])
+        record: T = self.read(identifier)
+        self.track(record)
+        return record
+
+    def get_many(self, identifiers: list[Identifier]) -> list[T | None]:
+        """
+        get() every identifier concurrently (data.many()), in order; None for the records that are not found.
+
+        For example, to load the records of an index page:
+        >>> repo.get_many([Identifier("g1"), Identifier("missing")])
+        [ArtGallery(...), None]
+        """
+
+        def get(identifier: Identifier) -> T | None:
+            try:
+                return self.get(identifier)
+            except RecordNotFoundError:
+                return None
+
+        return many(get, identifiers)
+
+    def read(self, identifier: Identifier) -> T:
+        """Load a record from the bucket, bypassing the unit of work. Raises RecordNotFoundError if not found."""
+        key: str = f"{self.path}/{identifier}.json"
         data: Any = bucket.load(key)
         if data is None:
             logger.debug("Repository.get() | record not found path=%s id=%s", self.path, identifier)
@@ -128,13 +231,17 @@ class Repository(Generic[T], ABC):
             raise CorruptionError("ID mismatch in record")
         return cast(T, self.MODEL.unserialize(data))
 
-    def save(self, record: T) -> T:
+    def save(self, record: T, verify: bool | None = None) -> T:
         """
-        Persist a record and return the loaded instance.
+        Persist a record and return it (written when the unit of work flushes, if shared). With verify (VERIFY
+        by default) the record is written now and read back and the loaded instance is returned, which checks
+        what was stored at the cost of a second read.
 
         For example, to save a new job:
         >>> job = Job(id=Identifier("j1"), stdin={"boundary": [...]})
         >>> saved = repo.save(job)
+        >>> saved is job
+        True
         """
         if not self.MODEL:
             raise ConfigurationError("MODEL is not set")
@@ -142,9 +249,41 @@ class Repository(Generic[T], ABC):
             raise ValidationError(f"Object must be a {self.MODEL.__name__}")
         record.updated_at = Timestamp.now()
         key: str = f"{self.path}/{record.id}.json"
-        bucket.save(key, record.serialize())
+        if self.VERIFY if verify is None else verify:
+            unit.pending.pop(key, None)
+            self.write(key, record)
+            record = self.read(record.id)
+            self.track(record)
+            return record
+        self.track(record)
+        self.defer(key, lambda: self.write(key, record))
+        return record
+
+    def write(self, key: str, record: T) -> None:
+        """Write record to the bucket under key."""
+        bucket.save(key, self.encode(record), encoding=self.ENCODING)
         logger.debug("Repository.save() | path=%s id=%s", self.path, record.id)
-        return self.get(record.id)
+
+    @property
+    def shared(self) -> bool:
+        """True if this repository goes through the unit of work now (SHARED and unit active)."""
+        return self.SHARED and unit.active
+
+    def track(self, record: T) -> None:
+        """Put record in the identity map of the unit of work, if shared."""
+        if self.shared:
+            unit.records[f"{self.path}/{record.id}.json"] = record
+
+    def defer(self, key: str, write: Callable[[], None]) -> None:
+        """Run write now, or at the next flush of the unit of work if shared (see UnitOfWork.defer())."""
+        if self.shared:
+            unit.defer(key, write)
+            return
+        write()
+
+    def encode(self, record: T) -> Any:
+        """Stored form of record; get() must be able to unserialize it. Defaults to record.serialize()."""
+        return record.serialize()
 
     def delete(self, identifier: Identifier) -> None:
         """
@@ -153,7 +292,10 @@ class Repository(Generic[T], ABC):
         For example, to remove a gallery:
         >>> repo.delete(Identifier("gallery-123"))
         """
-        bucket.delete(f"{self.path}/{identifier}.json")
+        key: str = f"{self.path}/{identifier}.json"
+        unit.records.pop(key, None)
+        unit.pending.pop(key, None)
+        bucket.delete(key)
         logger.debug("Repository.delete() | path=%s id=%s", self.path, identifier)
 
     def exists(self, identifier: Identifier) -> bool:
@@ -164,7 +306,10 @@ class Repository(Generic[T], ABC):
         >>> if repo.exists(Identifier("g1")):
         ...     gallery = repo.get(Identifier("g1"))
         """
-        return bucket.exists(f"{self.path}/{identifier}.json")
+        key: str = f"{self.path}/{identifier}.json"
+        if self.shared and key in unit.records:
+            return True
+        return bucket.exists(key)
 
     def search(
         self,
@@ -189,8 +334,7 @@ class Repository(Generic[T], ABC):
             limit=limit,
             next_token=next_token,
         )
-        for key in page:
-            data: Any = bucket.load(key)
+        for data in bucket.load_many(page.keys):
             if data is None:
                 continue
             results.records.append(cast(T, self.MODEL.unserialize(data)))
@@ -247,6 +391,10 @@ class ArtGalleryRepository(Repository[ArtGallery]):
     def path(self) -> str:
         return "data/galleries"
 
+    def encode(self, record: ArtGallery) -> Any:
+        """Galleries are stored in the indexed wire format (see ArtGallery.serialize_indexed)."""
+        return record.serialize_indexed()
+
 
 @dataclass
 class JobsRepository(PrivateRepository[Job]):
@@ -261,6 +409,8 @@ class JobsRepository(PrivateRepository[Job]):
 
     NAME: ClassVar[str] = "jobs"
     MODEL: ClassVar[type[Model]] = Job
+    ENCODING: ClassVar[Encoding] = Encoding.BINARY
+    SHARED: ClassVar[bool] = True
 
 
 @dataclass
@@ -277,3 +427,156 @@ class JobStateRepository(PrivateRepository[JobState]):
 
     NAME: ClassVar[str] = "states"
     MODEL: ClassVar[type[Model]] = JobState
+    ENCODING: ClassVar[Encoding] = Encoding.BINARY
+    SHARED: ClassVar[bool] = True
+
+    @property
+    def deltas_path(self) -> str:
+        """
+        S3 prefix of the delta records: data/{email.slug}/deltas/{id}/{generation}/{sequence}.json.
+        Kept outside path so search() only lists snapshots.
+        """
+        return f"{self.path.rsplit('/', 1)[0]}/deltas"
+
+    def read(self, identifier: Identifier) -> JobState:
+        """
+        Load the snapshot and replay its deltas in sequence order; state.deltas is how many were replayed
+        and state.attempt is the attempt of the last one. Raises RecordNotFoundError if there is no snapshot.
+
+        For example, to resume a job:
+        >>> state = repo.get(job.id)
+        >>> state.deltas
+        3
+        """
+        state: JobState = super().read(identifier)
+        prefix: str = f"{self.deltas_path}/{identifier}/{state.generation}/"
+        # Most resumes find no chain or a short one: one GET answers the empty case. Otherwise the chain is listed
+        # once and the records after the first are fetched in one concurrent batch, up to the first gap.
+        record: JobStateDeltaDict | None = bucket.load(f"{prefix}{state.deltas + 1}.json")
+        if record is None:
+            return state
+        sequences: set[int] = set()
+        next_token: Offset | None = None
+        while True:
+            page: Page = bucket.search(prefix, limit=Limit(MAX_LIMIT), next_token=next_token)
+            sequences.update(int(key[len(prefix) :].removesuffix(".json")) for key in page)
+            if not page.continues:
+                break
+            next_token = page.next_token
+        last: int = state.deltas + 1
+        while last + 1 in sequences:
+            last += 1
+        keys: list[str] = [f"{prefix}{sequence}.json" for sequence in range(state.deltas + 2, last + 1)]
+        records: list[JobStateDeltaDict | None] = [record] + bucket.load_many(keys)
+        for record in records:
+            if record is None:
+                break
+            state.replay(record["operations"])
+            state.attempt = Attempt(record["attempt"])
+            state.deltas += 1
+        return state
+
+    def checkpoint(self, state: JobState, previous: JobState | None) -> JobState:
+        """
+        Persist state as the next checkpoint after previous (the state as last loaded or checkpointed) and return
+        what is now stored. Writes only a delta record with the edits since previous; writes a new snapshot
+        (new generation) when there is no previous or its delta chain reached JOB_STATE_MAX_DELTAS, and then
+        drops the old chain. Nothing is written when neither data nor attempt changed.
+
+        For example, on every suspension:
+        >>> self.snapshot = repo.checkpoint(JobState(id=job.id, data=state, attempt=attempt), self.snapshot)
+        """
+        if previous is None or previous.id != state.id or previous.deltas >= JOB_STATE_MAX_DELTAS:
+            state.generation = uuid.uuid4().hex[:12]
+            state.deltas = 0
+            self.save(state)
+            if previous is not None:
+                self.defer(f"{self.deltas_path}/{previous.id}/{previous.generation}/", lambda: self.prune(previous.id, previous.generation))
+            return state
+        operations: list[Any] = state.delta(previous.data)
+        if not operations and state.attempt == previous.attempt:
+            return previous
+        sequence: int = previous.deltas + 1
+        record: JobStateDeltaDict = {
+            "id": str(state.id),
+            "generation": previous.generation,
+            "sequence": sequence,
+            "attempt": int(state.attempt),
+            "operations": operations,
+        }
+        key: str = f"{self.deltas_path}/{state.id}/{previous.generation}/{sequence}.json"
+        self.defer(key, lambda: bucket.save(key, record, encoding=self.ENCODING))
+        logger.debug("JobStateRepository.checkpoint() | id=%s generation=%s sequence=%s", state.id, previous.generation, sequence)
+        state.generation = previous.generation
+        state.deltas = sequence
+        state.created_at = previous.created_at
+        self.track(state)
+        return state
+
+    def prune(self, identifier: Identifier, generation: str | None = None) -> None:
+        """Delete the delta records of identifier (only those of generation, when given)."""
+        prefix: str = f"{self.deltas_path}/{identifier}/" + (f"{generation}/" if generation is not None else "")
+        next_token: Offset | None = None
+        while True:
+            page: Page = bucket.search(prefix, next_token=next_token)
+            for key in page:
+                bucket.delete(key)
+            if not page.continues:
+                return
+            next_token = page.next_token
+
+    def delete(self, identifier: Identifier) -> None:
+        """Delete the snapshot and all its delta records."""
+        super().delete(identifier)
+        self.prune(identifier)
+
+
+@dataclass
+class StepResultRepository(Repository[StepResult]):
+    """
+    Shared cache of step outputs keyed by Step.fingerprint(). Path: data/cache/steps.
+    Not scoped by user: equal inputs give equal outputs whoever submitted them.
+
+    For example, to look up a step output before running the step:
+    >>> repo = StepResultRepository()
+    >>> result = repo.get(Identifier(StitchingStep.fingerprint(job)))
+    """
+
+    MODEL: ClassVar[type[Model]] = StepResult
+    ENCODING: ClassVar[Encoding] = Encoding.BINARY
+
+    @property
+    def path(self) -> str:
+        return "data/cache/steps"
+
+    def evict(self, max_age_seconds: int = STEP_CACHE_MAX_AGE_SECONDS, max_bytes: int = STEP_CACHE_MAX_BYTES) -> int:
+        """
+        Delete entries last written more than max_age_seconds ago, then the oldest remaining ones until
+        the cache holds at most max_bytes. Uses the sizes and times listed by the bucket (no record is loaded).
+        Returns the number of entries deleted.
+
+        For example, after a pipeline finishes:
+        >>> StepResultRepository().evict()
+        3
+        """
+        entries: list[tuple[Timestamp, int, str]] = []
+        next_token: Offset | None = None
+        while True:
+            page: Page = bucket.search(f"{self.path}/", limit=Limit(MAX_LIMIT), next_token=next_token)
+            for key in page:
+                entries.append((page.modified.get(key) or Timestamp.now(), page.sizes.get(key, 0), key))
+            if not page.continues:
+                break
+            next_token = page.next_token
+        entries.sort()
+        cutoff: Timestamp = Timestamp(datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds))
+        total: int = sum(size for _, size, _ in entries)
+        deleted: int = 0
+        for modified, size, key in entries:
+            if modified >= cutoff and total <= max_bytes:
+                break
+            bucket.delete(key)
+            total -= size
+            deleted += 1
+        logger.debug("StepResultRepository.evict() | deleted=%s remaining_bytes=%s", deleted, total)
+        return deleted
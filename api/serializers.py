@@ -9,7 +9,8 @@ Context
 -------
 TypedDicts that describe the JSON-serialized form of domain models.
 Serialized is the parent type used as Serializable[T] in models; ModelDict
-is the base shape; UserDict, JobDict, ArtGalleryDict extend it.
+is the base shape; UserDict, JobDict, ArtGalleryDict extend it. SummaryDict and
+its subclasses are the small projections stored in index entries.
 """
 
 from __future__ import annotations
@@ -51,7 +52,9 @@ class JobDict(ModelDict):
     stdout: dict[str, Any]
     meta: dict[str, Any]
     stderr: dict[str, Any]
+    context: dict[str, str]
     duration: int
+    filed_status: str | None
 
 
 class JobStateDict(ModelDict):
@@ -59,6 +62,24 @@ class JobStateDict(ModelDict):
 
     data: dict[str, Any]
     attempt: int
+    generation: str
+
+
+class StepResultDict(ModelDict):
+    """Serialized form of StepResult (serialize/unserialize)."""
+
+    step_name: str
+    stdout: dict[str, Any]
+
+
+class JobStateDeltaDict(TypedDict):
+    """One checkpoint on top of a JobState snapshot: edit operations on data, and the attempt after them."""
+
+    id: str
+    generation: str
+    sequence: int
+    attempt: int
+    operations: list[Any]
 
 
 class ArtGalleryDict(ModelDict):
@@ -78,3 +99,73 @@ class ArtGalleryDict(ModelDict):
     stitches: list[Any]
     duration: int
     coverage: list[Any]
+
+
+class IndexedArtGalleryDict(ModelDict):
+    """Serialized form of ArtGallery.serialize_indexed(): geometry as positions into "vertices"."""
+
+    version: int
+    owner_job_id: str
+    title: str
+    duration: int
+    boundary: list[int]
+    obstacles: list[list[int]]
+    ears: list[list[int]]
+    convex_components: list[list[int]]
+    adjacency: list[list[int]]
+    guards: list[int]
+    visibility: list[list[int]]
+    exclusivity: list[list[int]]
+    stitched: list[int]
+    stitches: list[list[int]]
+    coverage: list[int]
+    vertices: list[Any]
+
+
+class SummaryDict(ModelDict):
+    """
+    Shared fields of the index summaries (Indexed.summary): counts and bounding box of a gallery, and its thumbnail
+    (boundary, obstacles and guards simplified to a bounded number of points for a list cell).
+    """
+
+    version: int
+    vertex_count: int
+    obstacle_count: int
+    guard_count: int
+    stitched_count: int
+    box: dict[str, Any] | None
+    thumbnail: dict[str, Any]
+
+
+class ArtGallerySummaryDict(SummaryDict):
+    """Serialized form of ArtGallery.summarize(): the scalar ArtGalleryDict fields the gallery list shows."""
+
+    owner_job_id: str
+    title: str
+    duration: int
+
+
+class JobSummaryDict(SummaryDict):
+    """Serialized form of Job.summarize(): the scalar JobDict fields the job list shows, with the title from meta."""
+
+    parent_id: str | None
+    status: str
+    step_name: str
+    title: str | None
+    duration: int
+    boundary: list[Any]
+    obstacles: dict[str, Any]
+    guards: dict[str, Any]
+    stitched: list[Any]
+
+
+class JobSummaryDict(SummaryDict):
+    """Serialized form of Job.summarize(): the JobDict fields the job list shows, stdin/stdout cut to the drawn geometry."""
+
+    parent_id: str | None
+    status: str
+    step_name: str
+    stdin: dict[str, Any]
+    stdout: dict[str, Any]
+    meta: dict[str, Any]
+    duration: int
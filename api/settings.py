@@ -43,6 +43,24 @@ X_AUTH_HEADER: str = "X-Auth"
 DEFAULT_LIMIT: int = int(os.getenv("DEFAULT_LIMIT", "20"))
 MAX_LIMIT: int = int(os.getenv("MAX_LIMIT", "1000"))
 
+# Bucket.load_many(): threads loading keys at once (listing pages, index entries and their records).
+# The S3 client keeps as many connections open; 1 loads one key at a time.
+BUCKET_MAX_WORKERS: int = int(os.getenv("BUCKET_MAX_WORKERS", "16"))
+
+# Bucket.save(): bodies of at least this many bytes are stored gzip-compressed (ContentEncoding "gzip") at this level.
+# Bucket.load() detects compressed objects from their content, so changing these never breaks reads.
+BUCKET_COMPRESSION_THRESHOLD: int = int(os.getenv("BUCKET_COMPRESSION_THRESHOLD", "1024"))
+BUCKET_COMPRESSION_LEVEL: int = int(os.getenv("BUCKET_COMPRESSION_LEVEL", "6"))
+
+# Storage backend of Bucket and Secret (storage.py): "s3", or "local" for one directory per bucket under BUCKET_ROOT.
+# Local objects of at least BUCKET_MMAP_THRESHOLD bytes are read through mmap.
+BUCKET_BACKEND: str = os.getenv("BUCKET_BACKEND", "s3")
+BUCKET_ROOT: str = os.getenv("BUCKET_ROOT") or os.path.join(os.getcwd(), ".buckets")
+BUCKET_MMAP_THRESHOLD: int = int(os.getenv("BUCKET_MMAP_THRESHOLD", "65536"))
+
+# JSON codec of the bucket, queue messages and API bodies (codec.py): "orjson", "json" (standard library) or "auto" (orjson if installed).
+JSON_CODEC: str = os.getenv("JSON_CODEC", "auto")
+
 # Title length (User name, gallery title, etc.)
 DEFAULT_TITLE_MAX_LENGTH: int = int(os.getenv("DEFAULT_TITLE_MAX_LENGTH", "200"))
 
@@ -64,12 +82,55 @@ STITCH_BUCKET_SIZE: int = int(os.getenv("STITCH_BUCKET_SIZE", "5"))
 # Task continuation: max number of times a step may re-queue (START same job_id) before failing.
 MAX_TASK_CONTINUATION_STEPS: int = int(os.getenv("MAX_TASK_CONTINUATION_STEPS", "50"))
 
+# Step checkpoints: JobState is a base snapshot plus append-only delta records (one per checkpoint);
+# the next checkpoint after this many deltas writes a fresh snapshot instead (compaction).
+JOB_STATE_MAX_DELTAS: int = int(os.getenv("JOB_STATE_MAX_DELTAS", "8"))
+
 # Max units of work of each run.
 STITCHING_MAX_WORK: int = int(os.getenv("STITCHING_MAX_WORK", "50"))
 EAR_CLIPPING_MAX_WORK: int = int(os.getenv("EAR_CLIPPING_MAX_WORK", "100"))
 CONVEX_COMPONENT_OPTIMIZATION_MAX_WORK: int = int(os.getenv("CONVEX_COMPONENT_OPTIMIZATION_MAX_WORK", "200"))
 GUARD_PLACEMENT_MAX_WORK: int = int(os.getenv("GUARD_PLACEMENT_MAX_WORK", "5000"))
 
+# Deadline-driven suspension (worker Lambda): when the invocation deadline is known, steps ignore the
+# max work counts above and suspend once the next DEADLINE_CHECK_INTERVAL units of work, at the pace
+# measured so far, would eat into the last SUSPEND_SAFETY_MARGIN_MS (kept to save state and requeue).
+SUSPEND_SAFETY_MARGIN_MS: int = int(os.getenv("SUSPEND_SAFETY_MARGIN_MS", "10000"))
+DEADLINE_CHECK_INTERVAL: int = int(os.getenv("DEADLINE_CHECK_INTERVAL", "32"))
+
+# Cost model (costs.py): fitted coefficients file, and the wall time of one worker invocation
+# (the worker Lambda timeout) used to turn predicted runtimes into work budgets and continuation counts.
+COST_MODEL_PATH: str = os.getenv("COST_MODEL_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "costs.json")
+WORKER_TIMEOUT_MS: int = int(os.getenv("WORKER_TIMEOUT_MS", "900000"))
+
+# Guard placement: number of worker processes used to explore candidates in parallel.
+# 0 or 1 keeps the serial path (default; AWS Lambda has no /dev/shm for process pools).
+GUARD_PLACEMENT_WORKERS: int = int(os.getenv("GUARD_PLACEMENT_WORKERS", "0"))
+
+# Guard placement: components with at least this many targets (vertices + midpoints) are checked
+# with the batched Sight kernel instead of one sees() call per target.
+GUARD_PLACEMENT_BATCH_MIN_TARGETS: int = int(os.getenv("GUARD_PLACEMENT_BATCH_MIN_TARGETS", "8"))
+
+# Guard placement: drop candidates dominated by another candidate before exploring them (GuardPlacementStep.prune()).
+# Dominance reads component membership and visibility graph rows only (benchmarks/bench_guard_pruning.py).
+GUARD_PLACEMENT_PRUNING: bool = os.getenv("GUARD_PLACEMENT_PRUNING", "1").lower() in ("1", "true", "yes")
+
+# Index summaries (ArtGallery.summarize(), Job.summarize()): about this many vertices, and at most this many guards,
+# are kept in the simplified geometry a list cell draws (models.thumbnail()).
+SUMMARY_THUMBNAIL_POINTS: int = int(os.getenv("SUMMARY_THUMBNAIL_POINTS", "128"))
+
+# Step result cache (StepResultRepository): outputs of completed steps are stored under a Signature of the step,
+# STEP_CACHE_VERSION and the step's input fields (Step.fingerprint()), and copied by StartTask instead of running
+# the step again. Bump STEP_CACHE_VERSION whenever a step returns something else for the same input (code changes,
+# or settings such as STITCH_BUCKET_SIZE). Eviction drops entries older than STEP_CACHE_MAX_AGE_SECONDS, then the
+# oldest ones until the cache fits in STEP_CACHE_MAX_BYTES.
+STEP_CACHE_ENABLED: bool = os.getenv("STEP_CACHE_ENABLED", "1").lower() in ("1", "true", "yes")
+STEP_CACHE_VERSION: str = os.getenv("STEP_CACHE_VERSION", "1")
+STEP_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("STEP_CACHE_MAX_AGE_SECONDS", str(30 * 24 * 3600)))
+STEP_CACHE_MAX_BYTES: int = int(os.getenv("STEP_CACHE_MAX_BYTES", str(1024**3)))
+# Fraction of finished root jobs that run eviction: each run lists the whole cache prefix, so it is sampled.
+STEP_CACHE_EVICTION_RATE: float = float(os.getenv("STEP_CACHE_EVICTION_RATE", "0.05"))
+
 # Anonymous and test user constants (used by User model)
 ANONYMOUS_EMAIL: str = "nobody@unknown.local"
 ANONYMOUS_NAME: str = "Anonymous"
@@ -161,23 +161,30 @@ class EarClippingStepState(State):
 
 
 class ConvexComponentOptimizationStepState(State):
-    """State for ConvexComponentOptimizationStep. Has convex_components and adjacency. Gallery is read-only."""
+    """
+    State for ConvexComponentOptimizationStep. Has convex_components and adjacency, and the ids of the components
+    kept from a source job (settled), which are not merged with each other again. Gallery is read-only.
+    """
 
     convex_components: Table
     adjacency: Table
+    settled: set[Identifier]
 
     def __init__(
         self,
         convex_components: Table | None = None,
         adjacency: Table | None = None,
+        settled: set[Identifier] | None = None,
     ) -> None:
         self.convex_components = convex_components if convex_components is not None else Table()
         self.adjacency = adjacency if adjacency is not None else Table()
+        self.settled = settled if settled is not None else set()
 
     def serialize(self) -> dict[str, Any]:
         return {
             "convex_components": self.convex_components.serialize(),
             "adjacency": {str(hash(bag.key)): [str(v) for v in bag.items] for bag in self.adjacency},
+            "settled": sorted(str(c) for c in self.settled),
         }
 
     @classmethod
@@ -192,14 +199,18 @@ class ConvexComponentOptimizationStepState(State):
             for id_ser in adj_raw.get(str(hash(comp)), []):
                 coll += Identifier(id_ser)
             adjacency.add(coll)
-        return cls(convex_components=convex_components, adjacency=adjacency)
+        settled = {Identifier(c) for c in data.get("settled") or []}
+        return cls(convex_components=convex_components, adjacency=adjacency, settled=settled)
 
 
 class GuardPlacementStepState(State):
     """
     State for GuardPlacementStep. Has component_id_by_point, visibility_by_segment,
     remaining_points, remaining_component_ids, component_id_by_midpoint, and (for suspend/resume)
-    guards, visibility, exclusivity. Gallery is read-only; only state is written until completion.
+    guards, visibility, exclusivity. pruned holds the number of dominated candidates dropped per round;
+    universe holds the coverage universe size before and after reduction and the number of forced
+    guards; dominated holds the targets reduction dropped, forced the forced guards themselves.
+    Gallery is read-only; only state is written until completion.
     """
 
     component_id_by_point: dict[int, list[Identifier]]
@@ -210,6 +221,10 @@ class GuardPlacementStepState(State):
     guards: Table
     visibility: Table
     exclusivity: Table
+    pruned: list[int]
+    universe: dict[str, int]
+    forced: list[Point]
+    dominated: set[Point]
 
     def __init__(
         self,
@@ -221,6 +236,10 @@ class GuardPlacementStepState(State):
         guards: Table | None = None,
         visibility: Table | None = None,
         exclusivity: Table | None = None,
+        pruned: list[int] | None = None,
+        universe: dict[str, int] | None = None,
+        forced: list[Point] | None = None,
+        dominated: set[Point] | None = None,
     ) -> None:
         self.component_id_by_point = component_id_by_point if component_id_by_point is not None else {}
         self.visibility_by_segment = visibility_by_segment if visibility_by_segment is not None else {}
@@ -230,17 +249,27 @@ class GuardPlacementStepState(State):
         self.guards = guards if guards is not None else Table()
         self.visibility = visibility if visibility is not None else Table()
         self.exclusivity = exclusivity if exclusivity is not None else Table()
+        self.pruned = pruned if pruned is not None else []
+        self.universe = universe if universe is not None else {}
+        self.forced = forced if forced is not None else []
+        self.dominated = dominated if dominated is not None else set()
 
     def serialize(self) -> dict[str, Any]:
         out: dict[str, Any] = {
             "component_id_by_point": {str(k): [str(v) for v in vs] for k, vs in self.component_id_by_point.items()},
-            "visibility_by_segment": {str(hash(k)): v for k, v in self.visibility_by_segment.items()},
-            "remaining_points": [p.serialize() for p in self.remaining_points],
-            "remaining_component_ids": [str(c) for c in self.remaining_component_ids],
-            "component_id_by_midpoint": {str(hash(k)): [str(v) for v in vs] for k, vs in self.component_id_by_midpoint.items()},
+            # Per-invocation caches, rebuilt after resume (unserialize() drops them), so they are not checkpointed.
+            "visibility_by_segment": {},
+            # Sorted so consecutive checkpoints differ only by the removed items (JobState.delta()).
+            "remaining_points": [p.serialize() for p in sorted(self.remaining_points)],
+            "remaining_component_ids": sorted(str(c) for c in self.remaining_component_ids),
+            "component_id_by_midpoint": {},
             "guards": self.guards.serialize(),
-            "visibility": {str(hash(bag.key)): [p.serialize() for p in bag.items] for bag in self.visibility},
-            "exclusivity": {str(hash(bag.key)): [p.serialize() for p in bag.items] for bag in self.exclusivity},
+            "visibility": {str(hash(bag.key)): [p.serialize() for p in sorted(bag.items)] for bag in self.visibility},
+            "exclusivity": {str(hash(bag.key)): [p.serialize() for p in sorted(bag.items)] for bag in self.exclusivity},
+            "pruned": list(self.pruned),
+            "universe": dict(self.universe),
+            "forced": [p.serialize() for p in self.forced],
+            "dominated": [p.serialize() for p in sorted(self.dominated)],
         }
         return out
 
@@ -283,4 +312,8 @@ class GuardPlacementStepState(State):
             guards=guards,
             visibility=visibility,
             exclusivity=exclusivity,
+            pruned=[int(count) for count in data.get("pruned") or []],
+            universe={key: int(size) for key, size in (data.get("universe") or {}).items()},
+            forced=[Point.unserialize(p) for p in data.get("forced") or []],
+            dominated={Point.unserialize(p) for p in data.get("dominated") or []},
         )
@@ -23,17 +23,23 @@ the caller persists the updated job after run().
 from __future__ import annotations
 
 import logging
+import time
 from abc import ABC
 from abc import abstractmethod
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
 from functools import cached_property
 from typing import Any
 from typing import Type
 
+from attributes import Deadline
 from attributes import Identifier
 from attributes import Signature
 from attributes import Work
+from buffers import GeometryBuffer
+from edits import Edit
+from edits import residue
 from enums import Status
 from enums import StepName
 from exceptions import BridgeFailureError
@@ -47,26 +53,38 @@ from exceptions import NoMoreEarsError
 from exceptions import OnlyMidpointsRemainingError
 from exceptions import PolygonNotSimpleError
 from exceptions import PolygonsDoNotShareEdgeError
+from exceptions import RecordNotFoundError
 from exceptions import StepNotHandledError
 from exceptions import StitchWinnerSubsequenceError
 from exceptions import SuspendedStepError
 from exceptions import ValidationError
 from exceptions import ValidationObstacleNotContainedError
+from fingerprints import Fingerprint
 from geometry import Point
 from geometry import Polygon
 from geometry.convex import ConvexComponent
 from geometry.ear import Ear
+from geometry.point import SerializedPoint
 from geometry.segment import Segment
+from geometry.segment import SerializedSegment
+from geometry.sight import Sight
+from geometry.visibility import VisibilityGraph
 from geometry.walk import Walk
 from models import ArtGallery
 from models import Job
 from models import User
 from repositories import JobsRepository
 from settings import CONVEX_COMPONENT_OPTIMIZATION_MAX_WORK
+from settings import DEADLINE_CHECK_INTERVAL
 from settings import EAR_CLIPPING_MAX_WORK
+from settings import GUARD_PLACEMENT_BATCH_MIN_TARGETS
 from settings import GUARD_PLACEMENT_MAX_WORK
+from settings import GUARD_PLACEMENT_PRUNING
+from settings import GUARD_PLACEMENT_WORKERS
+from settings import STEP_CACHE_VERSION
 from settings import STITCH_BUCKET_SIZE
 from settings import STITCHING_MAX_WORK
+from settings import SUSPEND_SAFETY_MARGIN_MS
 from states import ArtGalleryStepState
 from states import ConvexComponentOptimizationStepState
 from states import EarClippingStepState
@@ -82,16 +100,18 @@ logger = logging.getLogger(__name__)
 
 def work(max_work: int):
     """
-    Decorator for step instance methods: increments self.work by 1 each call;
-    if self.work > max_work, calls self.suspend() before invoking the method.
+    Decorator for step instance methods: increments self.work by 1 each call; once self.work
+    reaches self.checkpoint, self.check(max_work) may call self.suspend() before invoking the method.
+    Without a deadline that means self.work > max_work; with one, see Step.check().
+    Steps with suspendable=False (e.g. pool workers) only count work; the owner suspends.
     Use a value from settings (e.g. STITCHING_MAX_WORK, GUARD_PLACEMENT_MAX_WORK).
     """
 
     def decorator(f):
         def wrapper(self, *args, **kwargs):
             self.work = self.work + 1
-            if self.work > max_work:
-                self.suspend()
+            if self.work >= self.checkpoint:
+                self.check(max_work)
             return f(self, *args, **kwargs)
 
         return wrapper
@@ -109,10 +129,30 @@ class Step(ABC):
 
     STATE_CLASS: Type[State] = State
 
-    def __init__(self, job: Job, user: User, state: dict) -> None:
+    # Fields of job.stdout (over job.stdin) that run() reads; run() must return the same output for the same values.
+    # Empty for steps whose outcome is not a pure function of their input (e.g. coordinators creating children).
+    INPUTS: tuple[str, ...] = ()
+
+    # Fields StartTask loads into job.stdout from the pipeline context (Job.context) before run(): INPUTS plus
+    # what run() reads without it changing the output (e.g. visibility_graph). Only the jobs holding them are read.
+    CONTEXT: tuple[str, ...] = ()
+
+    # Fields of run()'s output that later steps read through the pipeline context but that are not part of the result:
+    # they stay in the job's own stdout and ReportTask leaves them out of the parent's (e.g. visibility_graph).
+    INTERNAL: tuple[str, ...] = ()
+
+    def __init__(self, job: Job, user: User, state: dict, deadline: Deadline | None = None, budget: int | None = None) -> None:
         self.job: Job = job
         self.user: User = user
         self.work: Work = Work(0)
+        self.suspendable: bool = True
+        self.deadline: Deadline | None = deadline
+        self.budget: int | None = budget
+        # Started by the first check(), at the first unit of work: decoding the gallery, prepare() and the
+        # visibility graph run before it and would otherwise count as the pace of the first units.
+        self.clock: float | None = None
+        self.origin: int = 0
+        self.checkpoint: int = 0
         self.state: State = self.STATE_CLASS.unserialize(state)
         self._state_was_empty: bool = state == {}
 
@@ -126,6 +166,43 @@ class Step(ABC):
         """JobsRepository for the step's user. Cached for the lifetime of the step instance."""
         return JobsRepository(user=self.user)
 
+    @cached_property
+    def source(self) -> ArtGallery | None:
+        """
+        Gallery of the job this one was edited from (stdin "source_id", see edits.py), or None if there is none,
+        or it is missing or did not succeed. Cached for the lifetime of the step instance.
+        """
+        source_id: str | None = self.job.stdin.get("source_id")
+        if not source_id:
+            return None
+        try:
+            source: Job = self.repository.get(Identifier(source_id))
+        except RecordNotFoundError:
+            logger.warning("Step.source() | job.id=%s source_id=%s not found", self.job.id, source_id)
+            return None
+        if not source.is_finished():
+            return None
+        return ArtGallery.unserialize(source.stdout, trusted=True, lazy=True)
+
+    @cached_property
+    def edit(self) -> Edit | None:
+        """Obstacles removed and added since self.source (see edits.py), or None to run in full."""
+        if self.source is None:
+            return None
+        return Edit.of(self.source, self.gallery)
+
+    @cached_property
+    def graph(self) -> VisibilityGraph:
+        """
+        Vertex-to-vertex visibility graph of self.gallery. Read from job.stdout (emitted by
+        ValidationPolygonStep and loaded from its job through the pipeline context, never merged into
+        the root job, see Step.INTERNAL); built here for jobs that predate it.
+        """
+        data: dict[str, Any] | None = self.job.stdout.get("visibility_graph")
+        if data:
+            return VisibilityGraph.unserialize(data)
+        return VisibilityGraph.build(self.gallery.boundary, list(self.gallery.obstacles))
+
     @staticmethod
     def of(step_name: StepName) -> Type[Step]:
         """
@@ -152,6 +229,61 @@ class Step(ABC):
             raise StepNotHandledError(f"Step cannot be handled: {step_name.slug}")
         return cls
 
+    @classmethod
+    def fingerprint(cls, job: Job, **kwargs: Any) -> Fingerprint | None:
+        """
+        Cache key of this step's output for job (see StepResult), or None if the step has no INPUTS, they
+        cannot be normalized, or the job is edited from a source job (its output depends on the source's).
+        Signature of the step slug, STEP_CACHE_VERSION, the run() kwargs and the INPUTS fields, normalized
+        so shifted, rotated or reordered copies of a gallery share it (see fingerprints.py).
+
+        For example, two jobs with the same stitched polygon share their ear clipping output:
+        >>> EarClippingStep.fingerprint(job).key == EarClippingStep.fingerprint(other).key
+        True
+        """
+        if not cls.INPUTS or job.stdin.get("source_id"):
+            return None
+        data: dict[str, Any] = {**job.stdin, **job.stdout}
+        return Fingerprint.of(str(job.step_name.slug), STEP_CACHE_VERSION, kwargs, {name: data.get(name) for name in cls.INPUTS})
+
+    def spend(self, units: int, max_work: int) -> None:
+        """Count units of work at once (batched checks, merged worker results), then check() like the work decorator."""
+        self.work = self.work + units
+        if self.work >= self.checkpoint:
+            self.check(max_work, units)
+
+    def check(self, max_work: int, units: int = 1) -> None:
+        """
+        Suspend when the budget is spent; otherwise move self.checkpoint to the next check.
+
+        Without a deadline the budget is self.budget units (picked by the cost model, see costs.py) or
+        max_work when there is none, checked on every unit past it. With a deadline the first check
+        starts the clock and lets the first DEADLINE_CHECK_INTERVAL units run, so every invocation makes
+        progress; after that the clock is read every DEADLINE_CHECK_INTERVAL units and the step suspends
+        when the next interval, at the pace measured since the first unit, would run into the last
+        SUSPEND_SAFETY_MARGIN_MS.
+        """
+        if not self.suspendable:
+            return
+        if self.deadline is None:
+            limit: int = self.budget if self.budget is not None else max_work
+            if self.work > limit:
+                self.suspend()
+            self.checkpoint = limit + 1
+            return
+        if self.clock is None:
+            # The units just counted have not run yet.
+            self.clock = time.monotonic()
+            self.origin = int(self.work) - units
+            self.checkpoint = self.work + DEADLINE_CHECK_INTERVAL
+            return
+        pace: float = 1000 * (time.monotonic() - self.clock) / max(int(self.work) - self.origin, 1)
+        projected: float = pace * max(units, DEADLINE_CHECK_INTERVAL)
+        if self.deadline.remaining() - SUSPEND_SAFETY_MARGIN_MS < projected:
+            logger.info("Step.check() | job.id=%s work=%s remaining=%s projected=%.0f", self.job.id, self.work, self.deadline.remaining(), projected)
+            self.suspend()
+        self.checkpoint = self.work + DEADLINE_CHECK_INTERVAL
+
     def suspend(self) -> None:
         """
         Raise SuspendedStepError with current step state so the task handler can requeue().
@@ -244,7 +376,8 @@ class ArtGalleryStep(CoordinatorStep):
                 parent_id=self.job.id,
                 status=Status.PENDING,
                 step_name=step_name,
-                stdin=dict(self.job.stdin),
+                # Geometry is not copied: children load it from the pipeline context (see StartTask.inherit()).
+                stdin={key: value for key, value in self.job.stdin.items() if key not in ("boundary", "obstacles")},
             )
             self.repository.save(child)
             child_ids.append(child_id)
@@ -279,10 +412,13 @@ class ValidationPolygonStep(SequenceStep):
     """
 
     STATE_CLASS: Type[State] = ValidationPolygonStepState
+    INPUTS: tuple[str, ...] = ("boundary", "obstacles")
+    CONTEXT: tuple[str, ...] = ("boundary", "obstacles")
+    INTERNAL: tuple[str, ...] = ("visibility_graph",)
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.gallery: ArtGallery = ArtGallery.unserialize(self.job.stdin)
+        self.gallery: ArtGallery = ArtGallery.unserialize({**self.job.stdin, **self.job.stdout})
 
     def init(self) -> None:
         pass
@@ -348,6 +484,7 @@ class ValidationPolygonStep(SequenceStep):
         return {
             "boundary": self.gallery.boundary.serialize(),
             "obstacles": [obstacle.serialize() for obstacle in self.gallery.obstacles],
+            "visibility_graph": VisibilityGraph.build(self.gallery.boundary, list(self.gallery.obstacles)).serialize(),
         }
 
 
@@ -363,29 +500,56 @@ class StitchingStep(SequenceStep):
     (using Sequence shift from structs.py; one O(n) rotation per obstacle). We keep
     a bucket of the shortest STITCH_BUCKET_SIZE valid bridges; once the bucket is
     full we pick the smallest by size and stop, avoiding full O(n) checks when good
-    short bridges exist.
+    short bridges exist. Candidates are first looked up in the visibility graph (Step.graph),
+    which replaces the per-candidate boundary containment and obstacle crossing tests.
 
     Complexity: O(n^3), n = total vertices (boundary + all obstacles); bucket early exit often reduces work.
     """
 
     STATE_CLASS: Type[State] = StitchingStepState
+    INPUTS: tuple[str, ...] = ("boundary", "obstacles")
+    CONTEXT: tuple[str, ...] = ("boundary", "obstacles", "visibility_graph")
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.gallery: ArtGallery = ArtGallery.unserialize(self.job.stdout)
+        self.gallery: ArtGallery = ArtGallery.unserialize(self.job.stdout, trusted=True, lazy=True)
         if self._state_was_empty:
             self.init()
         # Gallery is read-only; state holds points, stitches, remaining_obstacles
 
     def init(self) -> None:
+        if not self.reuse():
+            self.reset()
+
+    def reset(self) -> None:
+        """Start from the boundary with every obstacle left to bridge."""
         self.state.points = Polygon(list(self.gallery.boundary))
         self.state.stitches = []
         self.state.points_in_stitches = set()
         self.state.remaining_obstacles = self.sort()
 
-    def sort(self) -> list[Polygon]:
-        """Return obstacles sorted by rightmost vertex (x, y) descending for bridge order."""
-        obstacles = list(self.gallery.obstacles)
+    def reuse(self) -> bool:
+        """
+        Start from the source job's stitched polygon without the obstacles the edit touches (Edit.unbridge()),
+        with only those left to bridge. Returns False when there is no source or it cannot be unbridged.
+        """
+        if self.edit is None:
+            return False
+        unbridged: tuple[Polygon, list[Segment], list[Polygon]] | None = self.edit.unbridge(self.source.stitched, list(self.source.stitches))
+        if unbridged is None:
+            logger.info("StitchingStep.reuse() | job.id=%s source stitched polygon cannot be unbridged", self.job.id)
+            return False
+        points, stitches, pending = unbridged
+        self.state.points = points
+        self.state.stitches = stitches
+        self.state.points_in_stitches = {point for stitch in stitches for point in stitch}
+        self.state.remaining_obstacles = self.sort(pending)
+        logger.info("StitchingStep.reuse() | job.id=%s kept_stitches=%s pending=%s", self.job.id, len(stitches), len(pending))
+        return True
+
+    def sort(self, obstacles: list[Polygon] | None = None) -> list[Polygon]:
+        """Return obstacles (default: all of the gallery's) sorted by rightmost vertex (x, y) descending for bridge order."""
+        obstacles = list(self.gallery.obstacles) if obstacles is None else list(obstacles)
         obstacles.sort(key=lambda obstacle: (obstacle.rightmost.x, obstacle.rightmost.y), reverse=True)
         return obstacles
 
@@ -412,20 +576,15 @@ class StitchingStep(SequenceStep):
                 # Rejecting candidate because it is already used as an endpoint of another stitch.
                 if candidate in self.state.points_in_stitches:
                     continue
-                segment: Segment = candidate.to(anchor)
-
-                # Rejecting segment because it is not fully inside the boundary.
-                if not self.gallery.boundary.contains(segment, inclusive=True):
+                # Rejecting segment because it leaves the boundary or crosses an obstacle (visibility graph lookup).
+                if not self.graph.sees(candidate, anchor):
                     continue
+                segment: Segment = candidate.to(anchor)
 
                 # Rejecting segment because it intersects another obstacle.
                 if any(other.intersects(segment, inclusive=False) for other in self.gallery.obstacles if other is not obstacle):
                     continue
 
-                # Rejecting segment because it crosses an edge of the obstacle we are bridging.
-                if any(segment.crosses(edge) for edge in obstacle.edges):
-                    continue
-
                 # Rejecting segment because it is collinear with a boundary edge (would lie on boundary).
                 if any(
                     Walk(start=edge[0], center=edge[1], end=segment[0]).is_collinear()
@@ -504,6 +663,12 @@ class StitchingStep(SequenceStep):
         self.state.points_in_stitches.add(bridge[0])
         self.state.points_in_stitches.add(bridge[1])
 
+    def stitch(self) -> None:
+        """Bridge the remaining obstacles in order."""
+        while self.state.remaining_obstacles:
+            obstacle = self.state.remaining_obstacles.pop(0)
+            self.bridge(obstacle)
+
     def run(self, **kwargs: Any) -> dict[str, Any]:
         logger.info(
             "StitchingStep.run() | job.id=%s obstacles=%s boundary_points=%s",
@@ -511,9 +676,15 @@ class StitchingStep(SequenceStep):
             len(self.state.remaining_obstacles),
             len(self.gallery.boundary),
         )
-        while self.state.remaining_obstacles:
-            obstacle = self.state.remaining_obstacles.pop(0)
-            self.bridge(obstacle)
+        try:
+            self.stitch()
+        except BridgeFailureError:
+            # The kept bridges of an edited gallery may block the only bridges of the pending obstacles.
+            if self.edit is None:
+                raise
+            logger.warning("StitchingStep.run() | job.id=%s bridge failed on the source stitched polygon, stitching in full", self.job.id)
+            self.reset()
+            self.stitch()
 
         if len(self.state.points) > 0:
             assert self.state.points.is_ccw(), f"Stitched polygon is not CCW: {self.state.points}"
@@ -538,17 +709,35 @@ class EarClippingStep(SequenceStep):
     """
 
     STATE_CLASS: Type[State] = EarClippingStepState
+    INPUTS: tuple[str, ...] = ("stitched", "stitches")
+    CONTEXT: tuple[str, ...] = ("boundary", "obstacles", "stitched", "stitches")
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.gallery: ArtGallery = ArtGallery.unserialize(self.job.stdout)
+        self.gallery: ArtGallery = ArtGallery.unserialize(self.job.stdout, trusted=True, lazy=True)
         if self._state_was_empty:
             self.init()
         # Gallery is read-only; state holds titanic and ears
 
     def split(self) -> list[Polygon]:
-        """Return list of polygons to clip; default is a single polygon (titanic)."""
-        return [self.state.titanic]
+        """
+        Return list of polygons to clip; default is a single polygon (titanic). For a gallery edited from a source
+        job, the source ears that survive the edit (Edit.survives()) are added to state.ears and only the pieces of
+        titanic they leave (residue()) are clipped.
+        """
+        if self.edit is None:
+            return [self.state.titanic]
+        stitches: list[Segment] = [stitch for stitch in self.gallery.stitches if stitch not in self.source.stitches]
+        points: set[Point] = set(self.state.titanic)
+        ears: list[Ear] = [ear for ear in self.source.ears if self.edit.survives(ear, points, stitches)]
+        pieces: list[Polygon] | None = residue(self.state.titanic, ears)
+        if pieces is None:
+            logger.info("EarClippingStep.split() | job.id=%s source ears do not fit the stitched polygon", self.job.id)
+            return [self.state.titanic]
+        for ear in ears:
+            self.state.ears.add(ear)
+        logger.info("EarClippingStep.split() | job.id=%s kept_ears=%s pieces=%s", self.job.id, len(ears), len(pieces))
+        return pieces or [Polygon([])]
 
     def init(self) -> None:
         self.state.titanic = Polygon(list(self.gallery.stitched))
@@ -558,6 +747,29 @@ class EarClippingStep(SequenceStep):
         self.state.titanic = self.state.splits[0]
         self.state.splits.pop(0)
 
+    def reset(self) -> None:
+        """Drop the ears kept from the source job and clip the whole stitched polygon."""
+        self.state.titanic = Polygon(list(self.gallery.stitched))
+        self.state.ears = Table()
+        self.state.splits = []
+
+    def covers(self) -> bool:
+        """True if the ears add up to the area of the stitched polygon (the kept ears and the pieces clipped around them tile it)."""
+        area: Decimal = abs(self.gallery.stitched.signed_area)
+        return abs(sum((abs(ear.signed_area) for ear in self.state.ears), Decimal(0)) - area) <= area * Decimal("1e-9")
+
+    def triangulate(self) -> None:
+        """Clip titanic, then each of the remaining splits, into state.ears."""
+        while True:
+            try:
+                ear: Ear = self.clip()
+                ear.sort("ccw")
+                self.state.ears.add(ear)
+            except NoMoreEarsError:
+                if not self.state.splits:
+                    break
+                self.state.titanic = self.state.splits.pop(0)
+
     @work(EAR_CLIPPING_MAX_WORK)
     def clip(self) -> Ear:
         """
@@ -614,13 +826,19 @@ class EarClippingStep(SequenceStep):
         raise EarClippingFailureError(f"No valid ear found for polygon: {self.state.titanic}")
 
     def run(self, **kwargs: Any) -> dict[str, Any]:
-        while True:
-            try:
-                ear: Ear = self.clip()
-                ear.sort("ccw")
-                self.state.ears.add(ear)
-            except NoMoreEarsError:
-                break
+        try:
+            self.triangulate()
+        except EarClippingFailureError:
+            # A piece left by the kept source ears may not be clippable on its own.
+            if self.edit is None:
+                raise
+            logger.warning("EarClippingStep.run() | job.id=%s clipping around the source ears failed, clipping in full", self.job.id)
+            self.reset()
+            self.triangulate()
+        if self.edit is not None and not self.covers():
+            logger.warning("EarClippingStep.run() | job.id=%s ears do not cover the stitched polygon, clipping in full", self.job.id)
+            self.reset()
+            self.triangulate()
 
         if not self.state.ears:
             raise EarClippingFailureError("No ears found for polygon")
@@ -642,19 +860,49 @@ class ConvexComponentOptimizationStep(SequenceStep):
     """
 
     STATE_CLASS: Type[State] = ConvexComponentOptimizationStepState
+    INPUTS: tuple[str, ...] = ("ears",)
+    CONTEXT: tuple[str, ...] = ("boundary", "obstacles", "ears")
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.gallery: ArtGallery = ArtGallery.unserialize(self.job.stdout)
+        self.gallery: ArtGallery = ArtGallery.unserialize(self.job.stdout, trusted=True, lazy=True)
         if self._state_was_empty:
             self.init()
 
     def init(self) -> None:
         """Build initial convex_components from ears and adjacency table; store both in state."""
         ears: Table[Ear] = self.gallery.ears
-        self.state.convex_components = Table.unserialize([ConvexComponent(ear) for ear in ears])
+        self.state.convex_components = self.reuse() or Table.unserialize([ConvexComponent(ear) for ear in ears])
         self.state.adjacency = self.explore(self.state.convex_components)
 
+    def reuse(self) -> Table[ConvexComponent] | None:
+        """
+        Initial components of a gallery edited from a source job: the source components none of whose ears were
+        dropped (a component holds the ears whose vertices are all its vertices, as it is convex), marked settled,
+        and one component per other ear. Returns None when there is no source or the components do not add up to
+        the ears' area.
+        """
+        if self.edit is None:
+            return None
+        ears: Table[Ear] = self.gallery.ears
+        dropped: list[Ear] = [ear for ear in self.source.ears if ear not in ears]
+        kept: list[ConvexComponent] = []
+        for component in self.source.convex_components:
+            vertices: set[Point] = set(component)
+            if not any(all(point in vertices for point in ear) for ear in dropped):
+                kept.append(component)
+        components: Table[ConvexComponent] = Table.unserialize(kept)
+        for ear in ears:
+            if not any(all(point in component for point in ear) for component in kept):
+                components.add(ConvexComponent(ear))
+        area: Decimal = sum((abs(ear.signed_area) for ear in ears), Decimal(0))
+        if abs(sum((abs(component.signed_area) for component in components), Decimal(0)) - area) > area * Decimal("1e-9"):
+            logger.info("ConvexComponentOptimizationStep.reuse() | job.id=%s source components do not fit the ears", self.job.id)
+            return None
+        self.state.settled = {component.id for component in kept}
+        logger.info("ConvexComponentOptimizationStep.reuse() | job.id=%s kept_components=%s", self.job.id, len(kept))
+        return components
+
     def explore(self, table: Table[ConvexComponent]) -> Table[Collection[ConvexComponent, Identifier]]:
         """
         Build Table[Collection[ConvexComponent, Identifier]] from Table[ConvexComponent]: index by edge,
@@ -679,6 +927,7 @@ class ConvexComponentOptimizationStep(SequenceStep):
     def merge(self) -> None:
         """
         Perform one merge: find the best adjacent pair by area, merge them, and update state.
+        Pairs of settled components (kept from a source job, see reuse()) are skipped: the source tried them.
         Raises NoMoreConvexComponentsMergeError when no valid merge is possible.
         """
         best_area: Decimal | None = None
@@ -686,6 +935,8 @@ class ConvexComponentOptimizationStep(SequenceStep):
         best_pair: tuple[ConvexComponent, ConvexComponent] | None = None
         for component in self.state.convex_components:
             for adjacent_id in self.state.adjacency[component]:
+                if component.id in self.state.settled and adjacent_id in self.state.settled:
+                    continue
                 adjacent: ConvexComponent = self.state.convex_components[adjacent_id]
                 try:
                     merged: ConvexComponent = component + adjacent
@@ -733,7 +984,9 @@ class GuardPlacementStep(SequenceStep):
     Algorithm (same greedy logic with exploration heuristic for performance):
     1. Remaining state: all convex components and all stitched points (vertices to cover).
     2. Sort remaining components by measure(component): fewest points not in remaining first (most uncovered points).
-    3. Pick the first component; its vertices are the guard candidates.
+    3. Pick the first component; its vertices are the guard candidates. Candidates dominated by another
+       candidate are dropped (see prune(); pruned counts per round are returned as "pruned"), unless
+       GUARD_PLACEMENT_PRUNING is off.
     4. Score each candidate via explore(guard): returns a Collection of points visible from that guard.
        explore uses component_id_by_point to find all components the guard belongs to, hydrates
        visibility_by_segment and the visibility bag with all points of those components, then
@@ -742,7 +995,14 @@ class GuardPlacementStep(SequenceStep):
     5. Best guard = candidate that sees the most remaining points (using explore). Add that guard and
        its full visibility (all stitched points seen) to the gallery; remove the largest component
        and any other component fully covered; remove from remaining points all points that guard sees.
-    6. Repeat until no points remain.
+    6. Repeat until no points remain (or only dominated ones, see reduce()).
+
+    Before step 2, reduce() finds the dominated targets (covered whenever some other target is) and the
+    forced guards (vertices no other vertex sees), from the visibility graph; forced guards are stationed
+    first and the universe size before and after and the forced count are returned as "universe". The
+    greedy loop scores against every remaining point but stops once only dominated targets remain, which
+    restore() attaches to the guards placed. For a gallery edited from a source job, reuse() puts the
+    source guards the edit did not affect in front of the forced guards.
 
     explore(guard): gets guard's component ids from component_id_by_point; initializes explored with
     those ids and hydrates visibility + visibility_by_segment with all points of those components;
@@ -752,17 +1012,26 @@ class GuardPlacementStep(SequenceStep):
 
     Returns guards and visibility as Table.serialize().
 
+    Parallel mode (GUARD_PLACEMENT_WORKERS > 1): compete() farms explore() out to a process pool.
+    Each worker holds a read-only copy of the gallery and its own line-of-sight cache; new
+    visibility_by_segment entries and work counts are merged back into this step, so suspension
+    and the (coverage, len, hash) tie-break behave exactly as in serial mode.
+
     Complexity: O(n^4) in the worst case; the exploration heuristic reduces visibility checks in practice.
     """
 
     STATE_CLASS: Type[State] = GuardPlacementStepState
+    INPUTS: tuple[str, ...] = ("boundary", "obstacles", "stitched", "convex_components", "adjacency")
+    CONTEXT: tuple[str, ...] = ("boundary", "obstacles", "stitched", "convex_components", "adjacency", "visibility_graph")
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.gallery: ArtGallery = ArtGallery.unserialize(self.job.stdout)
+        self.gallery: ArtGallery = ArtGallery.unserialize(self.job.stdout, trusted=True, lazy=True)
         if self._state_was_empty:
             self.prepare()
             self.state.remaining_component_ids = {c.id for c in self.gallery.convex_components}
+            self.reduce()
+            self.reuse()
 
     def init(self) -> None:
         pass
@@ -796,12 +1065,10 @@ class GuardPlacementStep(SequenceStep):
         # spikes in a non-convex boundary) or cross obstacles are not counted as visible.
         for component_id in explored:
             component: ConvexComponent = self.gallery.convex_components[component_id]
-            for point in component:
-                if self.sees(guard, point):
-                    visibility += point
-            for edge in component.edges:
-                if self.sees(guard, edge.midpoint):
-                    visibility += edge.midpoint
+            targets: list[Point] = list(component) + [edge.midpoint for edge in component.edges]
+            for target, seen in zip(targets, self.sees_many(guard, targets)):
+                if seen:
+                    visibility += target
 
         # Continue exploring explorable components until no more are available.
         while explorable - explored:
@@ -814,13 +1081,10 @@ class GuardPlacementStep(SequenceStep):
             # Mark the component as explored.
             explored.add(adjacent_id)
             visible = False
-            for point in adjacent:
-                if self.sees(guard, point):
-                    visibility += point
-                    visible = True
-            for midpoint in adjacent.midpoints:
-                if self.sees(guard, midpoint):
-                    visibility += midpoint
+            targets = list(adjacent) + list(adjacent.midpoints)
+            for target, seen in zip(targets, self.sees_many(guard, targets)):
+                if seen:
+                    visibility += target
                     visible = True
 
             # If the component is visible, explore its adjacent components.
@@ -833,29 +1097,27 @@ class GuardPlacementStep(SequenceStep):
     def sees(self, guard: Point, target: Point) -> bool:
         """
         True if target is visible from guard in the art gallery. Caches by segment in visibility_by_segment.
-        Only uncached visibility checks count as work; guard==target or cache hit undo the decorator's increment.
+        Vertex pairs are answered by the visibility graph. Only uncached checks of other targets (edge
+        midpoints) count as work; guard==target, graph lookups and cache hits undo the decorator's increment.
         """
         if guard == target:
             self.work -= 1
             return True
+        visible: bool | None = self.graph.sees(guard, target)
+        if visible is not None:
+            self.work -= 1
+            return visible
         segment: Segment = guard.to(target)
         if segment in self.state.visibility_by_segment:
             self.work -= 1
             return self.state.visibility_by_segment[segment]
 
-        # Segment must lie inside or on the boundary polygon.
-        if not self.gallery.boundary.contains(segment, inclusive=True):
+        if not self.encloses(segment):
             self.state.visibility_by_segment[segment] = False
             return False
 
+        # No obstacle edge may properly cross the segment (line-of-sight cut).
         for obstacle in self.gallery.obstacles:
-
-            # No obstacle may contain the segment midpoint (strictly inside obstacle => blocked).
-            if obstacle.intersects(segment.midpoint, inclusive=False):
-                self.state.visibility_by_segment[segment] = False
-                return False
-
-            # No obstacle edge may properly cross the segment (line-of-sight cut).
             for edge in obstacle.edges:
                 if segment.crosses(edge):
                     self.state.visibility_by_segment[segment] = False
@@ -863,6 +1125,58 @@ class GuardPlacementStep(SequenceStep):
         self.state.visibility_by_segment[segment] = True
         return True
 
+    def encloses(self, segment: Segment) -> bool:
+        """
+        True if segment lies inside or on the boundary and no obstacle strictly contains its midpoint.
+        The edge-crossing half of the visibility test lives in sees() and the Sight kernel.
+        """
+        # Segment must lie inside or on the boundary polygon.
+        if not self.gallery.boundary.contains(segment, inclusive=True):
+            return False
+
+        # No obstacle may contain the segment midpoint (strictly inside obstacle => blocked).
+        midpoint: Point = segment.midpoint
+        return not any(obstacle.intersects(midpoint, inclusive=False) for obstacle in self.gallery.obstacles)
+
+    @cached_property
+    def sight(self) -> Sight:
+        """Obstacle edges prepared for batched crossing tests from one guard (see geometry.sight)."""
+        return Sight([edge for obstacle in self.gallery.obstacles for edge in obstacle.edges])
+
+    def sees_many(self, guard: Point, targets: list[Point]) -> list[bool]:
+        """
+        sees() for every target, in order. Below GUARD_PLACEMENT_BATCH_MIN_TARGETS this is one sees() call
+        per target. Otherwise uncached targets are screened in one pass of the Sight kernel and only the
+        segments no obstacle edge crosses go through encloses(). Results, visibility_by_segment entries
+        and work are the same as calling sees() per target; the budget is checked once per batch.
+        """
+        if len(targets) < GUARD_PLACEMENT_BATCH_MIN_TARGETS:
+            return [self.sees(guard, target) for target in targets]
+        visible: list[bool] = [True] * len(targets)
+        pending: list[tuple[int, Point, Segment]] = []
+        for index, target in enumerate(targets):
+            if target == guard:
+                continue
+            seen: bool | None = self.graph.sees(guard, target)
+            if seen is not None:
+                visible[index] = seen
+                continue
+            segment: Segment = guard.to(target)
+            if segment in self.state.visibility_by_segment:
+                visible[index] = self.state.visibility_by_segment[segment]
+            else:
+                pending.append((index, target, segment))
+        if not pending:
+            return visible
+
+        self.spend(len({segment for _, _, segment in pending}), GUARD_PLACEMENT_MAX_WORK)
+        crossed: list[bool] = self.sight.crosses(guard, [target for _, target, _ in pending])
+        for (index, _, segment), cut in zip(pending, crossed):
+            if segment not in self.state.visibility_by_segment:
+                self.state.visibility_by_segment[segment] = not cut and self.encloses(segment)
+            visible[index] = self.state.visibility_by_segment[segment]
+        return visible
+
     def prepare(self) -> None:
         """
         Hydrate state from gallery (read-only). Set remaining_points and component maps;
@@ -878,6 +1192,130 @@ class GuardPlacementStep(SequenceStep):
             for midpoint in component.midpoints:
                 self.state.component_id_by_midpoint[midpoint].add(component.id)
 
+    @cached_property
+    def cover_by_target(self) -> dict[Point, int]:
+        """
+        Guards known to see each coverage target, as a bitset over self.graph.vertices.
+        Exact for vertices (graph row plus the vertex itself). A lower bound for edge midpoints:
+        the vertices of the convex components the midpoint belongs to, which see all of them.
+        """
+        cover_by_target: dict[Point, int] = {}
+        for vertex in self.gallery.stitched:
+            row: int | None = self.graph.row(vertex)
+            if row is not None:
+                cover_by_target[vertex] = row | 1 << self.graph.index_by_point[vertex]
+        for component in self.gallery.convex_components:
+            mask: int = 0
+            for point in component:
+                index: int | None = self.graph.index_by_point.get(point)
+                if index is not None:
+                    mask |= 1 << index
+            for midpoint in component.midpoints:
+                if midpoint not in self.graph:
+                    cover_by_target[midpoint] = cover_by_target.get(midpoint, 0) | mask
+        return cover_by_target
+
+    def reduce(self) -> None:
+        """
+        Set-cover reduction of the coverage targets before the greedy loop, from the visibility graph.
+
+        1. Dominated targets: target b goes into state.dominated when some vertex target a left in the
+           universe has every guard that sees a also seeing b (cover(a) within cover(b), see
+           cover_by_target). Covering a then covers b, so the greedy loop stops once only dominated
+           targets remain and restore() attaches them to the guards placed. Only vertices can dominate,
+           since only their cover is exact; of two vertices with the same cover only the last one is kept.
+        2. Unique covers: a vertex no other vertex sees can only be covered by a guard standing on it
+           (guards are vertices), so it goes into state.forced and place() stations it first.
+
+        remaining_points is left whole, so compete() still scores every target: scoring on the reduced
+        universe changes which candidate wins and placed more guards on the music and matrix fixtures.
+        Records the universe size before and after and the number of forced guards in state.universe.
+
+        For example:
+        >>> step.reduce()
+        >>> step.state.universe
+        {'before': 1204, 'after': 377, 'forced': 0}
+        """
+        cover_by_target: dict[Point, int] = self.cover_by_target
+        vertices: list[Point] = self.graph.vertices
+        present: int = 0
+        for target in self.state.remaining_points:
+            if target in self.graph:
+                present |= 1 << self.graph.index_by_point[target]
+
+        # A rival a of b is in cover(a), so within cover(b): only the bits of cover(b) are tried.
+        self.state.dominated = set()
+        for target in sorted(self.state.remaining_points):
+            cover: int = cover_by_target.get(target, 0)
+            rivals: int = cover & present
+            if target in self.graph:
+                rivals &= ~(1 << self.graph.index_by_point[target])
+            while rivals:
+                low: int = rivals & -rivals
+                rivals ^= low
+                if cover_by_target[vertices[low.bit_length() - 1]] & ~cover == 0:
+                    self.state.dominated.add(target)
+                    if target in self.graph:
+                        present &= ~(1 << self.graph.index_by_point[target])
+                    break
+
+        self.state.forced = [vertex for vertex in sorted(set(self.gallery.stitched)) if self.graph.row(vertex) == 0]
+        self.state.universe = {
+            "before": len(self.state.remaining_points),
+            "after": len(self.state.remaining_points) - len(self.state.dominated),
+            "forced": len(self.state.forced),
+        }
+        logger.info(
+            "GuardPlacementStep.reduce() | job.id=%s before=%s after=%s forced=%s",
+            self.job.id,
+            self.state.universe["before"],
+            self.state.universe["after"],
+            self.state.universe["forced"],
+        )
+
+    def restore(self) -> None:
+        """
+        Attach every remaining dominated target to a guard that sees it, trying the guards in its known
+        cover first, and drop it from remaining_points. A target no guard sees (explore() is a heuristic,
+        so its dominating target may have been counted for a guard that sees() disagrees on) leaves
+        state.dominated and goes back to the greedy loop.
+        """
+        for target in sorted(self.state.remaining_points & self.state.dominated):
+            cover: int = self.cover_by_target.get(target, 0)
+            guards: list[Point] = sorted(
+                self.state.guards.values(),
+                key=lambda guard: not (guard in self.graph and cover >> self.graph.index_by_point[guard] & 1),
+            )
+            guard: Point | None = next((guard for guard in guards if self.sees(guard, target)), None)
+            if guard is None:
+                self.state.dominated.discard(target)
+                continue
+            visibility: Collection[Point, Point] = self.state.visibility[guard]
+            visibility += target
+            self.state.remaining_points.discard(target)
+        self.settle()
+        logger.info("GuardPlacementStep.restore() | job.id=%s points_remaining=%s", self.job.id, len(self.state.remaining_points))
+
+    def reuse(self) -> None:
+        """
+        Put the guards of the source job (see edits.py) that the edit did not affect in front of state.forced: those
+        still on the stitched polygon whose visibility in the source only held vertices the stitched polygon still
+        has. place() explores them in the edited gallery and the greedy loop only covers what they leave; analyze()
+        drops any that end up with no exclusive point.
+        """
+        if self.edit is None:
+            return
+        points: set[Point] = set(self.gallery.stitched)
+        before: set[Point] = set(self.source.stitched)
+        kept: list[Point] = []
+        for guard in sorted(self.source.guards):
+            if guard not in points or hash(guard) not in self.state.component_id_by_point or guard not in self.source.visibility:
+                continue
+            if all(point in points for point in self.source.visibility[guard] if point in before):
+                kept.append(guard)
+        self.state.forced = kept + [guard for guard in self.state.forced if guard not in kept]
+        logger.info("GuardPlacementStep.reuse() | job.id=%s kept_guards=%s", self.job.id, len(kept))
+
     def compete(self, candidates: list[Point]) -> (Point, Collection[Point, Point]):
         """
         Return the best candidate and its visibility.
@@ -889,7 +1327,11 @@ class GuardPlacementStep(SequenceStep):
             Collection[Point, Point]: The visibility of the best candidate.
         """
         assert len(candidates) > 0, f"GuardPlacementStep.compete() | job.id={self.job.id} candidates={candidates}"
-        visibility_by_guard: dict[Point, Collection[Point, Point]] = {guard: self.explore(guard) for guard in candidates}
+        visibility_by_guard: dict[Point, Collection[Point, Point]]
+        if GUARD_PLACEMENT_WORKERS > 1 and len(candidates) > 1:
+            visibility_by_guard = self.delegate(candidates)
+        else:
+            visibility_by_guard = {guard: self.explore(guard) for guard in candidates}
         coverage_by_guard: dict[Point, int] = {
             guard: sum(1 for point in self.state.remaining_points if point in visibility_by_guard[guard]) for guard in candidates
         }
@@ -897,6 +1339,56 @@ class GuardPlacementStep(SequenceStep):
         sorted_candidates: list[Point] = sorted(candidates, key=key, reverse=True)
         return sorted_candidates[0], visibility_by_guard[sorted_candidates[0]]
 
+    @cached_property
+    def buffer(self) -> GeometryBuffer:
+        """Gallery geometry in shared memory for the worker processes (see ArtGallery.export)."""
+        return self.gallery.export()
+
+    @cached_property
+    def executor(self) -> ProcessPoolExecutor:
+        """
+        Process pool for parallel explore(). Each worker rebuilds a read-only GuardPlacementStep
+        from the job, user and current state once, attaching the gallery from the shared buffer
+        instead of unserializing stdout, then keeps its own visibility_by_segment cache.
+        """
+        job: dict[str, Any] = {**self.job.serialize(), "stdout": {"visibility_graph": self.graph.serialize()}}
+        return ProcessPoolExecutor(
+            max_workers=GUARD_PLACEMENT_WORKERS,
+            initializer=_initialize_explorer,
+            initargs=(job, self.user.serialize(), self.state.serialize(), self.buffer.name),
+        )
+
+    def delegate(self, candidates: list[Point]) -> dict[Point, Collection[Point, Point]]:
+        """
+        Run explore() for every candidate in the process pool and return the visibility by guard.
+        Merges the workers' new visibility_by_segment entries and work into this step, then spends
+        that work against the budget (results are kept in the cache if it suspends).
+        """
+        visibility_by_guard: dict[Point, Collection[Point, Point]] = {}
+        spent: int = 0
+        results = self.executor.map(_explore, [guard.serialize() for guard in candidates])
+        for guard, (points, segments, work) in zip(candidates, results):
+            visibility: Collection[Point, Point] = Collection(guard)
+            for point in points:
+                visibility += Point.unserialize(point)
+            for segment, visible in segments:
+                self.state.visibility_by_segment.setdefault(Segment.unserialize(segment), visible)
+            spent += work
+            visibility_by_guard[guard] = visibility
+        logger.debug("GuardPlacementStep.delegate() | job.id=%s candidates=%s work=%s", self.job.id, len(candidates), self.work + spent)
+        self.spend(spent, GUARD_PLACEMENT_MAX_WORK)
+        return visibility_by_guard
+
+    def close(self) -> None:
+        """Shut down the process pool and release the shared buffer if compete() started them."""
+        if "executor" in self.__dict__:
+            self.executor.shutdown()
+            del self.__dict__["executor"]
+        if "buffer" in self.__dict__:
+            self.buffer.close()
+            self.buffer.unlink()
+            del self.__dict__["buffer"]
+
     def analyze(self) -> None:
         """
         Build exclusivity table in state: for each guard, points visible only by that guard.
@@ -935,9 +1427,85 @@ class GuardPlacementStep(SequenceStep):
         largest_component: ConvexComponent = sorted_components[0]
         return list(largest_component)[:max_candidates]
 
+    def prune(self, candidates: list[Point]) -> list[Point]:
+        """
+        Drop candidates dominated by another candidate, before compete() explores them.
+
+        Candidate v is dominated by w when every convex component v belongs to also contains w and the
+        visibility graph shows w seeing every vertex v sees: w then sees all of v's home components,
+        their edge midpoints included, and every other vertex explore() can count for v. Only the
+        midpoints of v's other components are not compared, so v is dropped without any sees() call.
+        When v and w dominate each other only the one compete() would prefer (higher hash) is kept, so
+        at least one candidate always survives. Candidates that are not gallery vertices are never
+        pruned. Appends the number pruned to state.pruned.
+
+        For example:
+        >>> step.prune([convex_vertex, reflex_vertex])
+        [reflex_vertex]
+        """
+        candidates = list(dict.fromkeys(candidates))
+        homes: dict[Point, set[Identifier]] = {guard: set(self.state.component_id_by_point.get(hash(guard), [])) for guard in candidates}
+        # Rows include the candidate itself: a guard trivially sees the vertex it stands on.
+        rows: dict[Point, int | None] = {guard: self.graph.row(guard) for guard in candidates}
+        for guard, row in rows.items():
+            if row is not None:
+                rows[guard] = row | 1 << self.graph.index_by_point[guard]
+
+        def dominates(w: Point, v: Point) -> bool:
+            return homes[v] <= homes[w] and not rows[v] & ~rows[w]
+
+        kept: list[Point] = []
+        for v in candidates:
+            if rows[v] is None or not homes[v]:
+                kept.append(v)
+                continue
+            rivals: list[Point] = [w for w in candidates if w != v and rows[w] is not None and dominates(w, v)]
+            if any(not dominates(v, w) or hash(w) > hash(v) for w in rivals):
+                continue
+            kept.append(v)
+        self.state.pruned.append(len(candidates) - len(kept))
+        logger.debug("GuardPlacementStep.prune() | job.id=%s candidates=%s pruned=%s", self.job.id, len(candidates), self.state.pruned[-1])
+        return kept
+
     def run(self, **kwargs: Any) -> dict[str, Any]:
-        # Run until all points are covered.
+        try:
+            return self.place()
+        finally:
+            self.close()
+
+    def station(self, guard: Point, visibility: Collection[Point, Point]) -> None:
+        """Add guard and its visibility to state; drop the points it sees and the components it fully covers."""
+        self.state.guards += guard
+        self.state.visibility += visibility
+        assert len(visibility) > 0, f"GuardPlacementStep.run() | job.id={self.job.id} best_visibility={visibility}"
+        self.state.remaining_points -= set(visibility)
+        self.settle()
+
+    def settle(self) -> None:
+        """Drop the remaining components whose points and midpoints are all covered."""
+        # Reads remaining_points, already cut by the guards' visibility (avoids redundant sees() calls).
+        for cid in list(self.state.remaining_component_ids):
+            component: ConvexComponent = self.gallery.convex_components[cid]
+            if any(point in self.state.remaining_points for point in component):
+                continue
+            if any(midpoint in self.state.remaining_points for midpoint in component.midpoints):
+                continue
+            self.state.remaining_component_ids -= {cid}
+
+    def place(self) -> dict[str, Any]:
+        """Greedy placement loop behind run(); see the class docstring for the algorithm."""
+        # Guards that are the only cover of some target go first (see reduce()).
+        while self.state.forced:
+            guard: Point = self.state.forced[0]
+            if guard not in self.state.guards:
+                self.station(guard, self.explore(guard))
+            self.state.forced.pop(0)
+
+        # Run until all points are covered; once only dominated targets remain, restore() attaches them.
         while self.state.remaining_points:
+            if self.state.remaining_points <= self.state.dominated:
+                self.restore()
+                continue
             logger.debug(
                 "GuardPlacementStep.run() | job.id=%s points_remaining=%s components_remaining=%s",
                 self.job.id,
@@ -958,22 +1526,12 @@ class GuardPlacementStep(SequenceStep):
                 ]
                 candidates = list(candidates_list)
                 assert candidates, f"Candidates are all monsters: f{self.state.remaining_points}"
+            if GUARD_PLACEMENT_PRUNING:
+                candidates = self.prune(candidates)
 
             # Add the best guard and its visibility to state (gallery is read-only until completion).
             best_guard, best_visibility = self.compete(candidates)
-            self.state.guards += best_guard
-            self.state.visibility += best_visibility
-            assert len(best_visibility) > 0, f"GuardPlacementStep.run() | job.id={self.job.id} best_visibility={best_visibility}"
-            self.state.remaining_points -= set(best_visibility)
-
-            # Remove any component fully covered by best_guard using best_visibility (avoids redundant sees() calls).
-            for cid in list(self.state.remaining_component_ids):
-                component: ConvexComponent = self.gallery.convex_components[cid]
-                if any(point in self.state.remaining_points for point in component):
-                    continue
-                if any(midpoint in self.state.remaining_points for midpoint in component.midpoints):
-                    continue
-                self.state.remaining_component_ids -= {cid}
+            self.station(best_guard, best_visibility)
             logger.info("GuardPlacementStep.run() | job.id=%s points_remaining=%s", self.job.id, len(self.state.remaining_points))
 
         logger.info("GuardPlacementStep.run() | job.id=%s guards=%s", self.job.id, len(self.state.guards))
@@ -990,4 +1548,35 @@ class GuardPlacementStep(SequenceStep):
             "visibility": {str(hash(bag.key)): [p.serialize() for p in bag.items] for bag in self.state.visibility},
             "exclusivity": {str(hash(bag.key)): [p.serialize() for p in bag.items] for bag in self.state.exclusivity},
             "coverage": [p.serialize() for p in coverage],
+            "pruned": list(self.state.pruned),
+            "universe": dict(self.state.universe),
         }
+
+
+# Read-only GuardPlacementStep owned by a pool worker process (see GuardPlacementStep.executor).
+_explorer: GuardPlacementStep | None = None
+
+
+def _initialize_explorer(job: dict[str, Any], user: dict[str, Any], state: dict[str, Any], name: str) -> None:
+    """Process pool initializer: rebuild the state and attach the shared gallery once per worker process."""
+    global _explorer
+    _explorer = GuardPlacementStep(job=Job.unserialize(job), user=User.unserialize(user), state=state)
+    _explorer.gallery = ArtGallery.attach(name)
+    _explorer.suspendable = False
+
+
+def _explore(guard: SerializedPoint) -> tuple[list[SerializedPoint], list[tuple[SerializedSegment, bool]], int]:
+    """
+    Pool task: explore one guard in the worker. Returns the visible points, the
+    visibility_by_segment entries added by this call and the work spent on them.
+    """
+    assert _explorer is not None, "GuardPlacementStep worker not initialized."
+    _explorer.work = Work(0)
+    known: int = len(_explorer.state.visibility_by_segment)
+    visibility: Collection[Point, Point] = _explorer.explore(Point.unserialize(guard))
+    segments = list(_explorer.state.visibility_by_segment.items())[known:]
+    return (
+        [point.serialize() for point in visibility],
+        [(segment.serialize(), visible) for segment, visible in segments],
+        int(_explorer.work),
+    )
@@ -0,0 +1,242 @@
+"""
+Storage backends: the object store calls Bucket and Secret make, on S3 or on a local directory.
+
+Title
+-----
+Storage Module
+
+Context
+-------
+Bucket and Secret talk to their store through five S3 client calls:
+head_object, get_object, put_object, delete_object and list_objects_v2.
+Storage is that interface; the boto3 S3 client implements it as is, and
+LocalStorage implements it on the filesystem, one directory per bucket under
+BUCKET_ROOT and one file per key. data.connect() picks the backend from
+BUCKET_BACKEND ("s3" or "local"), so the pipeline, the tests and the
+benchmarks run on a developer box with no cloud access, and a single-node
+deployment skips the network round trips.
+
+LocalStorage answers like S3: missing keys raise ClientError with the codes
+Bucket already handles ("NoSuchKey" on get, "404" on head), deleting a
+missing key succeeds, and listings return keys under a prefix in
+lexicographic order, MaxKeys at a time, with an opaque NextContinuationToken
+while IsTruncated, as Page expects. Writes go to a temporary file in the
+target directory that is then renamed over the key, so readers see the old
+or the new object, never half of one. Objects of BUCKET_MMAP_THRESHOLD bytes
+or more are read through mmap: Bucket.load() decompresses or decodes the
+mapped pages without first copying the object into a bytes object.
+
+Keys are relative paths: "." and ".." segments, empty segments and absolute
+keys raise ValidationError, and a key cannot be both an object and the
+prefix of another key's directory (S3 allows "a" and "a/b"; a filesystem
+does not).
+
+Examples:
+>>> storage = LocalStorage("/tmp/buckets")
+>>> storage.put_object(Bucket="data", Key="data/galleries/g1.json", Body=b"{}", ContentType="application/json")
+>>> storage.get_object(Bucket="data", Key="data/galleries/g1.json")["Body"].read()
+b'{}'
+>>> storage.list_objects_v2(Bucket="data", Prefix="data/galleries/", MaxKeys=20)["Contents"][0]["Key"]
+'data/galleries/g1.json'
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import heapq
+import mmap
+import os
+import tempfile
+from abc import ABC
+from abc import abstractmethod
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import Iterator
+
+from botocore.exceptions import ClientError
+from exceptions import ValidationError
+from settings import BUCKET_MMAP_THRESHOLD
+
+# Prefix and suffix of the temporary files of writes in progress; listings skip them.
+TEMPORARY_PREFIX: str = ".put-"
+TEMPORARY_SUFFIX: str = ".tmp"
+
+
+class Storage(ABC):
+    """
+    The S3 client calls Bucket and Secret make, with boto3's keyword arguments and response shapes.
+    Errors are ClientError with the S3 error code in response["Error"]["Code"].
+    """
+
+    @abstractmethod
+    def head_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def get_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def put_object(self, Bucket: str, Key: str, Body: bytes, ContentType: str, ContentEncoding: str | None = None) -> dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def delete_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", MaxKeys: int = 1000, ContinuationToken: str | None = None) -> dict[str, Any]:
+        pass
+
+
+class Body:
+    """get_object() response Body: read() returns the object's bytes, or its read-only mmap for large objects."""
+
+    def __init__(self, content: bytes | mmap.mmap) -> None:
+        self.content: bytes | mmap.mmap = content
+
+    def read(self) -> bytes | mmap.mmap:
+        return self.content
+
+
+class LocalStorage(Storage):
+    """
+    Storage on the local filesystem: object Key of bucket Bucket is the file root/Bucket/Key.
+    ContentType and ContentEncoding are not stored; Bucket.load() detects the format from the content.
+
+    For example, to run the API against a local directory:
+    >>> bucket = Bucket()
+    >>> bucket._client = LocalStorage("/tmp/buckets")
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root: str = os.path.abspath(root)
+
+    def path(self, bucket: str, key: str) -> str:
+        """File of key in bucket. Raises ValidationError for keys that are not plain relative paths."""
+        if not bucket or os.sep in bucket or bucket in (".", ".."):
+            raise ValidationError(f"Invalid bucket name for local storage: {bucket!r}")
+        parts: list[str] = key.split("/")
+        if key.startswith("/") or any(part in ("", ".", "..") for part in parts) or any(os.sep in part for part in parts):
+            raise ValidationError(f"Invalid key for local storage: {key!r}")
+        return os.path.join(self.root, bucket, *parts)
+
+    def missing(self, code: str, operation: str, key: str) -> ClientError:
+        return ClientError({"Error": {"Code": code, "Message": f"Not Found: {key}"}}, operation)
+
+    def failed(self, operation: str, error: OSError) -> ClientError:
+        """Filesystem error (disk full, a key where another key's directory is, ...) as the S3 error Bucket reports."""
+        return ClientError({"Error": {"Code": "InternalError", "Message": str(error)}}, operation)
+
+    def head_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        path: str = self.path(Bucket, Key)
+        if not os.path.isfile(path):
+            raise self.missing("404", "HeadObject", Key)
+        stat: os.stat_result = os.stat(path)
+        return {"ContentLength": stat.st_size, "LastModified": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)}
+
+    def get_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        try:
+            with open(self.path(Bucket, Key), "rb") as file:
+                stat: os.stat_result = os.fstat(file.fileno())
+                content: bytes | mmap.mmap
+                if stat.st_size and stat.st_size >= BUCKET_MMAP_THRESHOLD:
+                    # The mapping outlives the file descriptor; it is unmapped when the last reference goes.
+                    content = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    content = file.read()
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError) as e:
+            raise self.missing("NoSuchKey", "GetObject", Key) from e
+        return {
+            "Body": Body(content),
+            "ContentLength": stat.st_size,
+            "LastModified": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+        }
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, ContentType: str, ContentEncoding: str | None = None) -> dict[str, Any]:
+        path: str = self.path(Bucket, Key)
+        directory: str = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=TEMPORARY_PREFIX, suffix=TEMPORARY_SUFFIX)
+            try:
+                with os.fdopen(descriptor, "wb") as file:
+                    file.write(Body)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(temporary, path)
+            except BaseException:
+                if os.path.exists(temporary):
+                    os.unlink(temporary)
+                raise
+        except OSError as e:
+            raise self.failed("PutObject", e) from e
+        return {}
+
+    def delete_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        path: str = self.path(Bucket, Key)
+        try:
+            os.unlink(path)
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            # S3 deletes of missing keys succeed.
+            return {}
+        # Drop the directories the key leaves empty, like S3 prefixes that no longer have keys.
+        top: str = os.path.join(self.root, Bucket)
+        directory: str = os.path.dirname(path)
+        while directory != top:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+        return {}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", MaxKeys: int = 1000, ContinuationToken: str | None = None) -> dict[str, Any]:
+        after: str = ""
+        if ContinuationToken is not None:
+            try:
+                after = base64.b64decode(ContinuationToken.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+            except (binascii.Error, UnicodeError, ValueError) as e:
+                raise ClientError(
+                    {"Error": {"Code": "InvalidArgument", "Message": "The continuation token provided is incorrect"}}, "ListObjectsV2"
+                ) from e
+        # One more than a page tells whether the listing is truncated.
+        keys: list[str] = heapq.nsmallest(MaxKeys + 1, (key for key in self.keys(Bucket, Prefix) if key > after))
+        page: list[str] = keys[:MaxKeys]
+        contents: list[dict[str, Any]] = []
+        for key in page:
+            try:
+                stat: os.stat_result = os.stat(self.path(Bucket, key))
+            except FileNotFoundError:
+                # Deleted since the walk; S3 pages may also hold fewer than MaxKeys keys.
+                continue
+            contents.append({"Key": key, "Size": stat.st_size, "LastModified": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)})
+        response: dict[str, Any] = {
+            "Contents": contents,
+            "IsTruncated": len(keys) > MaxKeys,
+            "KeyCount": len(contents),
+            "MaxKeys": MaxKeys,
+            "Name": Bucket,
+            "Prefix": Prefix,
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = base64.urlsafe_b64encode(page[-1].encode("utf-8")).decode("ascii")
+        return response
+
+    def keys(self, bucket: str, prefix: str) -> Iterator[str]:
+        """Keys of bucket starting with prefix, in no particular order; only the directories prefix reaches are walked."""
+        top: str = os.path.join(self.root, bucket)
+        base: str = prefix.rpartition("/")[0]
+        start: str = os.path.join(top, *base.split("/")) if base else top
+        for directory, directories, files in os.walk(start):
+            relative: str = os.path.relpath(directory, top).replace(os.sep, "/")
+            relative = "" if relative == "." else f"{relative}/"
+            directories[:] = [name for name in directories if f"{relative}{name}/".startswith(prefix) or prefix.startswith(f"{relative}{name}/")]
+            for name in files:
+                if name.startswith(TEMPORARY_PREFIX) and name.endswith(TEMPORARY_SUFFIX):
+                    continue
+                key: str = f"{relative}{name}"
+                if key.startswith(prefix):
+                    yield key
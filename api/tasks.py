@@ -9,12 +9,24 @@ Context
 -------
 This module defines the worker tasks: StartTask and ReportTask. Task is
 the base (validate, execute, handler). StartTask maps job.step_name to
-a Step (api/steps.py), runs step.run(**meta), updates job from step.job
-and merges run output into job.stdout, saves the job, and calls broadcast()
-to enqueue REPORT for the job. Returns
-FAILED if job already failed. ReportTask loads job and children, merges
-children stdout/stderr into job, sets status (SUCCESS/FAILED), saves, and
-notifies parent with REPORT. TaskRequest has job_id, user_email, and
+a Step (api/steps.py), loads the fields the step declares (Step.CONTEXT)
+from the jobs the pipeline context points at (inherit()), runs
+step.run(**meta), updates job from step.job and keeps the run output as
+the child's stdout (merged into job.stdout for root jobs), records work and wall time in job.meta
+for the cost model (costs.py), saves the job, and calls broadcast()
+to enqueue REPORT for the job. Jobs the cost model expects to finish in the
+time left run inline instead of being queued, one after the other in
+StartTask.handler() once the job that started them is reported. Steps with a fingerprint
+(Step.fingerprint(), fingerprints.py) are looked up in the step result cache
+(StepResultRepository) first and skipped on a hit, the cached output moved
+into the job's frame; hits and misses are counted in job.meta. Returns
+FAILED if job already failed. Jobs and states go through the repositories'
+unit of work (repositories.unit) of the worker message: each is read once
+and saves are written before a message is queued (Task.enqueue()).
+ReportTask loads job and children, merges
+children stdout (without Step.INTERNAL fields) and stderr into job, sets status (SUCCESS/FAILED), saves, and
+notifies parent with REPORT, evicting old cache entries when a root job
+finishes (on a STEP_CACHE_EVICTION_RATE sample of them). TaskRequest has job_id, user_email, and
 optional meta; TaskResponse has status and optional job_id, error, traceback.
 Used by workers.handler and workers (ROUTES).
 
@@ -25,17 +37,22 @@ Examples:
 
 from __future__ import annotations
 
+import random
+import time
 from abc import abstractmethod
 from functools import cached_property
 from typing import Any
 from typing import NotRequired
 
 from attributes import Attempt
+from attributes import Deadline
 from attributes import Email
 from attributes import Identifier
 from controllers import Controller
 from controllers import ControllerRequest
 from controllers import ControllerResponse
+from costs import CostModel
+from costs import Size
 from enums import Action
 from enums import Status
 from exceptions import CoordinatorStepRequiresChildrenError
@@ -47,14 +64,23 @@ from exceptions import RecordNotFoundError
 from exceptions import SequenceStepJobNotInSiblingsError
 from exceptions import SequenceStepRequiresParentError
 from exceptions import SuspendedStepError
+from fingerprints import Fingerprint
+from indexes import JobsPrivateIndex
 from logger import get_logger
 from messages import Message
 from messages import Queue
 from models import Job
 from models import JobState
+from models import StepResult
 from models import User
 from repositories import JobsRepository
 from repositories import JobStateRepository
+from repositories import StepResultRepository
+from repositories import unit
+from settings import STEP_CACHE_ENABLED
+from settings import STEP_CACHE_EVICTION_RATE
+from settings import SUSPEND_SAFETY_MARGIN_MS
+from settings import WORKER_TIMEOUT_MS
 from steps import CoordinatorStep
 from steps import MonitorStep
 from steps import ParallelStep
@@ -113,6 +139,10 @@ class Task(Controller):
         self.user: User
         self.state: dict[str, Any]
         self.attempt: Attempt
+        self.deadline: Deadline | None = None
+        self.context: Any = None
+        self.snapshot: JobState | None = None
+        self.inputs: dict[str, Any] = {}
 
     def validate(self, body: dict[str, Any]) -> TaskRequest:
         """Parse body into TaskRequest (job_id, user_email, optional meta)."""
@@ -134,12 +164,15 @@ class Task(Controller):
         """Enqueue follow-up messages (e.g. START next, REPORT parent). Overridden by StartTask and ReportTask."""
         pass
 
-    def handler(self, body: dict[str, Any] | None = None) -> TaskResponse:
+    def handler(self, body: dict[str, Any] | None = None, context: Any = None) -> TaskResponse:
         """
         Validate, load job and state (resume); if failed or max attempts, return; else execute, save, broadcast.
+        context is the Lambda context, if any; its remaining time becomes self.deadline for the step.
         """
         payload: dict[str, Any] = body if body is not None else {}
         validated: TaskRequest = self.validate(payload)
+        self.context = context
+        self.deadline = Deadline.from_context(context)
 
         self.user = User(email=validated["user_email"])
 
@@ -208,9 +241,11 @@ class Task(Controller):
         """
         try:
             job_state: JobState = self.state_repository.get(self.job.id)
+            self.snapshot = job_state
             self.state = dict(job_state.data)
             self.attempt = Attempt(job_state.attempt)
         except RecordNotFoundError:
+            self.snapshot = None
             self.state = {}
             self.attempt = Attempt(0)
 
@@ -218,10 +253,21 @@ class Task(Controller):
         """
         Persist job to repository and persist step state (current attempt) so state and job stay in sync.
         Called after execute() completes successfully; also when max continuation attempts is reached.
+        A root job (the one the user created) also gets its JobsPrivateIndex summary rewritten, so the job list
+        follows its status.
         """
         self.repository.save(self.job)
-        job_state = JobState(id=self.job.id, data=dict(self.state), attempt=self.attempt)
-        self.state_repository.save(job_state)
+        if self.job.parent_id is None:
+            JobsPrivateIndex(user_email=self.user.email).refresh(self.job)
+        self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """
+        Persist self.state at self.attempt as a delta on top of the state loaded by resume() or last checkpointed
+        (self.snapshot), so a continuation writes only what the step changed. See JobStateRepository.checkpoint().
+        """
+        job_state: JobState = JobState(id=self.job.id, data=dict(self.state), attempt=self.attempt)
+        self.snapshot = self.state_repository.checkpoint(job_state, self.snapshot)
 
     def flush(self) -> None:
         """
@@ -233,8 +279,7 @@ class Task(Controller):
         slug: str = self.job.step_name.slug
         self.job.meta[f"step:{slug}:attempt"] = int(new_attempt)
         self.attempt = new_attempt
-        job_state = JobState(id=self.job.id, data=dict(self.state), attempt=self.attempt)
-        self.state_repository.save(job_state)
+        self.checkpoint()
 
     def requeue(self) -> None:
         """
@@ -244,6 +289,11 @@ class Task(Controller):
         self.flush()
         self.save()
         message = Message(action=Action.START, job_id=self.job.id, user_email=self.user.email)
+        self.enqueue(message)
+
+    def enqueue(self, message: Message) -> None:
+        """Put message on the queue, flushing the unit of work first so the task it starts reads what this one saved."""
+        unit.flush()
         queue.put(message)
 
     @cached_property
@@ -288,51 +338,229 @@ class StartTask(Task):
     True
     """
 
+    def __init__(self):
+        super().__init__()
+        # Jobs start() found fit to run in this invocation; handler() runs them once this job is reported.
+        self.inlined: list[Identifier] = []
+
     def execute(self, validated_input: TaskRequest) -> StartTaskResponse:
         self.job.start()
 
-        # If this job has a parent, inherit parent's stdout and all previous siblings' stdout
-        # so the step has the full pipeline state (e.g. ear_clipping needs stitched from stitching).
+        # If this job has a parent, load the fields its step reads (e.g. ear_clipping needs stitched from stitching)
+        # from the jobs that produced them. The step sees them in job.stdout; only its own output is saved there.
         if self.job.parent_id is not None:
-            parent_job: Job = self.parent
-            self.job.stdout.update(parent_job.stdout)
-            sibling_ids: list[Identifier] = list(parent_job.children_ids)
-            try:
-                my_idx: int = sibling_ids.index(self.job.id)
-            except ValueError:
-                my_idx = -1
-            for prev_idx in range(my_idx):
-                prev_job: Job = self.repository.get(sibling_ids[prev_idx])
-                self.job.stdout.update(prev_job.stdout)
+            self.job.context = self.inherit()
+            self.inputs = {name: self.artifact(name) for name in self.fields() if name in self.job.context}
+            self.job.stdout.update(self.inputs)
 
-        # Execute the step, and capture any error.
+        # Execute the step (unless its output is cached), and capture any error. Work and wall time are recorded even if it suspends.
+        size: Size = self.size
         try:
             meta: dict[str, Any] = validated_input.get("meta") or {}
-            step: Step = Step.of(self.job.step_name)(job=self.job, user=self.user, state=dict(self.state))
-            stdout: dict[str, Any] = step.run(**meta)
+            fingerprint: Fingerprint | None = self.fingerprint(meta)
+            cached: dict[str, Any] | None = self.lookup(fingerprint)
+            if cached is not None:
+                self.keep(cached)
+                return {"status": self.job.status, "job_id": self.job.id}
+            step: Step = Step.of(self.job.step_name)(
+                job=self.job,
+                user=self.user,
+                state=dict(self.state),
+                deadline=self.deadline,
+                budget=self.budget(size),
+            )
+            clock: float = time.monotonic()
+            try:
+                stdout: dict[str, Any] = step.run(**meta)
+            finally:
+                self.record(step, size, time.monotonic() - clock)
             self.job = step.job
-            self.job.stdout.update(stdout)
+            self.keep(stdout)
+            self.store(fingerprint, stdout)
         except SuspendedStepError:
-            # If the step is suspended, let the supervisor handle it.
+            # If the step is suspended, let the supervisor handle it (the inputs are loaded again on resume).
+            self.keep({})
             raise
         except Exception as error:
+            self.keep({})
             self.job.fail(error)
             logger.exception("StartTask.execute() | step failed job_id=%s step_name=%s error=%s", self.job.id, self.job.step_name, error)
 
         # Handler will call save() and broadcast(); we just return status and job_id.
         return {"status": self.job.status, "job_id": self.job.id}
 
+    def inherit(self) -> dict[str, Identifier]:
+        """
+        Pipeline context of this child job: the context of the sibling before it, or for the first child the
+        parent's stdin fields (the gallery), plus this job's own output fields once it ran (see keep()).
+
+        Siblings saved before jobs had a context (kept by a partial reprocess) are read in full, as each of
+        them then holds every field produced before it.
+        """
+        sibling_ids: list[Identifier] = list(self.parent.children_ids)
+        index: int = sibling_ids.index(self.job.id) if self.job.id in sibling_ids else 0
+        context: dict[str, Identifier] = {name: self.parent.id for name in self.parent.stdin}
+        if index == 0:
+            return context
+        previous: Job = self.repository.get(sibling_ids[index - 1])
+        if previous.context:
+            return dict(previous.context)
+        for sibling_id in sibling_ids[:index]:
+            context.update({name: sibling_id for name in self.repository.get(sibling_id).stdout})
+        return context
+
+    def artifact(self, name: str) -> Any:
+        """Field name of the pipeline context: from the stdin of the parent (the gallery), or the stdout of the sibling that produced it."""
+        holder: Job = self.repository.get(self.job.context[name])
+        return holder.stdin.get(name) if holder.id == self.job.parent_id else holder.stdout.get(name)
+
+    def fields(self) -> tuple[str, ...]:
+        """Fields the step reads from the pipeline context (Step.CONTEXT), or every field in it for steps that declare none."""
+        return Step.of(self.job.step_name).CONTEXT or tuple(self.job.context)
+
+    def keep(self, stdout: dict[str, Any]) -> None:
+        """
+        Set the step output. A child job keeps only its own output in stdout, and its context points at itself
+        for those fields; a root job merges it into stdout (its children's stdout is merged by ReportTask).
+        """
+        if self.job.parent_id is None:
+            self.job.stdout.update(stdout)
+            return
+        self.job.stdout = dict(stdout)
+        self.job.context.update({name: self.job.id for name in stdout})
+
+    @property
+    def size(self) -> Size:
+        """Size of the gallery this job works on: its stdin, or the inputs a child loaded from the pipeline context."""
+        return Size.of({**self.job.stdin, **self.inputs})
+
+    def fingerprint(self, meta: dict[str, Any]) -> Fingerprint | None:
+        """Cache key and frame of this step run (Step.fingerprint()), or None when the cache is off or the step is not cacheable."""
+        if not STEP_CACHE_ENABLED:
+            return None
+        try:
+            return Step.of(self.job.step_name).fingerprint(self.job, **meta)
+        except Exception as error:
+            logger.warning("StartTask.fingerprint() | job_id=%s error=%s", self.job.id, error)
+            return None
+
+    def lookup(self, fingerprint: Fingerprint | None) -> dict[str, Any] | None:
+        """
+        Cached output moved into this job's frame, or None on a miss. Only looked up when the step starts fresh
+        (no saved state); counts step:{slug}:cache_hits or step:{slug}:cache_misses in job.meta. Cache errors count as misses.
+        """
+        if fingerprint is None or self.state:
+            return None
+        prefix: str = f"step:{self.job.step_name.slug}:"
+        stdout: dict[str, Any] | None = None
+        try:
+            stdout = fingerprint.frame.restore(self.cache.get(Identifier(fingerprint.key)).stdout)
+        except RecordNotFoundError:
+            pass
+        except Exception as error:
+            logger.warning("StartTask.lookup() | cache read failed job_id=%s error=%s", self.job.id, error)
+        counter: str = f"{prefix}cache_hits" if stdout is not None else f"{prefix}cache_misses"
+        self.job.meta[counter] = self.job.meta.get(counter, 0) + 1
+        return stdout
+
+    def store(self, fingerprint: Fingerprint | None, stdout: dict[str, Any]) -> None:
+        """Cache stdout, moved into the normalized frame, once the step completed (never raises: the job does not depend on the cache)."""
+        if fingerprint is None:
+            return
+        try:
+            result: StepResult = StepResult(id=Identifier(fingerprint.key), step_name=self.job.step_name, stdout=fingerprint.frame.normalize(stdout))
+            self.cache.save(result)
+        except Exception as error:
+            logger.warning("StartTask.store() | cache write failed job_id=%s error=%s", self.job.id, error)
+
+    @cached_property
+    def cache(self) -> StepResultRepository:
+        """Shared step result cache (see Step.fingerprint())."""
+        return StepResultRepository()
+
+    def budget(self, size: Size) -> int | None:
+        """
+        Work budget for this invocation from the cost model, or None to keep the step's *_MAX_WORK (also for
+        galleries beyond the sizes the model was fitted on). Only used without a deadline; with one the step
+        watches the clock instead (Step.check()).
+        """
+        if self.deadline is not None:
+            return None
+        return CostModel.current().budget(self.job.step_name, size, (WORKER_TIMEOUT_MS - SUSPEND_SAFETY_MARGIN_MS) / 1000)
+
+    def record(self, step: Step, size: Size, seconds: float) -> None:
+        """
+        Add this invocation's work and wall time to job.meta (step:{slug}:work, :wall_time, :invocations)
+        and store the gallery size (:vertices, :obstacles). The first invocation (attempt 0) resets the totals.
+        These are the samples CostModel.fit() is refreshed from.
+        """
+        prefix: str = f"step:{self.job.step_name.slug}:"
+        fresh: bool = int(self.attempt) == 0
+        for key, value in (("work", int(step.work)), ("wall_time", round(seconds, 3)), ("invocations", 1)):
+            self.job.meta[f"{prefix}{key}"] = value if fresh else self.job.meta.get(f"{prefix}{key}", 0) + value
+        self.job.meta[f"{prefix}vertices"] = size.vertices
+        self.job.meta[f"{prefix}obstacles"] = size.obstacles
+
+    def inline(self, job_id: Identifier) -> bool:
+        """
+        True if job_id should run inside this invocation instead of being queued: there is a deadline and
+        the cost model predicts its step finishes before the safety margin.
+        """
+        if self.deadline is None:
+            return False
+        seconds: float = (self.deadline.remaining() - SUSPEND_SAFETY_MARGIN_MS) / 1000
+        if seconds <= 0:
+            return False
+        job: Job = self.repository.get(job_id)
+        # Children do not hold the gallery (see inherit()); they work on the same one as this job.
+        size: Size = Size.of(job.stdin) if job.stdin.get("boundary") else self.size
+        return CostModel.current().fits(job.step_name, size, seconds)
+
     def start(self, job_id: Identifier) -> None:
-        """Put a message to START the given job_id."""
+        """
+        Leave job_id to handler() to run inline when the cost model says it fits in the time left (see inline());
+        otherwise put a message to START it.
+        """
+        if self.inline(job_id):
+            self.inlined.append(job_id)
+            return
         logger.debug("StartTask.start() | job_id=%s", job_id)
         message: Message = Message(action=Action.START, job_id=job_id, user_email=self.user.email)
-        queue.put(message)
+        self.enqueue(message)
+
+    def handler(self, body: dict[str, Any] | None = None, context: Any = None) -> TaskResponse:
+        """
+        Task.handler(), then the jobs start() left to run inline, one after the other in this loop: each runs after
+        broadcast() put the REPORT of the job that started it, and the ones it starts inline join the loop instead
+        of nesting another handler. A job that no longer fits in the time left is queued instead.
+        """
+        response: TaskResponse = super().handler(body, context)
+        while self.inlined:
+            job_id: Identifier = self.inlined.pop(0)
+            if not self.inline(job_id):
+                self.enqueue(Message(action=Action.START, job_id=job_id, user_email=self.user.email))
+                continue
+            logger.info("StartTask.handler() | running inline job_id=%s remaining=%s", job_id, self.deadline.remaining())
+            task: StartTask = StartTask()
+            Task.handler(task, body={"job_id": str(job_id), "user_email": str(self.user.email)}, context=context)
+            self.inlined.extend(task.inlined)
+        return response
+
+    def resumed(self) -> Identifier:
+        """
+        First child of self.job that has not succeeded: children_ids[0] on a fresh run, or the child a partial
+        reprocess (ReprocessingJobMutation with step_name) deleted first, the ones before it being kept.
+        """
+        for child_id in self.job.children_ids:
+            if not self.repository.get(child_id).is_finished():
+                return child_id
+        return self.job.children_ids[0]
 
     def report(self) -> None:
         """Put a message to REPORT self.job.id so ReportTask runs (aggregate or notify parent)."""
         logger.debug("StartTask.report() | job_id=%s", self.job.id)
         message: Message = Message(action=Action.REPORT, job_id=self.job.id, user_email=self.user.email)
-        queue.put(message)
+        self.enqueue(message)
 
     def broadcast(self) -> None:
         """
@@ -343,7 +571,7 @@ class StartTask(Task):
         Otherwise builds the step via Step.of(self.job.step_name) to decide what to enqueue.
 
         Step-type behavior (a step may satisfy more than one; each branch runs independently):
-        - CoordinatorStep: enqueue START for the first child (self.job.children_ids[0]). Raises if job has no children.
+        - CoordinatorStep: enqueue START for the first child that has not succeeded (see resumed()). Raises if job has no children.
         - SequenceStep: require job has a parent; find this job's index in parent.children_ids. If not last,
           enqueue START for the next sibling. Parent notification is done by self.report() when ReportTask runs.
         - MonitorStep: enqueue START for every child in self.job.children_ids. Raises if job has no children.
@@ -353,18 +581,18 @@ class StartTask(Task):
             return
         step: Step = Step.of(self.job.step_name)(job=self.job, user=self.user, state=dict(self.state))
 
-        # CoordinatorStep: START the first child.
+        # CoordinatorStep: START the first child that has not succeeded (children kept by a partial reprocess are skipped).
         if isinstance(step, CoordinatorStep):
             if not self.job.children_ids:
                 raise CoordinatorStepRequiresChildrenError("CoordinatorStep requires children")
-            self.start(self.job.children_ids[0])
+            self.start(self.resumed())
 
         # SequenceStep: START next sibling (if any); REPORT parent is done by self.report() via ReportTask.
         if isinstance(step, SequenceStep):
             if self.job.parent_id is None:
                 raise SequenceStepRequiresParentError("SequenceStep requires parent")
             try:
-                parent_job: Job = self.repository.get(self.job.parent_id)
+                parent_job: Job = self.parent
             except RecordNotFoundError:
                 raise SequenceStepRequiresParentError("SequenceStep requires parent")
             sibling_ids: list[Identifier] = list(parent_job.children_ids)
@@ -393,7 +621,8 @@ class StartTask(Task):
 class ReportTask(Task):
     """
     Load job by id. If job is failed, broadcast to parent and return.
-    Load all children (no try/except). Merge children stdout into job.stdout (dict update; keys override).
+    Load all children (no try/except). Merge children stdout into job.stdout (dict update; keys override), leaving
+    out the fields each child's step keeps internal (Step.INTERNAL, e.g. visibility_graph).
     If any child failed: merge children stderr into job.stderr, job.status = FAILED.
     If any child pending: leave status unchanged.
     Else: job.status = SUCCESS.
@@ -409,9 +638,10 @@ class ReportTask(Task):
     def execute(self, validated_input: TaskRequest) -> ReportTaskResponse:
         logger.debug("ReportTask.execute() | aggregating job_id=%s children=%d", self.job.id, len(self.children))
 
-        # Merge children stdout and meta into job.stdout and job.meta.
+        # Merge children stdout (without the fields their steps keep internal) and meta into job.stdout and job.meta.
         for child in self.children:
-            self.job.stdout.update(child.stdout)
+            internal: tuple[str, ...] = Step.of(child.step_name).INTERNAL
+            self.job.stdout.update({name: value for name, value in child.stdout.items() if name not in internal})
             self.job.meta.update(child.meta)
 
         # If any child failed, merge children stderr into job.stderr and set job.status to FAILED.
@@ -431,9 +661,24 @@ class ReportTask(Task):
             # All children are successful, so set job.status to SUCCESS and finish the job.
             self.job.finish()
             logger.info("ReportTask.execute() | job completed job_id=%s status=SUCCESS", self.job.id)
+            if self.job.parent_id is None:
+                self.evict()
 
         return {"status": self.job.status, "job_id": self.job.id, "job": self.job.serialize()}
 
+    def evict(self) -> None:
+        """
+        Trim the step result cache by age and size (StepResultRepository.evict()) on a random
+        STEP_CACHE_EVICTION_RATE of finished root jobs, since every run lists the whole cache.
+        Failures are logged, not raised.
+        """
+        if not STEP_CACHE_ENABLED or random.random() >= STEP_CACHE_EVICTION_RATE:
+            return
+        try:
+            StepResultRepository().evict()
+        except Exception as error:
+            logger.warning("ReportTask.evict() | cache eviction failed job_id=%s error=%s", self.job.id, error)
+
     def broadcast(self) -> None:
         """
         Put a REPORT message for the parent; no-op if parent_id is None or job is pending.
@@ -447,4 +692,4 @@ class ReportTask(Task):
         if self.job.parent_id is None or self.job.is_pending():
             return
         message: Message = Message(action=Action.REPORT, job_id=self.job.parent_id, user_email=self.user.email)
-        queue.put(message)
+        self.enqueue(message)
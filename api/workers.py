@@ -30,6 +30,7 @@ from typing import Type
 from attributes import Email
 from attributes import Identifier
 from attributes import ReceiptHandle
+from codec import codec
 from enums import Action
 from enums import Status
 from interfaces import Serializable
@@ -37,6 +38,7 @@ from logger import configure_logging
 from logger import get_logger
 from messages import Message
 from messages import Queue
+from repositories import unit
 from tasks import ReportTask
 from tasks import StartTask
 from tasks import Task
@@ -108,7 +110,7 @@ class WorkerRequest(Serializable[dict[str, Any]]):
         if "body" in data:
             body: str = data.get("body", "{}")
             try:
-                message_data: dict[str, Any] = json.loads(body) if body else {}
+                message_data: dict[str, Any] = codec.decode(body) if body else {}
             except json.JSONDecodeError:
                 logger.warning("Invalid JSON in SQS message body: %s", body)
                 message_data = {}
@@ -164,6 +166,7 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     messages are logged and appended to results with an "error" key; the message is
     still committed. If task execution fails, the exception is logged and the message
     is not committed so SQS can retry. The worker always processes all messages.
+    Each message runs in the repositories' unit of work (repositories.unit).
 
     Returns a JSON-serializable dict with key "results" (list of task result dicts).
     """
@@ -182,7 +185,9 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
                 action.value,
                 request.job_id,
             )
-            out: TaskResponse = ROUTES[action]().handler(body=body)
+            # Jobs and states read and saved while processing the message are shared and written once (see UnitOfWork).
+            with unit:
+                out: TaskResponse = ROUTES[action]().handler(body=body, context=context)
         except Exception as err:
             logger.exception("handler.handler() | processing request failed error=%s", err)
             out = {"status": Status.FAILED, "error": str(err)}
@@ -196,5 +201,4 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
             queue.commit(request.message)
 
     response = WorkerResponse(results=results)
-    payload = response.serialize()
-    return json.loads(json.dumps(payload, default=str))
+    return response.serialize()
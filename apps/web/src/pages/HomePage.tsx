@@ -49,8 +49,8 @@ const Cell = ({ gallery, height = DEFAULT_CELL_HEIGHT }: CellProps) => {
         typeof gallery.title === "string" && gallery.title.trim()
             ? String(gallery.title)
             : t("editor.untitledGallery");
-    const stitchedPointsCount = gallery.artGallery.stitched?.points?.length ?? 0;
-    const guardsCount = gallery.artGallery.guards.length;
+    const stitchedPointsCount = gallery.stitchedCount ?? gallery.artGallery.stitched?.points?.length ?? 0;
+    const guardsCount = gallery.guardCount ?? gallery.artGallery.guards.length;
 
     return (
         <div
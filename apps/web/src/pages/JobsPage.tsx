@@ -40,8 +40,8 @@ const Cell = ({ job }: CellProps) => {
             : t("editor.untitledGallery");
     const displayStatus = getDisplayStatus(job);
     const isSuccess = displayStatus === Status.SUCCESS && job.artGallery != null;
-    const stitchedPointsCount = job.artGallery?.stitched?.points?.length ?? 0;
-    const guardsCount = job.artGallery?.guards?.length ?? 0;
+    const stitchedPointsCount = job.stitchedCount ?? job.artGallery?.stitched?.points?.length ?? 0;
+    const guardsCount = job.guardCount ?? job.artGallery?.guards?.length ?? 0;
 
     return (
         <Container padded spaced rounded left pulse={displayStatus === Status.PENDING} onClick={() => navigate(`/jobs/${job.id}`)}>
@@ -0,0 +1,109 @@
+"""
+Benchmark: encode and decode time of the stdlib JSON path and of each codec (codec.py).
+
+Title
+-----
+Codec Benchmark
+
+Context
+-------
+Runs the pipeline in-process on each gallery (a "module:VARIABLE" reference
+to a stdin dict, e.g. tests.test_polygon_monster:POLYGON_MONSTER_STDIN) and
+times, on the final job stdout (what Bucket.save() writes for a job) and on
+its published gallery as a model (what an API response encodes):
+the previous stdlib path (json.dumps(default=str), plus the worker's
+json.loads(json.dumps(...)) round trip) and encode/decode with
+StandardCodec ("json") and OrjsonCodec ("orjson").
+
+Examples:
+>>> python benchmarks/bench_codec.py tests.test_polygon_monster:POLYGON_MONSTER_STDIN tests.test_polygon_fire:FIRE_STDIN --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+ROOT: Path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "api"))
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DATA_BUCKET_NAME", "bench-data-bucket")
+for name in ("STITCHING_MAX_WORK", "EAR_CLIPPING_MAX_WORK", "CONVEX_COMPONENT_OPTIMIZATION_MAX_WORK", "GUARD_PLACEMENT_MAX_WORK"):
+    os.environ.setdefault(name, "999999999")
+
+from attributes import Email  # noqa: E402
+from attributes import Identifier  # noqa: E402
+from codec import Codec  # noqa: E402
+from enums import StepName  # noqa: E402
+from models import ArtGallery  # noqa: E402
+from models import Job  # noqa: E402
+from models import User  # noqa: E402
+from steps import Step  # noqa: E402
+
+PIPELINE: list[StepName] = [
+    StepName.VALIDATE_POLYGONS,
+    StepName.STITCHING,
+    StepName.EAR_CLIPPING,
+    StepName.CONVEX_COMPONENT_OPTIMIZATION,
+    StepName.GUARD_PLACEMENT,
+]
+
+
+def stdout_of(stdin: dict[str, Any]) -> dict[str, Any]:
+    """Final job stdout of the pipeline on stdin."""
+    user: User = User(email=Email("bench@example.com"))
+    stdout: dict[str, Any] = {}
+    for step_name in PIPELINE:
+        job: Job = Job(id=Identifier("bench"), step_name=step_name, stdin=dict(stdin), stdout=dict(stdout))
+        stdout.update(Step.of(step_name)(job=job, user=user, state={}).run())
+    return {**stdin, **stdout}
+
+
+def best(f: Callable[[], object], repeat: int) -> float:
+    """Fastest of repeat runs, in milliseconds."""
+    timings: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        f()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("galleries", nargs="+", help="module:VARIABLE references to gallery stdin dicts")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    codecs: list[Codec] = [Codec.of("json"), Codec.of("orjson")]
+    print(f"{'gallery':<28} {'value':<8} {'path':<18} {'bytes':>10} {'encode ms':>10} {'decode ms':>10}")
+    for reference in args.galleries:
+        module, variable = reference.split(":")
+        stdout: dict[str, Any] = stdout_of(getattr(importlib.import_module(module), variable))
+        gallery: ArtGallery = ArtGallery.unserialize({**stdout, "id": "bench", "owner_job_id": "bench"}, trusted=True)
+        # The stdlib path encoded gallery.serialize(); the codecs take the model itself (native() serializes it).
+        for label, value, legacy in (("stdout", stdout, lambda: stdout), ("gallery", gallery, gallery.serialize)):
+            text: str = json.dumps(legacy(), default=str)
+            encode: float = best(lambda: json.dumps(legacy(), default=str), args.repeat)
+            decode: float = best(lambda: json.loads(text), args.repeat)
+            print(f"{variable:<28} {label:<8} {'stdlib default=str':<18} {len(text):>10} {encode:>10.2f} {decode:>10.2f}")
+            if label == "stdout":
+                trip: float = best(lambda: json.loads(json.dumps(legacy(), default=str)), args.repeat)
+                print(f"{variable:<28} {label:<8} {'stdlib round trip':<18} {'':>10} {trip:>10.2f} {'':>10}")
+            for codec in codecs:
+                body: bytes = codec.encode(value)
+                assert codec.decode(body) == json.loads(text)
+                encode = best(lambda: codec.encode(value), args.repeat)
+                decode = best(lambda: codec.decode(body), args.repeat)
+                print(f"{variable:<28} {label:<8} {codec.NAME:<18} {len(body):>10} {encode:>10.2f} {decode:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: stored size and Bucket.save()/Bucket.load() time with and without gzip compression.
+
+Title
+-----
+Compression Benchmark
+
+Context
+-------
+Runs the pipeline in-process on each gallery (a "module:VARIABLE" reference
+to a stdin dict, e.g. tests.test_polygon_monster:POLYGON_MONSTER_STDIN) and
+stores, through Bucket over an in-memory client, the two large objects a
+finished job leaves: the published gallery (ArtGalleryRepository's indexed
+JSON) and the job stdout (JobsRepository's packed binary). For each it
+reports stored bytes, save time and load time for the legacy pretty-printed
+JSON (indent=2, before compression), and for the current Bucket with
+compression off (BUCKET_COMPRESSION_THRESHOLD above the object size) and on.
+
+Examples:
+>>> python benchmarks/bench_compression.py tests.test_polygon_monster:POLYGON_MONSTER_STDIN tests.test_polygon_fire:FIRE_STDIN --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+ROOT: Path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "api"))
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DATA_BUCKET_NAME", "bench-data-bucket")
+for name in ("STITCHING_MAX_WORK", "EAR_CLIPPING_MAX_WORK", "CONVEX_COMPONENT_OPTIMIZATION_MAX_WORK", "GUARD_PLACEMENT_MAX_WORK"):
+    os.environ.setdefault(name, "999999999")
+
+import data  # noqa: E402
+from attributes import Email  # noqa: E402
+from attributes import Identifier  # noqa: E402
+from enums import Encoding  # noqa: E402
+from enums import StepName  # noqa: E402
+from models import ArtGallery  # noqa: E402
+from models import Job  # noqa: E402
+from models import User  # noqa: E402
+from steps import Step  # noqa: E402
+
+PIPELINE: list[StepName] = [
+    StepName.VALIDATE_POLYGONS,
+    StepName.STITCHING,
+    StepName.EAR_CLIPPING,
+    StepName.CONVEX_COMPONENT_OPTIMIZATION,
+    StepName.GUARD_PLACEMENT,
+]
+
+
+class MemoryS3:
+    """In-memory stand-in for the boto3 S3 client calls Bucket.save() and Bucket.load() make."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, ContentType: str, ContentEncoding: str | None = None) -> dict[str, Any]:
+        self.objects[Key] = Body
+        return {}
+
+    def get_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+
+def stdout_of(stdin: dict[str, Any]) -> dict[str, Any]:
+    """Final job stdout of the pipeline on stdin."""
+    user: User = User(email=Email("bench@example.com"))
+    stdout: dict[str, Any] = {}
+    for step_name in PIPELINE:
+        job: Job = Job(id=Identifier("bench"), step_name=step_name, stdin=dict(stdin), stdout=dict(stdout))
+        stdout.update(Step.of(step_name)(job=job, user=user, state={}).run())
+    return {**stdin, **stdout}
+
+
+def best(f: Callable[[], object], repeat: int) -> float:
+    """Fastest of repeat runs, in milliseconds."""
+    timings: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        f()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("galleries", nargs="+", help="module:VARIABLE references to gallery stdin dicts")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    s3: MemoryS3 = MemoryS3()
+    bucket: data.Bucket = data.Bucket()
+    bucket._client = s3
+    threshold: int = data.BUCKET_COMPRESSION_THRESHOLD
+    print(f"{'gallery':<28} {'object':<8} {'format':<14} {'bytes':>10} {'save ms':>9} {'load ms':>9}")
+    for reference in args.galleries:
+        module, variable = reference.split(":")
+        stdout: dict[str, Any] = stdout_of(getattr(importlib.import_module(module), variable))
+        gallery: dict[str, Any] = ArtGallery.unserialize({**stdout, "id": "bench", "owner_job_id": "bench"}, trusted=True).serialize_indexed()
+        for label, value, encoding in (("gallery", gallery, Encoding.JSON), ("stdout", stdout, Encoding.BINARY)):
+            text: bytes = json.dumps(value, indent=2).encode("utf-8")
+            save: float = best(lambda: json.dumps(value, indent=2).encode("utf-8"), args.repeat)
+            load: float = best(lambda: json.loads(text), args.repeat)
+            print(f"{variable:<28} {label:<8} {'legacy json':<14} {len(text):>10} {save:>9.2f} {load:>9.2f}")
+            for mode, limit in ((encoding.value, 1 << 62), (f"{encoding.value}+gzip", threshold)):
+                data.BUCKET_COMPRESSION_THRESHOLD = limit
+                key: str = f"bench/{variable}/{label}/{mode}.json"
+                bucket.save(key, value, encoding=encoding)
+                assert bucket.load(key) == json.loads(text)
+                save = best(lambda: bucket.save(key, value, encoding=encoding), args.repeat)
+                load = best(lambda: bucket.load(key), args.repeat)
+                print(f"{variable:<28} {label:<8} {mode:<14} {len(s3.objects[key]):>10} {save:>9.2f} {load:>9.2f}")
+    data.BUCKET_COMPRESSION_THRESHOLD = threshold
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: legacy vs indexed (shared vertex table) art gallery serialization.
+
+Title
+-----
+Gallery Format Benchmark
+
+Context
+-------
+Runs the pipeline in-process on each gallery (a "module:VARIABLE" reference
+to a stdin dict, e.g. tests.test_polygon_monster:POLYGON_MONSTER_STDIN), builds
+the ArtGallery that publishing stores, and compares ArtGallery.serialize()
+with ArtGallery.serialize_indexed(): JSON size, json.loads time, and
+ArtGallery.unserialize time on the parsed dict.
+
+Examples:
+>>> python benchmarks/bench_gallery_format.py tests.test_polygon_monster:POLYGON_MONSTER_STDIN --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+ROOT: Path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "api"))
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+for name in ("STITCHING_MAX_WORK", "EAR_CLIPPING_MAX_WORK", "CONVEX_COMPONENT_OPTIMIZATION_MAX_WORK", "GUARD_PLACEMENT_MAX_WORK"):
+    os.environ.setdefault(name, "999999999")
+
+from bench_packing import best  # noqa: E402
+from bench_packing import stdout_of  # noqa: E402
+from models import ArtGallery  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("galleries", nargs="+", help="module:VARIABLE references to gallery stdin dicts")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    print(f"{'gallery':<32} {'format':<8} {'bytes':>9} {'parse ms':>9} {'decode ms':>10}")
+    for reference in args.galleries:
+        module, variable = reference.split(":")
+        stdout: dict[str, Any] = stdout_of(getattr(importlib.import_module(module), variable))
+        gallery: ArtGallery = ArtGallery.unserialize({**stdout, "id": "bench", "owner_job_id": "bench"})
+        for label, data in (("legacy", gallery.serialize()), ("indexed", gallery.serialize_indexed())):
+            text: str = json.dumps(data)
+            parse: float = best(lambda: json.loads(text), args.repeat)
+            decode: float = best(lambda: ArtGallery.unserialize(data), args.repeat)
+            print(f"{variable:<32} {label:<8} {len(text):>9} {parse:>9.2f} {decode:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: guard placement with and without candidate pruning.
+
+Title
+-----
+Guard Pruning Benchmark
+
+Context
+-------
+GuardPlacementStep.prune() drops candidates dominated by another candidate
+(component membership and visibility graph rows) before compete() explores
+them. This script runs the pipeline in-process on each gallery (a
+"module:VARIABLE" reference to a stdin dict) up to guard placement, then
+runs GuardPlacementStep with GUARD_PLACEMENT_PRUNING off and on and reports,
+for each: the explore() calls made, the candidates pruned, the guards placed
+and the best wall time.
+
+Examples:
+>>> python benchmarks/bench_guard_pruning.py tests.test_polygon_monster:POLYGON_MONSTER_STDIN --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sys
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+ROOT: Path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "api"))
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+for name in ("STITCHING_MAX_WORK", "EAR_CLIPPING_MAX_WORK", "CONVEX_COMPONENT_OPTIMIZATION_MAX_WORK", "GUARD_PLACEMENT_MAX_WORK"):
+    os.environ.setdefault(name, "999999999")
+
+from attributes import Email  # noqa: E402
+from attributes import Identifier  # noqa: E402
+from bench_packing import PIPELINE  # noqa: E402
+from bench_packing import best  # noqa: E402
+from enums import StepName  # noqa: E402
+from models import Job  # noqa: E402
+from models import User  # noqa: E402
+from steps import GuardPlacementStep  # noqa: E402
+from steps import Step  # noqa: E402
+
+USER: User = User(email=Email("bench@example.com"))
+
+
+def job(stdin: dict[str, Any]) -> Job:
+    """Run the pipeline on stdin and return the job guard placement is started with."""
+    stdout: dict[str, Any] = {}
+    for step_name in PIPELINE:
+        current: Job = Job(id=Identifier("bench"), step_name=step_name, stdin=dict(stdin), stdout=dict(stdout))
+        if step_name == StepName.GUARD_PLACEMENT:
+            return current
+        stdout.update(Step.of(step_name)(job=current, user=USER, state={}).run())
+    raise ValueError("PIPELINE has no guard placement step")
+
+
+def place(start: Job, pruning: bool) -> tuple[int, int, int]:
+    """Run guard placement once; return the explore() calls, the candidates pruned and the guards placed."""
+    explore = GuardPlacementStep.explore
+    calls: list[int] = [0]
+
+    def counted(self: GuardPlacementStep, guard: Any) -> Any:
+        calls[0] += 1
+        return explore(self, guard)
+
+    with patch("steps.GUARD_PLACEMENT_PRUNING", pruning), patch.object(GuardPlacementStep, "explore", counted):
+        step: GuardPlacementStep = GuardPlacementStep(job=Job.unserialize(start.serialize()), user=USER, state={})
+        out: dict[str, Any] = step.run()
+    return calls[0], sum(out["pruned"]), len(out["guards"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("galleries", nargs="+", help="module:VARIABLE references to gallery stdin dicts")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{'gallery':<24} {'pruning':<8} {'explore()':>10} {'pruned':>7} {'guards':>7} {'ms':>10}")
+    for reference in args.galleries:
+        module, variable = reference.split(":")
+        start: Job = job(getattr(importlib.import_module(module), variable))
+        for pruning in (False, True):
+            explored, pruned, guards = place(start, pruning)
+            elapsed: float = best(lambda: place(start, pruning), args.repeat)
+            print(f"{variable[:24]:<24} {'on' if pruning else 'off':<8} {explored:>10} {pruned:>7} {guards:>7} {elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
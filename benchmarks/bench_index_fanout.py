@@ -0,0 +1,129 @@
+"""
+Benchmark: sequential vs concurrent loading of an index page (Bucket.load_many(), Repository.get_many()).
+
+Title
+-----
+Index Fan-out Benchmark
+
+Context
+-------
+Fills a local S3 stand-in (an in-memory client that sleeps --latency
+milliseconds per request, like a round trip to S3) with --galleries
+published galleries and their ArtGalleryPublicIndex entries, then times
+ArtGalleryPublicIndex.search() of one home page (--limit entries and their
+galleries) and ArtGalleryRepository.search() of one page, with
+BUCKET_MAX_WORKERS=1 (one request at a time) and with each --workers value.
+
+Examples:
+>>> python benchmarks/bench_index_fanout.py --galleries 40 --limit 20 --latency 20 --workers 4 8 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+ROOT: Path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "api"))
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DATA_BUCKET_NAME", "bench-data-bucket")
+
+import data  # noqa: E402
+import indexes  # noqa: E402
+import repositories  # noqa: E402
+from attributes import Countdown  # noqa: E402
+from attributes import Identifier  # noqa: E402
+from attributes import Limit  # noqa: E402
+from models import ArtGallery  # noqa: E402
+
+from tests.test_polygon_boxes import POLYGON_BOXES_STDIN  # noqa: E402
+
+
+class LocalS3:
+    """In-memory stand-in for the boto3 S3 client calls Bucket makes; every request sleeps latency seconds."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency: float = latency
+        self.objects: dict[str, bytes] = {}
+        self.requests: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+    def request(self) -> None:
+        with self.lock:
+            self.requests += 1
+        time.sleep(self.latency)
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, ContentType: str, ContentEncoding: str | None = None) -> dict[str, Any]:
+        self.objects[Key] = Body
+        return {}
+
+    def get_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        self.request()
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str, MaxKeys: int, ContinuationToken: str | None = None) -> dict[str, Any]:
+        self.request()
+        keys: list[str] = sorted(key for key in self.objects if key.startswith(Prefix))
+        start: int = int(ContinuationToken or 0)
+        page: list[str] = keys[start : start + MaxKeys]
+        truncated: bool = start + MaxKeys < len(keys)
+        return {
+            "Contents": [{"Key": key, "Size": len(self.objects[key])} for key in page],
+            "IsTruncated": truncated,
+            "NextContinuationToken": str(start + MaxKeys),
+        }
+
+
+def fill(galleries: int) -> None:
+    """Publish galleries copies of the boxes gallery, each with an index entry."""
+    for i in range(galleries):
+        gallery: ArtGallery = ArtGallery.unserialize({**POLYGON_BOXES_STDIN, "id": f"g{i:04d}", "title": f"Gallery {i}", "owner_job_id": "bench"})
+        repositories.ArtGalleryRepository().save(gallery)
+        indexes.ArtGalleryPublicIndex().index(index_id=Identifier(f"{Countdown.from_timestamp(gallery.created_at)}-{i:04d}"), real_id=gallery.id)
+
+
+def best(f: Callable[[], object], repeat: int) -> float:
+    """Fastest of repeat runs, in milliseconds."""
+    timings: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        f()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--galleries", type=int, default=40)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=20.0, help="milliseconds per S3 request")
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    s3: LocalS3 = LocalS3(latency=args.latency / 1000)
+    repositories.bucket._client = s3
+    indexes.bucket._client = s3
+    fill(args.galleries)
+
+    print(f"{'listing':<28} {'workers':>8} {'requests':>9} {'ms':>9}")
+    for label, listing in (
+        ("ArtGalleryPublicIndex.search", lambda: indexes.ArtGalleryPublicIndex().search(limit=Limit(args.limit))),
+        ("ArtGalleryRepository.search", lambda: repositories.ArtGalleryRepository().search(limit=Limit(args.limit))),
+    ):
+        for workers in [1, *args.workers]:
+            data.BUCKET_MAX_WORKERS = workers
+            s3.requests = 0
+            elapsed: float = best(listing, args.repeat)
+            print(f"{label:<28} {workers:>8} {s3.requests // args.repeat:>9} {elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
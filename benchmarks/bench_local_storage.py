@@ -0,0 +1,124 @@
+"""
+Benchmark: Bucket.save()/Bucket.load() on the local filesystem backend, with and without mmap reads.
+
+Title
+-----
+Local Storage Benchmark
+
+Context
+-------
+Runs the pipeline in-process on each gallery (a "module:VARIABLE" reference
+to a stdin dict, e.g. tests.test_polygon_monster:POLYGON_MONSTER_STDIN) and
+stores its job stdout (packed binary) and published gallery (JSON) through
+Bucket over LocalStorage in a temporary directory (or --root). For each it
+reports stored bytes, save time (write to a temporary file, fsync, rename)
+and load time with BUCKET_MMAP_THRESHOLD off (read()) and on (mmap), each
+with compression on and off (BUCKET_COMPRESSION_THRESHOLD above the object
+size). It then times Bucket.search() pages of --limit keys over --keys
+objects, as listings and index pages do.
+
+Examples:
+>>> python benchmarks/bench_local_storage.py tests.test_polygon_monster:POLYGON_MONSTER_STDIN --repeat 20 --keys 2000 --limit 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+ROOT: Path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "api"))
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DATA_BUCKET_NAME", "bench-data-bucket")
+for name in ("STITCHING_MAX_WORK", "EAR_CLIPPING_MAX_WORK", "CONVEX_COMPONENT_OPTIMIZATION_MAX_WORK", "GUARD_PLACEMENT_MAX_WORK"):
+    os.environ.setdefault(name, "999999999")
+
+import data  # noqa: E402
+import storage  # noqa: E402
+from attributes import Email  # noqa: E402
+from attributes import Identifier  # noqa: E402
+from attributes import Offset  # noqa: E402
+from enums import Encoding  # noqa: E402
+from enums import StepName  # noqa: E402
+from models import ArtGallery  # noqa: E402
+from models import Job  # noqa: E402
+from models import User  # noqa: E402
+from steps import Step  # noqa: E402
+
+PIPELINE: list[StepName] = [
+    StepName.VALIDATE_POLYGONS,
+    StepName.STITCHING,
+    StepName.EAR_CLIPPING,
+    StepName.CONVEX_COMPONENT_OPTIMIZATION,
+    StepName.GUARD_PLACEMENT,
+]
+
+
+def stdout_of(stdin: dict[str, Any]) -> dict[str, Any]:
+    """Final job stdout of the pipeline on stdin."""
+    user: User = User(email=Email("bench@example.com"))
+    stdout: dict[str, Any] = {}
+    for step_name in PIPELINE:
+        job: Job = Job(id=Identifier("bench"), step_name=step_name, stdin=dict(stdin), stdout=dict(stdout))
+        stdout.update(Step.of(step_name)(job=job, user=user, state={}).run())
+    return {**stdin, **stdout}
+
+
+def best(f: Callable[[], object], repeat: int) -> float:
+    """Fastest of repeat runs, in milliseconds."""
+    timings: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        f()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("galleries", nargs="+", help="module:VARIABLE references to gallery stdin dicts")
+    parser.add_argument("--root", default=None, help="directory of the buckets (default: a temporary directory)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keys", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    root: str = args.root or tempfile.mkdtemp(prefix="bench-buckets-")
+    bucket: data.Bucket = data.Bucket()
+    bucket._client = storage.LocalStorage(root)
+    compression: int = data.BUCKET_COMPRESSION_THRESHOLD
+    print(f"{'gallery':<28} {'object':<8} {'format':<14} {'read':<6} {'bytes':>10} {'save ms':>9} {'load ms':>9}")
+    for reference in args.galleries:
+        module, variable = reference.split(":")
+        stdout: dict[str, Any] = stdout_of(getattr(importlib.import_module(module), variable))
+        gallery: dict[str, Any] = ArtGallery.unserialize({**stdout, "id": "bench", "owner_job_id": "bench"}, trusted=True).serialize_indexed()
+        for label, value, encoding in (("gallery", gallery, Encoding.JSON), ("stdout", stdout, Encoding.BINARY)):
+            for mode, limit in ((encoding.value, 1 << 62), (f"{encoding.value}+gzip", compression)):
+                data.BUCKET_COMPRESSION_THRESHOLD = limit
+                key: str = f"bench/{variable}/{label}/{mode}.json"
+                save: float = best(lambda: bucket.save(key, value, encoding=encoding), args.repeat)
+                size: int = os.path.getsize(storage.LocalStorage(root).path(bucket.name, key))
+                for read, threshold in (("read", 1 << 62), ("mmap", 1)):
+                    storage.BUCKET_MMAP_THRESHOLD = threshold
+                    assert bucket.load(key) == bucket.load(key)
+                    load: float = best(lambda: bucket.load(key), args.repeat)
+                    print(f"{variable:<28} {label:<8} {mode:<14} {read:<6} {size:>10} {save:>9.2f} {load:>9.2f}")
+    data.BUCKET_COMPRESSION_THRESHOLD = compression
+
+    for i in range(args.keys):
+        bucket.save(f"index/bench/{i:08d}.json", {"index_id": f"{i:08d}", "real_id": f"g{i}"})
+    first: float = best(lambda: bucket.search(prefix="index/bench/", limit=args.limit), args.repeat)
+    token: Offset | None = bucket.search(prefix="index/bench/", limit=args.keys // 2).next_token
+    middle: float = best(lambda: bucket.search(prefix="index/bench/", limit=args.limit, next_token=token), args.repeat)
+    print(f"search of {args.limit} of {args.keys} keys: first page {first:.2f} ms, middle page {middle:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
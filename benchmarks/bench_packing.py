@@ -0,0 +1,97 @@
+"""
+Benchmark: JSON vs packed binary encoding of job stdout (api/packing.py).
+
+Title
+-----
+Packing Benchmark
+
+Context
+-------
+Runs the pipeline in-process on each gallery (a "module:VARIABLE" reference
+to a stdin dict, e.g. tests.test_polygon_monster:POLYGON_MONSTER_STDIN) and
+compares what Bucket.save() writes and Bucket.load() parses for the final
+stdout: object size, encode time and decode time, for the JSON encoding
+(json.dumps with indent=2, as Bucket.save() writes it) and Encoding.BINARY.
+
+Examples:
+>>> python benchmarks/bench_packing.py tests.test_polygon_monster:POLYGON_MONSTER_STDIN --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+ROOT: Path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "api"))
+sys.path.insert(0, str(ROOT))
+for name in ("STITCHING_MAX_WORK", "EAR_CLIPPING_MAX_WORK", "CONVEX_COMPONENT_OPTIMIZATION_MAX_WORK", "GUARD_PLACEMENT_MAX_WORK"):
+    os.environ.setdefault(name, "999999999")
+
+from attributes import Email  # noqa: E402
+from attributes import Identifier  # noqa: E402
+from enums import StepName  # noqa: E402
+from models import Job  # noqa: E402
+from models import User  # noqa: E402
+from packing import pack  # noqa: E402
+from packing import unpack  # noqa: E402
+from steps import Step  # noqa: E402
+
+PIPELINE: list[StepName] = [
+    StepName.VALIDATE_POLYGONS,
+    StepName.STITCHING,
+    StepName.EAR_CLIPPING,
+    StepName.CONVEX_COMPONENT_OPTIMIZATION,
+    StepName.GUARD_PLACEMENT,
+]
+
+
+def stdout_of(stdin: dict[str, Any]) -> dict[str, Any]:
+    """Final job stdout of the pipeline on stdin."""
+    user: User = User(email=Email("bench@example.com"))
+    stdout: dict[str, Any] = {}
+    for step_name in PIPELINE:
+        job: Job = Job(id=Identifier("bench"), step_name=step_name, stdin=dict(stdin), stdout=dict(stdout))
+        stdout.update(Step.of(step_name)(job=job, user=user, state={}).run())
+    return {**stdin, **stdout}
+
+
+def best(f: Callable[[], object], repeat: int) -> float:
+    """Fastest of repeat runs, in milliseconds."""
+    timings: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        f()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("galleries", nargs="+", help="module:VARIABLE references to gallery stdin dicts")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    print(f"{'gallery':<32} {'format':<8} {'bytes':>9} {'encode ms':>10} {'decode ms':>10}")
+    for reference in args.galleries:
+        module, variable = reference.split(":")
+        data: dict[str, Any] = stdout_of(getattr(importlib.import_module(module), variable))
+        text: bytes = json.dumps(data, indent=2).encode("utf-8")
+        packed: bytes = pack(data)
+        assert unpack(packed) == json.loads(text)
+        encode: float = best(lambda: json.dumps(data, indent=2).encode("utf-8"), args.repeat)
+        decode: float = best(lambda: json.loads(text), args.repeat)
+        print(f"{variable:<32} {'json':<8} {len(text):>9} {encode:>10.2f} {decode:>10.2f}")
+        encode = best(lambda: pack(data), args.repeat)
+        decode = best(lambda: unpack(packed), args.repeat)
+        print(f"{variable:<32} {'binary':<8} {len(packed):>9} {encode:>10.2f} {decode:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: attaching a shared-memory gallery vs pickling it into a worker.
+
+Title
+-----
+Shared Memory Benchmark
+
+Context
+-------
+Builds a synthetic gallery (a square boundary triangulated into a grid of
+convex components) and times what a worker process pays to obtain it:
+pickle.loads of the pickled gallery, ArtGallery.unserialize of the job
+stdout dict, and ArtGallery.attach of a block created once by export().
+
+Examples:
+>>> python benchmarks/bench_shared_memory.py --size 40 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "api"))
+
+from models import ArtGallery  # noqa: E402
+
+
+def build(size: int) -> ArtGallery:
+    """Square boundary of side size split into 2 * size * size triangles."""
+    components: list[list[list[int]]] = []
+    for i in range(size):
+        for j in range(size):
+            components.append([[i, j], [i + 1, j], [i + 1, j + 1]])
+            components.append([[i, j], [i + 1, j + 1], [i, j + 1]])
+    boundary: list[list[int]] = [[0, 0], [size, 0], [size, size], [0, size]]
+    return ArtGallery.unserialize({"boundary": boundary, "stitched": boundary, "convex_components": components})
+
+
+def measure(label: str, f: Callable[[], object], repeat: int) -> float:
+    best: float = min(_timed(f) for _ in range(repeat))
+    print(f"{label:<28} {best * 1000:10.2f} ms")
+    return best
+
+
+def _timed(f: Callable[[], object]) -> float:
+    start: float = time.perf_counter()
+    f()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--size", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    gallery: ArtGallery = build(args.size)
+    print(f"components={len(gallery.convex_components)} repeat={args.repeat}")
+
+    payload: bytes = pickle.dumps(gallery)
+    stdout: dict = gallery.serialize()
+    measure("pickle.dumps", lambda: pickle.dumps(gallery), args.repeat)
+    measure("pickle.loads", lambda: pickle.loads(payload), args.repeat)
+    measure("ArtGallery.unserialize", lambda: ArtGallery.unserialize(stdout), args.repeat)
+    measure("ArtGallery.export", lambda: _export_and_release(gallery), args.repeat)
+
+    buffer = gallery.export()
+    try:
+        measure("ArtGallery.attach", lambda: ArtGallery.attach(buffer.name), args.repeat)
+        print(f"{'pickle bytes':<28} {len(payload):10d}")
+        print(f"{'shared memory bytes':<28} {buffer.memory.size:10d}")
+    finally:
+        buffer.close()
+        buffer.unlink()
+
+
+def _export_and_release(gallery: ArtGallery) -> None:
+    buffer = gallery.export()
+    buffer.close()
+    buffer.unlink()
+
+
+if __name__ == "__main__":
+    main()
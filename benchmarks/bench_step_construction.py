@@ -0,0 +1,99 @@
+"""
+Benchmark: step construction time with eager vs lazy/trusted gallery decoding.
+
+Title
+-----
+Step Construction Benchmark
+
+Context
+-------
+Every SequenceStep after validation builds its gallery from job.stdout in
+its constructor. This script runs the pipeline in-process on each gallery (a
+"module:VARIABLE" reference to a stdin dict), keeps the stdout each step was
+started with, and times, per step:
+
+- eager:   ArtGallery.unserialize(stdout), every field decoded and validated
+- trusted: ArtGallery.unserialize(stdout, trusted=True)
+- lazy:    ArtGallery.unserialize(stdout, trusted=True, lazy=True)
+- step:    Step.of(step_name)(job=..., state={}) as shipped (lazy, trusted decoding plus init())
+- step (eager): the same constructor with ArtGallery.unserialize forced to decode eagerly and validate,
+  which is what steps did before lazy decoding
+
+Examples:
+>>> python benchmarks/bench_step_construction.py tests.test_polygon_monster:POLYGON_MONSTER_STDIN --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from typing import Iterator
+
+ROOT: Path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "api"))
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+for name in ("STITCHING_MAX_WORK", "EAR_CLIPPING_MAX_WORK", "CONVEX_COMPONENT_OPTIMIZATION_MAX_WORK", "GUARD_PLACEMENT_MAX_WORK"):
+    os.environ.setdefault(name, "999999999")
+
+from attributes import Email  # noqa: E402
+from attributes import Identifier  # noqa: E402
+from bench_packing import PIPELINE  # noqa: E402
+from bench_packing import best  # noqa: E402
+from enums import StepName  # noqa: E402
+from models import ArtGallery  # noqa: E402
+from models import Job  # noqa: E402
+from models import User  # noqa: E402
+from steps import Step  # noqa: E402
+
+USER: User = User(email=Email("bench@example.com"))
+
+
+def inputs(stdin: dict[str, Any]) -> list[tuple[StepName, Job]]:
+    """Run the pipeline on stdin and return the job each step after validation was started with."""
+    stdout: dict[str, Any] = {}
+    jobs: list[tuple[StepName, Job]] = []
+    for step_name in PIPELINE:
+        job: Job = Job(id=Identifier("bench"), step_name=step_name, stdin=dict(stdin), stdout=dict(stdout))
+        if step_name != StepName.VALIDATE_POLYGONS:
+            jobs.append((step_name, job))
+        stdout.update(Step.of(step_name)(job=job, user=USER, state={}).run())
+    return jobs
+
+
+@contextmanager
+def eager_decoding() -> Iterator[None]:
+    """Make ArtGallery.unserialize ignore trusted and lazy while the block runs."""
+    unserialize: Any = ArtGallery.__dict__["unserialize"]
+    ArtGallery.unserialize = classmethod(lambda cls, data, trusted=False, lazy=False: unserialize.__func__(cls, data))  # type: ignore[method-assign]
+    try:
+        yield
+    finally:
+        ArtGallery.unserialize = unserialize  # type: ignore[method-assign]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("galleries", nargs="+", help="module:VARIABLE references to gallery stdin dicts")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(f"{'gallery':<24} {'step':<32} {'eager ms':>9} {'trusted ms':>11} {'lazy ms':>8} {'step (eager) ms':>16} {'step ms':>8}")
+    for reference in args.galleries:
+        module, variable = reference.split(":")
+        for step_name, job in inputs(getattr(importlib.import_module(module), variable)):
+            eager: float = best(lambda: ArtGallery.unserialize(job.stdout), args.repeat)
+            trusted: float = best(lambda: ArtGallery.unserialize(job.stdout, trusted=True), args.repeat)
+            lazy: float = best(lambda: ArtGallery.unserialize(job.stdout, trusted=True, lazy=True), args.repeat)
+            with eager_decoding():
+                before: float = best(lambda: Step.of(step_name)(job=job, user=USER, state={}), args.repeat)
+            step: float = best(lambda: Step.of(step_name)(job=job, user=USER, state={}), args.repeat)
+            print(f"{variable[:24]:<24} {step_name.value:<32} {eager:>9.2f} {trusted:>11.2f} {lazy:>8.2f} {before:>16.2f} {step:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
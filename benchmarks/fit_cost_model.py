@@ -0,0 +1,101 @@
+"""
+Refit the per-step cost model (api/costs.py) from local pipeline runs.
+
+Title
+-----
+Cost Model Fit
+
+Context
+-------
+Runs validation, stitching, ear clipping, convex component optimization and
+guard placement in-process on each gallery (a "module:VARIABLE" reference to a
+stdin dict, e.g. one of the tests/test_polygon_*.py fixtures), records one
+Sample per step (work units, wall time, gallery size) exactly like StartTask
+does in job.meta, fits CostModel and writes the coefficients. In production
+the same fit runs on CostModel.samples(jobs) of finished jobs.
+
+Steps run to completion without suspending (the *_MAX_WORK counts are raised
+before the api modules are imported).
+
+The shipped api/costs.json is fitted on every tests/test_polygon_*.py fixture but matrix and octopus,
+up to gallery (163 vertices, 16 obstacles), so covers() holds for galleries of that size.
+
+Examples:
+>>> python benchmarks/fit_cost_model.py tests.test_polygon_fire:FIRE_STDIN --output api/costs.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT: Path = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "api"))
+sys.path.insert(0, str(ROOT))
+for name in ("STITCHING_MAX_WORK", "EAR_CLIPPING_MAX_WORK", "CONVEX_COMPONENT_OPTIMIZATION_MAX_WORK", "GUARD_PLACEMENT_MAX_WORK"):
+    os.environ.setdefault(name, "999999999")
+
+from attributes import Email  # noqa: E402
+from attributes import Identifier  # noqa: E402
+from costs import CostModel  # noqa: E402
+from costs import Sample  # noqa: E402
+from costs import Size  # noqa: E402
+from enums import StepName  # noqa: E402
+from models import Job  # noqa: E402
+from models import User  # noqa: E402
+from steps import Step  # noqa: E402
+
+PIPELINE: list[StepName] = [
+    StepName.VALIDATE_POLYGONS,
+    StepName.STITCHING,
+    StepName.EAR_CLIPPING,
+    StepName.CONVEX_COMPONENT_OPTIMIZATION,
+    StepName.GUARD_PLACEMENT,
+]
+
+
+def run(stdin: dict[str, Any]) -> list[Sample]:
+    """Run the pipeline on stdin and return one sample per step."""
+    user: User = User(email=Email("bench@example.com"))
+    size: Size = Size.of(stdin)
+    stdout: dict[str, Any] = {}
+    samples: list[Sample] = []
+    for step_name in PIPELINE:
+        job: Job = Job(id=Identifier("bench"), step_name=step_name, stdin=dict(stdin), stdout=dict(stdout))
+        clock: float = time.monotonic()
+        step: Step = Step.of(step_name)(job=job, user=user, state={})
+        stdout.update(step.run())
+        seconds: float = time.monotonic() - clock
+        samples.append(
+            {
+                "step_name": str(step_name.slug),
+                "vertices": size.vertices,
+                "obstacles": size.obstacles,
+                "work": int(step.work),
+                "seconds": seconds,
+            }
+        )
+        print(f"{step_name.value:32} v={size.vertices:4} o={size.obstacles:3} work={int(step.work):7} seconds={seconds:8.3f}")
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("galleries", nargs="+", help="module:VARIABLE references to gallery stdin dicts")
+    parser.add_argument("--output", default=str(ROOT / "api" / "costs.json"))
+    args = parser.parse_args()
+    samples: list[Sample] = []
+    for reference in args.galleries:
+        module, variable = reference.split(":")
+        samples.extend(run(getattr(importlib.import_module(module), variable)))
+    CostModel.fit(samples).save(args.output)
+    print(f"wrote {args.output} ({len(samples)} samples)")
+
+
+if __name__ == "__main__":
+    main()
@@ -340,6 +340,8 @@ export const toDomainJob = (api: ApiJob): Job => {
         updated_at: api.updated_at ?? undefined,
         children_ids: api.children_ids ?? [],
         ...(api.duration != null && api.duration >= 0 ? { duration: api.duration } : {}),
+        ...(api.stitched_count != null ? { stitchedCount: api.stitched_count } : {}),
+        ...(api.guard_count != null ? { guardCount: api.guard_count } : {}),
         ...(artGallery != null ? { artGallery } : {}),
     };
 };
@@ -365,12 +367,16 @@ export const toDomainArtGallery = (api: ApiArtGallery): Gallery => {
         title: api.title,
         updated_at: api.updated_at,
         ...(api.duration != null && api.duration >= 0 ? { duration: api.duration } : {}),
+        ...(api.stitched_count != null ? { stitchedCount: api.stitched_count } : {}),
+        ...(api.guard_count != null ? { guardCount: api.guard_count } : {}),
         artGallery,
     };
 };
 
 export const fromApiJob = (raw: unknown): ApiJob => {
     const d = raw as Record<string, unknown>;
+    // List summaries: the thumbnail stands in for the geometry of stdin/stdout and the title for meta.
+    const thumbnail = d.thumbnail as Record<string, unknown> | undefined;
     return {
         id: String(d.id ?? ""),
         parent_id: d.parent_id != null ? String(d.parent_id) : null,
@@ -378,10 +384,12 @@ export const fromApiJob = (raw: unknown): ApiJob => {
         status: String(d.status ?? "pending"),
         step_name: String(d.step_name ?? d.stage ?? "art_gallery"),
         stdin: (d.stdin as Record<string, unknown>) ?? {},
-        stdout: (d.stdout as Record<string, unknown>) ?? {},
-        meta: (d.meta as Record<string, unknown>) ?? {},
+        stdout: (d.stdout as Record<string, unknown>) ?? thumbnail ?? {},
+        meta: (d.meta as Record<string, unknown>) ?? (d.title != null ? { title: String(d.title) } : {}),
         stderr: (d.stderr as Record<string, unknown>) ?? {},
         duration: d.duration != null && typeof d.duration === "number" ? d.duration : undefined,
+        stitched_count: typeof d.stitched_count === "number" ? d.stitched_count : undefined,
+        guard_count: typeof d.guard_count === "number" ? d.guard_count : undefined,
         created_at: String(d.created_at ?? ""),
         updated_at: String(d.updated_at ?? ""),
     };
@@ -441,8 +449,10 @@ export const artGalleryToValidationPayload = (artGallery: ArtGallery): {
 
 export const fromApiArtGallery = (raw: unknown): ApiArtGallery => {
     const d = raw as Record<string, unknown>;
-    const boundary = toPolygonDictShape(d.boundary);
-    const rawObstacles = d.obstacles;
+    // List summaries carry their boundary, obstacles and guards as a simplified thumbnail.
+    const geometry = (d.thumbnail as Record<string, unknown> | undefined) ?? d;
+    const boundary = toPolygonDictShape(geometry.boundary);
+    const rawObstacles = geometry.obstacles;
     const obstacles: Record<string, ApiPolygon> = {};
     if (rawObstacles != null && typeof rawObstacles === "object" && !Array.isArray(rawObstacles)) {
         for (const [k, v] of Object.entries(rawObstacles)) {
@@ -450,7 +460,7 @@ export const fromApiArtGallery = (raw: unknown): ApiArtGallery => {
             if (poly.points.length >= 3) obstacles[k] = poly;
         }
     }
-    const guards = (d.guards as Record<string, unknown>) ?? {};
+    const guards = (geometry.guards as Record<string, unknown>) ?? {};
     const stitchedRaw = d.stitched ?? d.stiteched ?? null;
     const stitched =
         stitchedRaw != null
@@ -473,6 +483,8 @@ export const fromApiArtGallery = (raw: unknown): ApiArtGallery => {
         stitches: (d.stitches as ApiArtGallery["stitches"]) ?? undefined,
         duration: d.duration != null && typeof d.duration === "number" ? d.duration : undefined,
         coverage: Array.isArray(d.coverage) ? (d.coverage as ApiArtGallery["coverage"]) : undefined,
+        stitched_count: typeof d.stitched_count === "number" ? d.stitched_count : undefined,
+        guard_count: typeof d.guard_count === "number" ? d.guard_count : undefined,
         created_at: String(d.created_at ?? ""),
         updated_at: String(d.updated_at ?? ""),
     };
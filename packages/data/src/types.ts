@@ -31,6 +31,12 @@ export interface ApiJob {
     stderr: Record<string, unknown>;
     /** Duration in milliseconds (optional; 0 or absent for older records). */
     duration?: number;
+    /** List summaries carry the title instead of meta and a simplified thumbnail (boundary, obstacles, guards) instead of stdin/stdout. */
+    title?: string | null;
+    thumbnail?: Record<string, unknown>;
+    /** Stitched polygon vertex and guard counts of a list summary, whose geometry is a simplified thumbnail. */
+    stitched_count?: number;
+    guard_count?: number;
     created_at: string;
     updated_at: string;
 }
@@ -67,6 +73,9 @@ export interface ApiArtGallery {
     duration?: number;
     /** Optional coverage points (stitched + convex edge midpoints from guard placement). */
     coverage?: Array<{ x: number; y: number } | [number, number]>;
+    /** Stitched polygon vertex and guard counts of a list summary, whose geometry is a simplified thumbnail. */
+    stitched_count?: number;
+    guard_count?: number;
     created_at: string;
     updated_at: string;
 }
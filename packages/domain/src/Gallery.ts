@@ -17,5 +17,8 @@ export interface Gallery {
     updated_at?: string;
     /** Duration in milliseconds (from job when published). */
     duration?: number;
+    /** Stitched polygon vertex and guard counts from a list summary, whose artGallery is a simplified thumbnail. */
+    stitchedCount?: number;
+    guardCount?: number;
     artGallery: ArtGallery;
 }
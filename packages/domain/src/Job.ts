@@ -28,4 +28,7 @@ export interface Job {
     children_ids?: string[];
     /** Total run duration in milliseconds (set when job completes). */
     duration?: number;
+    /** Stitched polygon vertex and guard counts from a list summary, whose artGallery is a simplified thumbnail. */
+    stitchedCount?: number;
+    guardCount?: number;
 }
@@ -17,6 +17,9 @@ os.environ.setdefault("EAR_CLIPPING_MAX_WORK", "999999999")
 os.environ.setdefault("CONVEX_COMPONENT_OPTIMIZATION_MAX_WORK", "999999999")
 os.environ.setdefault("STITCHING_MAX_WORK", "999999999")
 
+# Step result cache: off so task tests do not read or write the (mocked) bucket; cache tests patch it on
+os.environ.setdefault("STEP_CACHE_ENABLED", "0")
+
 # Allow api package to load without boto3/jwt (e.g. in local pytest without Lambda deps)
 if "boto3" not in sys.modules:
     sys.modules["boto3"] = MagicMock()
@@ -33,6 +36,7 @@ if "botocore" not in sys.modules:
     _botocore_exceptions = MagicMock()
     _botocore_exceptions.ClientError = _FakeClientError
     sys.modules["botocore.exceptions"] = _botocore_exceptions
+    sys.modules["botocore.config"] = MagicMock()
 if "jwt" not in sys.modules:
     _jwt = MagicMock()
     _jwt.decode = lambda payload, key, algorithms: {"email": "test@test.com", "name": "", "avatarUrl": None}
@@ -350,6 +350,47 @@ class TestDuration:
         assert d == 0
 
 
+class TestDeadline:
+    """Test Deadline attribute (monotonic cut-off time, remaining milliseconds)."""
+
+    def test_from_millis_remaining(self):
+        from attributes import Deadline
+
+        deadline = Deadline.from_millis(60000)
+        assert 59000 <= deadline.remaining() <= 60000
+
+    def test_remaining_after_deadline_is_zero(self):
+        from attributes import Deadline
+
+        assert Deadline.from_millis(0).remaining() == 0
+        assert Deadline(0).remaining() == 0
+
+    def test_from_context(self):
+        from attributes import Deadline
+
+        class Context:
+            def get_remaining_time_in_millis(self):
+                return 30000
+
+        deadline = Deadline.from_context(Context())
+        assert isinstance(deadline, Deadline)
+        assert 29000 <= deadline.remaining() <= 30000
+
+    def test_from_context_without_lambda_context_returns_none(self):
+        from attributes import Deadline
+
+        assert Deadline.from_context(None) is None
+        assert Deadline.from_context(object()) is None
+
+    def test_invalid_raises(self):
+        from attributes import Deadline
+
+        with pytest.raises(ValidationError, match=">= 0"):
+            Deadline(-1)
+        with pytest.raises(ValidationError, match="number"):
+            Deadline("x")
+
+
 class TestCountdown:
     """Test Countdown attribute."""
 
@@ -0,0 +1,67 @@
+"""Tests for buffers module."""
+
+import pytest
+from buffers import GeometryBuffer
+from geometry import ConvexComponent
+from models import ArtGallery
+
+
+def _gallery() -> ArtGallery:
+    return ArtGallery.unserialize(
+        {
+            "boundary": [[0, 0], [10, 0], [10, 10], [0, 10]],
+            "obstacles": [[["2.5", 2], [4, 2], [4, 4], ["2.5", 4]]],
+            "stitched": [[0, 0], [10, 0], [10, 10], [0, 10]],
+            "ears": [[[0, 0], [10, 0], [10, 10]]],
+            "convex_components": [[[0, 0], [10, 0], [10, 10]], [[0, 0], [10, 10], [0, 10]]],
+        }
+    )
+
+
+class TestGeometryBuffer:
+    """Test GeometryBuffer export/attach round trip."""
+
+    def test_attach_matches_gallery(self):
+        gallery = _gallery()
+        buffer = gallery.export()
+        try:
+            attached = ArtGallery.attach(buffer.name)
+        finally:
+            buffer.close()
+            buffer.unlink()
+        assert attached.boundary == gallery.boundary
+        assert attached.stitched == gallery.stitched
+        assert attached.obstacles == gallery.obstacles
+        assert attached.ears == gallery.ears
+        assert attached.convex_components == gallery.convex_components
+        assert all(isinstance(c, ConvexComponent) for c in attached.convex_components.values())
+        assert str(next(iter(attached.obstacles.values()))[0].x) == "2.5"
+
+    def test_vertices_are_shared(self):
+        buffer = GeometryBuffer.export(_gallery())
+        try:
+            view = GeometryBuffer.attach(buffer.name)
+            assert view.vertices_count == 8
+            component = next(iter(view.convex_components.values()))
+            assert component[0] is view.boundary[0]
+            view.close()
+        finally:
+            buffer.close()
+            buffer.unlink()
+
+    def test_adjacency(self):
+        gallery = _gallery()
+        first, second = list(gallery.convex_components.values())
+        gallery = ArtGallery.unserialize({**gallery.serialize(), "adjacency": {str(first.id): [str(second.id)], str(second.id): [str(first.id)]}})
+        buffer = gallery.export()
+        try:
+            attached = ArtGallery.attach(buffer.name)
+        finally:
+            buffer.close()
+            buffer.unlink()
+        assert attached.adjacency[first].items == {second.id}
+        assert attached.adjacency[second].items == {first.id}
+
+    def test_attach_unknown_name_raises(self):
+        with pytest.raises(FileNotFoundError):
+            GeometryBuffer.attach("geometry-buffer-does-not-exist")
@@ -0,0 +1,118 @@
+"""Tests for codec module."""
+
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from attributes import Email
+from attributes import Identifier
+from codec import Codec
+from codec import OrjsonCodec
+from codec import StandardCodec
+from codec import codec
+from codec import native
+from enums import Status
+from exceptions import ConfigurationError
+from geometry import Point
+from geometry import Polygon
+from models import User
+
+VALUE = {
+    "id": Identifier("g1"),
+    "status": Status.SUCCESS,
+    "boundary": Polygon([Point(["0", "0"]), Point(["10", "0"]), Point(["0", "10.5"])]),
+    "guards": {"7": Point([Decimal("0.1"), Decimal("-2.25")])},
+    "table": {3: "a", 12: "b"},
+    "pruned": [0, -4, 2**70],
+    "ratio": 0.25,
+    "flags": (True, False, None),
+    "title": "Galería",
+}
+
+EXPECTED = {
+    "id": "g1",
+    "status": "success",
+    "boundary": [["0", "0"], ["10", "0"], ["0", "10.5"]],
+    "guards": {"7": ["0.1", "-2.25"]},
+    "table": {"3": "a", "12": "b"},
+    "pruned": [0, -4, 2**70],
+    "ratio": 0.25,
+    "flags": [True, False, None],
+    "title": "Galería",
+}
+
+
+class TestNative:
+    """Test native() conversion of non-JSON values."""
+
+    def test_native_serializable(self):
+        assert native(Point(["1", "2.5"])) == ["1", "2.5"]
+
+    def test_native_decimal_keeps_exact_digits(self):
+        assert native(Decimal("0.10")) == "0.10"
+
+    def test_native_enum(self):
+        assert native(Status.FAILED) == "failed"
+
+    def test_native_set_and_tuple(self):
+        assert native((1, 2)) == [1, 2]
+        assert native(frozenset([3])) == [3]
+
+    def test_native_unknown_raises_type_error(self):
+        with pytest.raises(TypeError, match="object"):
+            native(object())
+
+
+@pytest.mark.parametrize("name", ["json", "orjson"])
+class TestCodec:
+    """Test both codecs encode and decode the same JSON."""
+
+    def test_round_trip(self, name):
+        assert Codec.of(name).decode(Codec.of(name).encode(VALUE)) == EXPECTED
+
+    def test_encode_is_compact_utf8(self, name):
+        assert Codec.of(name).encode({"a": [1, "é"], "b": Identifier("g1")}) == '{"a":[1,"é"],"b":"g1"}'.encode("utf-8")
+
+    def test_decode_reads_other_codec(self, name):
+        other: str = "orjson" if name == "json" else "json"
+        assert Codec.of(name).decode(Codec.of(other).encode(VALUE)) == EXPECTED
+        assert Codec.of(name).decode(json.dumps(EXPECTED, indent=2)) == EXPECTED
+
+    def test_decode_invalid_raises_json_decode_error(self, name):
+        with pytest.raises(json.JSONDecodeError):
+            Codec.of(name).decode(b"{not json")
+
+    def test_encode_model_uses_serialize(self, name):
+        user: User = User(email=Email("u@e.com"), name="Ana")
+        assert Codec.of(name).decode(Codec.of(name).encode({"user": user})) == {"user": user.serialize()}
+
+    def test_encode_unknown_raises_type_error(self, name):
+        with pytest.raises(TypeError):
+            Codec.of(name).encode({"a": object()})
+        with pytest.raises(TypeError):
+            Codec.of(name).encode({"a": datetime(2026, 1, 1)})
+
+
+class TestCodecOf:
+    """Test Codec.of() selection."""
+
+    def test_of_names(self):
+        assert isinstance(Codec.of("json"), StandardCodec)
+        assert isinstance(Codec.of("orjson"), OrjsonCodec)
+        assert isinstance(Codec.of("auto"), OrjsonCodec)
+
+    def test_of_unknown_raises(self):
+        with pytest.raises(ConfigurationError, match="JSON_CODEC"):
+            Codec.of("yaml")
+
+    def test_of_orjson_missing_raises(self, monkeypatch):
+        import codec as module
+
+        monkeypatch.setattr(module, "orjson", None)
+        assert isinstance(Codec.of("auto"), StandardCodec)
+        with pytest.raises(ConfigurationError, match="orjson"):
+            Codec.of("orjson")
+
+    def test_default_codec(self):
+        assert isinstance(codec, Codec)
@@ -0,0 +1,122 @@
+"""Tests for costs module."""
+
+import math
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+from costs import CostModel
+from costs import Size
+from enums import StepName
+
+
+def power_law(vertices: int, obstacles: int) -> dict:
+    """Sample of a step whose seconds and work follow a known power law."""
+    seconds = 0.01 * (1 + vertices) ** 2 * (1 + obstacles) ** 0.5
+    work = 3 * (1 + vertices) ** 1.5 - 1
+    return {"step_name": "stitching", "vertices": vertices, "obstacles": obstacles, "work": round(work), "seconds": seconds}
+
+
+SAMPLES = [power_law(vertices, obstacles) for vertices in (4, 10, 30, 80) for obstacles in (0, 1, 3)]
+
+
+class TestSize:
+    """Test Size."""
+
+    def test_of_counts_boundary_and_obstacle_vertices(self):
+        size = Size.of({"boundary": [[0, 0], [4, 0], [4, 4], [0, 4]], "obstacles": [[[1, 1], [2, 1], [2, 2]]]})
+        assert size == Size(vertices=7, obstacles=1)
+
+    def test_of_empty(self):
+        assert Size.of({}) == Size(vertices=0, obstacles=0)
+
+
+class TestCostModel:
+    """Test CostModel fit, predictions and persistence."""
+
+    def test_predict_without_coefficients_is_none(self):
+        model = CostModel()
+        assert model.predict(StepName.STITCHING, Size(vertices=4, obstacles=0)) is None
+        assert model.budget(StepName.STITCHING, Size(vertices=4, obstacles=0), 60) is None
+        assert model.invocations(StepName.STITCHING, Size(vertices=4, obstacles=0), 60) == 1
+        assert not model.fits(StepName.STITCHING, Size(vertices=4, obstacles=0), 60)
+        assert not model.covers(StepName.STITCHING, Size(vertices=4, obstacles=0))
+
+    def test_fit_recovers_power_law(self):
+        model = CostModel.fit(SAMPLES)
+        estimate = model.predict(StepName.STITCHING, Size(vertices=50, obstacles=2))
+        expected = power_law(50, 2)
+        assert estimate.seconds == pytest.approx(expected["seconds"], rel=1e-3)
+        assert estimate.work == pytest.approx(expected["work"], rel=1e-2)
+        assert model.coefficients["stitching"]["samples"] == len(SAMPLES)
+        assert model.coefficients["stitching"]["vertices"] == 80
+        assert model.coefficients["stitching"]["obstacles"] == 3
+
+    def test_budget_scales_work_to_window(self):
+        model = CostModel(
+            coefficients={"stitching": {"seconds": [math.log(10), 0.0, 0.0], "work": [math.log(1001), 0.0, 0.0], "vertices": 4, "obstacles": 0}}
+        )
+        assert model.budget(StepName.STITCHING, Size(vertices=4, obstacles=0), 5) in (499, 500)
+
+    def test_budget_none_for_steps_without_work(self):
+        model = CostModel(coefficients={"validate-polygons": {"seconds": [0.0, 0.0, 0.0], "work": [0.0, 0.0, 0.0], "vertices": 4, "obstacles": 0}})
+        assert model.budget(StepName.VALIDATE_POLYGONS, Size(vertices=4, obstacles=0), 5) is None
+
+    def test_invocations_and_fits(self):
+        model = CostModel(coefficients={"stitching": {"seconds": [math.log(100), 0.0, 0.0], "work": [0.0, 0.0, 0.0], "vertices": 4, "obstacles": 0}})
+        size = Size(vertices=4, obstacles=0)
+        assert model.invocations(StepName.STITCHING, size, 30) == 4
+        assert model.invocations(StepName.STITCHING, size, 200) == 1
+        assert model.fits(StepName.STITCHING, size, 101)
+        assert not model.fits(StepName.STITCHING, size, 99)
+
+    def test_covers_only_fitted_range(self):
+        model = CostModel.fit(SAMPLES)
+        assert model.covers(StepName.STITCHING, Size(vertices=80, obstacles=3))
+        assert not model.covers(StepName.STITCHING, Size(vertices=81, obstacles=0))
+        assert not model.covers(StepName.STITCHING, Size(vertices=4, obstacles=4))
+        assert not model.covers(StepName.GUARD_PLACEMENT, Size(vertices=4, obstacles=0))
+
+    def test_budget_and_fits_only_within_fitted_range(self):
+        model = CostModel.fit(SAMPLES)
+        assert model.budget(StepName.STITCHING, Size(vertices=80, obstacles=3), 60) is not None
+        assert model.fits(StepName.STITCHING, Size(vertices=80, obstacles=3), 3600)
+        assert model.budget(StepName.STITCHING, Size(vertices=81, obstacles=0), 60) is None
+        assert not model.fits(StepName.STITCHING, Size(vertices=81, obstacles=0), 3600)
+
+    def test_samples_from_finished_jobs(self):
+        finished = MagicMock()
+        finished.is_finished.return_value = True
+        finished.meta = {
+            "step:stitching:work": 12,
+            "step:stitching:wall_time": 0.5,
+            "step:stitching:vertices": 8,
+            "step:stitching:obstacles": 1,
+            "step:ear-clipping:work": 3,
+        }
+        pending = MagicMock()
+        pending.is_finished.return_value = False
+        pending.meta = dict(finished.meta)
+        samples = CostModel.samples([finished, pending])
+        assert samples == [{"step_name": "stitching", "vertices": 8, "obstacles": 1, "work": 12, "seconds": 0.5}]
+
+    def test_save_load_round_trip(self, tmp_path):
+        path = str(tmp_path / "costs.json")
+        model = CostModel.fit(SAMPLES)
+        model.save(path)
+        assert CostModel.load(path) == model
+
+    def test_load_missing_file_is_empty(self, tmp_path):
+        assert CostModel.load(str(tmp_path / "missing.json")).coefficients == {}
+
+    def test_current_loads_once(self, tmp_path):
+        path = str(tmp_path / "costs.json")
+        CostModel.fit(SAMPLES).save(path)
+        with patch.object(CostModel, "_current", None), patch("costs.COST_MODEL_PATH", path):
+            with patch.object(CostModel, "load", wraps=CostModel.load) as load:
+                assert CostModel.current() is CostModel.current()
+            load.assert_called_once_with()
+
+    def test_load_shipped_coefficients(self):
+        model = CostModel.load()
+        assert model.predict(StepName.GUARD_PLACEMENT, Size(vertices=10, obstacles=1)) is not None
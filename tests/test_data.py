@@ -1,6 +1,7 @@
 """Tests for data package."""
 
 import json
+import time
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
@@ -10,6 +11,8 @@ from attributes import Offset
 from data import Bucket
 from data import Page
 from data import Secret
+from data import many
+from enums import Encoding
 from exceptions import ConfigurationError
 from exceptions import NotFoundError
 from exceptions import ServiceUnavailableError
@@ -77,7 +80,8 @@ class TestBucket:
             b = Bucket()
             _ = b.client
             _ = b.client
-            mock_boto.client.assert_called_once_with("s3")
+            mock_boto.client.assert_called_once()
+            assert mock_boto.client.call_args[0] == ("s3",)
 
     def test_exists_invalid_key_raises(self):
         b = Bucket()
@@ -212,6 +216,65 @@ class TestBucket:
             assert call_kw["Key"] == "data/k.json"
             assert json.loads(call_kw["Body"].decode("utf-8")) == {"x": 1}
 
+    def test_save_binary_round_trips_through_load(self):
+        mock_client = MagicMock()
+        with patch("data.boto3") as mock_boto:
+            mock_boto.client.return_value = mock_client
+            b = Bucket()
+            b.save("data/k.json", {"boundary": [["0", "0"], ["1.5", "0"]]}, encoding=Encoding.BINARY)
+            call_kw = mock_client.put_object.call_args[1]
+            assert call_kw["ContentType"] == "application/octet-stream"
+            assert call_kw["Body"].startswith(b"\x00GB")
+            mock_body = MagicMock()
+            mock_body.read.return_value = call_kw["Body"]
+            mock_client.get_object.return_value = {"Body": mock_body}
+            assert b.load("data/k.json") == {"boundary": [["0", "0"], ["1.5", "0"]]}
+
+    def test_save_compresses_large_bodies_and_load_reads_them(self):
+        mock_client = MagicMock()
+        value = {"boundary": [[str(i), f"{i}.5"] for i in range(1000)]}
+        with patch("data.boto3") as mock_boto:
+            mock_boto.client.return_value = mock_client
+            b = Bucket()
+            for encoding in Encoding:
+                b.save("data/k.json", value, encoding=encoding)
+                call_kw = mock_client.put_object.call_args[1]
+                assert call_kw["ContentEncoding"] == "gzip"
+                assert call_kw["Body"].startswith(data.GZIP_MAGIC)
+                mock_body = MagicMock()
+                mock_body.read.return_value = call_kw["Body"]
+                mock_client.get_object.return_value = {"Body": mock_body}
+                assert b.load("data/k.json") == value
+
+    @patch("data.BUCKET_COMPRESSION_THRESHOLD", 1 << 20)
+    def test_save_below_threshold_writes_compact_json(self):
+        mock_client = MagicMock()
+        with patch("data.boto3") as mock_boto:
+            mock_boto.client.return_value = mock_client
+            Bucket().save("data/k.json", {"x": [1, 2]})
+            call_kw = mock_client.put_object.call_args[1]
+            assert call_kw["Body"] == b'{"x":[1,2]}'
+            assert "ContentEncoding" not in call_kw
+
+    def test_load_legacy_pretty_json(self):
+        mock_client = MagicMock()
+        mock_body = MagicMock()
+        mock_body.read.return_value = json.dumps({"x": 1}, indent=2).encode("utf-8")
+        mock_client.get_object.return_value = {"Body": mock_body}
+        with patch("data.boto3") as mock_boto:
+            mock_boto.client.return_value = mock_client
+            assert Bucket().load("data/k.json") == {"x": 1}
+
+    def test_load_corrupt_compressed_content_raises(self):
+        mock_client = MagicMock()
+        mock_body = MagicMock()
+        mock_body.read.return_value = data.GZIP_MAGIC + b"not gzip"
+        mock_client.get_object.return_value = {"Body": mock_body}
+        with patch("data.boto3") as mock_boto:
+            mock_boto.client.return_value = mock_client
+            with pytest.raises(ValidationError, match="compressed"):
+                Bucket().load("data/k.json")
+
     def test_save_not_serializable_raises(self):
         mock_client = MagicMock()
         with patch("data.boto3") as mock_boto:
@@ -278,6 +341,18 @@ class TestBucket:
             assert list(page.keys) == ["data/a.json", "data/b.json"]
             assert page.next_token is None
 
+    def test_search_reports_sizes_and_modified(self):
+        mock_client = MagicMock()
+        mock_client.list_objects_v2.return_value = {
+            "Contents": [{"Key": "data/a.json", "Size": 12, "LastModified": "2026-01-01T00:00:00.000000Z"}, {"Key": "data/b.json"}],
+            "IsTruncated": False,
+        }
+        with patch("data.boto3") as mock_boto:
+            mock_boto.client.return_value = mock_client
+            page = Bucket().search(prefix="data/")
+            assert page.sizes == {"data/a.json": 12}
+            assert page.modified == {"data/a.json": "2026-01-01T00:00:00.000000Z"}
+
     def test_search_with_next_token(self):
         mock_client = MagicMock()
         mock_client.list_objects_v2.return_value = {
@@ -331,6 +406,35 @@ class TestBucket:
             assert mock_client.list_objects_v2.call_args[1]["MaxKeys"] == 5
 
 
+class TestMany:
+    """Test many() (bounded concurrent map) and Bucket.load_many()."""
+
+    def test_keeps_order_when_later_items_finish_first(self):
+        assert many(lambda n: time.sleep(n / 100) or n, [5, 1, 3, 0]) == [5, 1, 3, 0]
+
+    def test_raises_the_first_error(self):
+        def f(n):
+            if n == 2:
+                raise ValueError("two")
+            return n
+
+        with pytest.raises(ValueError, match="two"):
+            many(f, [1, 2, 3])
+
+    @patch("data.BUCKET_MAX_WORKERS", 1)
+    def test_one_worker_runs_in_order(self):
+        seen = []
+        assert many(lambda n: seen.append(n) or n, [3, 1, 2]) == [3, 1, 2]
+        assert seen == [3, 1, 2]
+
+    def test_load_many_loads_every_key_in_order(self):
+        b = Bucket()
+        b._client = MagicMock()
+        with patch.object(Bucket, "load", side_effect=lambda key, default=None: None if key == "b" else key.upper()) as mock_load:
+            assert b.load_many(["a", "b", "c"]) == ["A", None, "C"]
+        assert mock_load.call_count == 3
+
+
 class TestSecret:
     """Test Secret (S3-backed secrets)."""
 
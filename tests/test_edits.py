@@ -0,0 +1,160 @@
+"""Tests for edits module (incremental recomputation of an edited gallery)."""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from attributes import Email
+from attributes import Identifier
+from edits import Edit
+from edits import interval
+from edits import residue
+from enums import Status
+from enums import StepName
+from geometry import Ear
+from geometry import Point
+from geometry import Polygon
+from models import ArtGallery
+from models import Job
+from models import User
+from steps import Step
+
+from tests.test_polygon_boxes import POLYGON_BOXES_STDIN
+from tests.test_polygon_fire import FIRE_STDIN
+from tests.utils import assert_convex_components_simple_convex_no_obstacle_intersection
+from tests.utils import assert_ears_simple_and_convex
+
+PIPELINE = [
+    StepName.VALIDATE_POLYGONS,
+    StepName.STITCHING,
+    StepName.EAR_CLIPPING,
+    StepName.CONVEX_COMPONENT_OPTIMIZATION,
+    StepName.GUARD_PLACEMENT,
+]
+
+
+def shifted(ring, dx, dy):
+    return [[str(Decimal(x) + dx), str(Decimal(y) + dy)] for x, y in ring]
+
+
+def pipeline(stdin, source=None):
+    """Merged stdout of every step on stdin; with source (stdout of a finished job) the steps reuse it."""
+    user = User(email=Email("u@e.com"))
+    stdout = {}
+    if source is not None:
+        stdin = {**stdin, "source_id": "source"}
+    with patch("steps.JobsRepository") as repository:
+        repository.return_value.get.return_value = Job(id=Identifier("source"), status=Status.SUCCESS, stdin=stdin, stdout=source or {})
+        for step_name in PIPELINE:
+            job = Job(id=Identifier("j1"), step_name=step_name, stdin=dict(stdin), stdout=dict(stdout))
+            stdout.update(Step.of(step_name)(job=job, user=user, state={}).run())
+    return {**stdin, **stdout}
+
+
+def edits(stdin):
+    """Galleries one edit away from stdin: each obstacle removed, or moved."""
+    for i in range(len(stdin["obstacles"])):
+        obstacles = list(stdin["obstacles"])
+        del obstacles[i]
+        yield f"remove{i}", {"boundary": stdin["boundary"], "obstacles": obstacles}
+        obstacles = list(stdin["obstacles"])
+        obstacles[i] = shifted(obstacles[i], 3, -2)
+        yield f"move{i}", {"boundary": stdin["boundary"], "obstacles": obstacles}
+
+
+def assert_valid(stdout):
+    """The incremental output is a valid pipeline output for its gallery, like a full run."""
+    gallery = ArtGallery.unserialize(stdout)
+    stitched = gallery.stitched
+    assert stitched.is_ccw()
+    assert sum(abs(ear.signed_area) for ear in gallery.ears) == pytest.approx(abs(stitched.signed_area))
+    assert sum(abs(component.signed_area) for component in gallery.convex_components) == pytest.approx(abs(stitched.signed_area))
+    assert_ears_simple_and_convex(stdout["ears"])
+    assert_convex_components_simple_convex_no_obstacle_intersection(stdout["convex_components"], stdout["obstacles"])
+    seen = {tuple(point) for bag in stdout["visibility"].values() for point in bag}
+    assert {tuple(point) for point in stdout["coverage"]} <= seen
+
+
+class TestInterval:
+    """Test interval() of a bridge in a stitched ring."""
+
+    def test_finds_the_enclosed_obstacle(self):
+        v, a, b, c, w = Point(["0", "0"]), Point(["1", "0"]), Point(["2", "0"]), Point(["2", "1"]), Point(["0", "5"])
+        assert interval([v, a, b, c, a, v, w], v.to(a)) == (0, 5)
+        assert interval([w, v, a, b, c, a, v], v.to(a)) == (1, 6)
+        assert interval([a, b, c, a, v, w, v], v.to(a)) == (6, 4)
+
+    def test_none_without_exactly_one_interval(self):
+        v, a, w = Point(["0", "0"]), Point(["1", "0"]), Point(["0", "5"])
+        assert interval([v, w, a], v.to(a)) is None
+
+
+class TestResidue:
+    """Test residue() of a ring around kept ears."""
+
+    def test_one_ear_off_a_square_leaves_the_other_half(self):
+        a, b, c, d = Point(["0", "0"]), Point(["1", "0"]), Point(["1", "1"]), Point(["0", "1"])
+        assert residue(Polygon([a, b, c, d]), [Ear([a, b, c])]) == [Polygon([c, d, a])]
+
+    def test_no_ears_leave_the_ring_and_all_ears_leave_nothing(self):
+        a, b, c, d = Point(["0", "0"]), Point(["1", "0"]), Point(["1", "1"]), Point(["0", "1"])
+        assert residue(Polygon([a, b, c, d]), []) == [Polygon([a, b, c, d])]
+        assert residue(Polygon([a, b, c, d]), [Ear([a, b, c]), Ear([a, c, d])]) == []
+
+    def test_ear_off_the_ring_is_refused(self):
+        a, b, c, d = Point(["0", "0"]), Point(["1", "0"]), Point(["1", "1"]), Point(["0", "1"])
+        assert residue(Polygon([a, b, c, d]), [Ear([a, b, Point(["5", "5"])])]) is None
+
+
+class TestEdit:
+    """Test Edit.of() and Edit.unbridge() on the boxes gallery."""
+
+    @pytest.fixture(scope="class")
+    def source(self):
+        return ArtGallery.unserialize(pipeline(POLYGON_BOXES_STDIN), trusted=True)
+
+    def test_of_diffs_obstacles_by_hash(self, source):
+        moved = {
+            "boundary": POLYGON_BOXES_STDIN["boundary"],
+            "obstacles": [POLYGON_BOXES_STDIN["obstacles"][0][::-1], shifted(POLYGON_BOXES_STDIN["obstacles"][1], 3, -2)],
+        }
+        edit = Edit.of(source, ArtGallery.unserialize(moved))
+        assert (len(edit.removed), len(edit.added), len(edit.kept)) == (1, 1, 1)
+        assert Edit.of(source, ArtGallery.unserialize({**moved, "boundary": shifted(POLYGON_BOXES_STDIN["boundary"], 1, 0)})) is None
+
+    def test_unbridge_cuts_out_the_removed_obstacle(self, source):
+        removed = {"boundary": POLYGON_BOXES_STDIN["boundary"], "obstacles": POLYGON_BOXES_STDIN["obstacles"][:1]}
+        points, stitches, pending = Edit.of(source, ArtGallery.unserialize(removed)).unbridge(source.stitched, list(source.stitches))
+        assert len(points) == len(source.stitched) - 6
+        assert points.is_ccw()
+        assert len(stitches) + len(pending) == 1
+        assert not any(point in points for point in Polygon.unserialize(POLYGON_BOXES_STDIN["obstacles"][1]))
+
+
+class TestIncremental:
+    """Jobs with a source_id reuse the source's outputs and match a full recompute's validity."""
+
+    @pytest.mark.parametrize("stdin", [POLYGON_BOXES_STDIN, FIRE_STDIN], ids=["boxes", "fire"])
+    def test_edits_match_full_recompute(self, stdin):
+        source = pipeline(stdin)
+        for name, edited in edits(stdin):
+            full = pipeline(edited)
+            incremental = pipeline(edited, source=source)
+            assert_valid(incremental)
+            assert len(incremental["stitched"]) == len(full["stitched"]), name
+            assert {tuple(point) for point in incremental["stitched"]} == {tuple(point) for point in full["stitched"]}, name
+            assert sum(abs(ear.signed_area) for ear in ArtGallery.unserialize(incremental).ears) == pytest.approx(
+                sum(abs(ear.signed_area) for ear in ArtGallery.unserialize(full).ears)
+            ), name
+
+    def test_unaffected_outputs_are_kept(self):
+        source = pipeline(FIRE_STDIN)
+        edited = dict(edits(FIRE_STDIN))["move2"]
+        incremental = pipeline(edited, source=source)
+        assert len(set(incremental["ears"]) & set(source["ears"])) > len(source["ears"]) // 2
+        assert set(incremental["convex_components"]) & set(source["convex_components"])
+        assert set(incremental["guards"]) & set(source["guards"])
+
+    def test_not_cached(self):
+        job = Job(id=Identifier("j1"), step_name=StepName.STITCHING, stdin={**POLYGON_BOXES_STDIN, "source_id": "source"})
+        assert Step.of(StepName.STITCHING).fingerprint(job) is None
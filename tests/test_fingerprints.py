@@ -0,0 +1,150 @@
+"""Tests for fingerprints module."""
+
+from decimal import Decimal
+
+import pytest
+from attributes import Email
+from attributes import Identifier
+from enums import StepName
+from exceptions import ValidationError
+from fingerprints import Fingerprint
+from fingerprints import Frame
+from fingerprints import canonical
+from geometry import Point
+from geometry import Polygon
+from models import Job
+from models import User
+from steps import Step
+from structs import Table
+
+from tests.test_polygon_boxes import POLYGON_BOXES_STDIN
+
+PIPELINE = [
+    StepName.VALIDATE_POLYGONS,
+    StepName.STITCHING,
+    StepName.EAR_CLIPPING,
+    StepName.CONVEX_COMPONENT_OPTIMIZATION,
+    StepName.GUARD_PLACEMENT,
+]
+
+
+def shifted(value, dx, dy):
+    """Copy of a gallery value tree with every point moved by (dx, dy)."""
+    if isinstance(value, list) and len(value) == 2 and not isinstance(value[0], list):
+        return [str(Decimal(str(value[0])) + dx), str(Decimal(str(value[1])) + dy)]
+    if isinstance(value, list):
+        return [shifted(item, dx, dy) for item in value]
+    return value
+
+
+def unordered(value):
+    """value with lists of points turned into sets (Collection.serialize() orders them by hash)."""
+    if isinstance(value, dict):
+        return {key: unordered(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(item, list) and len(item) == 2 and isinstance(item[0], str) for item in value):
+        return {tuple(item) for item in value}
+    if isinstance(value, list):
+        return [unordered(item) for item in value]
+    return value
+
+
+def pipeline(stdin):
+    """Output and fingerprint of every step of the pipeline on stdin."""
+    user = User(email=Email("u@e.com"))
+    stdout = {}
+    outputs = []
+    for step_name in PIPELINE:
+        job = Job(id=Identifier("j1"), step_name=step_name, stdin=dict(stdin), stdout=dict(stdout))
+        fingerprint = Step.of(step_name).fingerprint(job)
+        output = Step.of(step_name)(job=job, user=user, state={}).run()
+        outputs.append((fingerprint, output))
+        stdout.update(output)
+    return outputs
+
+
+class TestFrame:
+    """Test Frame translation and re-keying."""
+
+    def test_of_floors_bounding_box_corner(self):
+        assert Frame.of({"boundary": [["10.5", "-3.25"], ["14", "20"], ["11", "7"]]}) == Frame(x=10, y=-4)
+        assert Frame.of({}) == Frame(x=0, y=0)
+
+    def test_of_refuses_coordinates_that_do_not_round_trip(self):
+        assert Frame.of({"boundary": [["1E+1", "0"], ["20", "0"], ["20", "5"]]}) is None
+
+    def test_normalize_and_restore_keep_coordinate_strings(self):
+        frame = Frame(x=10, y=20)
+        points = [["10", "20.50"], ["11.25", "25"], ["9.5", "19.125"]]
+        assert frame.normalize(points) == [["0", "0.50"], ["1.25", "5"], ["-0.5", "-0.875"]]
+        assert frame.restore(frame.normalize(points)) == points
+
+    def test_tables_are_rekeyed_with_their_references(self):
+        guard = Point(["12", "21"])
+        ear = Polygon.unserialize([["10", "20"], ["14", "20"], ["12", "23"]])
+        other = Polygon.unserialize([["10", "20"], ["12", "23"], ["9", "22"]])
+        value = {
+            "guards": {str(hash(guard)): guard.serialize()},
+            "visibility": {str(hash(guard)): [["10", "20"], ["14", "20"]]},
+            "ears": Table().add(ear).add(other).serialize(),
+            "adjacency": {str(hash(ear)): [hash(other)], str(hash(other)): [hash(ear)]},
+            "pruned": [3, 4],
+        }
+        frame = Frame(x=10, y=20)
+        moved = frame.normalize(value)
+        moved_guard = Point(["2", "1"])
+        moved_ear = Polygon.unserialize([["0", "0"], ["4", "0"], ["2", "3"]])
+        assert moved["guards"] == {str(hash(moved_guard)): ["2", "1"]}
+        assert list(moved["visibility"]) == [str(hash(moved_guard))]
+        assert str(hash(moved_ear)) in moved["ears"]
+        assert moved["adjacency"][str(hash(moved_ear))] == [hash(Polygon.unserialize([["0", "0"], ["2", "3"], ["-1", "2"]]))]
+        assert moved["pruned"] == [3, 4]
+        assert frame.restore(moved) == value
+
+    def test_unknown_table_keys_are_refused(self):
+        with pytest.raises(ValidationError, match="Cannot move table key"):
+            Frame(x=1, y=1).normalize({"visibility": {"123": [["1", "1"]]}})
+
+
+class TestFingerprint:
+    """Test Fingerprint normalization of step inputs."""
+
+    BOUNDARY = [["1", "1"], ["9", "1"], ["9", "9"], ["1", "9"]]
+    OBSTACLES = [[["2", "2"], ["2", "3"], ["3", "3"]], [["5", "5"], ["5", "6"], ["6", "6"]]]
+
+    def key(self, boundary, obstacles):
+        return Fingerprint.of("stitching", "1", {}, {"boundary": boundary, "obstacles": obstacles}).key
+
+    def test_invariant_to_translation_start_vertex_and_obstacle_order(self):
+        key = self.key(self.BOUNDARY, self.OBSTACLES)
+        assert self.key(shifted(self.BOUNDARY, 100, -7), shifted(self.OBSTACLES, 100, -7)) == key
+        assert self.key(self.BOUNDARY[2:] + self.BOUNDARY[:2], [self.OBSTACLES[1], self.OBSTACLES[0][1:] + self.OBSTACLES[0][:1]]) == key
+
+    def test_sensitive_to_shape_orientation_step_and_version(self):
+        key = self.key(self.BOUNDARY, self.OBSTACLES)
+        assert self.key(self.BOUNDARY[::-1], self.OBSTACLES) != key
+        assert self.key(self.BOUNDARY, self.OBSTACLES[:1]) != key
+        assert self.key(shifted(self.BOUNDARY, Decimal("0.5"), 0), shifted(self.OBSTACLES, Decimal("0.5"), 0)) != key
+        inputs = {"boundary": self.BOUNDARY, "obstacles": self.OBSTACLES}
+        assert Fingerprint.of("validate-polygons", "1", {}, inputs).key != key
+        assert Fingerprint.of("stitching", "2", {}, inputs).key != key
+
+    def test_numeric_stdin_matches_strings(self):
+        boundary = [[int(x), int(y)] for x, y in self.BOUNDARY]
+        assert self.key(boundary, self.OBSTACLES) == self.key(self.BOUNDARY, self.OBSTACLES)
+
+    def test_canonical_writes_table_polygons_in_one_form(self):
+        ring = [["0", "0"], ["4", "0"], ["2", "3"]]
+        key = str(hash(Polygon.unserialize(ring)))
+        assert canonical({"ears": {key: ring}}) == canonical({"ears": {key: [ring[1], ring[0], ring[2]]}})
+
+
+class TestMappedOutputs:
+    """Cached outputs moved into another frame equal the outputs computed there."""
+
+    def test_pipeline_outputs_round_trip_between_translated_galleries(self):
+        stdin = POLYGON_BOXES_STDIN
+        moved = {"boundary": shifted(stdin["boundary"], -40, 13), "obstacles": shifted(stdin["obstacles"], -40, 13)}
+        for (fingerprint, output), (other, expected) in zip(pipeline(stdin), pipeline(moved)):
+            assert fingerprint.key == other.key
+            assert fingerprint.frame.restore(fingerprint.frame.normalize(output)) == output
+            assert unordered(other.frame.restore(fingerprint.frame.normalize(output))) == unordered(expected)
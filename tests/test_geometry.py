@@ -12,6 +12,8 @@ from geometry import Interval
 from geometry import Point
 from geometry import Polygon
 from geometry import Segment
+from geometry import Sight
+from geometry import VisibilityGraph
 from geometry import Walk
 from attributes import Email
 from models import Job
@@ -110,6 +112,13 @@ class TestConvexComponent:
         assert hash(c) == hash(c.id)
         assert int(c.id) == hash(c)
 
+    def test_trusted_skips_convexity_check(self):
+        points = [Point([0, 0]), Point([1, 0]), Point([1, 1]), Point([0.5, 0.5]), Point([0, 1])]
+        c = ConvexComponent.trusted(points)
+        assert isinstance(c, ConvexComponent)
+        assert list(c) == points
+        assert c[0] is points[0]
+
     def test_hash_depends_on_points_and_order(self):
         """Hash depends on the points and their order; same points same order -> same hash."""
         points = [Point([0, 0]), Point([1, 0]), Point([0.5, 1])]
@@ -1005,3 +1014,102 @@ class TestPolygon:
     def test_is_simple_less_than_three_vertices(self):
         assert Polygon([]).is_simple() is False
         assert Polygon([Point([0, 0]), Point([1, 0])]).is_simple() is False
+
+
+class TestSight:
+    """Test the batched crossing kernel against Segment.crosses."""
+
+    def _square(self):
+        return Polygon.unserialize([[2, 2], [4, 2], [4, 4], [2, 4]])
+
+    def test_crosses_matches_segment_crosses(self):
+        square = self._square()
+        sight = Sight(square.edges)
+        guard = Point([0, 3])
+        targets = [Point([x, y]) for x in range(0, 7) for y in range(0, 7)]
+        expected = [any(guard.to(target).crosses(edge) for edge in square.edges) for target in targets]
+        assert sight.crosses(guard, targets) == expected
+
+    def test_borderline_cases_use_exact_check(self):
+        sight = Sight(self._square().edges)
+        # Along an edge (collinear), through a vertex, ending on an edge, and the guard itself.
+        targets = [Point([6, 2]), Point([6, 6]), Point([2, 3]), Point([0, 0])]
+        assert sight.crosses(Point([0, 0]), targets) == [False, False, False, False]
+        assert sight.crosses(Point([0, 3]), [Point([5, 3])]) == [True]
+
+    def test_decimal_coordinates(self):
+        edge = Segment([Point(["0.1", "0.1"]), Point(["0.3", "0.3"])])
+        sight = Sight([edge])
+        guard = Point(["0.1", "0.3"])
+        targets = [Point(["0.3", "0.1"]), Point(["0.2", "0.2"]), Point(["0.15", "0.25"])]
+        assert sight.crosses(guard, targets) == [guard.to(target).crosses(edge) for target in targets]
+
+    def test_large_coordinates_near_collinear(self):
+        # Around 1e15 floats are 0.125 apart: the edge ends a few thousandths off the guard->target line, and rounding
+        # moves it across the line by more than the orientation's own product tolerance.
+        base = Decimal(10) ** 15
+        cases = [
+            ((45, 38), (9, 19), ("40.32", "35.536"), (35, 6)),
+            ((28, 5), (5, 20), ("12.82", "14.898"), (35, 18)),
+            ((45, 7), (35, 21), ("38.0", "16.8009"), (18, 28)),
+            ((12, 15), (1, 46), ("8.15", "25.854"), (50, 10)),
+        ]
+        for g, t, a, b in cases:
+            guard, target = Point([base + g[0], base + g[1]]), Point([base + t[0], base + t[1]])
+            edge = Segment([Point([base + Decimal(a[0]), base + Decimal(a[1])]), Point([base + b[0], base + b[1]])])
+            assert Sight([edge]).crosses(guard, [target]) == [guard.to(target).crosses(edge)]
+
+    def test_no_edges(self):
+        assert Sight([]).crosses(Point([0, 0]), [Point([1, 1])]) == [False]
+
+
+class TestVisibilityGraph:
+    """Test the rotational-sweep visibility graph against the exact predicate."""
+
+    def _gallery(self):
+        boundary = Polygon.unserialize([[0, 0], [10, 0], [10, 10], [5, 6], [0, 10]])
+        obstacles = [Polygon.unserialize([[2, 2], [4, 2], [4, 4], [2, 4]]), Polygon.unserialize([[6, 2], [8, 2], [7, 4]])]
+        boundary.sort("ccw")
+        for obstacle in obstacles:
+            obstacle.sort("cw")
+        return boundary, obstacles
+
+    def test_build_matches_exact_predicate(self):
+        boundary, obstacles = self._gallery()
+        graph = VisibilityGraph.build(boundary, obstacles)
+        assert len(graph) == 12
+        for i, a in enumerate(graph.vertices):
+            for b in graph.vertices[i + 1 :]:
+                expected = VisibilityGraph.clear(boundary, obstacles, a.to(b))
+                assert graph.sees(a, b) == expected, f"{a} -> {b}"
+                assert graph.sees(b, a) == expected
+
+    def test_collinear_vertices(self):
+        # Vertices on the same ray from the boundary corner exercise the exact fallback.
+        boundary = Polygon.unserialize([[0, 0], [12, 0], [12, 12], [0, 12]])
+        obstacles = [Polygon.unserialize([[4, 4], [6, 4], [6, 6], [4, 6]]), Polygon.unserialize([[8, 8], [10, 8], [10, 10]])]
+        for obstacle in obstacles:
+            obstacle.sort("cw")
+        graph = VisibilityGraph.build(boundary, obstacles)
+        assert graph.sees(Point([0, 0]), Point([4, 4])) is True
+        assert graph.sees(Point([4, 6]), Point([6, 4])) is False
+        # Along the hypotenuse of the triangle: touching an edge does not block.
+        assert graph.sees(Point([8, 8]), Point([12, 12])) is True
+        for i, a in enumerate(graph.vertices):
+            for b in graph.vertices[i + 1 :]:
+                assert graph.sees(a, b) == VisibilityGraph.clear(boundary, obstacles, a.to(b)), f"{a} -> {b}"
+
+    def test_sees_returns_none_for_non_vertex(self):
+        boundary, obstacles = self._gallery()
+        graph = VisibilityGraph.build(boundary, obstacles)
+        assert graph.sees(Point([0, 0]), Point([1, 1])) is None
+        assert Point([0, 0]) in graph
+        assert Point([1, 1]) not in graph
+
+    def test_serialize_round_trip(self):
+        boundary, obstacles = self._gallery()
+        graph = VisibilityGraph.build(boundary, obstacles)
+        data = json.loads(json.dumps(graph.serialize()))
+        restored = VisibilityGraph.unserialize(data)
+        assert restored.vertices == graph.vertices
+        assert restored.rows == graph.rows
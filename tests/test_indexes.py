@@ -4,16 +4,21 @@ from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
+from attributes import Countdown
 from attributes import Identifier
 from attributes import Limit
 from attributes import Offset
 from data import Page
+from enums import Status
 from exceptions import RecordNotFoundError
 from exceptions import ValidationError
 from indexes import ArtGalleryPublicIndex
 from indexes import Indexed
 from indexes import JobsPrivateIndex
+from indexes import JobsStatusIndex
+from models import Job
 from models import User
+from repositories import UnitOfWork
 
 import api  # noqa: F401
 
@@ -24,11 +29,13 @@ class TestIndexed:
     def test_serialize(self):
         entry = Indexed(index_id=Identifier("id1"), real_id=Identifier("r1"))
         d = entry.serialize()
-        assert d["index_id"] == "id1" and d["real_id"] == "r1"
+        assert d["index_id"] == "id1" and d["real_id"] == "r1" and d["summary"] is None
 
     def test_unserialize(self):
         entry = Indexed.unserialize({"index_id": "id1", "real_id": "r1"})
         assert str(entry.index_id) == "id1" and str(entry.real_id) == "r1"
+        assert entry.summary is None
+        assert Indexed.unserialize({"index_id": "id1", "real_id": "r1", "summary": {"version": 1}}).summary == {"version": 1}
 
     def test_unserialize_not_dict_raises(self):
         with pytest.raises(ValidationError, match="must be a dict"):
@@ -113,14 +120,15 @@ class TestArtGalleryPublicIndex:
             keys=["index/galleries/k1.json"],
             next_token=Offset("next"),
         )
-        mock_bucket.load.side_effect = [{"index_id": "k1", "real_id": "g1"}]
+        mock_bucket.load_many.return_value = [{"index_id": "k1", "real_id": "g1"}]
         fake_repo = MagicMock()
-        fake_repo.get.return_value = MagicMock()
+        fake_repo.get_many.return_value = [MagicMock()]
         idx = ArtGalleryPublicIndex()
         idx.repository = fake_repo
         records, token = idx.search(limit=Limit(10))
         assert len(records) == 1
         assert str(token) == "next"
+        fake_repo.get_many.assert_called_once_with([Identifier("g1")])
 
     @patch("indexes.bucket")
     def test_search_stale_key_deleted_read_repair(self, mock_bucket):
@@ -129,9 +137,9 @@ class TestArtGalleryPublicIndex:
             keys=["index/galleries/stale.json", "index/galleries/ok.json"],
             next_token=None,
         )
-        mock_bucket.load.side_effect = [None, {"index_id": "ok", "real_id": "g1"}]
+        mock_bucket.load_many.return_value = [None, {"index_id": "ok", "real_id": "g1"}]
         fake_repo = MagicMock()
-        fake_repo.get.return_value = MagicMock()
+        fake_repo.get_many.return_value = [MagicMock()]
         idx = ArtGalleryPublicIndex()
         idx.repository = fake_repo
         records, token = idx.search(limit=Limit(10))
@@ -139,6 +147,18 @@ class TestArtGalleryPublicIndex:
         mock_bucket.delete.assert_called_once()
         assert "stale" in str(mock_bucket.delete.call_args[0][0])
 
+    @patch("indexes.bucket")
+    def test_search_missing_record_deletes_its_entry_and_keeps_order(self, mock_bucket):
+        keys = ["index/galleries/a.json", "index/galleries/b.json", "index/galleries/c.json"]
+        mock_bucket.search.return_value = Page(keys=keys, next_token=None)
+        mock_bucket.load_many.return_value = [{"index_id": key[-6], "real_id": f"g{key[-6]}"} for key in keys]
+        idx = ArtGalleryPublicIndex()
+        idx.repository = MagicMock()
+        idx.repository.get_many.return_value = ["A", None, "C"]
+        records, _ = idx.search(limit=Limit(10))
+        assert records == ["A", "C"]
+        mock_bucket.delete.assert_called_once_with("index/galleries/b.json")
+
     @patch("indexes.bucket")
     def test_all_iterates_with_read_repair(self, mock_bucket):
         """Index.all() yields records and skips stale keys (load returns None)."""
@@ -146,9 +166,9 @@ class TestArtGalleryPublicIndex:
             Page(keys=["index/galleries/a.json"], next_token=Offset("next")),
             Page(keys=[], next_token=None),
         ]
-        mock_bucket.load.side_effect = [{"index_id": "a", "real_id": "g1"}]
+        mock_bucket.load_many.side_effect = [[{"index_id": "a", "real_id": "g1"}], []]
         fake_repo = MagicMock()
-        fake_repo.get.return_value = MagicMock()
+        fake_repo.get_many.side_effect = lambda ids: [MagicMock() for _ in ids]
         idx = ArtGalleryPublicIndex()
         idx.repository = fake_repo
         out = list(idx.all())
@@ -159,19 +179,140 @@ class TestArtGalleryPublicIndex:
     def test_all_stale_key_deleted(self, mock_bucket):
         """Index.all() deletes key when load returns None."""
         mock_bucket.search.return_value = Page(keys=["index/galleries/stale.json"], next_token=None)
-        mock_bucket.load.return_value = None
+        mock_bucket.load_many.return_value = [None]
         idx = ArtGalleryPublicIndex()
         idx.repository = MagicMock()
+        idx.repository.get_many.return_value = []
         out = list(idx.all())
         assert len(out) == 0
         mock_bucket.delete.assert_called_once()
 
+    @patch("indexes.bucket")
+    def test_summaries_read_entries_alone(self, mock_bucket):
+        summary = {"version": ArtGalleryPublicIndex.SUMMARY_VERSION, "id": "g1", "title": "T"}
+        mock_bucket.search.return_value = Page(keys=["index/galleries/a.json"], next_token=Offset("next"))
+        mock_bucket.load_many.return_value = [{"index_id": "a", "real_id": "g1", "summary": summary}]
+        idx = ArtGalleryPublicIndex()
+        idx.repository = MagicMock()
+        summaries, token = idx.summaries(limit=Limit(10))
+        assert summaries == [summary]
+        assert str(token) == "next"
+        idx.repository.get_many.assert_not_called()
+        mock_bucket.save.assert_not_called()
+
+    @patch("indexes.bucket")
+    def test_summaries_backfill_outdated_entries(self, mock_bucket):
+        fresh = {"version": ArtGalleryPublicIndex.SUMMARY_VERSION, "id": "ga"}
+        keys = ["index/galleries/a.json", "index/galleries/b.json", "index/galleries/c.json", "index/galleries/d.json"]
+        mock_bucket.search.return_value = Page(keys=keys, next_token=None)
+        mock_bucket.load_many.return_value = [
+            {"index_id": "a", "real_id": "ga", "summary": fresh},
+            {"index_id": "b", "real_id": "gb"},
+            {"index_id": "c", "real_id": "gc", "summary": {"version": 0, "id": "gc"}},
+            {"index_id": "d", "real_id": "gd"},
+        ]
+        record = MagicMock()
+        record.summarize.return_value = {"version": ArtGalleryPublicIndex.SUMMARY_VERSION, "id": "new"}
+        idx = ArtGalleryPublicIndex()
+        idx.repository = MagicMock()
+        idx.repository.get_many.return_value = [record, record, None]
+        summaries, _ = idx.summaries(limit=Limit(10))
+        assert [summary["id"] for summary in summaries] == ["ga", "new", "new"]
+        idx.repository.get_many.assert_called_once_with([Identifier("gb"), Identifier("gc"), Identifier("gd")])
+        assert [call[0][0] for call in mock_bucket.save.call_args_list] == ["index/galleries/b.json", "index/galleries/c.json"]
+        assert mock_bucket.save.call_args[0][1]["summary"]["id"] == "new"
+        mock_bucket.delete.assert_called_once_with("index/galleries/d.json")
+
 
 class TestJobsPrivateIndex:
     """Test JobsPrivateIndex (user-scoped path)."""
 
-    def test_path_includes_user_slug(self):
+    @patch("indexes.bucket")
+    def test_refresh_writes_entry_with_summary(self, mock_bucket):
+        user = User.test()
+        job = Job(id=Identifier("j1"), status=Status.SUCCESS, meta={"title": "T"})
+        JobsPrivateIndex(user_email=user.email).refresh(job)
+        countdown = Countdown.from_timestamp(job.created_at)
+        (key, data), (status_key, status_data) = [call[0] for call in mock_bucket.save.call_args_list]
+        assert key == f"index/jobs/{user.email.slug}/{countdown}.json"
+        assert status_key == f"index/jobs-status/{user.email.slug}/success/{countdown}.json"
+        assert data["real_id"] == "j1"
+        assert data["summary"] == status_data["summary"] == job.summarize()
+        mock_bucket.delete.assert_not_called()
+
+    @patch("indexes.bucket")
+    def test_refresh_moves_the_status_entry_after_a_transition(self, mock_bucket):
         user = User.test()
-        idx = JobsPrivateIndex(user_email=user.email)
-        assert "jobs" in idx.path
-        assert user.email.slug in idx.path
+        job = Job(id=Identifier("j1"))
+        job.fail(ValueError("boom"))
+        JobsPrivateIndex(user_email=user.email).refresh(job)
+        countdown = Countdown.from_timestamp(job.created_at)
+        assert mock_bucket.save.call_args[0][0] == f"index/jobs-status/{user.email.slug}/failed/{countdown}.json"
+        mock_bucket.delete.assert_called_once_with(f"index/jobs-status/{user.email.slug}/pending/{countdown}.json")
+        assert job.filed_status is None
+
+    @patch("indexes.bucket")
+    def test_refresh_in_a_unit_of_work_writes_at_flush(self, mock_bucket):
+        user = User.test()
+        job = Job(id=Identifier("j1"))
+        with patch("indexes.unit", new_callable=UnitOfWork) as unit:
+            with unit:
+                job.start()
+                JobsPrivateIndex(user_email=user.email).refresh(job)
+                job.finish()
+                JobsPrivateIndex(user_email=user.email).refresh(job)
+                mock_bucket.save.assert_not_called()
+                assert job.filed_status == Status.PENDING
+        countdown = Countdown.from_timestamp(job.created_at)
+        assert [call[0][0] for call in mock_bucket.save.call_args_list] == [
+            f"index/jobs/{user.email.slug}/{countdown}.json",
+            f"index/jobs-status/{user.email.slug}/success/{countdown}.json",
+        ]
+        mock_bucket.delete.assert_called_once_with(f"index/jobs-status/{user.email.slug}/pending/{countdown}.json")
+        assert job.filed_status is None
+
+    @patch("indexes.bucket")
+    def test_refresh_of_a_reloaded_job_moves_an_entry_left_by_a_failed_flush(self, mock_bucket):
+        user = User.test()
+        job = Job(id=Identifier("j1"))
+        job.fail(ValueError("boom"))
+        # The record was saved with its transition but the index writes after it failed.
+        reloaded = Job.unserialize(job.serialize())
+        JobsPrivateIndex(user_email=user.email).refresh(reloaded)
+        countdown = Countdown.from_timestamp(job.created_at)
+        mock_bucket.delete.assert_called_once_with(f"index/jobs-status/{user.email.slug}/pending/{countdown}.json")
+
+    @patch("indexes.bucket")
+    def test_forget_deletes_every_entry(self, mock_bucket):
+        user = User.test()
+        job = Job(id=Identifier("j1"))
+        job.finish()
+        JobsPrivateIndex(user_email=user.email).forget(job)
+        countdown = Countdown.from_timestamp(job.created_at)
+        assert {call[0][0] for call in mock_bucket.delete.call_args_list} == {
+            f"index/jobs/{user.email.slug}/{countdown}.json",
+            f"index/jobs-status/{user.email.slug}/pending/{countdown}.json",
+            f"index/jobs-status/{user.email.slug}/success/{countdown}.json",
+        }
+
+
+class TestJobsStatusIndex:
+    """Test JobsStatusIndex (per user and status)."""
+
+    def test_path_includes_user_slug_and_status(self):
+        user = User.test()
+        assert JobsStatusIndex(user_email=user.email, status=Status.FAILED).path == f"index/jobs-status/{user.email.slug}/failed/"
+
+    @patch("indexes.bucket")
+    def test_summaries_drop_entries_of_another_status(self, mock_bucket):
+        user = User.test()
+        job = Job(id=Identifier("j2"), status=Status.SUCCESS)
+        fresh = {**Job(id=Identifier("j1"), status=Status.FAILED).summarize()}
+        mock_bucket.search.return_value = Page(keys=["a.json", "b.json"], next_token=None)
+        mock_bucket.load_many.return_value = [{"index_id": "a", "real_id": "j1", "summary": fresh}, {"index_id": "b", "real_id": "j2"}]
+        idx = JobsStatusIndex(user_email=user.email, status=Status.FAILED)
+        idx.repository = MagicMock()
+        idx.repository.get_many.return_value = [job]
+        summaries, _ = idx.summaries(limit=Limit(10))
+        assert summaries == [fresh]
+        mock_bucket.delete.assert_called_once_with(f"{idx.path}{Countdown.from_timestamp(job.created_at)}.json")
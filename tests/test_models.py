@@ -1,18 +1,25 @@
 """Tests for models package."""
 
+from unittest.mock import patch
+
+import pytest
 from attributes import Identifier
 from enums import Status
 from enums import StepName
+from exceptions import ValidationError
 from geometry import ConvexComponent
 from geometry import Point
 from models import ArtGallery
 from models import Job
 from models import JobState
+from models import StepResult
 from models import User
+from models import thumbnail
 from settings import ANONYMOUS_EMAIL
 from settings import ANONYMOUS_NAME
 from settings import TEST_EMAIL
 from settings import TEST_NAME
+from structs import Table
 
 
 class TestUser:
@@ -97,6 +104,173 @@ class TestArtGalleryAdjacency:
         assert out["coverage"] == []
 
 
+def full_gallery() -> ArtGallery:
+    """Gallery with every geometry field set, sharing vertices between them."""
+    cc1 = ConvexComponent([Point([0, 0]), Point([2, 0]), Point([2, 2])])
+    cc2 = ConvexComponent([Point([0, 0]), Point([2, 2]), Point([0, 2])])
+    guard = Point([0, 0])
+    return ArtGallery.unserialize(
+        {
+            "id": "g1",
+            "boundary": [[0, 0], [2, 0], [2, 2], [0, 2]],
+            "owner_job_id": "j1",
+            "title": "Test",
+            "duration": 7,
+            "created_at": "2024-01-01T00:00:00",
+            "updated_at": "2024-01-01T00:00:00",
+            "obstacles": [[[0.5, 0.5], [1, 0.5], [1, 1]]],
+            "ears": [cc1.serialize(), cc2.serialize()],
+            "convex_components": [cc1.serialize(), cc2.serialize()],
+            "adjacency": {str(cc1.id): [str(cc2.id)], str(cc2.id): [str(cc1.id)]},
+            "guards": {str(hash(guard)): guard.serialize()},
+            "visibility": {str(hash(guard)): [[2, 0], [2, 2], [0, 2]]},
+            "exclusivity": {str(hash(guard)): [[2, 0]]},
+            "stitched": [[0, 0], [2, 0], [2, 2], [0, 2]],
+            "stitches": [[[0, 0], [0.5, 0.5]]],
+            "coverage": [[0, 0], [2, 2]],
+        }
+    )
+
+
+def canonical(data: dict) -> dict:
+    """Legacy serialization with set-ordered lists sorted, for comparing galleries."""
+    for key in ("visibility", "exclusivity", "adjacency"):
+        data[key] = {k: sorted(map(str, v)) for k, v in data[key].items()}
+    data["coverage"] = sorted(map(str, data["coverage"]))
+    return data
+
+
+class TestArtGalleryIndexed:
+    """Test ArtGallery.serialize_indexed() and version detection in unserialize()."""
+
+    def test_vertices_are_listed_once(self):
+        data = full_gallery().serialize_indexed()
+        assert data["version"] == ArtGallery.INDEXED_VERSION
+        assert len(data["vertices"]) == len({tuple(v) for v in data["vertices"]}) == 7
+        assert data["vertices"][data["boundary"][0]] == Point([0, 0]).serialize()
+        assert data["stitches"] == [[data["boundary"][0], data["obstacles"][0][0]]]
+
+    def test_round_trip(self):
+        gallery = full_gallery()
+        restored = ArtGallery.unserialize(gallery.serialize_indexed())
+        assert canonical(restored.serialize()) == canonical(gallery.serialize())
+        assert restored.duration == 7
+
+    def test_points_are_shared(self):
+        restored = ArtGallery.unserialize(full_gallery().serialize_indexed())
+        assert restored.boundary[0] is restored.stitched[0]
+        assert restored.boundary[0] is list(restored.guards.values())[0]
+
+    def test_adjacency_refers_to_components(self):
+        data = full_gallery().serialize_indexed()
+        assert sorted(data["adjacency"]) == [[0], [1]]
+
+    def test_legacy_dict_still_decodes(self):
+        gallery = full_gallery()
+        assert canonical(ArtGallery.unserialize(gallery.serialize()).serialize()) == canonical(gallery.serialize())
+
+    def test_unknown_version_raises(self):
+        with pytest.raises(ValidationError, match="version"):
+            ArtGallery.unserialize_indexed({"version": 99})
+
+    def test_position_out_of_range_raises(self):
+        with pytest.raises(ValidationError, match="position"):
+            ArtGallery.unserialize({"version": ArtGallery.INDEXED_VERSION, "boundary": [0, 1, 5], "vertices": [[0, 0], [1, 0], [1, 1]]})
+
+
+class TestArtGalleryLazy:
+    """Test ArtGallery.unserialize(lazy=True, trusted=True)."""
+
+    def test_lazy_fields_decode_on_first_access(self):
+        data = full_gallery().serialize()
+        gallery = ArtGallery.unserialize(data, lazy=True)
+        assert "ears" not in vars(gallery)
+        assert "boundary" not in vars(gallery)
+        assert gallery.id == "g1"
+        assert len(gallery.ears) == 2
+        assert "ears" in vars(gallery)
+        assert "convex_components" not in vars(gallery)
+        assert canonical(gallery.serialize()) == canonical(ArtGallery.unserialize(data).serialize())
+
+    def test_lazy_indexed(self):
+        gallery = full_gallery()
+        lazy = ArtGallery.unserialize(gallery.serialize_indexed(), trusted=True, lazy=True)
+        assert len(lazy.adjacency) == 2
+        assert canonical(lazy.serialize()) == canonical(gallery.serialize())
+
+    def test_assigned_field_is_not_decoded(self):
+        gallery = ArtGallery.unserialize(full_gallery().serialize(), lazy=True)
+        gallery.guards = Table()
+        assert len(gallery.guards) == 0
+
+    def test_unknown_attribute_raises(self):
+        gallery = ArtGallery.unserialize(full_gallery().serialize(), lazy=True)
+        with pytest.raises(AttributeError):
+            gallery.missing
+
+    def test_trusted_skips_validation(self):
+        concave = [[0, 0], [2, 0], [2, 2], [1, 1], [0, 2]]
+        data = {"id": "g1", "boundary": concave, "convex_components": [concave]}
+        with pytest.raises(ValidationError, match="convex"):
+            ArtGallery.unserialize(data)
+        gallery = ArtGallery.unserialize(data, trusted=True)
+        component = list(gallery.convex_components.values())[0]
+        assert isinstance(component, ConvexComponent)
+        assert len(component) == 5
+
+
+class TestSummaries:
+    """Test ArtGallery.summarize() and Job.summarize() (index entry summaries)."""
+
+    def test_gallery_summary_keeps_scalars_counts_box_and_thumbnail(self):
+        gallery = full_gallery()
+        summary = gallery.summarize()
+        assert summary["version"] == ArtGallery.SUMMARY_VERSION
+        assert (summary["vertex_count"], summary["obstacle_count"], summary["guard_count"], summary["stitched_count"]) == (7, 1, 1, 4)
+        assert summary["box"]["top_right"] == Point([2, 2]).serialize()
+        assert summary["title"] == "Test"
+        assert summary["thumbnail"] == {
+            "boundary": gallery.boundary.serialize(),
+            "obstacles": gallery.obstacles.serialize(),
+            "guards": gallery.guards.serialize(),
+        }
+        assert not {"boundary", "obstacles", "guards", "stitched", "ears", "convex_components", "visibility", "coverage"} & summary.keys()
+
+    def test_lazy_gallery_summary_decodes_only_drawn_fields(self):
+        gallery = ArtGallery.unserialize(full_gallery().serialize_indexed(), trusted=True, lazy=True)
+        assert gallery.summarize() == full_gallery().summarize()
+        assert "ears" not in vars(gallery) and "visibility" not in vars(gallery)
+
+    def test_thumbnail_decimates_to_about_the_point_budget(self):
+        boundary = [[i, 0] for i in range(1000)]
+        obstacles = {"big": [[i, 1] for i in range(300)], "small": [[0, 2], [1, 2], [1, 3]]}
+        guards = {str(i): [i, 0] for i in range(10)}
+        with patch("models.SUMMARY_THUMBNAIL_POINTS", 130):
+            result = thumbnail(boundary, obstacles, guards)
+        assert result["boundary"] == boundary[::11] and result["obstacles"] == {"big": obstacles["big"][::11]}
+        assert result["guards"] == guards
+        with patch("models.SUMMARY_THUMBNAIL_POINTS", 4):
+            result = thumbnail(boundary[:4], list(obstacles.values()), guards)
+        assert result["boundary"] == boundary[:4] and result["obstacles"] == [obstacles["big"][::77]]
+        assert result["guards"] == dict(list(guards.items())[:4])
+
+    def test_job_summary_counts_stdout_over_stdin(self):
+        stdin = {"boundary": [[0, 0], [4, 0], [4, 4], [0, 4]], "obstacles": [[[1, 1], [2, 1], [2, 2]]]}
+        job = Job(id=Identifier("j1"), stdin=stdin, meta={"title": "T", "notes": "x" * 100})
+        summary = job.summarize()
+        assert (summary["vertex_count"], summary["obstacle_count"], summary["guard_count"]) == (7, 1, 0)
+        assert summary["thumbnail"] == {**stdin, "guards": []}
+        assert summary["status"] == "pending" and summary["title"] == "T"
+        assert not {"stdin", "stdout", "meta"} & summary.keys()
+        job.stdout = {"guards": {"a": [0, 0], "b": [4, 4]}, "ears": {"e": [[0, 0], [4, 0], [4, 4]]}}
+        summary = job.summarize()
+        assert summary["guard_count"] == 2 and summary["thumbnail"]["guards"] == job.stdout["guards"]
+
+    def test_job_summary_without_geometry(self):
+        summary = Job(id=Identifier("j1")).summarize()
+        assert (summary["vertex_count"], summary["stitched_count"], summary["box"], summary["title"]) == (0, 0, None, None)
+
+
 class TestJobLifecycle:
     """Test Job.start(), .finish(), .fail()."""
 
@@ -119,14 +293,23 @@ class TestJobLifecycle:
             children_ids=[Identifier("c1")],
             stdout={"key": "value"},
             stderr={"error": "msg"},
+            context={"boundary": Identifier("p1")},
         )
         job.start()
         assert job.status == Status.PENDING
         assert job.children_ids == []
         assert job.stdout == {}
         assert job.stderr == {}
+        assert job.context == {}
         assert "step:art-gallery:started_at" in job.meta
 
+    def test_context_round_trip(self):
+        job = Job(id=Identifier("j1"), context={"boundary": Identifier("p1"), "stitched": Identifier("c1")})
+        data = job.serialize()
+        assert data["context"] == {"boundary": "p1", "stitched": "c1"}
+        assert Job.unserialize(data).context == job.context
+        assert Job.unserialize({**data, "context": None}).context == {}
+
     def test_finish_sets_success_and_finished_at(self):
         job = Job(
             id=Identifier("j1"),
@@ -140,6 +323,16 @@ class TestJobLifecycle:
         assert "step:art-gallery:elapsed_time" in job.meta
         assert job.duration >= 0
 
+    def test_transitions_keep_the_filed_status(self):
+        job = Job(id=Identifier("j1"))
+        job.fail(ValueError("boom"))
+        assert (job.filed_status, job.status) == (Status.PENDING, Status.FAILED)
+        job.start()
+        assert job.filed_status == Status.PENDING
+        assert job.serialize()["filed_status"] == "pending"
+        assert Job.unserialize(job.serialize()).filed_status == Status.PENDING
+        assert Job.unserialize(Job(id=Identifier("j2")).serialize()).filed_status is None
+
     def test_fail_sets_failed_and_stderr(self):
         job = Job(
             id=Identifier("j1"),
@@ -186,3 +379,43 @@ class TestJobState:
         assert "JobState" in str(state)
         assert "j1" in str(state)
         assert "JobState" in repr(state)
+
+    def test_delta_and_replay_round_trip(self):
+        previous = {"remaining": [[str(x), "0"] for x in range(6)], "universe": {"before": 4}, "gone": 1, "pruned": [2]}
+        data = {
+            "remaining": [["0", "0"], ["3", "0"], ["4", "0"], ["5", "0"]],
+            "universe": {"before": 4, "after": 2},
+            "pruned": [2, 5],
+            "guards": {"1": ["0", "0"]},
+        }
+        state = JobState(id=Identifier("j1"), data=data)
+        operations = state.delta(previous)
+        assert ["rem", ["remaining"], [["1", "0"], ["2", "0"]]] in operations
+        assert ["ext", ["pruned"], [5]] in operations
+        assert ["set", ["universe", "after"], 2] in operations
+        assert ["del", ["gone"]] in operations
+        replayed = JobState(id=Identifier("j1"), data=dict(previous))
+        replayed.replay(operations)
+        assert replayed.data == data
+
+    def test_delta_replaces_reordered_lists(self):
+        state = JobState(id=Identifier("j1"), data={"forced": [3, 1, 2]})
+        assert state.delta({"forced": [1, 2, 3]}) == [["set", ["forced"], [3, 1, 2]]]
+        assert state.delta({"forced": [3, 1, 2]}) == []
+
+    def test_serialize_round_trip_keeps_generation(self):
+        state = JobState(id=Identifier("j1"), generation="abc")
+        assert JobState.unserialize(state.serialize()).generation == "abc"
+
+
+class TestStepResult:
+    """Test StepResult serialization."""
+
+    def test_serialize_round_trip(self):
+        result = StepResult(id=Identifier("k1"), step_name=StepName.STITCHING, stdout={"stitched": [["0", "0"]], "stitches": []})
+        loaded = StepResult.unserialize(result.serialize())
+        assert loaded.id == result.id
+        assert loaded.step_name == StepName.STITCHING
+        assert loaded.stdout == result.stdout
+        assert loaded.serialize()["step_name"] == "stitching"
+        assert "StepResult" in str(result) and "StepResult" in repr(result)
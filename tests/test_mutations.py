@@ -1,5 +1,6 @@
 """Tests for mutations package."""
 
+import math
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
@@ -11,7 +12,10 @@ from exceptions import GalleryHasNoConvexComponentsError
 from exceptions import GalleryHasNoEarsError
 from exceptions import GalleryHasNoGuardsError
 from exceptions import GalleryHasNoVisibilityError
+from exceptions import GalleryTooExpensiveError
 from exceptions import JobNotFoundError
+from exceptions import JobSourceNotFinishedError
+from exceptions import JobStepNotReprocessableError
 from exceptions import RecordNotFoundError
 from exceptions import UnauthorizedError
 from exceptions import ValidationError
@@ -101,6 +105,60 @@ class TestJobMutation:
         mock_repo.save.assert_called_once()
         mock_queue.put.assert_called_once()
 
+    @patch("mutations.queue")
+    @patch("mutations.JobsRepository")
+    def test_execute_refuses_gallery_expected_to_exceed_continuations(self, mock_repo_cls, mock_queue):
+        from costs import CostModel
+        from geometry import Polygon
+        from structs import Table
+
+        mock_repo_cls.return_value.exists.return_value = False
+        model = CostModel(
+            coefficients={"stitching": {"seconds": [math.log(10**9), 0.0, 0.0], "work": [0.0, 0.0, 0.0], "vertices": 100, "obstacles": 5}}
+        )
+        handler = JobMutation(user=User.test())
+        req = {"boundary": Polygon.unserialize([[0, 0], [2, 0], [1, 2]]), "obstacles": Table.unserialize([])}
+        with patch.object(CostModel, "current", return_value=model):
+            with pytest.raises(GalleryTooExpensiveError, match="stitching"):
+                handler.execute(req)
+        mock_repo_cls.return_value.save.assert_not_called()
+        mock_queue.put.assert_not_called()
+
+    def test_validate_source_id_not_string_raises(self):
+        handler = JobMutation(user=User.test())
+        with pytest.raises(ValidationError, match="source_id"):
+            handler.validate({"boundary": [[0, 0], [2, 0], [1, 2]], "obstacles": [], "source_id": 1})
+
+    @patch("mutations.queue")
+    @patch("mutations.JobsRepository")
+    @patch("mutations.JobsPrivateIndex")
+    def test_execute_records_finished_source_in_stdin(self, mock_index_cls, mock_repo_cls, mock_queue):
+        mock_repo = mock_repo_cls.return_value
+        mock_repo.exists.return_value = False
+        mock_repo.get.return_value = Job(id=Identifier("src"), status=Status.SUCCESS)
+        handler = JobMutation(user=User.test())
+        req = handler.validate({"boundary": [[0, 0], [2, 0], [1, 2]], "obstacles": [], "source_id": "src"})
+        handler.execute(req)
+        mock_repo.get.assert_called_once_with(Identifier("src"))
+        assert mock_repo.save.call_args[0][0].stdin["source_id"] == "src"
+
+    @patch("mutations.queue")
+    @patch("mutations.JobsRepository")
+    def test_execute_refuses_missing_or_unfinished_source(self, mock_repo_cls, mock_queue):
+        mock_repo = mock_repo_cls.return_value
+        mock_repo.exists.return_value = False
+        handler = JobMutation(user=User.test())
+        req = handler.validate({"boundary": [[0, 0], [2, 0], [1, 2]], "obstacles": [], "source_id": "src"})
+        mock_repo.get.side_effect = RecordNotFoundError("Job src not found")
+        with pytest.raises(JobNotFoundError, match="Source job"):
+            handler.execute(req)
+        mock_repo.get.side_effect = None
+        mock_repo.get.return_value = Job(id=Identifier("src"), status=Status.PENDING)
+        with pytest.raises(JobSourceNotFinishedError):
+            handler.execute(req)
+        mock_repo.save.assert_not_called()
+        mock_queue.put.assert_not_called()
+
 
 class TestJobUpdateMutation:
     """Test JobUpdateMutation validate and execute."""
@@ -159,12 +217,13 @@ class TestJobUpdateMutation:
         mock_job_repo.save.assert_called_once()
         mock_gallery_repo_cls.return_value.exists.assert_not_called()
 
+    @patch("mutations.JobsPrivateIndex")
     @patch("mutations.ArtGalleryPublicIndex")
     @patch("mutations.ArtGalleryRepository")
     @patch("mutations.JobsRepository")
     @patch("mutations.Countdown")
     def test_execute_updates_job_and_gallery_title(
-        self, mock_countdown_cls, mock_job_repo_cls, mock_gallery_repo_cls, mock_index_cls
+        self, mock_countdown_cls, mock_job_repo_cls, mock_gallery_repo_cls, mock_index_cls, mock_jobs_index_cls
     ):
         user = User.test()
         mock_job_repo = MagicMock()
@@ -196,6 +255,7 @@ class TestJobUpdateMutation:
         result = handler.execute({"job_id": Identifier("j1"), "meta": {"title": "New Title"}})
         assert result is not None
         mock_gallery_repo.save.assert_called_once()
+        mock_jobs_index_cls.return_value.refresh.assert_called_once_with(job)
 
 
 class TestArtGalleryPublishMutation:
@@ -386,13 +446,14 @@ class TestJobDeleteMutation:
         req = handler.validate({"id": "job-123"})
         assert str(req["job_id"]) == "job-123"
 
+    @patch("mutations.JobStateRepository")
     @patch("mutations.JobsPrivateIndex")
     @patch("mutations.ArtGalleryPublicIndex")
     @patch("mutations.ArtGalleryRepository")
     @patch("mutations.JobsRepository")
     @patch("mutations.Countdown")
     def test_execute_kill_deletes_gallery_and_job(
-        self, mock_countdown_cls, mock_job_repo_cls, mock_gallery_repo_cls, mock_index_cls, mock_private_index_cls
+        self, mock_countdown_cls, mock_job_repo_cls, mock_gallery_repo_cls, mock_index_cls, mock_private_index_cls, mock_state_repo_cls
     ):
         user = User.test()
         mock_job_repo = MagicMock()
@@ -419,6 +480,7 @@ class TestJobDeleteMutation:
         assert result == {}
         mock_gallery_repo.delete.assert_called_once()
         mock_job_repo.delete.assert_called_once_with(job.id)
+        mock_state_repo_cls.return_value.delete.assert_called_once_with(Identifier("j1"))
 
 
 class TestReprocessingJobMutation:
@@ -454,6 +516,58 @@ class TestReprocessingJobMutation:
         mock_jobs_repo.save.assert_called_once()
         mock_queue.put.assert_called_once()
 
+    def test_validate_step_name(self):
+        handler = ReprocessingJobMutation(user=User.test())
+        assert handler.validate({"id": "job-123"})["step_name"] is None
+        assert handler.validate({"id": "job-123", "step_name": "guard-placement"})["step_name"] == StepName.GUARD_PLACEMENT
+        with pytest.raises(ValidationError):
+            handler.validate({"id": "job-123", "step_name": "painting"})
+
+    def pipeline(self, statuses):
+        """Root job with one child per step of the pipeline, in the given statuses."""
+        steps = [StepName.VALIDATE_POLYGONS, StepName.STITCHING, StepName.EAR_CLIPPING, StepName.CONVEX_COMPONENT_OPTIMIZATION, StepName.GUARD_PLACEMENT]
+        children = {
+            Identifier(f"j1_{step_name.value}"): Job(id=Identifier(f"j1_{step_name.value}"), parent_id=Identifier("j1"), step_name=step_name, status=status)
+            for step_name, status in zip(steps, statuses)
+        }
+        job = Job(id=Identifier("j1"), status=Status.SUCCESS, step_name=StepName.ART_GALLERY, children_ids=list(children))
+        return job, children
+
+    @patch("mutations.queue")
+    @patch("mutations.JobDeleteMutation")
+    @patch("mutations.ArtGalleryRepository")
+    @patch("mutations.JobsRepository")
+    def test_execute_from_step_deletes_only_downstream_children(self, mock_repo_cls, mock_gallery_repo_cls, mock_delete_cls, mock_queue):
+        user = User.test()
+        job, children = self.pipeline([Status.SUCCESS, Status.SUCCESS, Status.SUCCESS, Status.SUCCESS, Status.FAILED])
+        mock_repo_cls.return_value.get.side_effect = lambda job_id: job if job_id == job.id else children[job_id]
+        mock_gallery_repo_cls.return_value.exists.return_value = False
+        handler = ReprocessingJobMutation(user=user)
+        handler.execute({"job_id": Identifier("j1"), "step_name": StepName.CONVEX_COMPONENT_OPTIMIZATION})
+        killed = [call[0][0] for call in mock_delete_cls.return_value.kill.call_args_list]
+        assert killed == [Identifier("j1_convex_component_optimization"), Identifier("j1_guard_placement")]
+        assert job.status == Status.PENDING
+        mock_queue.put.assert_called_once()
+        assert mock_queue.put.call_args[0][0].job_id == Identifier("j1")
+
+    @patch("mutations.queue")
+    @patch("mutations.JobDeleteMutation")
+    @patch("mutations.ArtGalleryRepository")
+    @patch("mutations.JobsRepository")
+    def test_execute_from_step_requires_upstream_success(self, mock_repo_cls, mock_gallery_repo_cls, mock_delete_cls, mock_queue):
+        user = User.test()
+        job, children = self.pipeline([Status.SUCCESS, Status.FAILED, Status.PENDING, Status.PENDING, Status.PENDING])
+        mock_repo_cls.return_value.get.side_effect = lambda job_id: job if job_id == job.id else children[job_id]
+        handler = ReprocessingJobMutation(user=user)
+        with pytest.raises(JobStepNotReprocessableError, match="stitching did not succeed"):
+            handler.execute({"job_id": Identifier("j1"), "step_name": StepName.GUARD_PLACEMENT})
+        with pytest.raises(JobStepNotReprocessableError, match="job has no art_gallery step"):
+            handler.execute({"job_id": Identifier("j1"), "step_name": StepName.ART_GALLERY})
+        mock_gallery_repo_cls.return_value.delete.assert_not_called()
+        mock_delete_cls.return_value.kill.assert_not_called()
+        mock_queue.put.assert_not_called()
+        assert job.status == Status.SUCCESS
+
     @patch("mutations.JobsRepository")
     def test_execute_job_not_found_raises(self, mock_repo_cls):
         user = User.test()
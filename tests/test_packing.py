@@ -0,0 +1,74 @@
+"""Tests for packing module."""
+
+import json
+import mmap
+
+import pytest
+from exceptions import ValidationError
+from packing import MAGIC
+from packing import is_packed
+from packing import pack
+from packing import scaled
+from packing import unpack
+from packing import unscaled
+
+STATE = {
+    "boundary": [["0", "0"], ["10", "0"], ["10", "10"], ["0", "10"]],
+    "guards": {"70696421008374921635885845632756936023455011245752281387915919043935312492816": ["0.5", "-2.25"]},
+    "visibility": {"-12": [["0", "0"], ["0.5", "-2.25"]], "7": []},
+    "remaining_component_ids": ["abc-1", "abc-1", "007"],
+    "pruned": [0, 3, -4, 2**70],
+    "ratio": 0.25,
+    "flags": [True, False, None],
+    "odd": [["1e5", "-0"], ["0.10", "3"]],
+    "title": "Galería",
+}
+
+
+class TestPacking:
+    """Test pack/unpack round trips and format detection."""
+
+    def test_round_trip_equals_json_round_trip(self):
+        assert unpack(pack(STATE)) == json.loads(json.dumps(STATE))
+
+    def test_is_packed(self):
+        assert is_packed(pack(STATE))
+        assert pack(STATE).startswith(MAGIC)
+        assert not is_packed(json.dumps(STATE).encode("utf-8"))
+
+    def test_repeated_points_and_hash_keys_are_smaller_than_json(self):
+        points = [[str(i), str(i * 2)] for i in range(50)]
+        data = {str(hash(tuple(point)) * 10**50): points for point in points}
+        assert len(pack(data)) * 5 < len(json.dumps(data, indent=2))
+
+    def test_unpack_reads_a_mapping(self, tmp_path):
+        path = tmp_path / "state.bin"
+        path.write_bytes(pack(STATE))
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            assert is_packed(content)
+            assert unpack(content) == json.loads(json.dumps(STATE))
+
+    def test_scaled_only_when_exact(self):
+        assert scaled("-12.50") == (-1250, 2)
+        assert unscaled(-1250, 2) == "-12.50"
+        assert unscaled(5, 3) == "0.005"
+        assert scaled("-0") is None
+        assert scaled("007") is None
+
+    def test_long_and_non_ascii_digit_strings_stay_strings(self):
+        data = {"long": "9" * 5000, "point": ["1" * 5000, "0.5"], "arabic": "\u0661\u0662", "points": [["\u0661", "2"]]}
+        assert unpack(pack(data)) == data
+
+    def test_unsupported_version_raises(self):
+        content = bytearray(pack(STATE))
+        content[3] = 99
+        with pytest.raises(ValidationError, match="version"):
+            unpack(bytes(content))
+
+    def test_truncated_content_raises(self):
+        with pytest.raises(ValidationError, match="Corrupt"):
+            unpack(pack(STATE)[:-3])
+
+    def test_unsupported_value_raises(self):
+        with pytest.raises(ValidationError, match="Cannot pack"):
+            pack({"x": object()})
@@ -5,6 +5,8 @@ from unittest.mock import patch
 
 import pytest
 from data import Page
+from enums import Status
+from exceptions import ValidationError
 from models import ArtGallery
 from models import Job
 from models import User
@@ -107,7 +109,7 @@ class TestJobListQuery:
     @patch("queries.JobsPrivateIndex")
     def test_handler_returns_data_and_next_token(self, mock_index_cls):
         mock_index = MagicMock()
-        mock_index.search.return_value = ([], None)
+        mock_index.summaries.return_value = ([], None)
         mock_index_cls.return_value = mock_index
         user = User.test()
         query = JobListQuery(user=user)
@@ -115,7 +117,21 @@ class TestJobListQuery:
         assert "data" in result
         assert "next_token" in result
         assert isinstance(result["data"], list)
-        mock_index.search.assert_called_once()
+        mock_index.summaries.assert_called_once()
+
+    @patch("queries.JobsStatusIndex")
+    @patch("queries.JobsPrivateIndex")
+    def test_status_filter_lists_the_status_index(self, mock_index_cls, mock_status_index_cls):
+        mock_status_index_cls.return_value.summaries.return_value = ([{"id": "j1", "status": "failed"}], None)
+        user = User.test()
+        result = JobListQuery(user=user).handler(body={"limit": 10, "status": "FAILED"})
+        assert result["data"] == [{"id": "j1", "status": "failed"}]
+        mock_status_index_cls.assert_called_once_with(user_email=user.email, status=Status.FAILED)
+        mock_index_cls.assert_not_called()
+
+    def test_unknown_status_raises(self):
+        with pytest.raises(ValidationError, match="status"):
+            JobListQuery(user=User.test()).validate({"status": "running"})
 
 
 class TestJobDetailsQuery:
@@ -7,7 +7,10 @@ import pytest
 from attributes import Identifier
 from attributes import Limit
 from attributes import Offset
+from attributes import Timestamp
 from data import Page
+from enums import Encoding
+from enums import StepName
 from exceptions import CorruptionError
 from exceptions import RecordNotFoundError
 from exceptions import UnauthorizedError
@@ -15,11 +18,14 @@ from exceptions import ValidationError
 from models import ArtGallery
 from models import Job
 from models import JobState
+from models import StepResult
 from models import User
 from repositories import ArtGalleryRepository
 from repositories import JobsRepository
 from repositories import JobStateRepository
 from repositories import Results
+from repositories import StepResultRepository
+from repositories import UnitOfWork
 
 import api  # noqa: F401
 
@@ -81,8 +87,34 @@ class TestRepositories:
         repo = ArtGalleryRepository()
         gallery = ArtGallery.unserialize(gallery_data)
         saved = repo.save(gallery)
-        assert saved is not None
+        assert saved is gallery
         mock_bucket.save.assert_called()
+        mock_bucket.load.assert_not_called()
+
+    @patch("repositories.bucket")
+    def test_art_gallery_repository_saves_indexed_format(self, mock_bucket):
+        gallery = ArtGallery.unserialize({"id": "g1", "boundary": [[0, 0], [1, 0], [1, 1]], "owner_job_id": "job1", "title": "T"})
+        mock_bucket.load.side_effect = lambda key: mock_bucket.save.call_args[0][1]
+        saved = ArtGalleryRepository().save(gallery, verify=True)
+        assert mock_bucket.save.call_args[0][1]["version"] == ArtGallery.INDEXED_VERSION
+        assert saved is not gallery
+        assert saved.boundary == gallery.boundary
+
+    @patch("repositories.bucket")
+    def test_repository_verify_class_default_reads_back(self, mock_bucket):
+        gallery = ArtGallery.unserialize({"id": "g1", "boundary": [[0, 0], [1, 0], [1, 1]], "owner_job_id": "job1", "title": "T"})
+        mock_bucket.load.side_effect = lambda key: mock_bucket.save.call_args[0][1]
+        with patch.object(ArtGalleryRepository, "VERIFY", True):
+            assert ArtGalleryRepository().save(gallery) is not gallery
+            assert ArtGalleryRepository().save(gallery, verify=False) is gallery
+        assert mock_bucket.load.call_count == 1
+
+    @patch("repositories.bucket")
+    def test_get_many_keeps_order_and_skips_missing(self, mock_bucket):
+        records = {f"data/galleries/{name}.json": {"id": name, "boundary": [[0, 0], [1, 0], [1, 1]]} for name in ("g1", "g3")}
+        mock_bucket.load.side_effect = records.get
+        galleries = ArtGalleryRepository().get_many([Identifier("g3"), Identifier("g2"), Identifier("g1")])
+        assert [gallery and gallery.id for gallery in galleries] == ["g3", None, "g1"]
 
     @patch("repositories.bucket")
     def test_art_gallery_repository_delete(self, mock_bucket):
@@ -145,7 +177,7 @@ class TestJobStateRepository:
             "created_at": "",
             "updated_at": "",
         }
-        mock_bucket.load.return_value = state_data
+        mock_bucket.load.side_effect = lambda key: state_data if key.endswith("/states/j1.json") else None
         user = User.test()
         repo = JobStateRepository(user=user)
         state = JobState.unserialize(state_data)
@@ -153,6 +185,12 @@ class TestJobStateRepository:
         assert saved is not None
         mock_bucket.save.assert_called()
 
+    @patch("repositories.bucket")
+    def test_job_state_repository_saves_packed(self, mock_bucket):
+        mock_bucket.load.side_effect = lambda key: None if "/deltas/" in key else JobState(id=Identifier("j1")).serialize()
+        JobStateRepository(user=User.test()).save(JobState(id=Identifier("j1")))
+        assert mock_bucket.save.call_args.kwargs["encoding"] == Encoding.BINARY
+
     @patch("repositories.bucket")
     def test_job_state_repository_get_not_found_raises(self, mock_bucket):
         mock_bucket.load.return_value = None
@@ -164,14 +202,201 @@ class TestJobStateRepository:
     @patch("repositories.bucket")
     def test_job_state_repository_delete(self, mock_bucket):
         mock_bucket.delete.return_value = True
+        mock_bucket.search.return_value = Page(keys=[])
         user = User.test()
         repo = JobStateRepository(user=user)
         repo.delete(Identifier("j1"))
         mock_bucket.delete.assert_called_once()
 
+    @patch("repositories.bucket")
+    def test_job_state_repository_delete_removes_deltas(self, mock_bucket):
+        mock_bucket.search.return_value = Page(keys=["data/x/deltas/j1/g/1.json", "data/x/deltas/j1/g/2.json"])
+        repo = JobStateRepository(user=User.test())
+        repo.delete(Identifier("j1"))
+        assert mock_bucket.search.call_args[0][0] == f"{repo.deltas_path}/j1/"
+        assert mock_bucket.delete.call_count == 3
+
+    @patch("repositories.bucket")
+    def test_job_state_repository_checkpoint_writes_deltas_and_replays(self, mock_bucket):
+        store = {}
+        mock_bucket.load.side_effect = lambda key: store.get(key)
+        mock_bucket.load_many.side_effect = lambda keys: [store.get(key) for key in keys]
+        mock_bucket.save.side_effect = lambda key, data, **kwargs: store.__setitem__(key, data)
+        mock_bucket.delete.side_effect = lambda key: store.pop(key, None)
+        mock_bucket.search.side_effect = lambda prefix, **kwargs: Page(keys=[key for key in store if key.startswith(prefix)])
+        repo = JobStateRepository(user=User.test())
+        points = [[str(x), "0"] for x in range(20)]
+
+        first = repo.checkpoint(JobState(id=Identifier("j1"), data={"remaining": points, "guards": []}, attempt=1), None)
+        assert first.deltas == 0
+        snapshot_key = f"{repo.path}/j1.json"
+        assert store[snapshot_key]["data"]["remaining"] == points
+
+        data = {"remaining": points[3:], "guards": [points[0]]}
+        second = repo.checkpoint(JobState(id=Identifier("j1"), data=data, attempt=2), first)
+        assert second.deltas == 1
+        assert store[snapshot_key]["data"]["remaining"] == points
+        delta = store[f"{repo.deltas_path}/j1/{first.generation}/1.json"]
+        assert delta["operations"] == [["rem", ["remaining"], points[:3]], ["ext", ["guards"], [points[0]]]]
+
+        assert repo.checkpoint(JobState(id=Identifier("j1"), data=dict(data), attempt=2), second) is second
+
+        loaded = repo.get(Identifier("j1"))
+        assert loaded.data == data
+        assert loaded.attempt == 2
+        assert loaded.deltas == 1
+
+    @patch("repositories.bucket")
+    @patch("repositories.JOB_STATE_MAX_DELTAS", 2)
+    def test_job_state_repository_checkpoint_compacts_long_chains(self, mock_bucket):
+        store = {}
+        mock_bucket.load.side_effect = lambda key: store.get(key)
+        mock_bucket.load_many.side_effect = lambda keys: [store.get(key) for key in keys]
+        mock_bucket.save.side_effect = lambda key, data, **kwargs: store.__setitem__(key, data)
+        mock_bucket.delete.side_effect = lambda key: store.pop(key, None)
+        mock_bucket.search.side_effect = lambda prefix, **kwargs: Page(keys=[key for key in store if key.startswith(prefix)])
+        repo = JobStateRepository(user=User.test())
+        state = None
+        for attempt in range(1, 5):
+            state = repo.checkpoint(JobState(id=Identifier("j1"), data={"pruned": list(range(attempt))}, attempt=attempt), state)
+        assert state.deltas == 0
+        assert [key for key in store if key.startswith(repo.deltas_path)] == []
+        loaded = repo.get(Identifier("j1"))
+        assert loaded.data == {"pruned": [0, 1, 2, 3]}
+        assert loaded.attempt == 4
+
+    @patch("repositories.bucket")
+    def test_job_state_repository_get_lists_the_chain_and_fetches_it_in_one_batch(self, mock_bucket):
+        store = {}
+        mock_bucket.load.side_effect = lambda key: store.get(key)
+        mock_bucket.load_many.side_effect = lambda keys: [store.get(key) for key in keys]
+        mock_bucket.save.side_effect = lambda key, data, **kwargs: store.__setitem__(key, data)
+        mock_bucket.search.side_effect = lambda prefix, **kwargs: Page(keys=sorted(key for key in store if key.startswith(prefix)))
+        repo = JobStateRepository(user=User.test())
+        state = repo.checkpoint(JobState(id=Identifier("j1"), data={"pruned": []}, attempt=1), None)
+        assert repo.get(Identifier("j1")).deltas == 0
+        assert (mock_bucket.load.call_count, mock_bucket.search.call_count, mock_bucket.load_many.call_count) == (2, 0, 0)
+        with patch("repositories.JOB_STATE_MAX_DELTAS", 20):
+            for attempt in range(2, 13):
+                state = repo.checkpoint(JobState(id=Identifier("j1"), data={"pruned": list(range(attempt))}, attempt=attempt), state)
+        mock_bucket.reset_mock()
+        # A chain longer than JOB_STATE_MAX_DELTAS (the setting was lowered) is still read in one batch.
+        with patch("repositories.JOB_STATE_MAX_DELTAS", 2):
+            loaded = JobStateRepository(user=User.test()).get(Identifier("j1"))
+        assert (loaded.data, loaded.attempt, loaded.deltas) == ({"pruned": list(range(12))}, 12, 11)
+        assert (mock_bucket.load.call_count, mock_bucket.search.call_count, mock_bucket.load_many.call_count) == (2, 1, 1)
+        assert [key.rsplit("/", 1)[1] for key in mock_bucket.load_many.call_args[0][0]] == [f"{i}.json" for i in range(2, 12)]
+
     @patch("repositories.bucket")
     def test_job_state_repository_exists(self, mock_bucket):
         mock_bucket.exists.return_value = True
         user = User.test()
         repo = JobStateRepository(user=user)
         assert repo.exists(Identifier("j1")) is True
+
+
+class TestUnitOfWork:
+    """Test the identity map and write buffer shared by JobsRepository and JobStateRepository."""
+
+    def store(self, mock_bucket):
+        store = {}
+        mock_bucket.load.side_effect = lambda key: store.get(key)
+        mock_bucket.load_many.side_effect = lambda keys: [store.get(key) for key in keys]
+        mock_bucket.save.side_effect = lambda key, data, **kwargs: store.__setitem__(key, data)
+        mock_bucket.delete.side_effect = lambda key: store.pop(key, None)
+        mock_bucket.search.side_effect = lambda prefix, **kwargs: Page(keys=[key for key in store if key.startswith(prefix)])
+        return store
+
+    @patch("repositories.unit", new_callable=UnitOfWork)
+    @patch("repositories.bucket")
+    def test_reads_are_served_from_memory(self, mock_bucket, unit):
+        store = self.store(mock_bucket)
+        repo = JobsRepository(user=User.test())
+        store[f"{repo.path}/j1.json"] = Job(id=Identifier("j1")).serialize()
+        with unit:
+            job = repo.get(Identifier("j1"))
+            assert JobsRepository(user=User.test()).get(Identifier("j1")) is job
+            assert repo.exists(Identifier("j1"))
+        assert mock_bucket.load.call_count == 1
+        mock_bucket.exists.assert_not_called()
+        assert repo.get(Identifier("j1")) is not job
+
+    @patch("repositories.unit", new_callable=UnitOfWork)
+    @patch("repositories.bucket")
+    def test_writes_are_buffered_and_flushed_once(self, mock_bucket, unit):
+        store = self.store(mock_bucket)
+        repo = JobsRepository(user=User.test())
+        with unit:
+            job = repo.save(Job(id=Identifier("j1")))
+            job.stdout["key"] = "value"
+            repo.save(job)
+            assert repo.get(Identifier("j1")) is job
+            with unit:
+                ArtGalleryRepository().save(ArtGallery.unserialize({"id": "g1", "boundary": [[0, 0], [1, 0], [1, 1]]}))
+            assert mock_bucket.save.call_count == 1
+        assert mock_bucket.save.call_count == 2
+        assert Job.unserialize(store[f"{repo.path}/j1.json"]).stdout == {"key": "value"}
+        mock_bucket.load.assert_not_called()
+
+    @patch("repositories.unit", new_callable=UnitOfWork)
+    @patch("repositories.bucket")
+    @patch("repositories.JOB_STATE_MAX_DELTAS", 1)
+    def test_checkpoints_are_written_in_order(self, mock_bucket, unit):
+        store = self.store(mock_bucket)
+        repo = JobStateRepository(user=User.test())
+        with unit:
+            state = None
+            for attempt in range(1, 4):
+                state = repo.checkpoint(JobState(id=Identifier("j1"), data={"pruned": list(range(attempt))}, attempt=attempt), state)
+            assert repo.get(Identifier("j1")) is state
+            assert store == {}
+        assert [key for key in store if key.startswith(repo.deltas_path)] == []
+        loaded = repo.get(Identifier("j1"))
+        assert loaded.data == {"pruned": [0, 1, 2]}
+        assert loaded.generation == state.generation
+
+    @patch("repositories.unit", new_callable=UnitOfWork)
+    @patch("repositories.bucket")
+    def test_verify_writes_now_and_delete_drops_pending(self, mock_bucket, unit):
+        store = self.store(mock_bucket)
+        repo = JobsRepository(user=User.test())
+        with unit:
+            saved = repo.save(Job(id=Identifier("j1")), verify=True)
+            assert f"{repo.path}/j1.json" in store
+            assert repo.get(Identifier("j1")) is saved
+            repo.save(Job(id=Identifier("j2")))
+            repo.delete(Identifier("j2"))
+        assert f"{repo.path}/j2.json" not in store
+        assert mock_bucket.save.call_count == 1
+
+
+class TestStepResultRepository:
+    """Test StepResultRepository storage and eviction."""
+
+    @patch("repositories.bucket")
+    def test_saves_packed_under_cache_path(self, mock_bucket):
+        result = StepResult(id=Identifier("k1"), step_name=StepName.STITCHING, stdout={"stitched": []})
+        mock_bucket.load.return_value = result.serialize()
+        StepResultRepository().save(result)
+        assert mock_bucket.save.call_args[0][0] == "data/cache/steps/k1.json"
+        assert mock_bucket.save.call_args.kwargs["encoding"] == Encoding.BINARY
+
+    @patch("repositories.bucket")
+    def test_evict_drops_expired_then_oldest_until_size_fits(self, mock_bucket):
+        now = Timestamp.now()
+        expired = Timestamp("2020-01-01T00:00:00.000000Z")
+        keys = ["data/cache/steps/a.json", "data/cache/steps/b.json", "data/cache/steps/c.json", "data/cache/steps/d.json"]
+        first = Page(keys=keys[:2], next_token=Offset("t"), sizes={keys[0]: 10, keys[1]: 40}, modified={keys[0]: now, keys[1]: expired})
+        second = Page(
+            keys=keys[2:],
+            sizes={keys[2]: 30, keys[3]: 20},
+            modified={keys[2]: Timestamp("2026-01-01T00:00:00.000000Z"), keys[3]: Timestamp("2026-01-02T00:00:00.000000Z")},
+        )
+        mock_bucket.search.side_effect = [first, second]
+        deleted = StepResultRepository().evict(max_age_seconds=3600 * 24 * 365 * 100, max_bytes=60)
+        assert deleted == 1
+        assert [call[0][0] for call in mock_bucket.delete.call_args_list] == [keys[1]]
+        mock_bucket.search.side_effect = [first, second]
+        mock_bucket.delete.reset_mock()
+        assert StepResultRepository().evict(max_age_seconds=3600, max_bytes=1000) == 3
+        assert [call[0][0] for call in mock_bucket.delete.call_args_list] == [keys[1], keys[2], keys[3]]
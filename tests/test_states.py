@@ -148,3 +148,19 @@ class TestGuardPlacementStepState:
         assert state.component_id_by_point == {}
         assert state.remaining_points == set()
         assert state.remaining_component_ids == set()
+
+    def test_pruned_round_trip(self):
+        state = GuardPlacementStepState(pruned=[2, 0, 1])
+        assert state.serialize()["pruned"] == [2, 0, 1]
+        assert GuardPlacementStepState.unserialize(state.serialize()).pruned == [2, 0, 1]
+        assert GuardPlacementStepState.unserialize({}).pruned == []
+
+    def test_universe_forced_and_dominated_round_trip(self):
+        state = GuardPlacementStepState(
+            universe={"before": 10, "after": 7, "forced": 1}, forced=[Point([1, 2])], dominated={Point([3, 4]), Point([0, 1])}
+        )
+        restored = GuardPlacementStepState.unserialize(state.serialize())
+        assert restored.universe == {"before": 10, "after": 7, "forced": 1}
+        assert restored.forced == [Point([1, 2])]
+        assert restored.dominated == {Point([3, 4]), Point([0, 1])}
+        assert GuardPlacementStepState.unserialize({}).dominated == set()
@@ -3,11 +3,17 @@
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+import pytest
+from attributes import Deadline
 from attributes import Email
 from attributes import Identifier
+from attributes import Work
 from enums import StepName
+from exceptions import SuspendedStepError
+from geometry import Point
 from models import Job
 from models import User
+from settings import DEADLINE_CHECK_INTERVAL
 from steps import ArtGalleryStep
 from steps import ConvexComponentOptimizationStep
 from steps import EarClippingStep
@@ -15,6 +21,7 @@ from steps import GuardPlacementStep
 from steps import Step
 from steps import StitchingStep
 from steps import ValidationPolygonStep
+from structs import Collection
 from tasks import StartTask
 
 
@@ -35,6 +42,25 @@ class TestStepRegistration:
         assert step.work == Work(0)
         assert step.work == 0
 
+    def test_fingerprint_depends_only_on_step_inputs(self):
+        stitched = [["0", "0"], ["4", "0"], ["4", "4"], ["0", "4"]]
+        job = Job(id=Identifier("j1"), step_name=StepName.EAR_CLIPPING, stdout={"stitched": stitched, "stitches": [], "boundary": stitched})
+        other = Job(id=Identifier("j2"), step_name=StepName.EAR_CLIPPING, stdin={"stitched": [[9, 9]]}, stdout={"stitched": stitched, "stitches": []})
+        assert EarClippingStep.fingerprint(job).key == EarClippingStep.fingerprint(other).key
+        assert EarClippingStep.fingerprint(job).key != EarClippingStep.fingerprint(job, fast=True).key
+        changed = Job(id=Identifier("j3"), step_name=StepName.EAR_CLIPPING, stdout={"stitched": stitched[1:], "stitches": []})
+        assert EarClippingStep.fingerprint(job).key != EarClippingStep.fingerprint(changed).key
+        assert ArtGalleryStep.fingerprint(job) is None
+
+    def test_fingerprint_ignores_table_key_order_and_tracks_version(self):
+        ears = {"1": [["0", "0"], ["1", "0"], ["0", "1"]], "2": [["1", "0"], ["1", "1"], ["0", "1"]]}
+        job = Job(id=Identifier("j1"), step_name=StepName.CONVEX_COMPONENT_OPTIMIZATION, stdout={"ears": ears})
+        reordered = Job(id=Identifier("j2"), step_name=StepName.CONVEX_COMPONENT_OPTIMIZATION, stdout={"ears": dict(reversed(ears.items()))})
+        key = ConvexComponentOptimizationStep.fingerprint(job).key
+        assert key == ConvexComponentOptimizationStep.fingerprint(reordered).key
+        with patch("steps.STEP_CACHE_VERSION", "2"):
+            assert ConvexComponentOptimizationStep.fingerprint(job).key != key
+
 
 def _user():
     return User(email=Email("u@e.com"))
@@ -60,6 +86,48 @@ class TestSimpleSteps:
         assert len(out["stitched"]) == 4
         assert out["stitched"][0] in ([0, 0], ["0", "0"])
 
+    def test_stitching_step_suspends_at_deadline(self):
+        job = Job(
+            id=Identifier("j1"),
+            step_name=StepName.STITCHING,
+            stdin={},
+            stdout={
+                "boundary": [[0, 0], [10, 0], [10, 10], [0, 10]],
+                "obstacles": [[[2, 2], [4, 2], [4, 4], [2, 4]], [[6, 6], [8, 6], [8, 8], [6, 8]]],
+            },
+        )
+        step = StitchingStep(job=job, user=_user(), state={}, deadline=Deadline.from_millis(0))
+        # The first interval always runs; the second unit is past it.
+        with patch("steps.DEADLINE_CHECK_INTERVAL", 1), pytest.raises(SuspendedStepError):
+            step.run()
+
+    def test_check_with_deadline_starts_clock_at_first_unit(self):
+        job = Job(
+            id=Identifier("j1"), step_name=StepName.STITCHING, stdin={}, stdout={"boundary": [[0, 0], [10, 0], [10, 10], [0, 10]], "obstacles": []}
+        )
+        step = StitchingStep(job=job, user=_user(), state={}, deadline=Deadline.from_millis(0))
+        # Setup (decoding, prepare()) is not part of the pace, and the first interval always runs.
+        assert step.clock is None
+        step.work = Work(1)
+        step.check(max_work=5)
+        assert step.clock is not None
+        assert step.checkpoint == 1 + DEADLINE_CHECK_INTERVAL
+        step.work = Work(1 + DEADLINE_CHECK_INTERVAL)
+        with pytest.raises(SuspendedStepError):
+            step.check(max_work=5)
+
+    def test_check_with_deadline_ignores_max_work(self):
+        job = Job(
+            id=Identifier("j1"), step_name=StepName.STITCHING, stdin={}, stdout={"boundary": [[0, 0], [10, 0], [10, 10], [0, 10]], "obstacles": []}
+        )
+        step = StitchingStep(job=job, user=_user(), state={}, deadline=Deadline.from_millis(3600000))
+        step.work = Work(100)
+        step.check(max_work=5)
+        assert step.checkpoint == 100 + DEADLINE_CHECK_INTERVAL
+        step.deadline = None
+        with pytest.raises(SuspendedStepError):
+            step.check(max_work=5)
+
     def test_stitching_step_run_with_one_obstacle(self):
         # Boundary [0,0]-[10,0]-[10,10]-[0,10]; obstacle [2,2]-[4,2]-[4,4]-[2,4] inside.
         # StitchingStep reads from job.stdout (output of validation step).
@@ -91,6 +159,7 @@ class TestSimpleSteps:
         assert "obstacles" in out
         assert len(out["boundary"]) == 4
         assert out["obstacles"] == []
+        assert len(out["visibility_graph"]["vertices"]) == 4
 
     def test_ear_clipping_step_run(self):
         # Ear clipping reads stitched from job.stdout (from stitching step).
@@ -229,6 +298,181 @@ class TestSimpleSteps:
         assert len(out["guards"]) >= 1
         assert len(out["visibility"]) == len(out["guards"])
 
+    def test_guard_placement_step_run_parallel_matches_serial(self):
+        boundary = [[0, 0], [10, 0], [10, 10], [0, 10]]
+        obstacles = [[[2, 2], [4, 2], [4, 4], [2, 4]]]
+        job_stitch = Job(id=Identifier("j_stitch"), step_name=StepName.STITCHING, stdin={}, stdout={"boundary": boundary, "obstacles": obstacles})
+        stitch_out = StitchingStep(job=job_stitch, user=_user(), state={}).run()
+        job_ear = Job(id=Identifier("j_ear"), step_name=StepName.EAR_CLIPPING, stdin={}, stdout={"stitched": stitch_out["stitched"]})
+        ear_out = EarClippingStep(job=job_ear, user=_user(), state={}).run()
+        job_convex = Job(
+            id=Identifier("j_convex"),
+            step_name=StepName.CONVEX_COMPONENT_OPTIMIZATION,
+            stdin={},
+            stdout={"stitched": stitch_out["stitched"], "ears": ear_out["ears"]},
+        )
+        convex_out = ConvexComponentOptimizationStep(job=job_convex, user=_user(), state={}).run()
+        stdout = {
+            "boundary": boundary,
+            "obstacles": obstacles,
+            "stitched": stitch_out["stitched"],
+            "convex_components": convex_out["convex_components"],
+            "adjacency": convex_out["adjacency"],
+        }
+        serial = GuardPlacementStep(job=Job(id=Identifier("j1"), step_name=StepName.GUARD_PLACEMENT, stdout=dict(stdout)), user=_user(), state={})
+        serial_out = serial.run()
+        with patch("steps.GUARD_PLACEMENT_WORKERS", 2):
+            parallel = GuardPlacementStep(
+                job=Job(id=Identifier("j1"), step_name=StepName.GUARD_PLACEMENT, stdout=dict(stdout)), user=_user(), state={}
+            )
+            parallel_out = parallel.run()
+        assert parallel_out["guards"] == serial_out["guards"]
+        for key in ("visibility", "exclusivity"):
+            assert {g: sorted(ps) for g, ps in parallel_out[key].items()} == {g: sorted(ps) for g, ps in serial_out[key].items()}
+        assert parallel.state.visibility_by_segment == serial.state.visibility_by_segment
+        assert "executor" not in parallel.__dict__
+
+    def test_guard_placement_step_reduce_reports_universe_and_still_covers_every_target(self):
+        boundary = [[0, 0], [10, 0], [10, 10], [0, 10]]
+        obstacles = [[[2, 2], [4, 2], [4, 4], [2, 4]]]
+        job_stitch = Job(id=Identifier("j_stitch"), step_name=StepName.STITCHING, stdin={}, stdout={"boundary": boundary, "obstacles": obstacles})
+        stitch_out = StitchingStep(job=job_stitch, user=_user(), state={}).run()
+        job_ear = Job(id=Identifier("j_ear"), step_name=StepName.EAR_CLIPPING, stdin={}, stdout={"stitched": stitch_out["stitched"]})
+        ear_out = EarClippingStep(job=job_ear, user=_user(), state={}).run()
+        job_convex = Job(
+            id=Identifier("j_convex"),
+            step_name=StepName.CONVEX_COMPONENT_OPTIMIZATION,
+            stdin={},
+            stdout={"stitched": stitch_out["stitched"], "ears": ear_out["ears"]},
+        )
+        convex_out = ConvexComponentOptimizationStep(job=job_convex, user=_user(), state={}).run()
+        stdout = {
+            "boundary": boundary,
+            "obstacles": obstacles,
+            "stitched": stitch_out["stitched"],
+            "convex_components": convex_out["convex_components"],
+            "adjacency": convex_out["adjacency"],
+        }
+        step = GuardPlacementStep(job=Job(id=Identifier("j1"), step_name=StepName.GUARD_PLACEMENT, stdout=stdout), user=_user(), state={})
+        universe = step.state.universe
+        targets = set(step.state.remaining_points)
+        assert universe == {"before": len(targets), "after": len(targets - step.state.dominated), "forced": 0}
+        assert step.state.dominated and step.state.dominated < targets
+        assert step.state.forced == []
+        with patch.object(step.graph, "row", side_effect=lambda vertex: 0 if vertex == Point([0, 0]) else 1):
+            step.reduce()
+        assert step.state.forced == [Point([0, 0])]
+        assert step.state.universe["forced"] == 1
+        step.reduce()
+        assert step.state.remaining_points == targets
+        out = step.run()
+        assert out["universe"] == universe
+        seen = {tuple(p) for points in out["visibility"].values() for p in points}
+        assert {tuple(p) for p in out["coverage"]} <= seen
+
+    def test_guard_placement_step_restore_attaches_dominated_targets_or_returns_them(self):
+        boundary = [[0, 0], [10, 0], [10, 10], [0, 10]]
+        stdout = {"boundary": boundary, "obstacles": [], "stitched": boundary}
+        step = GuardPlacementStep(job=Job(id=Identifier("j1"), step_name=StepName.GUARD_PLACEMENT, stdout=stdout), user=_user(), state={})
+        guard, seen, unseen = Point([0, 0]), Point([10, 0]), Point([5, 5])
+        step.state.guards += guard
+        step.state.visibility += Collection(guard)
+        step.state.remaining_points = {seen, unseen}
+        step.state.dominated = {seen, unseen}
+        with patch.object(step, "sees", side_effect=lambda g, target: target == seen):
+            step.restore()
+        assert seen in step.state.visibility[guard]
+        assert step.state.remaining_points == {unseen}
+        assert step.state.dominated == {seen}
+
+    def test_guard_placement_step_prune_drops_dominated_candidates(self):
+        boundary = [[0, 0], [10, 0], [10, 10], [0, 10]]
+        stdout = {"boundary": boundary, "obstacles": [], "stitched": boundary}
+        step = GuardPlacementStep(job=Job(id=Identifier("j1"), step_name=StepName.GUARD_PLACEMENT, stdout=stdout), user=_user(), state={})
+        a, b, c = Point([0, 0]), Point([10, 0]), Point([0, 10])
+        step.state.component_id_by_point = {hash(a): [Identifier("c1")], hash(b): [Identifier("c1"), Identifier("c2")], hash(c): [Identifier("c3")]}
+        # Every corner sees every other, but b's components include a's: a is dominated. c has its own component.
+        assert step.prune([a, b, c, a]) == [b, c]
+        assert step.state.pruned == [1]
+        # Mutual dominance keeps the candidate compete() would prefer.
+        step.state.component_id_by_point[hash(a)] = [Identifier("c1"), Identifier("c2")]
+        assert step.prune([a, b]) == [max(a, b, key=hash)]
+        assert step.prune([Point([5, 5])]) == [Point([5, 5])]
+        assert step.state.pruned == [1, 1, 0]
+
+    def test_guard_placement_step_prune_reads_no_line_of_sight(self):
+        boundary = [[0, 0], [10, 0], [10, 10], [0, 10]]
+        stdout = {"boundary": boundary, "obstacles": [], "stitched": boundary}
+        step = GuardPlacementStep(job=Job(id=Identifier("j1"), step_name=StepName.GUARD_PLACEMENT, stdout=stdout), user=_user(), state={})
+        a, b = Point([0, 0]), Point([10, 0])
+        step.state.component_id_by_point = {hash(a): [Identifier("c1")], hash(b): [Identifier("c1"), Identifier("c2")]}
+        step.state.component_id_by_midpoint = {Point([5, 5]): {Identifier("c3")}}
+        with patch.object(step, "sees_many") as sees_many, patch.object(step, "sees") as sees:
+            assert step.prune([a, b]) == [b]
+        sees_many.assert_not_called()
+        sees.assert_not_called()
+        # b's row misses a vertex a sees: a is kept.
+        rows = {a: 0b1100, b: 0b0101}
+        with patch.object(step.graph, "row", side_effect=lambda vertex: rows[vertex]):
+            assert step.prune([a, b]) == [a, b]
+
+    def test_guard_placement_step_propose_slices_the_least_covered_component(self):
+        boundary = [[0, 0], [10, 0], [10, 10], [0, 10]]
+        stdout = {"boundary": boundary, "obstacles": [], "stitched": boundary}
+        step = GuardPlacementStep(job=Job(id=Identifier("j1"), step_name=StepName.GUARD_PLACEMENT, stdout=stdout), user=_user(), state={})
+        component = MagicMock(id=Identifier("c1"), __iter__=lambda self: iter([Point(p) for p in boundary]), __len__=lambda self: 4)
+        step.state.remaining_component_ids = {component.id}
+        with patch.object(step.gallery, "convex_components", {component.id: component}), patch.object(step, "measure", return_value=0):
+            assert step.propose(max_candidates=3) == [Point(p) for p in boundary[:3]]
+
+    def test_guard_placement_step_place_prunes_unless_disabled(self):
+        boundary = [[0, 0], [10, 0], [10, 10], [0, 10]]
+        obstacles = [[[2, 2], [4, 2], [4, 4], [2, 4]]]
+        job_stitch = Job(id=Identifier("j_stitch"), step_name=StepName.STITCHING, stdin={}, stdout={"boundary": boundary, "obstacles": obstacles})
+        stitch_out = StitchingStep(job=job_stitch, user=_user(), state={}).run()
+        job_ear = Job(id=Identifier("j_ear"), step_name=StepName.EAR_CLIPPING, stdin={}, stdout={"stitched": stitch_out["stitched"]})
+        ear_out = EarClippingStep(job=job_ear, user=_user(), state={}).run()
+        job_convex = Job(
+            id=Identifier("j_convex"),
+            step_name=StepName.CONVEX_COMPONENT_OPTIMIZATION,
+            stdin={},
+            stdout={"stitched": stitch_out["stitched"], "ears": ear_out["ears"]},
+        )
+        convex_out = ConvexComponentOptimizationStep(job=job_convex, user=_user(), state={}).run()
+        stdout = {
+            "boundary": boundary,
+            "obstacles": obstacles,
+            "stitched": stitch_out["stitched"],
+            "convex_components": convex_out["convex_components"],
+            "adjacency": convex_out["adjacency"],
+        }
+        step = GuardPlacementStep(job=Job(id=Identifier("j1"), step_name=StepName.GUARD_PLACEMENT, stdout=dict(stdout)), user=_user(), state={})
+        with patch.object(step, "prune", side_effect=lambda candidates: candidates[:1]) as prune:
+            out = step.run()
+        assert prune.call_count >= 1
+        seen = {tuple(p) for points in out["visibility"].values() for p in points}
+        assert {tuple(p) for p in out["coverage"]} <= seen
+        step = GuardPlacementStep(job=Job(id=Identifier("j1"), step_name=StepName.GUARD_PLACEMENT, stdout=dict(stdout)), user=_user(), state={})
+        with patch("steps.GUARD_PLACEMENT_PRUNING", False), patch.object(step, "prune") as prune:
+            step.run()
+        prune.assert_not_called()
+        assert step.state.pruned == []
+
+    def test_guard_placement_step_sees_many_matches_sees(self):
+        boundary = [[0, 0], [10, 0], [10, 10], [0, 10]]
+        obstacles = [[[2, 2], [4, 2], [4, 4], [2, 4]]]
+        job_stitch = Job(id=Identifier("j_stitch"), step_name=StepName.STITCHING, stdin={}, stdout={"boundary": boundary, "obstacles": obstacles})
+        stitch_out = StitchingStep(job=job_stitch, user=_user(), state={}).run()
+        stdout = {"boundary": boundary, "obstacles": obstacles, "stitched": stitch_out["stitched"]}
+        batched = GuardPlacementStep(job=Job(id=Identifier("j1"), step_name=StepName.GUARD_PLACEMENT, stdout=dict(stdout)), user=_user(), state={})
+        single = GuardPlacementStep(job=Job(id=Identifier("j1"), step_name=StepName.GUARD_PLACEMENT, stdout=dict(stdout)), user=_user(), state={})
+        points = list(batched.gallery.stitched) + [Point([x, y]) for x in range(0, 11, 2) for y in range(1, 11, 3)]
+        for guard in list(batched.gallery.stitched):
+            with patch("steps.GUARD_PLACEMENT_BATCH_MIN_TARGETS", 1):
+                assert batched.sees_many(guard, points) == [single.sees(guard, point) for point in points]
+        assert batched.work == single.work
+        assert batched.state.visibility_by_segment == single.state.visibility_by_segment
+
 
 class TestArtGalleryStep:
     """Test ArtGalleryStep with mocks (step does not enqueue; StartTask.broadcast/report do)."""
@@ -0,0 +1,190 @@
+"""Tests for storage module."""
+
+import mmap
+import os
+from unittest.mock import patch
+
+import data
+import pytest
+from data import Bucket
+from data import ClientError
+from enums import Encoding
+from exceptions import ConfigurationError
+from exceptions import ValidationError
+from storage import TEMPORARY_PREFIX
+from storage import LocalStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(str(tmp_path))
+
+
+def put(storage, key, body=b"{}"):
+    storage.put_object(Bucket="b", Key=key, Body=body, ContentType="application/json")
+
+
+class TestLocalStorage:
+    """Test LocalStorage against the S3 calls Bucket makes."""
+
+    def test_put_get(self, storage, tmp_path):
+        put(storage, "data/galleries/g1.json", b'{"id":"g1"}')
+        assert storage.get_object(Bucket="b", Key="data/galleries/g1.json")["Body"].read() == b'{"id":"g1"}'
+        assert (tmp_path / "b" / "data" / "galleries" / "g1.json").read_bytes() == b'{"id":"g1"}'
+
+    def test_put_replaces_and_leaves_no_temporary_files(self, storage, tmp_path):
+        put(storage, "k.json", b"1")
+        put(storage, "k.json", b"2")
+        assert storage.get_object(Bucket="b", Key="k.json")["Body"].read() == b"2"
+        assert os.listdir(tmp_path / "b") == ["k.json"]
+
+    def test_put_failure_removes_temporary_file(self, storage, tmp_path):
+        with patch("storage.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(ClientError) as e:
+                put(storage, "k.json")
+        assert e.value.response["Error"]["Code"] == "InternalError"
+        assert os.listdir(tmp_path / "b") == []
+
+    def test_put_under_object_key_raises_client_error(self, storage):
+        put(storage, "a.json")
+        with pytest.raises(ClientError) as e:
+            put(storage, "a.json/b.json")
+        assert e.value.response["Error"]["Code"] == "InternalError"
+
+    def test_get_large_object_is_mapped(self, storage):
+        put(storage, "big.bin", b"x" * 100)
+        with patch("storage.BUCKET_MMAP_THRESHOLD", 64):
+            body = storage.get_object(Bucket="b", Key="big.bin")["Body"].read()
+        assert isinstance(body, mmap.mmap)
+        assert body[:] == b"x" * 100
+
+    def test_get_missing_raises_no_such_key(self, storage):
+        put(storage, "a/b.json")
+        for key in ("missing.json", "a", "a/b.json/c"):
+            with pytest.raises(ClientError) as e:
+                storage.get_object(Bucket="b", Key=key)
+            assert e.value.response["Error"]["Code"] == "NoSuchKey"
+
+    def test_head(self, storage):
+        put(storage, "a/b.json", b"123")
+        assert storage.head_object(Bucket="b", Key="a/b.json")["ContentLength"] == 3
+        for key in ("missing.json", "a"):
+            with pytest.raises(ClientError) as e:
+                storage.head_object(Bucket="b", Key=key)
+            assert e.value.response["Error"]["Code"] == "404"
+
+    def test_delete_removes_empty_directories(self, storage, tmp_path):
+        put(storage, "a/b/c.json")
+        put(storage, "a/d.json")
+        storage.delete_object(Bucket="b", Key="a/b/c.json")
+        assert sorted(os.listdir(tmp_path / "b" / "a")) == ["d.json"]
+        storage.delete_object(Bucket="b", Key="a/d.json")
+        assert os.listdir(tmp_path / "b") == []
+
+    def test_delete_missing_succeeds(self, storage):
+        assert storage.delete_object(Bucket="b", Key="missing.json") == {}
+
+    def test_invalid_keys_raise(self, storage):
+        for key in ("/etc/passwd", "../x.json", "a/../../x.json", "a//b.json", "a/./b.json", "a/"):
+            with pytest.raises(ValidationError, match="Invalid key"):
+                storage.get_object(Bucket="b", Key=key)
+        with pytest.raises(ValidationError, match="Invalid bucket"):
+            storage.get_object(Bucket="..", Key="x.json")
+
+    def test_list_sorted_under_prefix(self, storage):
+        for key in ("index/jobs/u/2.json", "index/jobs/u/1.json", "index/jobs-status/u/x.json", "index/jobs/v/1.json", "data/u/1.json"):
+            put(storage, key, b"abc")
+        response = storage.list_objects_v2(Bucket="b", Prefix="index/jobs/", MaxKeys=10)
+        assert [obj["Key"] for obj in response["Contents"]] == ["index/jobs/u/1.json", "index/jobs/u/2.json", "index/jobs/v/1.json"]
+        assert response["Contents"][0]["Size"] == 3
+        assert response["IsTruncated"] is False
+        assert "NextContinuationToken" not in response
+        response = storage.list_objects_v2(Bucket="b", Prefix="index/jobs", MaxKeys=10)
+        assert len(response["Contents"]) == 4
+
+    def test_list_skips_temporary_files(self, storage, tmp_path):
+        put(storage, "p/a.json")
+        (tmp_path / "b" / "p" / f"{TEMPORARY_PREFIX}abc.tmp").write_bytes(b"{")
+        assert [obj["Key"] for obj in storage.list_objects_v2(Bucket="b", Prefix="p/", MaxKeys=10)["Contents"]] == ["p/a.json"]
+
+    def test_list_missing_prefix_is_empty(self, storage):
+        assert storage.list_objects_v2(Bucket="b", Prefix="nothing/", MaxKeys=10)["Contents"] == []
+
+    def test_list_pages_with_continuation_token(self, storage):
+        for i in range(5):
+            put(storage, f"p/{i}.json")
+        keys, token = [], None
+        while True:
+            response = storage.list_objects_v2(Bucket="b", Prefix="p/", MaxKeys=2, **({"ContinuationToken": token} if token else {}))
+            keys.extend(obj["Key"] for obj in response["Contents"])
+            if not response["IsTruncated"]:
+                break
+            token = response["NextContinuationToken"]
+        assert keys == [f"p/{i}.json" for i in range(5)]
+
+    def test_list_invalid_token_raises(self, storage):
+        with pytest.raises(ClientError) as e:
+            storage.list_objects_v2(Bucket="b", Prefix="p/", MaxKeys=2, ContinuationToken="!!!")
+        assert e.value.response["Error"]["Code"] == "InvalidArgument"
+
+
+class TestBucketOnLocalStorage:
+    """Test Bucket end to end over LocalStorage."""
+
+    @pytest.fixture
+    def bucket(self, storage):
+        bucket = Bucket()
+        bucket._client = storage
+        return bucket
+
+    def test_save_load_search_delete(self, bucket):
+        for i in range(3):
+            bucket.save(f"data/galleries/g{i}.json", {"id": f"g{i}", "title": "Galería"})
+        assert bucket.exists("data/galleries/g1.json")
+        assert bucket.load("data/galleries/g1.json") == {"id": "g1", "title": "Galería"}
+        page = bucket.search(prefix="data/galleries/", limit=2)
+        assert page.keys == ["data/galleries/g0.json", "data/galleries/g1.json"]
+        assert page.continues
+        assert set(page.sizes) == set(page.keys) and set(page.modified) == set(page.keys)
+        assert bucket.search(prefix="data/galleries/", limit=2, next_token=page.next_token).keys == ["data/galleries/g2.json"]
+        assert bucket.delete("data/galleries/g1.json") is True
+        assert bucket.load("data/galleries/g1.json") is None
+
+    def test_large_compressed_and_packed_objects_load_mapped(self, bucket):
+        value = {"boundary": [[str(i), f"{i}.5"] for i in range(2000)]}
+        with patch("storage.BUCKET_MMAP_THRESHOLD", 1024):
+            bucket.save("data/big.json", value)
+            bucket.save("data/big.bin", value, encoding=Encoding.BINARY)
+            with patch.object(data, "BUCKET_COMPRESSION_THRESHOLD", 1 << 30):
+                bucket.save("data/plain.json", value)
+                bucket.save("data/plain.bin", value, encoding=Encoding.BINARY)
+            for key in ("data/big.json", "data/big.bin", "data/plain.json", "data/plain.bin"):
+                assert bucket.load(key) == value
+
+    def test_packed_mapped_object_is_unpacked_without_a_copy(self, bucket):
+        value = {"boundary": [[str(i), f"{i}.5"] for i in range(2000)]}
+        with patch.object(data, "BUCKET_COMPRESSION_THRESHOLD", 1 << 30), patch("storage.BUCKET_MMAP_THRESHOLD", 1024):
+            bucket.save("data/plain.bin", value, encoding=Encoding.BINARY)
+            with patch("data.unpack", wraps=data.unpack) as unpack:
+                assert bucket.load("data/plain.bin") == value
+        assert isinstance(unpack.call_args[0][0], mmap.mmap)
+
+
+class TestConnect:
+    """Test data.connect() backend selection."""
+
+    def test_local(self, tmp_path):
+        with patch("data.BUCKET_BACKEND", "local"), patch("data.BUCKET_ROOT", str(tmp_path)):
+            client = data.connect()
+        assert isinstance(client, LocalStorage)
+        assert client.root == str(tmp_path)
+
+    def test_s3(self):
+        with patch("data.boto3") as mock_boto:
+            assert data.connect() is mock_boto.client.return_value
+            mock_boto.client.assert_called_once_with("s3")
+
+    def test_unknown_raises(self):
+        with patch("data.BUCKET_BACKEND", "ftp"):
+            with pytest.raises(ConfigurationError, match="BUCKET_BACKEND"):
+                data.connect()
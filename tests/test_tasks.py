@@ -1,14 +1,19 @@
 """Tests for tasks package."""
 
+import math
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
 
 from attributes import Attempt
+from attributes import Deadline
 from attributes import Duration
 from attributes import Email
 from attributes import Identifier
+from attributes import Signature
+from costs import CostModel
+from costs import Size
 from enums import Action
 from enums import Status
 from enums import StepName
@@ -17,8 +22,11 @@ from exceptions import MaxTaskContinuationAttemptsError
 from exceptions import RecordNotFoundError
 from exceptions import StepNotHandledError
 from exceptions import SuspendedStepError
+from fingerprints import Fingerprint
+from fingerprints import Frame
 from models import Job
 from models import JobState
+from models import StepResult
 from steps import Step
 from tasks import ReportTask
 from tasks import StartTask
@@ -55,6 +63,22 @@ class TestTaskHandler:
                 mock_validate.assert_called_once_with({})
                 mock_execute.assert_called_once()
 
+    @patch.object(StartTask, "broadcast")
+    @patch("tasks.JobStateRepository")
+    @patch("tasks.JobsRepository")
+    def test_handler_passes_lambda_deadline_to_step(self, mock_repo_cls, mock_state_repo_cls, mock_broadcast):
+        mock_repo_cls.return_value.get.return_value = Job(id=Identifier("j1"), step_name=StepName.STITCHING, status=Status.PENDING)
+        mock_state_repo_cls.return_value.get.side_effect = RecordNotFoundError("")
+        step_cls = MagicMock()
+        step_cls.return_value.run.return_value = {}
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 60000
+        with patch.object(Step, "of", return_value=step_cls):
+            StartTask().handler(body={"job_id": "j1", "user_email": "u@e.com"}, context=context)
+        deadline = step_cls.call_args.kwargs["deadline"]
+        assert isinstance(deadline, Deadline)
+        assert 0 < deadline.remaining() <= 60000
+
 
 class TestTaskFlushRequeue:
     """Test Task.flush() and Task.requeue() behavior."""
@@ -80,7 +104,7 @@ class TestTaskFlushRequeue:
         task.attempt = Attempt(0)
         task.flush()
         assert job.meta["step:stitching:attempt"] == 1
-        call_args = mock_state_repo.save.call_args[0][0]
+        call_args = mock_state_repo.checkpoint.call_args[0][0]
         assert call_args.attempt == 1
         assert call_args.data == {"key": "value"}
 
@@ -106,9 +130,35 @@ class TestTaskFlushRequeue:
         task.attempt = Attempt(0)
         task.requeue()
         mock_repo.save.assert_called_once_with(job)
-        assert mock_state_repo.save.call_count >= 1
+        assert mock_state_repo.checkpoint.call_count >= 1
         mock_queue.put.assert_called_once()
 
+    @patch("tasks.JobsPrivateIndex")
+    @patch("tasks.JobStateRepository")
+    @patch("tasks.JobsRepository")
+    def test_save_refreshes_the_index_summary_of_root_jobs_only(self, mock_repo_cls, mock_state_repo_cls, mock_index_cls):
+        task = StartTask()
+        task.user = MagicMock()
+        task.user.email = Email("u@e.com")
+        task.state = {}
+        task.attempt = Attempt(0)
+        task.job = Job(id=Identifier("c1"), parent_id=Identifier("p1"))
+        task.save()
+        mock_index_cls.assert_not_called()
+        task.job = Job(id=Identifier("p1"), status=Status.SUCCESS)
+        task.save()
+        mock_index_cls.assert_called_once_with(user_email=Email("u@e.com"))
+        mock_index_cls.return_value.refresh.assert_called_once_with(task.job)
+
+    @patch("tasks.unit")
+    @patch("tasks.queue")
+    def test_enqueue_flushes_the_unit_of_work_first(self, mock_queue, mock_unit):
+        calls = MagicMock()
+        calls.attach_mock(mock_unit.flush, "flush")
+        calls.attach_mock(mock_queue.put, "put")
+        StartTask().enqueue(MagicMock())
+        assert [name for name, _, _ in calls.mock_calls] == ["flush", "put"]
+
 
 class TestStartTask:
     """Test StartTask validate and execute with mocks."""
@@ -191,9 +241,167 @@ class TestStartTask:
         assert started_at_key in job.meta
         assert isinstance(job.meta[started_at_key], str)
         assert "T" in job.meta[started_at_key]
+        assert job.meta["step:stitching:invocations"] == 1
+        assert job.meta["step:stitching:vertices"] == 4
+        assert job.meta["step:stitching:obstacles"] == 0
+        assert "step:stitching:work" in job.meta
+        assert "step:stitching:wall_time" in job.meta
         mock_tasks_queue.put.assert_called()
         mock_repo.save.assert_called_once()
 
+    @patch("tasks.STEP_CACHE_ENABLED", True)
+    @patch("tasks.StepResultRepository")
+    @patch("tasks.queue")
+    @patch("tasks.JobStateRepository")
+    @patch("tasks.JobsRepository")
+    def test_execute_cache_hit_copies_stdout_without_running_step(self, mock_repo_cls, mock_state_repo_cls, mock_queue, mock_cache_cls):
+        mock_state_repo_cls.return_value.get.side_effect = RecordNotFoundError("")
+        job = Job(id=Identifier("j1"), step_name=StepName.EAR_CLIPPING, stdin={"stitched": [[0, 0], [1, 0], [0, 1]], "stitches": []})
+        mock_repo_cls.return_value.get.return_value = job
+        cached = StepResult(id=Identifier("k"), step_name=StepName.EAR_CLIPPING, stdout={"ears": {"1": [["0", "0"], ["1", "0"], ["0", "1"]]}})
+        mock_cache_cls.return_value.get.return_value = cached
+        with patch.object(StartTask, "broadcast"), patch("steps.EarClippingStep.run") as mock_run:
+            StartTask().handler({"job_id": "j1", "user_email": "u@e.com"})
+        mock_run.assert_not_called()
+        assert job.stdout["ears"] == cached.stdout["ears"]
+        assert job.meta["step:ear-clipping:cache_hits"] == 1
+        assert "step:ear-clipping:work" not in job.meta
+        mock_cache_cls.return_value.save.assert_not_called()
+
+    @patch("tasks.STEP_CACHE_ENABLED", True)
+    @patch("tasks.StepResultRepository")
+    @patch("tasks.queue")
+    @patch("tasks.JobStateRepository")
+    @patch("tasks.JobsRepository")
+    def test_execute_cache_miss_runs_step_and_stores_stdout(self, mock_repo_cls, mock_state_repo_cls, mock_queue, mock_cache_cls):
+        mock_state_repo_cls.return_value.get.side_effect = RecordNotFoundError("")
+        job = Job(id=Identifier("j1"), step_name=StepName.EAR_CLIPPING, stdin={"stitched": [[0, 0], [1, 0], [0, 1]], "stitches": []})
+        mock_repo_cls.return_value.get.return_value = job
+        mock_cache_cls.return_value.get.side_effect = RecordNotFoundError("")
+        ears = {"ears": {"1": [["0", "0"], ["1", "0"], ["0", "1"]]}}
+        with patch.object(StartTask, "broadcast"), patch("steps.EarClippingStep.run", return_value=ears) as mock_run:
+            StartTask().handler({"job_id": "j1", "user_email": "u@e.com"})
+        mock_run.assert_called_once()
+        assert job.meta["step:ear-clipping:cache_misses"] == 1
+        assert "step:ear-clipping:work" in job.meta
+        stored = mock_cache_cls.return_value.save.call_args[0][0]
+        fingerprint = Step.of(StepName.EAR_CLIPPING).fingerprint(job)
+        assert stored.id == Identifier(fingerprint.key)
+        assert stored.step_name == StepName.EAR_CLIPPING
+        assert stored.stdout == fingerprint.frame.normalize(ears)
+
+    @patch("tasks.STEP_CACHE_ENABLED", True)
+    @patch("tasks.StepResultRepository")
+    def test_lookup_skipped_on_continuation_and_errors_are_misses(self, mock_cache_cls):
+        task = StartTask()
+        task.job = Job(id=Identifier("j1"), step_name=StepName.STITCHING)
+        fingerprint = Fingerprint(key=Signature("k"), frame=Frame(x=0, y=0))
+        task.state = {"points": []}
+        assert task.lookup(fingerprint) is None
+        mock_cache_cls.return_value.get.assert_not_called()
+        task.state = {}
+        mock_cache_cls.return_value.get.side_effect = RuntimeError("S3 down")
+        assert task.lookup(fingerprint) is None
+        assert task.job.meta["step:stitching:cache_misses"] == 1
+        mock_cache_cls.return_value.save.side_effect = RuntimeError("S3 down")
+        task.store(fingerprint, {"stitched": []})
+
+    @patch("tasks.STEP_CACHE_ENABLED", True)
+    @patch("tasks.StepResultRepository")
+    def test_lookup_moves_cached_output_into_job_frame(self, mock_cache_cls):
+        task = StartTask()
+        task.job = Job(id=Identifier("j1"), step_name=StepName.STITCHING, stdout={"boundary": [["10", "20"], ["14", "20"], ["12", "23"]], "obstacles": []})
+        task.state = {}
+        fingerprint = Step.of(StepName.STITCHING).fingerprint(task.job)
+        assert fingerprint.frame == Frame(x=10, y=20)
+        stored = StepResult(id=Identifier(fingerprint.key), step_name=StepName.STITCHING, stdout={"stitched": [["0", "0"], ["4", "0"], ["2", "3"]], "stitches": []})
+        mock_cache_cls.return_value.get.return_value = stored
+        assert task.lookup(fingerprint) == {"stitched": [["10", "20"], ["14", "20"], ["12", "23"]], "stitches": []}
+        assert task.job.meta["step:stitching:cache_hits"] == 1
+
+    def test_record_accumulates_across_continuations(self):
+        job = Job(id=Identifier("j1"), step_name=StepName.STITCHING)
+        step = MagicMock()
+        step.work = 5
+        task = StartTask()
+        task.job = job
+        task.attempt = Attempt(0)
+        task.record(step, Size(vertices=8, obstacles=1), 1.5)
+        task.attempt = Attempt(1)
+        task.record(step, Size(vertices=8, obstacles=1), 2.0)
+        assert job.meta["step:stitching:work"] == 10
+        assert job.meta["step:stitching:wall_time"] == 3.5
+        assert job.meta["step:stitching:invocations"] == 2
+        assert job.meta["step:stitching:vertices"] == 8
+
+    def test_budget_only_without_deadline(self):
+        model = CostModel(coefficients={"stitching": {"seconds": [0.0, 0.0, 0.0], "work": [math.log(101), 0.0, 0.0], "vertices": 4, "obstacles": 0}})
+        task = StartTask()
+        task.job = Job(id=Identifier("j1"), step_name=StepName.STITCHING)
+        with patch.object(CostModel, "current", return_value=model):
+            assert task.budget(Size(vertices=4, obstacles=0)) == 100 * 890
+            task.deadline = Deadline.from_millis(60000)
+            assert task.budget(Size(vertices=4, obstacles=0)) is None
+
+    @patch("tasks.queue")
+    @patch("tasks.JobsRepository")
+    def test_start_runs_inline_when_step_fits(self, mock_repo_cls, mock_queue):
+        child = Job(id=Identifier("c1"), step_name=StepName.STITCHING, stdin={"boundary": [[0, 0], [1, 0], [0, 1]], "obstacles": []})
+        mock_repo_cls.return_value.get.return_value = child
+        model = CostModel(coefficients={"stitching": {"seconds": [0.0, 0.0, 0.0], "work": [0.0, 0.0, 0.0], "vertices": 3, "obstacles": 0}})
+        task = StartTask()
+        task.user = MagicMock()
+        task.user.email = Email("u@e.com")
+        task.deadline = Deadline.from_millis(60000)
+        with patch.object(CostModel, "current", return_value=model), patch.object(StartTask, "handler") as mock_handler:
+            task.start(Identifier("c1"))
+        # Left to handler(), which runs it once this job is reported.
+        mock_handler.assert_not_called()
+        assert task.inlined == [Identifier("c1")]
+        mock_queue.put.assert_not_called()
+
+    @patch("tasks.unit")
+    @patch("tasks.queue")
+    @patch("tasks.JobsRepository")
+    def test_handler_runs_inline_jobs_in_a_loop_after_the_report(self, mock_repo_cls, mock_queue, mock_unit):
+        child = Job(id=Identifier("c1"), step_name=StepName.STITCHING, stdin={"boundary": [[0, 0], [1, 0], [0, 1]], "obstacles": []})
+        mock_repo_cls.return_value.get.return_value = child
+        model = CostModel(coefficients={"stitching": {"seconds": [0.0, 0.0, 0.0], "work": [0.0, 0.0, 0.0], "vertices": 3, "obstacles": 0}})
+        tasks, job_ids = [], []
+
+        def run(task, body=None, context=None):
+            # Task.handler() of each job: j1 starts c1 inline, c1 starts c2 and c3, and c2 uses up the time left.
+            tasks.append(task)
+            job_ids.append(body["job_id"])
+            task.user = MagicMock()
+            task.user.email = Email("u@e.com")
+            task.deadline = Deadline.from_millis(60000)
+            task.inlined.extend({"j1": [Identifier("c1")], "c1": [Identifier("c2"), Identifier("c3")]}.get(body["job_id"], []))
+            if body["job_id"] == "c2":
+                tasks[0].deadline = Deadline.from_millis(0)
+            return {"status": Status.SUCCESS, "job_id": Identifier(body["job_id"])}
+
+        with patch.object(CostModel, "current", return_value=model), patch.object(Task, "handler", autospec=True, side_effect=run):
+            result = StartTask().handler(body={"job_id": "j1", "user_email": "u@e.com"})
+        assert result["job_id"] == Identifier("j1")
+        assert job_ids == ["j1", "c1", "c2"]
+        mock_queue.put.assert_called_once()
+        assert mock_queue.put.call_args.args[0].job_id == Identifier("c3")
+
+    @patch("tasks.queue")
+    @patch("tasks.JobsRepository")
+    def test_start_queues_when_step_does_not_fit(self, mock_repo_cls, mock_queue):
+        child = Job(id=Identifier("c1"), step_name=StepName.STITCHING, stdin={"boundary": [[0, 0], [1, 0], [0, 1]], "obstacles": []})
+        mock_repo_cls.return_value.get.return_value = child
+        model = CostModel(coefficients={"stitching": {"seconds": [math.log(3600), 0.0, 0.0], "work": [0.0, 0.0, 0.0], "vertices": 3, "obstacles": 0}})
+        task = StartTask()
+        task.user = MagicMock()
+        task.user.email = Email("u@e.com")
+        task.deadline = Deadline.from_millis(60000)
+        with patch.object(CostModel, "current", return_value=model):
+            task.start(Identifier("c1"))
+        mock_queue.put.assert_called_once()
+
     @patch("tasks.queue")
     @patch("tasks.JobStateRepository")
     @patch("tasks.JobsRepository")
@@ -328,6 +536,34 @@ class TestStartTask:
         start_msg = next(m for m in (put_calls[i][0][0] for i in range(len(put_calls))) if m.action == Action.START)
         assert start_msg.job_id == job.children_ids[0]
 
+    @patch("tasks.queue")
+    @patch("steps.JobsRepository")
+    @patch("tasks.JobStateRepository")
+    @patch("tasks.JobsRepository")
+    def test_execute_art_gallery_step_broadcast_skips_kept_children(self, mock_repo_cls, mock_state_repo_cls, mock_step_repo_cls, mock_queue):
+        mock_repo = MagicMock()
+        mock_repo_cls.return_value = mock_repo
+        mock_step_repo_cls.return_value = mock_repo
+        mock_state_repo_cls.return_value.get.side_effect = RecordNotFoundError("")
+        job = Job(
+            id=Identifier("parent-1"),
+            step_name=StepName.ART_GALLERY,
+            stdin={"boundary": [[0, 0], [10, 0], [10, 10], [0, 10]], "obstacles": []},
+        )
+        kept = [StepName.VALIDATE_POLYGONS, StepName.STITCHING, StepName.EAR_CLIPPING, StepName.CONVEX_COMPONENT_OPTIMIZATION]
+        kept_ids = {Identifier(Signature(f"parent-1_{step_name.value}")) for step_name in kept}
+        guard_id = Identifier(Signature(f"parent-1_{StepName.GUARD_PLACEMENT.value}"))
+        mock_repo.exists.side_effect = lambda job_id: job_id in kept_ids
+        mock_repo.get.side_effect = lambda job_id: job if job_id == job.id else Job(id=job_id, status=Status.SUCCESS if job_id in kept_ids else Status.PENDING)
+        task = StartTask()
+        task.handler({"job_id": Identifier("parent-1"), "user_email": Email("u@e.com")})
+        assert len(job.children_ids) == 5
+        saved = [call[0][0].id for call in mock_repo.save.call_args_list]
+        assert guard_id in saved
+        assert not kept_ids & set(saved)
+        starts = [call[0][0].job_id for call in mock_queue.put.call_args_list if call[0][0].action == Action.START]
+        assert starts == [guard_id]
+
     @patch("tasks.queue")
     @patch("tasks.JobStateRepository")
     @patch("tasks.JobsRepository")
@@ -392,6 +628,84 @@ class TestStartTask:
         mock_tasks_queue.put.assert_not_called()
 
 
+class TestStartTaskContext:
+    """Test the pipeline context StartTask passes between the children of an art gallery job."""
+
+    BOUNDARY = [["0", "0"], ["10", "0"], ["10", "10"], ["0", "10"]]
+    EARS = {"1": [["0", "0"], ["10", "0"], ["10", "10"]], "2": [["0", "0"], ["10", "10"], ["0", "10"]]}
+
+    def repository(self, jobs):
+        """Repository get() over a parent job with the gallery and its children jobs, and the list of ids it read."""
+        parent = Job(id=Identifier("p1"), step_name=StepName.ART_GALLERY, stdin={"boundary": self.BOUNDARY, "obstacles": []})
+        parent.children_ids = [job.id for job in jobs]
+        records = {parent.id: parent, **{job.id: job for job in jobs}}
+        read = []
+
+        def get(job_id):
+            read.append(job_id)
+            return records[job_id]
+
+        return get, read
+
+    @patch("tasks.queue")
+    @patch("tasks.JobStateRepository")
+    @patch("tasks.JobsRepository")
+    def test_child_loads_only_the_producers_of_its_fields(self, mock_repo_cls, mock_state_repo_cls, mock_queue):
+        mock_state_repo_cls.return_value.get.side_effect = RecordNotFoundError("")
+        stitching = Job(id=Identifier("c1"), step_name=StepName.STITCHING, parent_id=Identifier("p1"), stdout={"stitched": self.BOUNDARY})
+        stitching.context = {"boundary": Identifier("p1"), "obstacles": Identifier("p1"), "stitched": stitching.id}
+        ear_clipping = Job(id=Identifier("c2"), step_name=StepName.EAR_CLIPPING, parent_id=Identifier("p1"), stdout={"ears": self.EARS})
+        ear_clipping.context = {**stitching.context, "ears": ear_clipping.id}
+        job = Job(id=Identifier("c3"), step_name=StepName.CONVEX_COMPONENT_OPTIMIZATION, parent_id=Identifier("p1"))
+        get, read = self.repository([stitching, ear_clipping, job])
+        mock_repo_cls.return_value.get.side_effect = get
+        output = {"convex_components": {"1": self.BOUNDARY}}
+        seen = {}
+
+        def run(step, **kwargs):
+            seen.update(step.job.stdout)
+            return output
+
+        with patch.object(StartTask, "broadcast"), patch("steps.ConvexComponentOptimizationStep.run", run):
+            StartTask().handler({"job_id": "c3", "user_email": "u@e.com"})
+        assert seen == {"boundary": self.BOUNDARY, "obstacles": [], "ears": self.EARS}
+        assert set(read) == {Identifier("p1"), Identifier("c2"), Identifier("c3")}
+        assert job.stdout == output
+        assert job.context == {**ear_clipping.context, "convex_components": job.id}
+        assert job.meta["step:convex-component-optimization:vertices"] == 4
+
+    @patch("tasks.queue")
+    @patch("tasks.JobStateRepository")
+    @patch("tasks.JobsRepository")
+    def test_first_child_reads_the_gallery_from_the_parent(self, mock_repo_cls, mock_state_repo_cls, mock_queue):
+        mock_state_repo_cls.return_value.get.side_effect = RecordNotFoundError("")
+        job = Job(id=Identifier("c1"), step_name=StepName.VALIDATE_POLYGONS, parent_id=Identifier("p1"))
+        get, _ = self.repository([job])
+        mock_repo_cls.return_value.get.side_effect = get
+        with patch.object(StartTask, "broadcast"):
+            StartTask().handler({"job_id": "c1", "user_email": "u@e.com"})
+        assert job.status == Status.PENDING
+        assert job.stdout["boundary"] == self.BOUNDARY
+        assert job.context["boundary"] == job.id
+        assert job.context["visibility_graph"] == job.id
+
+    @patch("tasks.queue")
+    @patch("tasks.JobStateRepository")
+    @patch("tasks.JobsRepository")
+    def test_siblings_without_context_are_read_in_full(self, mock_repo_cls, mock_state_repo_cls, mock_queue):
+        mock_state_repo_cls.return_value.get.side_effect = RecordNotFoundError("")
+        stitching = Job(id=Identifier("c1"), step_name=StepName.STITCHING, parent_id=Identifier("p1"), stdout={"stitched": self.BOUNDARY, "stitches": []})
+        job = Job(id=Identifier("c2"), step_name=StepName.EAR_CLIPPING, parent_id=Identifier("p1"))
+        get, _ = self.repository([stitching, job])
+        mock_repo_cls.return_value.get.side_effect = get
+        with patch.object(StartTask, "broadcast"), patch("steps.EarClippingStep.run", return_value={"ears": self.EARS}) as mock_run:
+            StartTask().handler({"job_id": "c2", "user_email": "u@e.com"})
+        mock_run.assert_called_once()
+        assert job.context["stitched"] == Identifier("c1")
+        assert job.context["boundary"] == Identifier("p1")
+        assert job.stdout == {"ears": self.EARS}
+
+
 class TestReportTask:
     """Test ReportTask validate and execute with mocks."""
 
@@ -438,6 +752,7 @@ class TestReportTask:
             meta={},
         )
         child = MagicMock()
+        child.step_name = StepName.EAR_CLIPPING
         child.is_failed.return_value = False
         child.is_pending.return_value = False
         child.stdout = {"out": "c1"}
@@ -473,6 +788,7 @@ class TestReportTask:
             step_name=StepName.ART_GALLERY,
         )
         child = MagicMock()
+        child.step_name = StepName.EAR_CLIPPING
         child.is_failed.return_value = True
         child.is_pending.return_value = False
         child.stdout = {}
@@ -528,3 +844,53 @@ class TestReportTask:
         assert "step:art-gallery:finished_at" in parent.meta
         assert isinstance(parent.duration, Duration)
         assert parent.duration >= 0
+
+    @patch("tasks.ReportTask.broadcast")
+    @patch("tasks.queue")
+    @patch("tasks.JobStateRepository")
+    @patch("tasks.JobsRepository")
+    def test_execute_leaves_internal_child_fields_out_of_parent(self, mock_repo_cls, mock_state_repo_cls, mock_queue, mock_broadcast):
+        mock_state_repo_cls.return_value.get.side_effect = RecordNotFoundError("")
+        parent = Job(id=Identifier("p1"), children_ids=[Identifier("c1")], step_name=StepName.ART_GALLERY)
+        child = Job(
+            id=Identifier("c1"),
+            parent_id=Identifier("p1"),
+            status=Status.SUCCESS,
+            step_name=StepName.VALIDATE_POLYGONS,
+            stdout={"boundary": [[0, 0], [1, 0], [0, 1]], "obstacles": [], "visibility_graph": {"vertices": []}},
+        )
+        mock_repo_cls.return_value.get.side_effect = lambda rid: parent if str(rid) == "p1" else child
+        ReportTask().handler({"job_id": "p1", "user_email": "u@e.com"})
+        assert parent.stdout == {"boundary": [[0, 0], [1, 0], [0, 1]], "obstacles": []}
+        # The child keeps it for the steps that read it through the pipeline context.
+        assert "visibility_graph" in child.stdout
+
+    @patch("tasks.STEP_CACHE_ENABLED", True)
+    @patch("tasks.STEP_CACHE_EVICTION_RATE", 1.0)
+    @patch("tasks.StepResultRepository")
+    @patch("tasks.ReportTask.broadcast")
+    @patch("tasks.JobStateRepository")
+    @patch("tasks.JobsRepository")
+    def test_execute_root_job_finished_evicts_step_cache(self, mock_repo_cls, mock_state_repo_cls, mock_broadcast, mock_cache_cls):
+        mock_state_repo_cls.return_value.get.side_effect = RecordNotFoundError("")
+        parent = Job(id=Identifier("p1"), children_ids=[Identifier("c1")], step_name=StepName.ART_GALLERY)
+        child = Job(id=Identifier("c1"), parent_id=Identifier("p1"), status=Status.SUCCESS, step_name=StepName.GUARD_PLACEMENT)
+        mock_repo_cls.return_value.get.side_effect = lambda rid: parent if str(rid) == "p1" else child
+        mock_cache_cls.return_value.evict.side_effect = RuntimeError("S3 down")
+        ReportTask().handler({"job_id": "p1", "user_email": "u@e.com"})
+        assert parent.status == Status.SUCCESS
+        mock_cache_cls.return_value.evict.assert_called_once_with()
+
+    @patch("tasks.STEP_CACHE_ENABLED", True)
+    @patch("tasks.StepResultRepository")
+    def test_evict_runs_on_a_sample_of_finished_root_jobs(self, mock_cache_cls):
+        task = ReportTask()
+        task.job = Job(id=Identifier("p1"), step_name=StepName.ART_GALLERY)
+        with patch("tasks.STEP_CACHE_EVICTION_RATE", 0.25), patch("tasks.random.random", side_effect=[0.5, 0.1]):
+            task.evict()
+            mock_cache_cls.return_value.evict.assert_not_called()
+            task.evict()
+            mock_cache_cls.return_value.evict.assert_called_once_with()
+        with patch("tasks.STEP_CACHE_EVICTION_RATE", 0.0):
+            task.evict()
+        assert mock_cache_cls.return_value.evict.call_count == 1
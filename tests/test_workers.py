@@ -8,6 +8,7 @@ from attributes import Identifier
 from enums import Action
 from enums import Status
 from exceptions import ValidationError
+from repositories import unit
 from workers import WorkerRequest
 from workers import WorkerResponse
 from workers import handler
@@ -154,6 +155,16 @@ class TestHandler:
         assert resp["results"][0]["status"] == Status.SUCCESS.value
         mock_queue.commit.assert_called_once()
 
+    @patch("workers.Queue")
+    def test_handler_runs_each_message_in_the_unit_of_work(self, mock_queue_cls):
+        active = []
+        mock_task = MagicMock()
+        mock_task.handler.side_effect = lambda **kwargs: active.append(unit.active) or {"status": Status.SUCCESS}
+        with patch.dict("workers.ROUTES", {Action.START: lambda: mock_task}):
+            handler({"Records": [{"body": '{"action": "start", "job_id": "j1", "user_email": "u@e.com"}', "receiptHandle": "rh1"}]}, None)
+        assert active == [True]
+        assert not unit.active
+
     @patch("workers.Queue")
     def test_handler_commit_exception_logged_result_still_appended(self, mock_queue_cls):
         mock_queue = MagicMock()